@@ -5,6 +5,9 @@ import logging
 import pandas as pd
 from datetime import timedelta, datetime
 from core.news_analyzer import NewsAnalyzer
+from core.db_connector import DBConnector
+from core.corpus_cache import corpus_cache_stats
+from core.token_store import TokenStore, token_store
 
 # 기능 모듈 임포트
 from app_modules import DashboardModule, NewsModule, MusinsaModule, MagazineModule
@@ -347,20 +350,14 @@ def get_keywords():
             logger.warning("키워드 API: 데이터가 없습니다.")
             return jsonify([])
         
-        all_tokens = []
-        if 'tokens' in data.columns:
-            for tokens in data['tokens']:
-                if isinstance(tokens, list):
-                    all_tokens.extend(tokens)
+        token_counts = token_store(data).most_common(20)
         
-        if not all_tokens:
+        if not token_counts:
             logger.warning("키워드 API: 토큰 데이터가 없습니다.")
             return jsonify([])
-            
-        token_counts = pd.Series(all_tokens).value_counts().head(20)
         
         keywords = [{'text': key, 'count': int(value)} 
-                   for key, value in token_counts.items()]
+                   for key, value in token_counts]
         
         return jsonify(keywords)
     
@@ -615,10 +612,10 @@ def api_news_search():
         # 키워드로 기사 필터링
         if 'token_list' in data.columns:
             # 토큰에서 키워드 검색
-            matches = data['token_list'].apply(lambda tokens: keyword in tokens if isinstance(tokens, list) else False)
+            matches = token_store(data, 'token_list').contains(keyword)
         elif 'tokens' in data.columns:
             # 토큰에서 키워드 검색
-            matches = data['tokens'].apply(lambda tokens: keyword in tokens if isinstance(tokens, list) else False)
+            matches = token_store(data).contains(keyword)
         else:
             # 제목이나 내용에서 키워드 검색
             matches = (
@@ -869,31 +866,15 @@ def integrated_trends():
                 'topKeywords': []
             })
         
-        # 통합 데이터 준비
-        combined_tokens = []
-        
-        # 뉴스 토큰 추출
-        if not news_data.empty and 'token_list' in news_data.columns:
-            for tokens in news_data['token_list']:
-                if isinstance(tokens, list):
-                    combined_tokens.extend(tokens)
-        
-        # 매거진 토큰 추출
-        if not magazine_data.empty and 'tokens' in magazine_data.columns:
-            for tokens in magazine_data['tokens']:
-                if isinstance(tokens, list):
-                    combined_tokens.extend(tokens)
-        
-        # 무신사 토큰 추출 (적절한 컬럼명 가정)
-        if not musinsa_data.empty and 'tokens' in musinsa_data.columns:
-            for tokens in musinsa_data['tokens']:
-                if isinstance(tokens, list):
-                    combined_tokens.extend(tokens)
+        # 통합 데이터 준비 (뉴스, 매거진, 무신사 토큰 저장소의 단어 id 별 빈도 합산)
+        combined = TokenStore.concat([
+            token_store(news_data, 'token_list'),
+            token_store(magazine_data),
+            token_store(musinsa_data)
+        ])
         
         # 상위 키워드 추출
-        from collections import Counter
-        token_counter = Counter(combined_tokens)
-        top_keywords = token_counter.most_common(10)
+        top_keywords = combined.most_common(10)
         
         # GPT/Gemini API를 호출하여 키워드 분석 및 인사이트 생성 (실제 구현 필요)
         # 여기서는 예시 데이터 반환
@@ -1037,6 +1018,24 @@ def calendar_events():
         logger.error(f"캘린더 이벤트 API 오류: {e}", exc_info=True)
         return jsonify({'error': str(e)})
 
+@app.route('/api/db-pool-stats')
+def db_pool_stats():
+    """DB 연결 풀 사용량 API (사용 중/유휴 연결 수, 대기 횟수와 시간, 대기 시간 초과, 연결 점검 결과)"""
+    try:
+        return jsonify(DBConnector.pool_stats())
+    except Exception as e:
+        logger.error(f"연결 풀 통계 API 오류: {e}", exc_info=True)
+        return jsonify({'error': str(e)})
+
+@app.route('/api/corpus-cache-stats')
+def corpus_cache_stats_api():
+    """문서 캐시 상태 API (적중/미적중, 증분 갱신 횟수, 보관 문서/파티션 수, 워터마크)"""
+    try:
+        return jsonify(corpus_cache_stats())
+    except Exception as e:
+        logger.error(f"문서 캐시 통계 API 오류: {e}", exc_info=True)
+        return jsonify({'error': str(e)})
+
 
 @app.errorhandler(404)
 def page_not_found(e):
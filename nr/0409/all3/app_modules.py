@@ -16,6 +16,7 @@ from core.visualizer import (
     generate_tfidf_chart
 )
 from core.competitor_analyzer import generate_competitor_analysis, generate_competitor_analysis_by_date
+from core.token_store import token_store
 
 class DashboardModule:
     """통합 대시보드 관련 기능을 담당하는 클래스"""
@@ -241,15 +242,8 @@ class NewsModule:
     def _extract_keywords(self, data):
         """키워드 추출"""
         try:
-            # 모든 토큰 추출
-            all_tokens = []
-            if 'tokens' in data.columns:
-                for tokens in data['tokens']:
-                    if isinstance(tokens, list):
-                        all_tokens.extend(tokens)
-                    
-            # 빈도수 계산
-            keyword_counts = pd.Series(all_tokens).value_counts().head(20).to_dict()
+            # 빈도수 계산 (정수 인코딩된 토큰 저장소)
+            keyword_counts = dict(token_store(data).most_common(20))
             
             return keyword_counts
         except Exception as e:
@@ -606,14 +600,8 @@ class MagazineModule:
     def _analyze_topics(self, data):
         """토픽 분석"""
         try:
-            # 모든 토큰 추출
-            all_tokens = []
-            for tokens in data['tokens']:
-                if isinstance(tokens, list):
-                    all_tokens.extend(tokens)
-                    
-            # 빈도수 계산
-            topic_counts = pd.Series(all_tokens).value_counts().head(20).to_dict()
+            # 빈도수 계산 (정수 인코딩된 토큰 저장소)
+            topic_counts = dict(token_store(data).most_common(20))
             
             topic_analysis = {
                 'top_topics': topic_counts
@@ -0,0 +1,81 @@
+# benchmarks/bench_cooccurrence.py
+"""키워드 네트워크 동시 출현 계산 비교: 문서별 토큰 쌍 이중 루프 vs 희소 행렬 Xᵀ·X
+
+뉴스 연관어 분석(상위 300개 단어)과 매거진 키워드 네트워크(불용어 제외, 사전 전체 상위 30개 쌍)의
+기존 파이썬 루프와 동시 출현 엔진의 계산 시간을 비교한다.
+
+    python benchmarks/bench_cooccurrence.py --docs 20000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from collections import Counter, defaultdict
+from itertools import combinations
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.local_db import _vocabulary
+from core.token_store import TokenStore, VOCABULARY
+from core.cooccurrence import build_cooccurrence, strongest_pairs
+
+STOPWORDS = {'패션', '스타일', '브랜드', '아이템', '트렌드'}
+
+
+def loop_association(docs, top_n):
+    """기존 연관어 분석: 상위 단어만 남긴 토큰의 모든 위치 쌍"""
+    word_set = set(w for w, _ in Counter(t for tokens in docs for t in tokens).most_common(top_n))
+    cooccurrence = defaultdict(int)
+    for tokens in docs:
+        filtered = [t for t in tokens if t in word_set]
+        for i, word1 in enumerate(filtered):
+            for word2 in filtered[i + 1:]:
+                if word1 != word2:
+                    cooccurrence[tuple(sorted([word1, word2]))] += 1
+    return cooccurrence
+
+
+def loop_network(docs, max_edges):
+    """기존 네트워크 데이터: 불용어를 뺀 문서별 고유 단어 쌍"""
+    edge_counter = Counter()
+    for tokens in docs:
+        unique_tokens = sorted(set(t for t in tokens if t not in STOPWORDS and len(t) > 1))
+        edge_counter.update(combinations(unique_tokens, 2))
+    return edge_counter.most_common(max_edges)
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=20000, help='예시 문서 수')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    words, weights = _vocabulary()
+    words = words + [f"단어{i}" for i in range(20000)]
+    weights = weights + [0.002] * 20000
+    docs = [rng.choices(words, weights=weights, k=rng.randint(20, 80)) for _ in range(args.docs)]
+    store = TokenStore.from_tokens(docs)
+    exclude = VOCABULARY.stopword_mask(STOPWORDS, min_length=2)
+    print(f"문서 {len(store)}개, 토큰 {len(store.values)}개")
+
+    cases = [
+        ('연관어(상위 300)', lambda: loop_association(docs, 300), lambda: build_cooccurrence(store, top_n=300).pairs()),
+        ('연관어(10토큰 구간)', None, lambda: build_cooccurrence(store, top_n=300, window=10).edges(weighting='npmi')),
+        ('네트워크(상위 30쌍)', lambda: loop_network(docs, 30), lambda: strongest_pairs(store, 30, exclude=exclude)),
+    ]
+    print(f"{'계산':<20}{'루프(ms)':>12}{'엔진(ms)':>12}")
+    for name, with_loop, with_engine in cases:
+        loop_ms = f"{timed(with_loop):.1f}" if with_loop else '-'
+        print(f"{name:<20}{loop_ms:>12}{timed(with_engine):>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_corpus_cache.py
+"""기간 조회 비교: 매번 DB 조회 + 토큰 디코딩 vs 문서 캐시 (로컬 SQLite 대체 DB)
+
+대시보드 기간 선택(7일 ~ 1년)마다 매거진 문서를 DB 에서 읽어 JSON 토큰을 디코딩하는 방식과
+문서 캐시에서 기간을 잘라 오는 방식의 조회 시간을 비교한다.
+
+    python benchmarks/bench_corpus_cache.py --docs 20000 --repeat 20
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.config import DATABASES, PERIOD_DAYS
+from core.corpus_cache import CorpusCache
+from core.db_connector import ConnectionPool, DBConnector, SQLiteBackend
+from core.local_db import build_local_databases
+from core.magazine_data_loader import CORPUS_QUERY, decode_documents
+
+PERIOD_QUERY = """
+    SELECT doc_id, doc_domain, source, upload_date, title, content, tokens
+    FROM magazine_tokenised
+    WHERE upload_date >= %s
+    ORDER BY upload_date DESC
+"""
+
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat * 1000, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=20000, help='예시 매거진 문서 수')
+    parser.add_argument('--repeat', type=int, default=20, help='기간별 반복 횟수')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_local_databases(directory, docs=args.docs, news=100)
+        backend = SQLiteBackend(DATABASES['magazine'], directory)
+        DBConnector._pools['magazine'] = ConnectionPool('magazine_pool', backend, pool_size=2)
+
+        cache = CorpusCache('magazine', CORPUS_QUERY, 'upload_date', key_column='doc_id', decode=decode_documents)
+        started = time.perf_counter()
+        cache.refresh()
+        print(f"캐시 적재: {(time.perf_counter() - started) * 1000:.1f}ms, {cache.stats()['documents']}개 문서")
+
+        print(f"{'기간':<8}{'문서 수':>8}{'DB(ms)':>10}{'캐시(ms)':>10}")
+        for period, days in PERIOD_DAYS.items():
+            start = datetime.now() - timedelta(days=days)
+            db_ms, count = timed(lambda: decode_documents(DBConnector.fetch_all(PERIOD_QUERY, (start,))), args.repeat)
+            cache_ms, _ = timed(lambda: cache.window(start), args.repeat)
+            print(f"{period:<8}{count:>8}{db_ms:>10.1f}{cache_ms:>10.2f}")
+
+        DBConnector._pools.pop('magazine').close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/bench_db_pool.py
+"""데이터 접근 계층 부하 테스트 (로컬 SQLite 대체 DB)
+
+여러 요청 스레드가 동시에 대시보드 조회 쿼리(기간별 매거진 문서, 뉴스 기사, 카드뉴스)를 실행할 때
+호출마다 새 연결을 여는 방식과 공유 연결 풀을 쓰는 방식의 처리량/지연 시간을 비교하고 풀 사용량을 출력한다.
+
+    python benchmarks/bench_db_pool.py --threads 16 --requests 50 --pool-size 5
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.config import DATABASES
+from core.db_connector import ConnectionPool, SQLiteBackend
+from core.local_db import build_local_databases
+
+# (데이터베이스, 쿼리, 파라미터 생성 함수) - 데이터 로더의 실제 쿼리
+QUERIES = [
+    ('magazine', """
+        SELECT doc_id, doc_domain, source, upload_date, title, content, tokens
+        FROM magazine_tokenised
+        WHERE upload_date >= %s
+        ORDER BY upload_date DESC
+    """, lambda: (datetime.now() - timedelta(days=30),)),
+    ('news', """
+        SELECT a.id, a.keyword, a.title, a.content, a.published, a.source, t.tokens
+        FROM knews_articles a
+        LEFT JOIN tokenised t ON a.id = t.id
+        WHERE a.published >= %s
+        ORDER BY a.published DESC
+    """, lambda: (datetime.now() - timedelta(days=7),)),
+    ('magazine', """
+        SELECT title, upload_date, article_url, source
+        FROM fashion_trends.all_trends
+        WHERE 1=1 AND LOWER(source) = %s
+        ORDER BY upload_date DESC
+        LIMIT 12;
+    """, lambda: ('vogue',)),
+]
+
+
+def run_query(backend, conn, query, params):
+    query, params = backend.prepare(query, params)
+    cursor = backend.cursor(conn)
+    try:
+        cursor.execute(query, params)
+        return len(cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def run(mode, backends, pools, threads, requests):
+    """모든 스레드가 requests 번씩 쿼리를 돌아가며 실행하고 지연 시간 목록 반환"""
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(index):
+        local = []
+        for i in range(requests):
+            database, query, params = QUERIES[(index + i) % len(QUERIES)]
+            backend = backends[database]
+            started = time.perf_counter()
+            if mode == 'per_call':
+                conn = backend.connect()
+                try:
+                    run_query(backend, conn, query, params())
+                finally:
+                    conn.close()
+            else:
+                with pools[database].connection() as conn:
+                    run_query(backend, conn, query, params())
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(threads)))
+    return latencies, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16, help='동시 요청 스레드 수')
+    parser.add_argument('--requests', type=int, default=50, help='스레드당 쿼리 수')
+    parser.add_argument('--pool-size', type=int, default=5, help='데이터베이스별 연결 풀 크기')
+    parser.add_argument('--docs', type=int, default=3000, help='예시 매거진 문서 수')
+    parser.add_argument('--news', type=int, default=3000, help='예시 뉴스 기사 수')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_local_databases(directory, docs=args.docs, news=args.news)
+        backends = {name: SQLiteBackend(config, directory) for name, config in DATABASES.items()}
+        pools = {name: ConnectionPool(f"{name}_pool", backend, pool_size=args.pool_size, checkout_timeout=30)
+                 for name, backend in backends.items()}
+
+        print(f"스레드 {args.threads}개 x 쿼리 {args.requests}개, 풀 크기 {args.pool_size}")
+        print(f"{'방식':<10}{'처리량(q/s)':>14}{'평균(ms)':>12}{'p95(ms)':>12}")
+        for mode in ('per_call', 'pooled'):
+            latencies, elapsed = run(mode, backends, pools, args.threads, args.requests)
+            latencies.sort()
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            print(f"{mode:<10}{len(latencies) / elapsed:>14.1f}{sum(latencies) / len(latencies) * 1000:>12.1f}"
+                  f"{p95 * 1000:>12.1f}")
+
+        for name, pool in pools.items():
+            print(f"  {name} 풀: {pool.stats()}")
+            pool.close()
+
+
+if __name__ == '__main__':
+    main()
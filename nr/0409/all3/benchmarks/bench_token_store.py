@@ -0,0 +1,94 @@
+# benchmarks/bench_token_store.py
+"""토큰 표현 비교: JSON 디코딩한 문자열 리스트 vs 정수 인코딩 토큰 저장소 (CSR)
+
+예시 매거진 문서의 tokens JSON 을 디코딩한 리스트와 TokenStore 의 메모리 사용량,
+단어 빈도/동시 출현/카테고리 집계/TF-IDF 계산 시간을 비교한다.
+
+    python benchmarks/bench_token_store.py --docs 20000
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from core.config import CATEGORY_KEYWORDS
+from core.local_db import _vocabulary
+from core.token_store import TokenStore, Vocabulary
+from core.cooccurrence import build_cooccurrence
+
+
+def measure(fn):
+    """(결과, 경과 ms, 할당된 메모리 MB)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    allocated = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+    return result, elapsed, allocated
+
+
+def list_cooccurrence(docs, top_words):
+    pairs = Counter()
+    for tokens in docs:
+        tokens = [t for t in tokens if t in top_words]
+        for i, word1 in enumerate(tokens):
+            for word2 in tokens[i + 1:]:
+                if word1 != word2:
+                    pairs[tuple(sorted([word1, word2]))] += 1
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=20000, help='예시 문서 수')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    words, weights = _vocabulary()
+    # 실제 말뭉치처럼 드문 단어(고유명사 등)도 섞음
+    words = words + [f"단어{i}" for i in range(20000)]
+    weights = weights + [0.002] * 20000
+    raw = [json.dumps(rng.choices(words, weights=weights, k=rng.randint(20, 80)), ensure_ascii=False)
+           for _ in range(args.docs)]
+
+    docs, list_ms, list_mb = measure(lambda: [json.loads(tokens) for tokens in raw])
+    store, store_ms, store_mb = measure(lambda: TokenStore.from_tokens(raw, vocabulary=Vocabulary()))
+    total = len(store.values)
+    print(f"문서 {len(store)}개, 토큰 {total}개, 고유 단어 {len(store.vocabulary)}개")
+    print(f"{'표현':<16}{'로드(ms)':>10}{'메모리(MB)':>12}{'토큰 100만개당(MB)':>20}")
+    print(f"{'JSON 리스트':<16}{list_ms:>10.1f}{list_mb:>12.1f}{list_mb / total * 1e6:>20.1f}")
+    print(f"{'TokenStore':<16}{store_ms:>10.1f}{store.nbytes / 1024 / 1024:>12.1f}"
+          f"{store.nbytes / 1024 / 1024 / total * 1e6:>20.1f}  (사전 포함 할당 {store_mb:.1f}MB)")
+
+    top_words = set(w for w, _ in Counter(t for tokens in docs for t in tokens).most_common(50))
+    cases = [
+        ('단어 빈도', lambda: Counter(t for tokens in docs for t in tokens), lambda: store.counter()),
+        ('동시 출현(상위 50)', lambda: list_cooccurrence(docs, top_words), lambda: build_cooccurrence(store, top_n=50)),
+        ('카테고리 집계', lambda: {c: sum(1 for tokens in docs for t in tokens if t in kws)
+                               for c, kws in CATEGORY_KEYWORDS.items()},
+         lambda: store.category_counts(CATEGORY_KEYWORDS)),
+        ('TF-IDF(100)', lambda: TfidfVectorizer(max_features=100).fit_transform([' '.join(t) for t in docs]),
+         lambda: store.tfidf(max_features=100)),
+    ]
+    print(f"{'계산':<20}{'리스트(ms)':>12}{'저장소(ms)':>12}")
+    for name, with_lists, with_store in cases:
+        started = time.perf_counter()
+        with_lists()
+        list_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        with_store()
+        store_ms = (time.perf_counter() - started) * 1000
+        print(f"{name:<20}{list_ms:>12.1f}{store_ms:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_trend_table.py
+"""키워드 추이 계산 비교: 키워드 × 구간마다 문서 스캔 vs 스냅샷 (일, 단어) 집계표 (로컬 SQLite 대체 DB)
+
+1년 기간 매거진 문서에서 상위 키워드들의 주간/월간 포함 문서 수를 기존 방식(구간별 DataFrame 필터 후
+키워드마다 토큰 리스트 검사)과 문서 캐시 집계표에서 잘라 오는 방식으로 계산해 시간을 비교한다.
+
+    python benchmarks/bench_trend_table.py --docs 20000 --keywords 50
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from core.config import DATABASES
+from core.corpus_cache import CorpusCache
+from core.db_connector import ConnectionPool, DBConnector, SQLiteBackend
+from core.local_db import build_local_databases
+from core.magazine_data_loader import CORPUS_QUERY, decode_documents
+from core.trend_table import trend_table
+
+
+def scan_trend(df, keywords, granularity):
+    """기존 방식: 구간마다 행을 거르고 키워드마다 토큰 리스트 검사"""
+    if granularity == 'weekly':
+        units = df['upload_date'].dt.to_period('W').dt.start_time
+    else:
+        units = df['upload_date'].dt.strftime('%Y-%m')
+    df = df.assign(time_unit=units)
+    trends = {}
+    for keyword in keywords:
+        trends[keyword] = [sum(1 for tokens in df[df['time_unit'] == unit]['tokens'] if keyword in tokens)
+                           for unit in sorted(df['time_unit'].unique())]
+    return trends
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--docs', type=int, default=20000, help='예시 매거진 문서 수')
+    parser.add_argument('--keywords', type=int, default=50, help='키워드 수')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_local_databases(directory, docs=args.docs, news=100)
+        backend = SQLiteBackend(DATABASES['magazine'], directory)
+        DBConnector._pools['magazine'] = ConnectionPool('magazine_pool', backend, pool_size=2)
+
+        cache = CorpusCache('magazine', CORPUS_QUERY, 'upload_date', key_column='doc_id', decode=decode_documents,
+                            token_column='tokens', group_column='magazine_name')
+        cache.refresh()
+        data = cache.window(datetime.now() - timedelta(days=365))
+        print(f"1년 문서 {len(data)}개")
+
+        build_ms = timed(lambda: trend_table(data, 'upload_date'))
+        keywords = [term for term, _ in trend_table(data, 'upload_date').top_terms(args.keywords)]
+        print(f"스냅샷 집계표 생성(첫 조회): {build_ms:.1f}ms")
+
+        print(f"{'계산':<24}{'스캔(ms)':>12}{'집계표(ms)':>12}")
+        for granularity in ('weekly', 'monthly'):
+            scan_ms = timed(lambda: scan_trend(data, keywords, granularity))
+            table_ms = timed(lambda: trend_table(data, 'upload_date').trend(keywords, granularity))
+            print(f"{granularity + f' × {len(keywords)}개 키워드':<24}{scan_ms:>12.1f}{table_ms:>12.1f}")
+
+        magazine = data['magazine_name'].iloc[0]
+        subset = data[data['magazine_name'] == magazine]
+        table_ms = timed(lambda: trend_table(subset, 'upload_date', group_column='magazine_name').trend(keywords, 'weekly'))
+        print(f"{'매거진 ' + magazine + ' weekly':<24}{'-':>12}{table_ms:>12.1f}")
+
+        DBConnector._pools.pop('magazine').close()
+
+
+if __name__ == '__main__':
+    main()
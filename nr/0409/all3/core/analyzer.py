@@ -8,6 +8,9 @@ from itertools import combinations
 from datetime import datetime, timedelta
 import os
 import logging
+from .token_store import VOCABULARY, token_store
+from .cooccurrence import strongest_pairs
+from .trend_table import trend_table
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -34,6 +37,22 @@ class Analyzer:
         """불용어 제거"""
         return [t for t in tokens if t not in STOPWORDS and len(t) > 1]
     
+    @staticmethod
+    def stopword_mask():
+        """remove_stopwords 가 지우는 단어 id 마스크 (토큰 저장소 집계의 exclude 로 사용)"""
+        return VOCABULARY.stopword_mask(STOPWORDS, min_length=2)
+    
+    @staticmethod
+    def token_counts(store):
+        """불용어를 뺀 단어 id 별 출현 횟수와 단어 → 횟수 조회 함수"""
+        counts = store.term_frequency(exclude=Analyzer.stopword_mask())
+        
+        def count_of(term):
+            term_id = store.vocabulary.id(term)
+            return int(counts[term_id]) if 0 <= term_id < len(counts) else 0
+        
+        return counts, count_of
+    
     @staticmethod
     def get_top_keywords(df, n=20):
         """
@@ -49,14 +68,9 @@ class Analyzer:
         if df.empty:
             return pd.DataFrame(columns=['token', 'count'])
         
-        # 모든 토큰 추출 및 불용어 제거
-        all_tokens = []
-        for tokens in df['tokens']:
-            all_tokens.extend(Analyzer.remove_stopwords(tokens))
-        
-        # 빈도수 계산
-        token_counts = pd.Series(all_tokens).value_counts().head(n).reset_index()
-        token_counts.columns = ['token', 'count']
+        # 불용어를 뺀 빈도수 계산 (정수 인코딩된 토큰 저장소)
+        top = token_store(df).most_common(n, exclude=Analyzer.stopword_mask())
+        token_counts = pd.DataFrame(top, columns=['token', 'count'])
         
         return token_counts
     
@@ -76,15 +90,13 @@ class Analyzer:
         if df.empty:
             return []
         
-        docs = df['tokens'].apply(lambda x: ' '.join(Analyzer.remove_stopwords(x))).tolist()
+        store = token_store(df)
         
-        if not docs or len(docs) <= article_idx:
+        if not len(store) or len(store) <= article_idx:
             return []
         
-        vectorizer = TfidfVectorizer()
         try:
-            tfidf_matrix = vectorizer.fit_transform(docs)
-            feature_names = vectorizer.get_feature_names_out()
+            feature_names, tfidf_matrix = store.tfidf(exclude=Analyzer.stopword_mask())
             
             scores = tfidf_matrix[article_idx].toarray()[0]
             top_n = scores.argsort()[-n:][::-1]
@@ -110,20 +122,14 @@ class Analyzer:
         if df.empty:
             return {'nodes': [], 'links': []}
         
-        edge_counter = Counter()
-        for tokens in df['tokens']:
-            cleaned = Analyzer.remove_stopwords(tokens)
-            unique_tokens = list(set(cleaned))
-            if len(unique_tokens) >= 2:
-                edge_counter.update(combinations(unique_tokens, 2))
-        
-        top_edges = edge_counter.most_common(max_edges)
+        # 불용어를 뺀 단어 쌍 중 함께 나온 문서 수 상위 max_edges 개
+        _, top_edges = strongest_pairs(token_store(df), max_edges, exclude=Analyzer.stopword_mask())
         
         # 네트워크 그래프 데이터 형식으로 변환
         nodes = set()
         edges = []
         
-        for (source, target), weight in top_edges:
+        for source, target, weight, _ in top_edges:
             nodes.add(source)
             nodes.add(target)
             edges.append({
@@ -222,15 +228,14 @@ class Analyzer:
             if df.empty:
                 return {k: 0 for k in keyword_list}
             
-            all_tokens = [token for tokens in df['tokens'] for token in Analyzer.remove_stopwords(tokens)]
-            counts = pd.Series(all_tokens).value_counts()
+            _, count_of = Analyzer.token_counts(token_store(df))
             
             result = {}
             for item in keyword_list:
                 if item in Analyzer.keyword_aliases:
-                    result[item] = sum(counts.get(alias, 0) for alias in Analyzer.keyword_aliases[item])
+                    result[item] = sum(count_of(alias) for alias in Analyzer.keyword_aliases[item])
                 else:
-                    result[item] = counts.get(item, 0)
+                    result[item] = count_of(item)
             
             return result
         
@@ -301,17 +306,19 @@ class Analyzer:
                 'tfidf_keywords': {}
             }
         
+        # 매거진별 문서를 이어 붙인 토큰 저장소 (magazines 순서, 불용어는 집계에서 제외)
+        stopword_mask = Analyzer.stopword_mask()
+        mag_names = list(dict.fromkeys(magazines))
+        mag_rows = {mag: row for row, mag in enumerate(mag_names)}
+        codes = pd.Categorical(df_mag['source'], categories=mag_names).codes
+        mag_store = token_store(df_mag).grouped(codes, n_groups=len(mag_names))
+        
         # 상위 키워드 비교
         top_tokens_per_mag = {}
         for mag in magazines:
-            mag_tokens = []
-            mag_df = df_mag[df_mag['source'] == mag]
-            
-            if not mag_df.empty:
-                for tokens in mag_df['tokens']:
-                    mag_tokens.extend(Analyzer.remove_stopwords(tokens))
-                
-                top_tokens_per_mag[mag] = pd.Series(mag_tokens).value_counts().head(30)
+            top = mag_store.subset([mag_rows[mag]]).most_common(30, exclude=stopword_mask)
+            if top:
+                top_tokens_per_mag[mag] = pd.Series(dict(top))
             else:
                 # 해당 매거진 데이터가 없는 경우 빈 시리즈 추가
                 top_tokens_per_mag[mag] = pd.Series()
@@ -330,34 +337,17 @@ class Analyzer:
         tfidf_keywords = {}
         
         if not df_mag.empty:
-            # 매거진별 그룹화
-            mag_groups = df_mag.groupby("source")['tokens']
-            
-            # 각 매거진별 모든 토큰 합치기
-            mag_tokens = {}
-            for mag, tokens_group in mag_groups:
-                if mag in magazines:
-                    all_tokens = []
-                    for tokens in tokens_group:
-                        all_tokens.extend(Analyzer.remove_stopwords(tokens))
-                    mag_tokens[mag] = all_tokens
+            # 문서가 있는 매거진 (magazines 순서)
+            present = [mag for mag in mag_names if mag_store.lengths()[mag_rows[mag]] > 0]
             
-            # 각 매거진별 텍스트 생성
-            docs = {}
-            for mag, tokens in mag_tokens.items():
-                docs[mag] = " ".join(tokens)
-            
-            # TF-IDF 분석 (2개 이상의 문서가 있을 때만)
-            if len(docs) >= 2:
+            # TF-IDF 분석 (2개 이상의 문서가 있을 때만) - 매거진별로 이어 붙인 토큰이 한 문서
+            if len(present) >= 2:
                 try:
-                    vectorizer = TfidfVectorizer()
-                    doc_list = [docs[mag] for mag in magazines if mag in docs]
+                    doc_store = mag_store.subset([mag_rows[mag] for mag in present])
+                    feature_names, tfidf_matrix = doc_store.tfidf(exclude=stopword_mask)
                     
-                    if doc_list:
-                        tfidf_matrix = vectorizer.fit_transform(doc_list)
-                        feature_names = vectorizer.get_feature_names_out()
-                        
-                        for i, mag in enumerate([mag for mag in magazines if mag in docs]):
+                    if len(doc_store):
+                        for i, mag in enumerate(present):
                             if i < tfidf_matrix.shape[0]:  # 인덱스 범위 검사
                                 row = tfidf_matrix[i].toarray().flatten()
                                 top_n = row.argsort()[-10:][::-1]
@@ -402,26 +392,10 @@ class Analyzer:
         if df_filtered.empty:
             return pd.DataFrame()
         
-        # 주간 데이터로 변환
-        df_filtered['week'] = df_filtered['upload_date'].dt.to_period('W').apply(lambda r: r.start_time)
-        
-        # 주간 키워드 언급량 계산
-        rows = []
-        for week, group in df_filtered.groupby('week'):
-            tokens = [token for tokens in group['tokens'] for token in Analyzer.remove_stopwords(tokens)]
-            counts = pd.Series(tokens).value_counts()
-            
-            row = {'week': week}
-            for kw in keywords:
-                # 키워드에 별칭이 있는 경우 합산
-                if kw in Analyzer.keyword_aliases:
-                    row[kw] = sum(counts.get(alias, 0) for alias in Analyzer.keyword_aliases[kw])
-                else:
-                    row[kw] = counts.get(kw, 0)
-            
-            rows.append(row)
-        
-        # 주간 데이터 정렬
-        result_df = pd.DataFrame(rows).sort_values('week')
+        # 주간 키워드 언급량 계산 (불용어를 뺀 출현 횟수, 별칭이 있는 키워드는 합산)
+        table = trend_table(df_filtered, 'upload_date')
+        result_df = table.trend(list(dict.fromkeys(keywords)), granularity='weekly', measure='tokens',
+                                aliases=Analyzer.keyword_aliases, exclude=Analyzer.stopword_mask())
+        result_df = result_df.rename_axis('week').reset_index()
         
         return result_df
\ No newline at end of file
@@ -25,6 +25,30 @@ NEWS_DB_CONFIG = {
 # 기존 DB 설정 (이전 코드와의 호환성을 위해 유지)
 DB_CONFIG = MYSQL_CONFIG
 
+# 데이터 로더가 사용하는 데이터베이스 (DBConnector.get_pool 의 키)
+DATABASES = {
+    'magazine': MYSQL_CONFIG,
+    'news': NEWS_DB_CONFIG
+}
+
+# DB 백엔드: 'mysql' 또는 로컬 실행/부하 테스트용 'sqlite' (SQLITE_DB_DIR 의 <DB 이름>.sqlite3 파일 사용, 없으면 예시 데이터로 생성)
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql').lower()
+SQLITE_DB_DIR = os.getenv('SQLITE_DB_DIR', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'local_db'))
+
+# 연결 풀 설정 (데이터베이스별 최대 연결 수, 연결 대기 제한 시간(초), 유휴 연결 점검 주기(초))
+DB_POOL_CONFIG = {
+    'pool_size': int(os.getenv('DB_POOL_SIZE', '5')),
+    'checkout_timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+    'ping_interval': float(os.getenv('DB_POOL_PING_INTERVAL', '30'))
+}
+
+# 문서 캐시 설정 (기간 조회를 메모리에서 처리, 보관 일수는 '1년' 이전 기간 비교(2년)까지 포함)
+CORPUS_CACHE_CONFIG = {
+    'enabled': os.getenv('CORPUS_CACHE', '1') != '0',
+    'retention_days': int(os.getenv('CORPUS_CACHE_DAYS', '731')),
+    'refresh_seconds': float(os.getenv('CORPUS_CACHE_REFRESH_SECONDS', '300'))
+}
+
 # 앱 설정
 APP_CONFIG = {
     'debug': os.getenv('APP_DEBUG', 'False').lower() == 'true',
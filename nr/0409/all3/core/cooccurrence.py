@@ -0,0 +1,141 @@
+# core/cooccurrence.py
+import logging
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+WEIGHTINGS = ('count', 'pmi', 'npmi')
+
+
+class Cooccurrence:
+    """상위 단어의 동시 출현 집계 결과
+
+    단위(문서 또는 window 토큰 구간) × 단어 이진 희소 행렬 X 로 Xᵀ·X 를 계산해,
+    두 단어가 함께 나온 단위 수(counts, 상삼각 희소 행렬)와 단어별 출현 단위 수(unit_frequency)를 담는다.
+    한 단위 안에서 같은 단어가 여러 번 나와도 한 번으로 센다.
+    """
+
+    def __init__(self, ids, terms, frequency, unit_frequency, counts, n_units):
+        self.ids = ids
+        self.terms = terms
+        self.frequency = frequency
+        self.unit_frequency = unit_frequency
+        self.counts = counts
+        self.n_units = n_units
+
+    def __len__(self):
+        return len(self.ids)
+
+    def weights(self, weighting='count'):
+        """단어 쌍별 (행, 열, 동시 출현 수, 가중치) 배열
+
+        Args:
+            weighting (str): 'count' (동시 출현 단위 수), 'pmi' (log p(a,b) / p(a)p(b)),
+                'npmi' (pmi / -log p(a,b), -1 ~ 1)
+        """
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"지원하지 않는 가중치입니다: {weighting}")
+        pairs = self.counts.tocoo()
+        rows, cols, counts = pairs.row, pairs.col, pairs.data
+        if weighting == 'count':
+            return rows, cols, counts, counts.astype(np.float64)
+
+        joint = counts / self.n_units
+        pmi = np.log(joint / (self.unit_frequency[rows] / self.n_units) / (self.unit_frequency[cols] / self.n_units))
+        if weighting == 'pmi':
+            return rows, cols, counts, pmi
+        # 모든 단위에 함께 나온 쌍은 -log p(a,b) = 0 이므로 1 로 둠
+        denominator = -np.log(joint)
+        npmi = np.divide(pmi, denominator, out=np.ones_like(pmi), where=denominator > 0)
+        return rows, cols, counts, npmi
+
+    def edges(self, min_count=1, max_edges=None, weighting='count'):
+        """(단어1, 단어2, 동시 출현 수, 가중치) 목록 (가중치 내림차순, 같으면 단어 순위 순)
+
+        Args:
+            min_count (int): 최소 동시 출현 단위 수
+            max_edges (int): 최대 엣지 수
+            weighting (str): 가중치 ('count', 'pmi', 'npmi')
+        """
+        rows, cols, counts, weights = self.weights(weighting)
+        keep = counts >= min_count
+        rows, cols, counts, weights = rows[keep], cols[keep], counts[keep], weights[keep]
+        order = np.lexsort((cols, rows, -weights))
+        if max_edges is not None:
+            order = order[:max_edges]
+        terms = self.terms
+        return [(terms[i], terms[j], int(c), float(w))
+                for i, j, c, w in zip(rows[order], cols[order], counts[order], weights[order])]
+
+    def pairs(self, min_count=1):
+        """(단어1, 단어2) → 동시 출현 수 dict"""
+        return {(a, b): count for a, b, count, _ in self.edges(min_count=min_count)}
+
+
+def _ranked_ids(store, exclude, rank_by):
+    if rank_by == 'frequency':
+        scores = store.term_frequency(exclude)
+    elif rank_by == 'documents':
+        scores = store.document_frequency(exclude)
+    else:
+        raise ValueError(f"지원하지 않는 순위 기준입니다: {rank_by}")
+    ids = np.flatnonzero(scores)
+    return ids[np.argsort(-scores[ids], kind='stable')], scores
+
+
+def build_cooccurrence(store, top_n=50, exclude=None, window=None, rank_by='frequency', columns=None):
+    """토큰 저장소의 상위 단어 동시 출현 집계
+
+    Args:
+        store (TokenStore): 문서 토큰 저장소
+        top_n (int): 사용할 상위 단어 수 (None 이면 나오는 단어 전체)
+        exclude: 제외 단어 (불리언 마스크 또는 단어 목록)
+        window (int): 있으면 문서를 window 토큰씩 끊은 구간 안의 동시 출현만 셈 (없으면 문서 단위)
+        rank_by (str): 상위 단어 기준 ('frequency' 출현 횟수, 'documents' 출현 문서 수)
+        columns (array): 상위 단어 대신 사용할 단어 id
+
+    Returns:
+        Cooccurrence
+    """
+    frequency = store.term_frequency(exclude)
+    if columns is None:
+        ranked, _ = _ranked_ids(store, exclude, rank_by)
+        columns = ranked if top_n is None else ranked[:top_n]
+    columns = np.asarray(columns, dtype=np.int64)
+
+    units = store if window is None else store.windows(window)
+    matrix = units.matrix(columns, binary=True)
+    product = (matrix.T @ matrix).tocsr()
+    counts = sparse.triu(product, k=1).tocsr()
+    counts.eliminate_zeros()
+    return Cooccurrence(
+        ids=columns,
+        terms=store.vocabulary.terms(columns).tolist(),
+        frequency=frequency[columns],
+        unit_frequency=product.diagonal().astype(np.int64),
+        counts=counts,
+        n_units=len(units)
+    )
+
+
+def strongest_pairs(store, n_pairs, exclude=None, initial_terms=200):
+    """함께 나온 문서 수 상위 n_pairs 개 단어 쌍 (사전 전체 기준)
+
+    두 단어가 함께 나온 문서 수는 각 단어의 출현 문서 수를 넘지 못하므로, 출현 문서 수 상위 단어만으로 계산하고
+    n_pairs 번째 쌍의 문서 수가 빠진 단어의 최대 출현 문서 수 이상이 될 때까지 단어 수를 두 배로 늘린다.
+
+    Returns:
+        tuple: (Cooccurrence, (단어1, 단어2, 문서 수, 가중치) 목록)
+    """
+    ranked, document_frequency = _ranked_ids(store, exclude, 'documents')
+    top_n = initial_terms
+    while True:
+        result = build_cooccurrence(store, columns=ranked[:top_n])
+        edges = result.edges(max_edges=n_pairs)
+        if top_n >= len(ranked):
+            return result, edges
+        bound = document_frequency[ranked[top_n]]
+        if len(edges) >= n_pairs and edges[-1][2] >= bound:
+            return result, edges
+        top_n *= 2
@@ -0,0 +1,222 @@
+# core/corpus_cache.py
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from .db_connector import DBConnector
+from .config import CORPUS_CACHE_CONFIG
+from .token_store import TokenStore, register_token_store
+from .trend_table import TrendSource
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusCache:
+    """소스(매거진/뉴스/무신사)별 문서 캐시
+
+    보관 기간(retention_days) 안의 문서를 토큰 디코딩 등 전처리를 마친 상태로 일(day) 단위 파티션에 담아 두고,
+    기간 조회는 파티션을 합친 스냅샷(날짜 오름차순)에서 이진 탐색으로 잘라 반환한다.
+    refresh_interval 초가 지나면 마지막 날짜(워터마크) 이후 행만 DB 에서 가져와 해당 일 파티션에 합친다.
+    보관 기간보다 오래된 구간을 요청하면 None 을 반환하므로 호출 측은 기존 DB 조회를 사용한다.
+    token_column 이 있으면 파티션마다 토큰을 전역 단어 사전으로 인코딩한 TokenStore 를 만들고
+    (토큰 리스트는 사전의 단어 객체를 공유하도록 바꿈), 스냅샷 저장소를 등록해 분석 함수가 token_store() 로 재사용한다.
+    키워드 추이 집계표도 스냅샷마다 한 번 만들어 trend_table() 이 기간/그룹별로 잘라 쓴다 (group_column 기준).
+    """
+
+    def __init__(self, name, query, date_column, key_column=None, decode=None, database='magazine',
+                 retention_days=None, refresh_interval=None, token_column=None, group_column=None):
+        """
+        Args:
+            name (str): 캐시 이름 (로그/통계용)
+            query (str): '날짜 컬럼 >= %s' 조건 하나를 받는 조회 쿼리
+            date_column (str): 파티션/워터마크 기준 날짜 컬럼
+            key_column (str): 문서 고유 키 (있으면 워터마크와 같은 시각의 행도 다시 가져와 키로 중복 제거)
+            decode (callable): 행 dict 목록 → DataFrame 전처리 함수 (토큰 JSON 디코딩 등)
+            database (str): DBConnector 데이터베이스 ('magazine' 또는 'news')
+            retention_days (int): 보관 일수
+            refresh_interval (float): 증분 갱신 주기 (초)
+            token_column (str): 정수 인코딩할 토큰 리스트 컬럼
+            group_column (str): 키워드 추이 집계표의 그룹 컬럼 (매거진 이름 등)
+        """
+        self.name = name
+        self.query = query
+        self.date_column = date_column
+        self.key_column = key_column
+        self.decode = decode or pd.DataFrame
+        self.database = database
+        self.retention_days = retention_days or CORPUS_CACHE_CONFIG['retention_days']
+        self.refresh_interval = CORPUS_CACHE_CONFIG['refresh_seconds'] if refresh_interval is None else refresh_interval
+        self.token_column = token_column
+        self.group_column = group_column
+
+        self._partitions = {}  # date → DataFrame
+        self._stores = {}  # date → TokenStore (token_column 이 있을 때)
+        self._snapshot = None  # (날짜 오름차순 DataFrame, datetime64 배열)
+        self._covered_since = None
+        self._watermark = None
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'refreshes': 0, 'fetched_rows': 0, 'refresh_failures': 0}
+
+    def stats(self):
+        """캐시 통계 (적중/미적중, 갱신 횟수, 보관 문서 수, 파티션 수, 워터마크)"""
+        snapshot = self._snapshot
+        stats = dict(self._stats)
+        stats.update({
+            'documents': len(snapshot[0]) if snapshot else 0,
+            'token_store_bytes': sum(store.nbytes for store in list(self._stores.values())),
+            'partitions': len(self._partitions),
+            'covered_since': self._covered_since.isoformat() if self._covered_since else None,
+            'watermark': self._watermark.isoformat() if self._watermark is not None else None
+        })
+        return stats
+
+    def window(self, start=None, end=None):
+        """[start, end] 구간 문서 (날짜 내림차순, DB 조회 결과와 같은 순서)
+
+        Returns:
+            DataFrame 또는 None: 보관 기간 밖 구간이거나 캐시를 채우지 못한 경우 None
+        """
+        self._ensure_fresh()
+        snapshot = self._snapshot
+        if snapshot is None or (start is not None and pd.Timestamp(start) < self._covered_since):
+            self._stats['misses'] += 1
+            return None
+
+        frame, dates = snapshot
+        lo = 0 if start is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(start)), side='left')
+        hi = len(dates) if end is None else np.searchsorted(dates, np.datetime64(pd.Timestamp(end)), side='right')
+        self._stats['hits'] += 1
+        return frame.iloc[lo:hi].iloc[::-1].reset_index(drop=True)
+
+    def day_window(self, start_day, end_day):
+        """DATE(날짜) BETWEEN 시작일 AND 종료일 과 같은 구간 (시작일/종료일 포함, 일 파티션 단위)"""
+        start = pd.Timestamp(start_day).normalize()
+        end = pd.Timestamp(end_day).normalize() + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+        return self.window(start, end)
+
+    def refresh(self):
+        """워터마크 이후 행을 가져와 파티션에 반영 (처음이면 보관 기간 전체 로드)"""
+        with self._lock:
+            self._refresh()
+
+    def _ensure_fresh(self):
+        if self._snapshot is not None and time.monotonic() - self._refreshed_at < self.refresh_interval:
+            return
+        if self._snapshot is None:
+            # 첫 로드는 끝날 때까지 기다림
+            with self._lock:
+                if self._snapshot is None:
+                    self._refresh()
+            return
+        # 증분 갱신은 한 스레드만 수행하고 나머지는 기존 스냅샷을 사용
+        if self._lock.acquire(blocking=False):
+            try:
+                self._refresh()
+            finally:
+                self._lock.release()
+
+    def _refresh(self):
+        now = datetime.now()
+        retention_start = pd.Timestamp(now - timedelta(days=self.retention_days)).normalize()
+        initial = self._watermark is None
+        since = retention_start if initial else self._watermark
+
+        try:
+            rows = DBConnector.fetch_all(self.query, (since.to_pydatetime(),), database=self.database)
+        except Exception as e:
+            self._stats['refresh_failures'] += 1
+            self._refreshed_at = time.monotonic()
+            logger.error(f"{self.name} 문서 캐시 갱신 실패: {e}")
+            return
+
+        self._refreshed_at = time.monotonic()
+        self._stats['refreshes'] += 1
+        self._stats['fetched_rows'] += len(rows)
+        changed = self._merge(rows, strict_after=None if initial or self.key_column else since)
+
+        # 보관 기간이 지난 파티션 정리
+        for day in [day for day in self._partitions if pd.Timestamp(day) < retention_start]:
+            del self._partitions[day]
+            self._stores.pop(day, None)
+            changed = True
+        self._covered_since = retention_start
+
+        if changed or self._snapshot is None:
+            self._rebuild()
+        logger.info(f"{self.name} 문서 캐시 {'로드' if initial else '갱신'}: {len(rows)}행 조회, "
+                    f"워터마크 {self._watermark}")
+
+    def _merge(self, rows, strict_after=None):
+        """새 행을 일 파티션에 합침 (변경이 있으면 True)"""
+        if not rows:
+            return False
+        frame = self.decode(rows)
+        if frame is None or frame.empty:
+            return False
+        frame[self.date_column] = pd.to_datetime(frame[self.date_column])
+        if strict_after is not None:
+            frame = frame[frame[self.date_column] > strict_after]
+            if frame.empty:
+                return False
+
+        for day, part in frame.groupby(frame[self.date_column].dt.date, sort=False):
+            existing = self._partitions.get(day)
+            if existing is not None:
+                part = pd.concat([existing, part], ignore_index=True)
+                if self.key_column and self.key_column in part.columns:
+                    part = part.drop_duplicates(subset=self.key_column, keep='last')
+            part = part.sort_values(self.date_column, kind='stable').reset_index(drop=True)
+            if self.token_column:
+                store = self._stores[day] = TokenStore.from_tokens(part[self.token_column])
+                part[self.token_column] = store.documents()
+            self._partitions[day] = part
+
+        latest = frame[self.date_column].max()
+        self._watermark = latest if self._watermark is None else max(self._watermark, latest)
+        return True
+
+    def _rebuild(self):
+        """파티션을 날짜순으로 합친 조회용 스냅샷 교체"""
+        parts = [self._partitions[day] for day in sorted(self._partitions)]
+        if parts:
+            frame = pd.concat(parts, ignore_index=True)
+        else:
+            frame = self.decode([])
+            if self.date_column not in frame.columns:
+                frame[self.date_column] = pd.Series(dtype='datetime64[ns]')
+        dates = frame[self.date_column].to_numpy(dtype='datetime64[ns]')
+        if self.token_column and self.token_column in frame.columns:
+            store = TokenStore.concat(self._stores[day] for day in sorted(self._partitions))
+            # 저장소, 행 번호, 키워드 추이 집계를 한 번에 교체 (조회 중에 서로 다른 스냅샷이 섞이지 않도록)
+            groups = frame[self.group_column] if self.group_column in frame.columns else None
+            trends = TrendSource(store, frame[self.date_column], groups, self.group_column)
+            register_token_store(self.name, store, frame[self.token_column], attachment=trends)
+        self._snapshot = (frame, dates)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_corpus_cache(name, factory):
+    """프로세스 전역 문서 캐시 (없으면 factory() 로 생성, 캐시를 끈 경우 None)
+
+    같은 이름의 캐시는 로더 인스턴스가 여러 개여도 하나만 만든다.
+    """
+    if not CORPUS_CACHE_CONFIG['enabled']:
+        return None
+    cache = _caches.get(name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                cache = _caches[name] = factory()
+    return cache
+
+
+def corpus_cache_stats():
+    """생성된 문서 캐시별 통계"""
+    return {name: cache.stats() for name, cache in list(_caches.items())}
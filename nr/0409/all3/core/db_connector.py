@@ -1,67 +1,380 @@
-import mysql.connector
-from mysql.connector import pooling
 import pandas as pd
 import os
+import time
+import sqlite3
 import logging
-from .config import DB_CONFIG
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from .config import DATABASES, DB_BACKEND, DB_POOL_CONFIG, SQLITE_DB_DIR
+
+# MySQL 드라이버는 선택 사항 (DB_BACKEND=sqlite 로컬 대체 DB는 드라이버 없이 동작)
+try:
+    import mysql.connector
+    MYSQL_AVAILABLE = True
+except ImportError:
+    MYSQL_AVAILABLE = False
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+class PoolTimeoutError(Exception):
+    """제한 시간 안에 연결 풀에서 연결을 얻지 못한 경우"""
+
+
+class MySQLBackend:
+    """MySQL 연결 생성/점검 및 쿼리 형식 (mysql.connector)"""
+
+    name = 'mysql'
+
+    def __init__(self, config):
+        self.config = config
+
+    def connect(self):
+        if not MYSQL_AVAILABLE:
+            raise RuntimeError("mysql-connector-python 패키지가 설치되어 있지 않습니다. (로컬 실행은 DB_BACKEND=sqlite)")
+        return mysql.connector.connect(**self.config)
+
+    def ping(self, conn):
+        conn.ping(reconnect=False)
+
+    def cursor(self, conn):
+        return conn.cursor(dictionary=True)
+
+    def prepare(self, query, params):
+        return query, params
+
+
+def _parse_datetime(value):
+    """SQLite DATETIME 컬럼 값을 datetime 으로 변환 (MySQL 드라이버와 같은 타입으로 반환)"""
+    text = value.decode()
+    for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return text
+
+
+sqlite3.register_converter('DATETIME', _parse_datetime)
+
+
+class SQLiteBackend:
+    """MySQL 대신 쓰는 로컬 SQLite 백엔드
+
+    MySQL 데이터베이스 이름마다 <SQLITE_DB_DIR>/<이름>.sqlite3 파일을 같은 이름으로 ATTACH 하므로
+    'fashion_trends.magazine_tokenised' 처럼 스키마를 붙인 쿼리와 붙이지 않은 쿼리가 모두 그대로 동작한다.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, config, directory=SQLITE_DB_DIR):
+        self.database = config['database']
+        self.directory = directory
+
+    def connect(self):
+        from .local_db import DATABASE_SCHEMAS, database_path, ensure_local_databases
+        ensure_local_databases(self.directory)
+
+        conn = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False, timeout=30)
+        conn.row_factory = lambda cursor, row: {col[0]: value for col, value in zip(cursor.description, row)}
+        # 설정된 데이터베이스를 먼저 붙여 스키마 없는 테이블 이름이 그쪽으로 해석되게 함
+        for name in [self.database] + [n for n in DATABASE_SCHEMAS if n != self.database]:
+            conn.execute("ATTACH DATABASE ? AS " + name, (database_path(self.directory, name),))
+        return conn
+
+    def ping(self, conn):
+        conn.execute("SELECT 1").fetchone()
+
+    def cursor(self, conn):
+        return conn.cursor()
+
+    def prepare(self, query, params):
+        """%s 자리표시자와 날짜 파라미터를 SQLite 형식으로 변환"""
+        if params is None:
+            return query.replace('%s', '?'), ()
+        if isinstance(params, dict):
+            raise ValueError("SQLite 백엔드는 위치 파라미터(%s)만 지원합니다.")
+        converted = []
+        for value in params:
+            if isinstance(value, datetime):
+                value = value.strftime('%Y-%m-%d %H:%M:%S')
+            elif isinstance(value, date):
+                value = value.strftime('%Y-%m-%d')
+            converted.append(value)
+        return query.replace('%s', '?'), converted
+
+
+class ConnectionPool:
+    """스레드 안전 연결 풀
+
+    Flask 요청 스레드마다 연결을 빌려 쓰고 반환한다. 풀이 가득 차면 checkout_timeout 초까지 기다린 뒤
+    PoolTimeoutError 를 낸다. ping_interval 초 이상 놀던 연결은 빌려주기 전에 점검(ping)하고,
+    끊긴 연결은 버리고 새로 연결한다. stats() 로 풀 사용량을 확인할 수 있다.
+    """
+
+    def __init__(self, name, backend, pool_size=5, checkout_timeout=10.0, ping_interval=30.0):
+        """
+        Args:
+            name (str): 풀 이름 (로그/통계용)
+            backend: 연결 생성/점검 백엔드 (MySQLBackend 또는 SQLiteBackend)
+            pool_size (int): 최대 연결 수
+            checkout_timeout (float): 연결 대기 최대 시간 (초)
+            ping_interval (float): 이 시간(초) 이상 사용하지 않은 연결은 빌려주기 전에 점검
+        """
+        self.name = name
+        self.backend = backend
+        self.pool_size = pool_size
+        self.checkout_timeout = checkout_timeout
+        self.ping_interval = ping_interval
+
+        self._idle = []  # (연결, 마지막 반환 시각)
+        self._opened = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'checkouts': 0, 'waits': 0, 'wait_ms_total': 0.0, 'wait_ms_max': 0.0, 'timeouts': 0,
+            'connects': 0, 'connect_failures': 0, 'pings': 0, 'ping_failures': 0, 'discarded': 0
+        }
+
+    def stats(self):
+        """풀 사용량 통계"""
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'backend': self.backend.name,
+                'pool_size': self.pool_size,
+                'open': self._opened,
+                'in_use': self._in_use,
+                'idle': len(self._idle)
+            })
+        stats['wait_ms_total'] = round(stats['wait_ms_total'], 1)
+        stats['wait_ms_max'] = round(stats['wait_ms_max'], 1)
+        return stats
+
+    def acquire(self):
+        """연결 빌리기 (풀이 가득 차면 checkout_timeout 까지 대기)"""
+        started = time.monotonic()
+        deadline = started + self.checkout_timeout
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    break
+                if self._opened < self.pool_size:
+                    # 자리만 먼저 잡고 실제 연결은 잠금 밖에서 생성
+                    self._opened += 1
+                    conn, returned_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeoutError(f"{self.name} 연결 풀 대기 시간 초과 ({self.checkout_timeout}초, 최대 {self.pool_size}개 사용 중)")
+                waited = True
+                self._cond.wait(remaining)
+
+            self._in_use += 1
+            self._stats['checkouts'] += 1
+            if waited:
+                wait_ms = (time.monotonic() - started) * 1000
+                self._stats['waits'] += 1
+                self._stats['wait_ms_total'] += wait_ms
+                self._stats['wait_ms_max'] = max(self._stats['wait_ms_max'], wait_ms)
+
+        try:
+            if conn is not None and time.monotonic() - returned_at >= self.ping_interval and not self._ping(conn):
+                self._close(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            self._release_slot()
+            raise
+        return conn
+
+    def release(self, conn, broken=False):
+        """연결 반환 (broken=True 면 닫고 자리만 비움)
+
+        반환 전에 트랜잭션을 끝낸다. MySQL 은 autocommit 이 꺼져 있고 REPEATABLE READ 라서
+        트랜잭션을 열어 둔 채 재사용하면 처음 읽은 스냅샷만 계속 보게 된다 (새 행이 보이지 않음).
+        """
+        if not broken and not self._rollback(conn):
+            broken = True
+        if broken:
+            self._close(conn)
+            self._release_slot()
+            return
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """with 블록 동안 연결 사용 (오류 시 롤백, 연결 오류면 연결 폐기)"""
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except Exception as e:
+            broken = not self._rollback(conn) or self._is_connection_error(e)
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    def close(self):
+        """놀고 있는 연결 모두 닫기 (사용 중인 연결은 반환될 때 풀에 다시 들어감)"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._opened -= len(idle)
+        for conn, _ in idle:
+            self._close(conn)
+
+    def _connect(self):
+        try:
+            conn = self.backend.connect()
+        except Exception:
+            with self._cond:
+                self._stats['connect_failures'] += 1
+            raise
+        with self._cond:
+            self._stats['connects'] += 1
+        return conn
+
+    def _ping(self, conn):
+        try:
+            self.backend.ping(conn)
+            ok = True
+        except Exception as e:
+            logger.warning(f"{self.name} 연결 점검 실패, 새로 연결합니다: {e}")
+            ok = False
+        with self._cond:
+            self._stats['pings'] += 1
+            if not ok:
+                self._stats['ping_failures'] += 1
+        return ok
+
+    def _release_slot(self):
+        with self._cond:
+            self._in_use -= 1
+            self._opened -= 1
+            self._cond.notify()
+
+    def _close(self, conn):
+        with self._cond:
+            self._stats['discarded'] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _rollback(conn):
+        try:
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _is_connection_error(error):
+        """연결 자체가 끊긴 오류인지 (SQLite 는 로컬 파일이라 연결이 끊기지 않음)"""
+        return MYSQL_AVAILABLE and isinstance(error, (mysql.connector.errors.InterfaceError,
+                                                      mysql.connector.errors.OperationalError))
+
+
 class DBConnector:
-    """데이터베이스 연결 및 쿼리 실행을 담당하는 클래스"""
+    """데이터베이스 연결 및 쿼리 실행을 담당하는 클래스
+
+    모든 데이터 로더는 데이터베이스('magazine', 'news')별 공유 연결 풀을 통해 쿼리한다.
+    DB_BACKEND=sqlite 이면 MySQL 대신 data/local_db 의 SQLite 파일을 사용한다.
+    """
     
-    _connection_pool = None
+    _pools = {}
+    _pools_lock = threading.Lock()
 
     @classmethod
-    def get_connection_pool(cls):
-        """연결 풀 반환 (없으면 생성)"""
-        if cls._connection_pool is None:
-            try:
-                cls._connection_pool = mysql.connector.pooling.MySQLConnectionPool(
-                    pool_name="fashion_trend_pool",
-                    pool_size=5,  # 연결 풀 크기 조정
-                    **DB_CONFIG
+    def get_pool(cls, database='magazine'):
+        """데이터베이스별 연결 풀 반환 (없으면 생성)"""
+        pool = cls._pools.get(database)
+        if pool is not None:
+            return pool
+        with cls._pools_lock:
+            if database not in cls._pools:
+                config = DATABASES[database]
+                backend = SQLiteBackend(config) if DB_BACKEND == 'sqlite' else MySQLBackend(config)
+                cls._pools[database] = ConnectionPool(
+                    f"{database}_pool", backend,
+                    pool_size=DB_POOL_CONFIG['pool_size'],
+                    checkout_timeout=DB_POOL_CONFIG['checkout_timeout'],
+                    ping_interval=DB_POOL_CONFIG['ping_interval']
                 )
-                logger.info("DB 연결 풀 생성 완료")
-            except Exception as e:
-                logger.error(f"Connection pool 생성 실패: {e}")
-                return None
-        return cls._connection_pool
-    
-    @staticmethod
-    def get_connection():
-        """MySQL 연결 객체 반환"""
-        try:
-            pool = DBConnector.get_connection_pool()
-            if pool:
-                connection = pool.get_connection()
-                return connection
-            else:
-                # 풀 생성 실패 시 직접 연결 시도
-                logger.warning("연결 풀 사용 불가, 직접 연결 시도")
-                conn = mysql.connector.connect(**DB_CONFIG)
-                return conn
-        except mysql.connector.Error as err:
-            logger.error(f"MySQL 연결 오류: {err}")
-            return None
+                logger.info(f"DB 연결 풀 생성 완료: {database} ({backend.name}, 최대 {DB_POOL_CONFIG['pool_size']}개)")
+            return cls._pools[database]
+
+    @classmethod
+    def pool_stats(cls):
+        """생성된 연결 풀별 사용량 통계"""
+        return {database: pool.stats() for database, pool in list(cls._pools.items())}
+
+    @classmethod
+    @contextmanager
+    def connection(cls, database='magazine'):
+        """풀에서 빌린 연결 (with 블록이 끝나면 반환)"""
+        with cls.get_pool(database).connection() as conn:
+            yield conn
+
+    @classmethod
+    def fetch_all(cls, query, params=None, database='magazine'):
+        """
+        조회 쿼리 실행
+        
+        Args:
+            query (str): SQL 쿼리문 (%s 자리표시자)
+            params (tuple, list): 쿼리 파라미터
+            database (str): 'magazine' 또는 'news'
+            
+        Returns:
+            list: 행 dict 목록
+        """
+        pool = cls.get_pool(database)
+        query, params = pool.backend.prepare(query, params)
+        with pool.connection() as conn:
+            cursor = pool.backend.cursor(conn)
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    @classmethod
+    def fetch_df(cls, query, params=None, database='magazine'):
+        """조회 쿼리 결과를 DataFrame 으로 반환"""
+        return pd.DataFrame(cls.fetch_all(query, params, database))
+
+    @classmethod
+    def execute(cls, query, params=None, database='magazine'):
+        """변경 쿼리 실행 후 커밋, 영향받은 행 수 반환"""
+        pool = cls.get_pool(database)
+        query, params = pool.backend.prepare(query, params)
+        with pool.connection() as conn:
+            cursor = pool.backend.cursor(conn)
+            try:
+                cursor.execute(query, params)
+                conn.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
     
     @staticmethod
-    def test_connection():
+    def test_connection(database='magazine'):
         """데이터베이스 연결 테스트"""
         try:
-            conn = DBConnector.get_connection()
-            if not conn:
-                logger.error("연결 객체를 가져올 수 없습니다.")
-                return False
-                
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                result = cursor.fetchone()
-            conn.close()
-            
-            if result and result[0] == 1:
+            rows = DBConnector.fetch_all("SELECT 1 AS ok", database=database)
+            if rows and rows[0]['ok'] == 1:
                 logger.info("데이터베이스 연결 테스트 성공")
                 return True
             else:
@@ -72,61 +385,27 @@ class DBConnector:
             return False
     
     @staticmethod
-    def execute_query(query, params=None, fetch=True):
+    def execute_query(query, params=None, fetch=True, database='magazine'):
         """
         쿼리 실행 및 결과 반환
         
         Args:
             query (str): SQL 쿼리문
-            params (tuple, list, dict): 쿼리 파라미터
+            params (tuple, list): 쿼리 파라미터
             fetch (bool): 결과를 가져올지 여부
+            database (str): 'magazine' 또는 'news'
             
         Returns:
             DataFrame 또는 None: 쿼리 결과 (fetch=True인 경우)
         """
-        conn = None
-        cursor = None
         try:
-            conn = DBConnector.get_connection()
-            if not conn:
-                logger.error("데이터베이스 연결 실패")
-                return None if fetch else False
-                
             if fetch:
-                try:
-                    df = pd.read_sql(query, conn, params=params)
-                    return df
-                except Exception as e:
-                    logger.error(f"pd.read_sql 실행 오류: {e}")
-                    
-                    # 직접 실행으로 대체 시도
-                    cursor = conn.cursor(dictionary=True)
-                    cursor.execute(query, params)
-                    rows = cursor.fetchall()
-                    if rows:
-                        return pd.DataFrame(rows)
-                    return pd.DataFrame()
-            else:
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                conn.commit()
-                return True
+                return DBConnector.fetch_df(query, params, database)
+            DBConnector.execute(query, params, database)
+            return True
         except Exception as e:
             logger.error(f"쿼리 실행 오류: {e}")
-            if not fetch and conn:
-                try:
-                    conn.rollback()
-                except:
-                    pass
             return None if fetch else False
-        finally:
-            try:
-                if cursor:
-                    cursor.close()
-                if conn:
-                    conn.close()
-            except:
-                pass
     
     @staticmethod
     def load_magazine_data(domain=None, source=None, start_date=None, end_date=None, limit=None):
@@ -318,12 +597,6 @@ class DBConnector:
             DataFrame: 필터링된 무신사 데이터
         """
         try:
-            conn = DBConnector.get_connection()
-            if not conn:
-                logger.error("데이터베이스 연결 실패")
-                return pd.DataFrame()
-            
-            cursor = conn.cursor(dictionary=True)
             
             query = """
             SELECT * FROM fashion_trends.musinsa_data
@@ -350,8 +623,7 @@ class DBConnector:
             
             logger.info(f"무신사 데이터 로드 쿼리: {query}, 파라미터: {params}")
             
-            cursor.execute(query, params)
-            result = cursor.fetchall()
+            result = DBConnector.fetch_all(query, params)
             
             if not result:
                 logger.warning("무신사 데이터가 없습니다.")
@@ -371,11 +643,3 @@ class DBConnector:
         except Exception as e:
             logger.error(f"무신사 데이터 로드 중 오류 발생: {e}")
             return pd.DataFrame()
-        finally:
-            try:
-                if 'cursor' in locals() and cursor:
-                    cursor.close()
-                if 'conn' in locals() and conn:
-                    conn.close()
-            except:
-                pass
\ No newline at end of file
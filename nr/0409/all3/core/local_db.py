@@ -0,0 +1,231 @@
+# core/local_db.py
+"""MySQL 없이 대시보드를 실행/부하 테스트하기 위한 로컬 SQLite 대체 DB
+
+MySQL 데이터베이스(fashion_trends, dump_migration)와 같은 이름/테이블 구조의 SQLite 파일을 만들고
+오늘 기준 최근 기간에 고르게 퍼진 예시 문서로 채운다. DB_BACKEND=sqlite 이면 DBConnector 가
+첫 연결 때 파일이 없으면 자동으로 만든다.
+
+    python -m core.local_db --docs 5000 --news 3000 --days 365 --force
+"""
+import os
+import csv
+import json
+import random
+import sqlite3
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta
+from .config import CATEGORY_KEYWORDS, MYSQL_CONFIG, NEWS_DB_CONFIG, SQLITE_DB_DIR
+
+logger = logging.getLogger(__name__)
+
+# 데이터베이스별 테이블 (MySQL 테이블과 컬럼 이름을 맞춤, 날짜 컬럼은 DATETIME 으로 선언해 datetime 으로 읽힘)
+DATABASE_SCHEMAS = {
+    MYSQL_CONFIG['database']: [
+        """CREATE TABLE IF NOT EXISTS magazine_tokenised (
+            id INTEGER PRIMARY KEY,
+            doc_id INTEGER,
+            doc_domain TEXT,
+            source TEXT,
+            upload_date DATETIME,
+            title TEXT,
+            content TEXT,
+            tokens TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_magazine_upload_date ON magazine_tokenised (upload_date)",
+        "CREATE INDEX IF NOT EXISTS idx_magazine_source ON magazine_tokenised (source)",
+        """CREATE TABLE IF NOT EXISTS all_trends (
+            id INTEGER PRIMARY KEY,
+            title TEXT,
+            upload_date DATETIME,
+            article_url TEXT,
+            source TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_all_trends_upload_date ON all_trends (upload_date)",
+        """CREATE TABLE IF NOT EXISTS musinsa_data (
+            id INTEGER PRIMARY KEY,
+            product_id TEXT,
+            brand TEXT,
+            name TEXT,
+            price TEXT,
+            category TEXT,
+            category_code INTEGER,
+            gender TEXT,
+            rating REAL,
+            review_count INTEGER,
+            link TEXT,
+            crawled_at DATETIME,
+            upload_date DATETIME
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_musinsa_upload_date ON musinsa_data (upload_date)",
+    ],
+    NEWS_DB_CONFIG['database']: [
+        """CREATE TABLE IF NOT EXISTS knews_articles (
+            id INTEGER PRIMARY KEY,
+            keyword TEXT,
+            title TEXT,
+            content TEXT,
+            published DATETIME,
+            source TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_knews_published ON knews_articles (published)",
+        """CREATE TABLE IF NOT EXISTS tokenised (
+            id INTEGER PRIMARY KEY,
+            tokens TEXT
+        )""",
+    ],
+}
+
+# 예시 문서 출처 (MAGAZINE_MAPPING 의 원본 source 값)
+MAGAZINE_SOURCES = ['jentestore', 'marieclaire', 'vogue', 'wkorea', 'wwdkorea']
+NEWS_SOURCES = ['패션비즈', '어패럴뉴스', '한국섬유신문', '패션엔']
+
+# 카테고리 키워드 외에 섞을 일반 어휘
+GENERAL_WORDS = [
+    '데님', '블랙', '화이트', '빈티지', '미니멀', '레더', '니트', '오버사이즈', '컬렉션', '런웨이',
+    '셀럽', '캠페인', '협업', '지속가능', '리사이클', '봄', '여름', '가을', '겨울', '스트릿',
+    '클래식', '로고', '디테일', '실루엣', '레이어드', '그레이', '베이지', '네이비', '플로럴', '체크',
+    'Y2K', '고프코어', '발레코어', '올드머니', '테일러링', '캐시미어', '실크', '트위드', '스포티', '로맨틱'
+]
+
+_build_lock = threading.Lock()
+
+
+def database_path(directory, name):
+    """데이터베이스 이름에 해당하는 SQLite 파일 경로"""
+    return os.path.join(directory, f"{name}.sqlite3")
+
+
+def _vocabulary():
+    words = list(dict.fromkeys(GENERAL_WORDS + [kw for keywords in CATEGORY_KEYWORDS.values() for kw in keywords]))
+    # 순위에 반비례하는 출현 확률 (실제 말뭉치처럼 소수 단어가 자주 나옴)
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+def _random_time(rng, now, days):
+    return (now - timedelta(seconds=rng.randint(0, days * 86400))).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _create(path, name):
+    conn = sqlite3.connect(path)
+    for statement in DATABASE_SCHEMAS[name]:
+        conn.execute(statement)
+    return conn
+
+
+def _fill_magazine(conn, rng, docs, days, now):
+    words, weights = _vocabulary()
+    magazine_rows, trend_rows = [], []
+    for i in range(1, docs + 1):
+        source = rng.choice(MAGAZINE_SOURCES)
+        uploaded = _random_time(rng, now, days)
+        tokens = rng.choices(words, weights=weights, k=rng.randint(20, 80))
+        title = f"{source} {' '.join(tokens[:3])} 기사 {i}"
+        magazine_rows.append((i, i, '매거진', source, uploaded, title, ' '.join(tokens), json.dumps(tokens, ensure_ascii=False)))
+        # 로컬 URL 은 OG 이미지 조회를 네트워크 없이 바로 실패시켜 기본 이미지를 쓰게 함
+        trend_rows.append((i, title, uploaded, f"local://{source}/{i}", source))
+    conn.executemany("INSERT INTO magazine_tokenised VALUES (?, ?, ?, ?, ?, ?, ?, ?)", magazine_rows)
+    conn.executemany("INSERT INTO all_trends VALUES (?, ?, ?, ?, ?)", trend_rows)
+
+
+def _fill_musinsa(conn, rng, days, now, csv_path):
+    """무신사 상품 (data/musinsa_data.csv 가 있으면 그 상품에 최근 업로드 날짜를 붙여 사용)"""
+    rows = []
+    if os.path.exists(csv_path):
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            for record in csv.DictReader(f):
+                rows.append((record['product_id'], record['brand'], record['name'], record['price'],
+                             record['category'], record['category_code'], record['gender'],
+                             record['rating'], record['review_count'], record['link'], record['crawled_at'],
+                             _random_time(rng, now, days)))
+    else:
+        for i in range(500):
+            rows.append((str(i), f"브랜드{i % 20}", f"상품 {i}", f"{rng.randint(10, 200) * 1000}원", '상의', 1,
+                         rng.choice(['남성', '여성']), round(rng.uniform(0, 5), 1), rng.randint(0, 500), '',
+                         _random_time(rng, now, days), _random_time(rng, now, days)))
+    conn.executemany(
+        "INSERT INTO musinsa_data (product_id, brand, name, price, category, category_code, gender, rating, "
+        "review_count, link, crawled_at, upload_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+    )
+
+
+def _fill_news(conn, rng, docs, days, now):
+    words, weights = _vocabulary()
+    article_rows, token_rows = [], []
+    for i in range(1, docs + 1):
+        tokens = rng.choices(words, weights=weights, k=rng.randint(30, 120))
+        article_rows.append((i, tokens[0], f"{' '.join(tokens[:4])} 뉴스 {i}", ' '.join(tokens),
+                             _random_time(rng, now, days), rng.choice(NEWS_SOURCES)))
+        token_rows.append((i, json.dumps(tokens, ensure_ascii=False)))
+    conn.executemany("INSERT INTO knews_articles VALUES (?, ?, ?, ?, ?, ?)", article_rows)
+    conn.executemany("INSERT INTO tokenised VALUES (?, ?)", token_rows)
+
+
+def build_local_databases(directory=SQLITE_DB_DIR, docs=2000, news=2000, days=365, seed=42):
+    """예시 데이터로 로컬 SQLite 데이터베이스 생성 (기존 파일은 교체)
+
+    Args:
+        directory (str): SQLite 파일 폴더
+        docs (int): 매거진 문서 수
+        news (int): 뉴스 기사 수
+        days (int): 문서 날짜를 퍼뜨릴 최근 일수
+        seed (int): 난수 시드
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    now = datetime.now()
+    csv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'musinsa_data.csv')
+
+    fillers = {
+        MYSQL_CONFIG['database']: lambda conn: (_fill_magazine(conn, rng, docs, days, now),
+                                                _fill_musinsa(conn, rng, days, now, csv_path)),
+        NEWS_DB_CONFIG['database']: lambda conn: _fill_news(conn, rng, news, days, now),
+    }
+    for name, fill in fillers.items():
+        path = database_path(directory, name)
+        # 다 채운 뒤 교체해 다른 프로세스가 만들다 만 파일을 읽지 않게 함
+        temp_path = f"{path}.building"
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        conn = _create(temp_path, name)
+        try:
+            fill(conn)
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(temp_path, path)
+        logger.info(f"로컬 DB 생성 완료: {path}")
+
+
+def ensure_local_databases(directory=SQLITE_DB_DIR):
+    """로컬 SQLite 데이터베이스가 없으면 기본 크기의 예시 데이터로 생성"""
+    paths = [database_path(directory, name) for name in DATABASE_SCHEMAS]
+    if all(os.path.exists(path) for path in paths):
+        return
+    with _build_lock:
+        if not all(os.path.exists(path) for path in paths):
+            logger.info(f"로컬 DB 파일이 없어 예시 데이터로 생성합니다: {directory}")
+            build_local_databases(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default=SQLITE_DB_DIR, help='SQLite 파일 폴더')
+    parser.add_argument('--docs', type=int, default=2000, help='매거진 문서 수')
+    parser.add_argument('--news', type=int, default=2000, help='뉴스 기사 수')
+    parser.add_argument('--days', type=int, default=365, help='문서 날짜를 퍼뜨릴 최근 일수')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--force', action='store_true', help='기존 파일이 있어도 다시 생성')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if not args.force and all(os.path.exists(database_path(args.dir, name)) for name in DATABASE_SCHEMAS):
+        print(f"이미 로컬 DB가 있습니다: {args.dir} (다시 만들려면 --force)")
+        return
+    build_local_databases(args.dir, docs=args.docs, news=args.news, days=args.days, seed=args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,12 @@
 # magazine_data_loader.py
-from sqlalchemy import create_engine
 import pandas as pd
 import logging
 from datetime import datetime, timedelta
 from .db_connector import DBConnector
+from .corpus_cache import CorpusCache, get_corpus_cache
+from .token_store import TokenStore, token_store
+from .cooccurrence import build_cooccurrence
+from .trend_table import trend_table
 from .analyzer import Analyzer
 from .visualizer import (
     generate_network_graph,
@@ -12,8 +15,7 @@ from .visualizer import (
     generate_tfidf_chart,
     generate_trend_chart
 )
-import mysql.connector
-from .config import MYSQL_CONFIG, PERIOD_DAYS
+from .config import PERIOD_DAYS
 from itertools import combinations
 from collections import defaultdict
 import json
@@ -52,6 +54,39 @@ MAGAZINE_MAPPING = {
     'WWD KOREA': ['wwdkorea']
 }
 
+# 매거진 문서 컬럼
+DOCUMENT_COLUMNS = ['doc_id', 'doc_domain', 'source', 'upload_date', 'title', 'content', 'tokens']
+
+# 문서 캐시 적재/증분 갱신 쿼리 (워터마크 이후 문서)
+CORPUS_QUERY = """
+    SELECT doc_id, doc_domain, source, upload_date, title, content, tokens
+    FROM magazine_tokenised
+    WHERE upload_date >= %s
+    ORDER BY upload_date
+"""
+
+
+def normalize_magazine_name(magazine_name):
+    """매거진 이름 정규화 (MAGAZINE_MAPPING 표시 이름, 없으면 대문자)"""
+    magazine_name = magazine_name.lower()
+    for display_name, variants in MAGAZINE_MAPPING.items():
+        if magazine_name in variants:
+            return display_name
+    return magazine_name.upper()
+
+
+def decode_documents(rows):
+    """조회 행 → 문서 DataFrame (토큰 JSON 디코딩, 출처 소문자화, magazine_name 추가)"""
+    if not rows:
+        return pd.DataFrame(columns=DOCUMENT_COLUMNS + ['magazine_name'])
+    data = pd.DataFrame(rows)
+    data['tokens'] = data['tokens'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
+    data['source'] = data['source'].str.lower()
+    data['magazine_name'] = data['source'].map(normalize_magazine_name)
+    data['upload_date'] = pd.to_datetime(data['upload_date'])
+    return data
+
+
 class MagazineDataLoader:
     """매거진 데이터 로드 및 처리 클래스"""
     
@@ -59,39 +94,47 @@ class MagazineDataLoader:
         """초기화"""
         self.data = None
         self.period = '7일'
-        self.db_connection = None
-        self.cursor = None
-        self.mysql_config = MYSQL_CONFIG
-        self.engine = create_engine(
-            f"mysql+pymysql://{self.mysql_config['user']}:{self.mysql_config['password']}@{self.mysql_config['host']}/{self.mysql_config['database']}"
-        )
-        self.connect_db()
+        self.database = 'magazine'  # DBConnector 연결 풀 (요청 스레드마다 연결을 빌려 씀)
         self.visualizations = {}
     
-    def connect_db(self):
-        """데이터베이스 연결"""
+    def _fetch(self, query, params=None):
+        """공유 연결 풀로 조회 쿼리 실행 (행 dict 목록 반환)"""
+        return DBConnector.fetch_all(query, params, database=self.database)
+    
+    def _corpus(self):
+        """프로세스 전역 매거진 문서 캐시 (CORPUS_CACHE=0 이면 None)"""
+        return get_corpus_cache('magazine', lambda: CorpusCache(
+            'magazine', CORPUS_QUERY, 'upload_date', key_column='doc_id',
+            decode=decode_documents, database=self.database, token_column='tokens', group_column='magazine_name'
+        ))
+    
+    def _cached_documents(self, start=None, end=None, by_day=False):
+        """문서 캐시에서 기간 문서 조회 (캐시를 쓸 수 없는 구간이면 None → DB 조회)"""
         try:
-            self.db_connection = mysql.connector.connect(**self.mysql_config)
-            self.cursor = self.db_connection.cursor(dictionary=True)
-            logging.info("데이터베이스 연결 성공")
+            corpus = self._corpus()
+            if corpus is None:
+                return None
+            return corpus.day_window(start, end) if by_day else corpus.window(start, end)
         except Exception as e:
-            logging.error(f"데이터베이스 연결 실패: {e}")
-            self.db_connection = None
-            self.cursor = None
+            logger.error(f"매거진 문서 캐시 조회 오류: {e}")
+            return None
     
     def load_data_by_period(self, period='7일'):
         """기간별 데이터 로드"""
         try:
-            if not self.cursor:
-                self.connect_db()
-                if not self.cursor:
-                    raise Exception("데이터베이스 연결이 없습니다.")
-
             self.period = period
             days = PERIOD_DAYS.get(period, 7)
             
             start_date = datetime.now() - timedelta(days=days)
             
+            # 문서 캐시에 있는 기간이면 메모리에서 바로 반환
+            cached = self._cached_documents(start_date)
+            if cached is not None:
+                self.data = cached
+                if self.data.empty:
+                    logging.warning(f"{period} 기간 동안 데이터가 없습니다.")
+                return self.data
+            
             query = """
                 SELECT 
                     doc_id,
@@ -106,25 +149,15 @@ class MagazineDataLoader:
                 ORDER BY upload_date DESC
             """
             
-            self.cursor.execute(query, (start_date,))
-            rows = self.cursor.fetchall()
+            rows = self._fetch(query, (start_date,))
             
             if not rows:
                 logging.warning(f"{period} 기간 동안 데이터가 없습니다.")
-                self.data = pd.DataFrame(columns=['doc_id', 'doc_domain', 'source', 'upload_date', 'title', 'content', 'tokens'])
+                self.data = pd.DataFrame(columns=DOCUMENT_COLUMNS)
                 return self.data
             
-            # DataFrame 생성
-            self.data = pd.DataFrame(rows)
-            
-            # tokens 컬럼의 JSON 문자열을 리스트로 변환
-            self.data['tokens'] = self.data['tokens'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
-            
-            # source 컬럼을 소문자로 변환
-            self.data['source'] = self.data['source'].str.lower()
-            
-            # magazine_name 컬럼 추가 및 정규화
-            self.data['magazine_name'] = self.data['source'].apply(self._get_normalized_magazine_name)
+            # DataFrame 생성 (토큰 디코딩, 매거진 이름 정규화)
+            self.data = decode_documents(rows)
             
             # 매거진 이름 매핑 확인을 위한 로깅
             unique_sources = self.data['source'].unique()
@@ -143,11 +176,13 @@ class MagazineDataLoader:
     def load_data_by_date_range(self, start_date, end_date):
         """직접 설정한 날짜 범위의 데이터 로드"""
         try:
-            if not self.cursor:
-                self.connect_db()
-                if not self.cursor:
-                    raise Exception("데이터베이스 연결이 없습니다.")
-
+            cached = self._cached_documents(start_date, end_date, by_day=True)
+            if cached is not None:
+                self.data = cached
+                if self.data.empty:
+                    logging.warning(f"{start_date}부터 {end_date}까지의 데이터가 없습니다.")
+                return self.data
+            
             query = """
                 SELECT 
                     doc_id,
@@ -162,28 +197,15 @@ class MagazineDataLoader:
                 ORDER BY upload_date DESC
             """
             
-            self.cursor.execute(query, (start_date, end_date))
-            rows = self.cursor.fetchall()
+            rows = self._fetch(query, (start_date, end_date))
             
             if not rows:
                 logging.warning(f"{start_date}부터 {end_date}까지의 데이터가 없습니다.")
-                self.data = pd.DataFrame(columns=['doc_id', 'doc_domain', 'source', 'upload_date', 'title', 'content', 'tokens'])
+                self.data = pd.DataFrame(columns=DOCUMENT_COLUMNS)
                 return self.data
             
-            # DataFrame 생성
-            self.data = pd.DataFrame(rows)
-            
-            # tokens 컬럼의 JSON 문자열을 리스트로 변환
-            self.data['tokens'] = self.data['tokens'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
-            
-            # source 컬럼을 소문자로 변환
-            self.data['source'] = self.data['source'].str.lower()
-            
-            # magazine_name 컬럼 추가 및 정규화
-            self.data['magazine_name'] = self.data['source'].apply(self._get_normalized_magazine_name)
-            
-            # upload_date를 datetime으로 변환
-            self.data['upload_date'] = pd.to_datetime(self.data['upload_date'])
+            # DataFrame 생성 (토큰 디코딩, 매거진 이름 정규화)
+            self.data = decode_documents(rows)
             
             logging.info(f"매거진 데이터 로드 완료: {len(self.data)}개 문서")
             return self.data
@@ -193,16 +215,6 @@ class MagazineDataLoader:
             self.data = pd.DataFrame(columns=['doc_id', 'doc_domain', 'source', 'upload_date', 'title', 'content', 'tokens'])
             return self.data
     
-    def __del__(self):
-        """소멸자: 데이터베이스 연결 종료"""
-        try:
-            if self.cursor:
-                self.cursor.close()
-            if self.db_connection:
-                self.db_connection.close()
-        except Exception as e:
-            logging.error(f"데이터베이스 연결 종료 중 오류 발생: {e}")
-    
     def filter_by_magazine(self, df, magazine_name):
         """매거진별 데이터 필터링"""
         try:
@@ -234,11 +246,6 @@ class MagazineDataLoader:
     def get_card_news(self, magazine_name=None):
         """카드뉴스 아이템 추출"""
         try:
-            if not self.cursor:
-                self.connect_db()
-                if not self.cursor:
-                    raise Exception("데이터베이스 연결이 없습니다.")
-            
             # 매거진 필터링 조건 설정
             filter_condition = ""
             params = []
@@ -260,8 +267,7 @@ class MagazineDataLoader:
                 LIMIT 12;
             """
             
-            self.cursor.execute(query, params)
-            articles = self.cursor.fetchall()
+            articles = self._fetch(query, params)
             
             # 결과가 없는 경우
             if not articles:
@@ -393,8 +399,7 @@ class MagazineDataLoader:
         if gender_data.empty:
             return None
         
-        all_tokens = [token for tokens in gender_data['tokens'] for token in tokens]
-        return pd.Series(all_tokens).value_counts().head(10)
+        return pd.Series(dict(token_store(gender_data).most_common(10)), dtype='int64')
     
     def generate_visualizations(self, data, selected_magazines, focus_keywords=None):
         """시각화 생성"""
@@ -407,15 +412,13 @@ class MagazineDataLoader:
                 focus_keywords = []
                 logger.info("focus_keywords가 None으로 전달되어 빈 리스트로 초기화")
             
+            # 정수 인코딩된 토큰 저장소 (이후 집계는 모두 이 배열로 계산)
+            store = token_store(data)
+            
             # 키워드가 없고 데이터가 있는 경우 키워드 자동 추출
             if not focus_keywords and data is not None and not data.empty:
                 # 상위 토큰 5개를 키워드로 사용
-                all_tokens = []
-                for doc in data['tokens']:
-                    if isinstance(doc, list):
-                        all_tokens.extend(doc)
-                token_counts = pd.Series(all_tokens).value_counts()
-                focus_keywords = token_counts.head(5).index.tolist()
+                focus_keywords = [term for term, _ in store.most_common(5)]
                 logger.info(f"자동 추출된 키워드: {focus_keywords}")
 
             # 트렌드 차트 데이터 준비
@@ -434,26 +437,28 @@ class MagazineDataLoader:
                 unique_magazines = data['magazine_name'].unique()
                 logger.info(f"데이터에 있는 매거진 이름: {unique_magazines}")
                 
+                # 키워드별 문서 출현 횟수 (대소문자 구분 없이 매칭되는 단어 합계)
+                _, present_terms = store.present_terms()
+                keyword_counts = {
+                    keyword: store.term_counts([term for term in present_terms if term.lower() == keyword.lower()])
+                    for keyword in focus_keywords
+                }
+                magazine_names = data['magazine_name'].to_numpy()
+                upload_dates = data['upload_date'].to_numpy()
+                
                 for magazine in normalized_magazines:
-                    mag_data = data[data['magazine_name'] == magazine]
-                    logger.info(f"매거진 '{magazine}' 데이터 수: {len(mag_data)}")
+                    in_magazine = magazine_names == magazine
+                    logger.info(f"매거진 '{magazine}' 데이터 수: {int(in_magazine.sum())}")
                     
-                    if not mag_data.empty:
-                        for keyword in focus_keywords:
-                            # 각 문서의 토큰에서 키워드 검색
-                            for _, row in mag_data.iterrows():
-                                tokens = row['tokens']
-                                if isinstance(tokens, list):  # tokens가 리스트인지 확인
-                                    # 대소문자 구분 없이 키워드 매칭
-                                    count = sum(1 for token in tokens if token.lower() == keyword.lower())
-                                    if count > 0:
-                                        trend_data_list.append({
-                                            'upload_date': row['upload_date'],
-                                            'count': count,
-                                            'magazine_name': magazine,
-                                            'keyword': keyword
-                                        })
-                                        logger.debug(f"키워드 '{keyword}' 발견: {count}회 ({magazine}, {row['upload_date']})")
+                    for keyword in focus_keywords:
+                        counts = keyword_counts[keyword]
+                        for row in np.flatnonzero(in_magazine & (counts > 0)):
+                            trend_data_list.append({
+                                'upload_date': upload_dates[row],
+                                'count': int(counts[row]),
+                                'magazine_name': magazine,
+                                'keyword': keyword
+                            })
             
             # 데이터프레임으로 변환
             if trend_data_list:
@@ -471,26 +476,16 @@ class MagazineDataLoader:
 
             # 네트워크 그래프 데이터 준비
             try:
-                # 상위 10개 키워드 추출
-                all_tokens = []
-                for doc in data['tokens']:
-                    if isinstance(doc, list):
-                        all_tokens.extend(doc)
-                top_tokens = pd.Series(all_tokens).value_counts().head(10).index.tolist()
-                
-                # 엣지 생성
+                # 상위 10개 키워드의 동시 출현 문서 수
+                cooccurrence = build_cooccurrence(store, top_n=10)
                 edges = []
                 weights = []
-                for doc_tokens in data['tokens']:
-                    if not isinstance(doc_tokens, list):
-                        continue
-                    doc_top_tokens = [t for t in doc_tokens if t in top_tokens]
-                    for t1, t2 in combinations(set(doc_top_tokens), 2):
-                        edges.append((t1, t2))
-                        weights.append(1)
+                for word1, word2, count, _ in cooccurrence.edges():
+                    edges.append((word1, word2))
+                    weights.append(count)
                 
                 network_data = {
-                    'nodes': top_tokens,
+                    'nodes': cooccurrence.terms,
                     'edges': edges,
                     'weights': weights
                 }
@@ -503,14 +498,8 @@ class MagazineDataLoader:
 
             # 카테고리 차트 데이터 준비
             try:
-                category_counts = defaultdict(int)
-                for tokens in data['tokens']:
-                    if not isinstance(tokens, list):
-                        continue
-                    for token in tokens:
-                        for category, keywords in CATEGORY_KEYWORDS.items():
-                            if token in keywords:
-                                category_counts[category] += 1
+                category_counts = {category: count for category, count in
+                                   store.category_counts(CATEGORY_KEYWORDS).items() if count > 0}
                 
                 category_data = {
                     'categories': list(category_counts.keys()),
@@ -525,11 +514,7 @@ class MagazineDataLoader:
 
             # 워드클라우드 데이터 준비
             try:
-                all_tokens = []
-                for doc in data['tokens']:
-                    if isinstance(doc, list):
-                        all_tokens.extend(doc)
-                word_freq = Counter(all_tokens)
+                word_freq = store.counter()
                 
                 visualizations['wordcloud'] = generate_wordcloud(word_freq)
                 logger.info("워드클라우드 생성 완료")
@@ -691,19 +676,11 @@ class MagazineDataLoader:
 
     def _get_normalized_magazine_name(self, magazine_name):
         """매거진 이름 정규화"""
-        magazine_name = magazine_name.lower()
-        for display_name, variants in MAGAZINE_MAPPING.items():
-            if magazine_name in variants:
-                return display_name
-        return magazine_name.upper()
+        return normalize_magazine_name(magazine_name)
 
     def analyze_time_trend(self, data):
         """시간별 트렌드 분석"""
         try:
-            # MySQL 연결
-            conn = mysql.connector.connect(**self.mysql_config)
-            cursor = conn.cursor(dictionary=True)
-            
             # 토큰 데이터 조회 (테이블명 수정)
             if data is None:
                 # 데이터가 제공되지 않으면 DB에서 직접 가져옴
@@ -728,57 +705,40 @@ class MagazineDataLoader:
                 else:
                     days = 7  # 기본값
                 
-                query = """
-                    SELECT tokens, upload_date
-                    FROM fashion_trends.magazine_tokenised
-                    WHERE upload_date >= DATE_SUB(NOW(), INTERVAL %s DAY)
-                    ORDER BY upload_date ASC
-                """
-                cursor.execute(query, (days,))
-                rows = cursor.fetchall()
+                # 문서 캐시에 있는 기간이면 캐시 집계표를 그대로 사용
+                start_date = datetime.now() - timedelta(days=days)
+                df = self._cached_documents(start_date)
+                if df is None:
+                    query = """
+                        SELECT source, tokens, upload_date
+                        FROM fashion_trends.magazine_tokenised
+                        WHERE upload_date >= %s
+                        ORDER BY upload_date ASC
+                    """
+                    rows = self._fetch(query, (start_date,))
+                    df = decode_documents(rows)
                 
-                if not rows:
+                if df.empty:
                     logger.warning("트렌드 분석을 위한 데이터가 없습니다.")
                     return None
                 
-                # 데이터프레임 생성
-                df = pd.DataFrame(rows)
                 df['upload_date'] = pd.to_datetime(df['upload_date'])
             else:
                 # 데이터가 제공된 경우
                 df = data.copy()
                 df['upload_date'] = pd.to_datetime(df['upload_date'])
             
-            # 토큰 처리 및 상위 키워드 추출
-            all_tokens = []
-            for row in df['tokens']:
-                if row:
-                    # 토큰 데이터가 문자열인 경우 JSON으로 변환 시도
-                    if isinstance(row, str):
-                        try:
-                            tokens = json.loads(row)
-                        except json.JSONDecodeError:
-                            tokens = []
-                    else:
-                        tokens = row
-                    
-                    if isinstance(tokens, list):
-                        all_tokens.extend(tokens)
-            
-            word_counts = Counter(all_tokens)
-            top_keywords = [word for word, _ in word_counts.most_common(5)]
-            
-            # 월별 키워드 빈도 계산
-            df['year_month'] = df['upload_date'].dt.strftime('%Y-%m')
-            monthly_trends = {}
+            # (일, 단어) 집계표 (문서 캐시 행이면 스냅샷 집계에서 잘라 옴) 및 상위 키워드 추출
+            table = trend_table(df, 'upload_date')
+            top_keywords = [term for term, _ in table.top_terms(5)]
             
-            for keyword in top_keywords:
-                trend = []
-                for month in sorted(df['year_month'].unique()):
-                    month_data = df[df['year_month'] == month]
-                    count = sum(1 for tokens in month_data['tokens'] if tokens and keyword in json.loads(tokens))
-                    trend.append((month, count))
-                monthly_trends[keyword] = trend
+            # 월별 키워드 포함 문서 수
+            monthly_counts = table.trend(top_keywords, granularity='monthly', measure='documents')
+            months = monthly_counts.index.strftime('%Y-%m').tolist()
+            monthly_trends = {
+                keyword: list(zip(months, monthly_counts[keyword].tolist()))
+                for keyword in top_keywords
+            }
             
             # Plotly 그래프 생성
             fig = go.Figure()
@@ -805,19 +765,10 @@ class MagazineDataLoader:
         except Exception as e:
             logger.error(f"시간별 트렌드 분석 중 오류 발생: {str(e)}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def generate_network_graph(self, data):
         """키워드 네트워크 그래프 생성"""
         try:
-            # MySQL 연결
-            conn = mysql.connector.connect(**self.mysql_config)
-            cursor = conn.cursor(dictionary=True)
-            
             # 데이터 로드
             if data is None:
                 # 데이터가 제공되지 않으면 DB에서 직접 가져옴
@@ -846,56 +797,31 @@ class MagazineDataLoader:
                 query = """
                     SELECT tokens
                     FROM fashion_trends.magazine_tokenised
-                    WHERE upload_date >= DATE_SUB(NOW(), INTERVAL %s DAY)
+                    WHERE upload_date >= %s
                 """
-                cursor.execute(query, (days,))
-                rows = cursor.fetchall()
+                rows = self._fetch(query, (datetime.now() - timedelta(days=days),))
+                store = TokenStore.from_tokens(row['tokens'] for row in rows)
             else:
                 # 제공된 데이터 사용
-                rows = [{'tokens': tokens} for tokens in data['tokens']]
+                store = token_store(data)
             
-            # 토큰 데이터 처리
-            all_tokens = []
-            for row in rows:
-                if row['tokens']:
-                    tokens = json.loads(row['tokens'])
-                    if isinstance(tokens, list):
-                        all_tokens.extend(tokens)
-            
-            if not all_tokens:
+            if not len(store.values):
                 logger.warning("네트워크 그래프 생성을 위한 토큰이 없습니다.")
                 return None
             
-            # 단어 빈도수 계산 및 상위 50개 선택
-            word_freq = Counter(all_tokens)
-            top_words = [word for word, _ in word_freq.most_common(50)]
-            
-            # 동시 출현 횟수 계산
-            cooccurrence = {}
-            for row in rows:
-                if row['tokens']:
-                    tokens = json.loads(row['tokens'])
-                    if not isinstance(tokens, list):
-                        continue
-                    # 상위 단어만 고려
-                    tokens = [t for t in tokens if t in top_words]
-                    for i, word1 in enumerate(tokens):
-                        for word2 in tokens[i+1:]:
-                            if word1 != word2:
-                                pair = tuple(sorted([word1, word2]))
-                                cooccurrence[pair] = cooccurrence.get(pair, 0) + 1
+            # 상위 50개 단어의 동시 출현 문서 수 계산
+            cooccurrence = build_cooccurrence(store, top_n=50)
             
             # 네트워크 그래프 생성
             G = nx.Graph()
             
             # 노드 추가
-            for word in top_words:
-                G.add_node(word, size=word_freq[word])
+            for word, freq in zip(cooccurrence.terms, cooccurrence.frequency):
+                G.add_node(word, size=int(freq))
             
-            # 엣지 추가 (가중치가 2 이상인 경우만)
-            for (word1, word2), weight in cooccurrence.items():
-                if weight >= 2:
-                    G.add_edge(word1, word2, weight=weight)
+            # 엣지 추가 (함께 나온 문서가 2개 이상인 경우만)
+            for word1, word2, count, _ in cooccurrence.edges(min_count=2):
+                G.add_edge(word1, word2, weight=count)
             
             # 노드 위치 계산
             pos = nx.spring_layout(G, k=1, iterations=50)
@@ -959,19 +885,10 @@ class MagazineDataLoader:
         except Exception as e:
             logger.error(f"네트워크 그래프 생성 중 오류 발생: {str(e)}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def generate_tfidf_wordcloud(self, data):
         """TF-IDF 기반 워드클라우드 생성"""
         try:
-            # MySQL 연결
-            conn = mysql.connector.connect(**self.mysql_config)
-            cursor = conn.cursor(dictionary=True)
-            
             # 데이터 로드
             if data is None:
                 # 데이터가 제공되지 않으면 DB에서 직접 가져옴
@@ -1000,36 +917,24 @@ class MagazineDataLoader:
                 query = """
                     SELECT tokens
                     FROM fashion_trends.magazine_tokenised
-                    WHERE upload_date >= DATE_SUB(NOW(), INTERVAL %s DAY)
+                    WHERE upload_date >= %s
                 """
-                cursor.execute(query, (days,))
-                rows = cursor.fetchall()
+                rows = self._fetch(query, (datetime.now() - timedelta(days=days),))
+                store = TokenStore.from_tokens(row['tokens'] for row in rows)
             else:
                 # 제공된 데이터 사용
-                rows = [{'tokens': tokens} for tokens in data['tokens']]
-            
-            # 문서-토큰 데이터 준비
-            documents = []
-            for row in rows:
-                if row['tokens']:
-                    try:
-                        tokens = json.loads(row['tokens'])
-                        if isinstance(tokens, list):
-                            # 토큰 리스트를 공백으로 구분된 문자열로 변환
-                            documents.append(' '.join(tokens))
-                    except json.JSONDecodeError:
-                        continue
-            
-            if not documents:
+                store = token_store(data)
+            
+            # 토큰이 있는 문서만 사용
+            store = store.subset(np.flatnonzero(store.lengths()))
+            if not len(store):
                 logger.warning("워드클라우드 생성을 위한 문서가 없습니다.")
                 return None
             
-            # TF-IDF 벡터라이저 초기화 및 적용
-            vectorizer = TfidfVectorizer(max_features=100)
-            tfidf_matrix = vectorizer.fit_transform(documents)
+            # 상위 100개 단어의 TF-IDF 계산
+            feature_names, tfidf_matrix = store.tfidf(max_features=100)
             
             # 각 단어의 평균 TF-IDF 점수 계산
-            feature_names = vectorizer.get_feature_names_out()
             mean_tfidf_scores = np.array(tfidf_matrix.mean(axis=0)).flatten()
             
             # 단어와 TF-IDF 점수를 딕셔너리로 변환
@@ -1075,11 +980,6 @@ class MagazineDataLoader:
         except Exception as e:
             logger.error(f"워드클라우드 생성 중 오류 발생: {str(e)}")
             return None
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def analyze_sentiment(self, data):
         """감성 분석 수행"""
@@ -1221,6 +1121,12 @@ class MagazineDataLoader:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
+            cached = self._cached_documents(start_date, end_date)
+            if cached is not None:
+                if cached.empty:
+                    logger.warning(f"{days}일 기간 동안 데이터가 없습니다.")
+                return cached
+            
             query = """
                 SELECT 
                     doc_id,
@@ -1235,28 +1141,13 @@ class MagazineDataLoader:
                 ORDER BY upload_date DESC
             """
             
-            self.cursor.execute(query, (start_date, end_date))
-            rows = self.cursor.fetchall()
+            rows = self._fetch(query, (start_date, end_date))
             
             if not rows:
                 logger.warning(f"{days}일 기간 동안 데이터가 없습니다.")
-                return pd.DataFrame(columns=['doc_id', 'doc_domain', 'source', 'upload_date', 'title', 'content', 'tokens'])
-            
-            data = pd.DataFrame(rows)
+                return pd.DataFrame(columns=DOCUMENT_COLUMNS)
             
-            # tokens 컬럼 처리
-            if 'tokens' in data.columns:
-                data['tokens'] = data['tokens'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
-            
-            # source 컬럼 소문자 변환
-            if 'source' in data.columns:
-                data['source'] = data['source'].str.lower()
-            
-            # magazine_name 컬럼 추가
-            if 'source' in data.columns:
-                data['magazine_name'] = data['source'].apply(self._get_normalized_magazine_name)
-            
-            return data
+            return decode_documents(rows)
         
         except Exception as e:
             logger.error(f"{days}일 기간 데이터 로드 중 오류 발생: {e}", exc_info=True)
@@ -1364,28 +1255,12 @@ class MagazineDataLoader:
     
     def _calculate_category_counts(self, current_data, prev_data, category_mapping):
         """카테고리별 토큰 출현 횟수 계산"""
-        current_counts = {category: 0 for category in category_mapping.keys()}
-        prev_counts = {category: 0 for category in category_mapping.keys()}
+        # 키워드가 토큰에 포함되면 (대소문자 무시) 해당 카테고리로 셈 - 고유 단어마다 한 번만 검사
+        def match(keywords, token):
+            return any(kw.lower() in token.lower() for kw in keywords)
         
-        # 현재 기간 데이터 처리
-        if not current_data.empty and 'tokens' in current_data.columns:
-            for _, row in current_data.iterrows():
-                tokens = row['tokens']
-                if isinstance(tokens, list):
-                    for token in tokens:
-                        for category, keywords in category_mapping.items():
-                            if any(kw.lower() in token.lower() for kw in keywords):
-                                current_counts[category] += 1
-        
-        # 이전 기간 데이터 처리
-        if not prev_data.empty and 'tokens' in prev_data.columns:
-            for _, row in prev_data.iterrows():
-                tokens = row['tokens']
-                if isinstance(tokens, list):
-                    for token in tokens:
-                        for category, keywords in category_mapping.items():
-                            if any(kw.lower() in token.lower() for kw in keywords):
-                                prev_counts[category] += 1
+        current_counts = token_store(current_data).category_counts(category_mapping, match)
+        prev_counts = token_store(prev_data).category_counts(category_mapping, match)
         
         return current_counts, prev_counts
     
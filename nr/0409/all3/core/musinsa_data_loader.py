@@ -4,11 +4,31 @@ import numpy as np
 import logging
 from datetime import datetime, timedelta
 from .db_connector import DBConnector
+from .corpus_cache import CorpusCache, get_corpus_cache
 from .config import PERIOD_DAYS
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 상품 캐시 적재/증분 갱신 쿼리 (워터마크 이후 상품)
+CORPUS_QUERY = """
+    SELECT * FROM fashion_trends.musinsa_data
+    WHERE upload_date >= %s
+    ORDER BY upload_date
+"""
+
+# DBConnector.get_musinsa_data 의 기본 LIMIT 과 같은 최대 상품 수
+MAX_ROWS = 1000
+
+
+def decode_products(rows):
+    """조회 행 → 상품 DataFrame (upload_date datetime 변환)"""
+    data = pd.DataFrame(rows)
+    if 'upload_date' in data.columns:
+        data['upload_date'] = pd.to_datetime(data['upload_date'])
+    return data
+
+
 class MusinsaDataLoader:
     """무신사 데이터 로드 및 처리를 담당하는 클래스"""
     
@@ -19,6 +39,25 @@ class MusinsaDataLoader:
         self.cache_enabled = True
         self.cache_timeout = 3600  # 캐시 유효 시간 (초)
     
+    def _fetch_products(self, start_date, end_date=None):
+        """기간 상품 조회 (상품 캐시 우선, 캐시를 쓸 수 없는 구간이면 DB 조회)
+
+        Args:
+            start_date (str): 시작 날짜 (YYYY-MM-DD 형식)
+            end_date (str): 종료 날짜 (YYYY-MM-DD 형식, 없으면 오늘까지)
+        """
+        try:
+            corpus = get_corpus_cache('musinsa', lambda: CorpusCache(
+                'musinsa', CORPUS_QUERY, 'upload_date', key_column='id', decode=decode_products
+            ))
+            if corpus is not None:
+                cached = corpus.day_window(start_date, end_date or datetime.now())
+                if cached is not None:
+                    return cached.head(MAX_ROWS).copy()
+        except Exception as e:
+            logger.error(f"무신사 상품 캐시 조회 오류: {e}")
+        return DBConnector.get_musinsa_data(start_date=start_date, end_date=end_date)
+    
     def load_data_by_period(self, period='7일'):
         """기간별 무신사 데이터 로드"""
         try:
@@ -41,7 +80,7 @@ class MusinsaDataLoader:
             logger.info(f"무신사 데이터 로드 시작 (기간: {period}, 시작일: {start_date_str})")
             
             # DBConnector를 통해 데이터 가져오기
-            data = DBConnector.get_musinsa_data(start_date=start_date_str)
+            data = self._fetch_products(start_date_str)
             
             if data is None or data.empty:
                 logger.warning(f"{period} 기간 동안 무신사 데이터가 없습니다.")
@@ -82,10 +121,7 @@ class MusinsaDataLoader:
                 return self.get_default_data()
             
             # DBConnector를 통해 데이터 가져오기
-            data = DBConnector.get_musinsa_data(
-                start_date=start_date_str, 
-                end_date=end_date_str
-            )
+            data = self._fetch_products(start_date_str, end_date_str)
             
             if data is None or data.empty:
                 logger.warning(f"{start_date_str}부터 {end_date_str}까지 무신사 데이터가 없습니다.")
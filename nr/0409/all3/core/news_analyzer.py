@@ -18,6 +18,9 @@ import logging
 import json
 from datetime import datetime, timedelta
 import re
+from .token_store import token_store
+from .cooccurrence import build_cooccurrence
+from .trend_table import trend_table
 
 
 # 로깅 설정 추가
@@ -581,9 +584,9 @@ class NewsAnalyzer:
                 logger.warning("키워드 트렌드: 날짜 컬럼을 찾을 수 없습니다.")
                 return None
             
-            # 토큰 컬럼 확인 - tokens와 token_list 둘 다 확인
+            # 토큰 컬럼 확인 - 디코딩된 token_list 우선, 없으면 tokens (JSON 문자열도 디코딩)
             token_column = None
-            for col in ['tokens', 'token_list']:
+            for col in ['token_list', 'tokens']:
                 if col in df.columns:
                     token_column = col
                     logger.info(f"키워드 트렌드: 토큰 컬럼 '{col}' 사용")
@@ -604,45 +607,35 @@ class NewsAnalyzer:
                 logger.warning(f"날짜 변환 후 {null_dates.sum()}개의 null 값이 생성되었습니다.")
                 df = df[~null_dates].copy()
             
-            # 시간 단위 컬럼 추가
+            # (일, 단어) 집계표에서 시간 단위별 키워드 포함 기사 수 계산
+            granularity = time_unit if time_unit in ('daily', 'weekly') else 'monthly'
+            table = trend_table(df, date_column, token_column)
+            counts = table.trend(list(dict.fromkeys(keywords)), granularity=granularity, measure='documents')
+            total_by_time = table.totals(granularity)
+            
+            # 시간 단위 라벨 (같은 라벨의 구간은 합산)
             if time_unit == 'daily':
-                df['time_unit'] = df[date_column].dt.strftime('%Y-%m-%d')
+                labels = total_by_time.index.strftime('%Y-%m-%d')
             elif time_unit == 'weekly':
-                df['time_unit'] = df[date_column].dt.to_period('W').dt.strftime('%Y-%U')
+                labels = total_by_time.index.to_series().dt.to_period('W').dt.strftime('%Y-%U')
             else:  # monthly
-                df['time_unit'] = df[date_column].dt.strftime('%Y-%m')
-            
-            # 시간 단위별 전체 문서 수 계산
-            total_by_time = df.groupby('time_unit').size()
-            time_units = sorted(df['time_unit'].unique())
-            
-            # 키워드별 시간 단위별 빈도 계산
-            keyword_trends = {}
-            for keyword in keywords:
-                trend_data = []
-                
-                # 시간 단위별로 반복
-                for time_unit_value in time_units:
-                    # 해당 시간 단위 데이터
-                    time_df = df[df['time_unit'] == time_unit_value]
-                    
-                    # 해당 키워드가 포함된 기사 수 계산
-                    if isinstance(time_df.iloc[0][token_column], list):
-                        # 리스트 형태인 경우
-                        keyword_count = sum(1 for tokens in time_df[token_column] if keyword in tokens)
-                    else:
-                        # 문자열 형태인 경우
-                        keyword_count = sum(1 for tokens in time_df[token_column] if isinstance(tokens, str) and keyword in tokens.split())
-                    
-                    trend_data.append({
-                        'time_unit': time_unit_value,
-                        'frequency': keyword_count
-                    })
-                
-                keyword_trends[keyword] = trend_data
+                labels = total_by_time.index.strftime('%Y-%m')
+            labels = np.asarray(labels)
+            counts = counts.groupby(labels).sum().sort_index()
+            total_by_time = total_by_time.groupby(labels).sum().sort_index()
+            time_units = total_by_time.index.tolist()
+            
+            # 키워드별 시간 단위별 빈도
+            keyword_trends = {
+                keyword: [
+                    {'time_unit': time_unit_value, 'frequency': int(frequency)}
+                    for time_unit_value, frequency in zip(time_units, counts[keyword].tolist())
+                ]
+                for keyword in keywords
+            }
             
             # 각 시간 단위의 전체 기사 수
-            totals = total_by_time.to_dict()
+            totals = {time_unit_value: int(total) for time_unit_value, total in total_by_time.items()}
             
             result = {
                 'trends': keyword_trends,
@@ -1007,41 +1000,27 @@ class NewsAnalyzer:
         }
     
     # 5. 연관어 분석 관련 기능
-    def analyze_word_association(self, top_n=300, min_count=2):
-        """단어 연관성 분석"""
+    def analyze_word_association(self, top_n=300, min_count=2, window=None, weighting='count'):
+        """단어 연관성 분석
+        
+        Args:
+            top_n (int): 사용할 상위 빈도 단어 수
+            min_count (int): 엣지로 남길 최소 동시 출현 수 (문서 또는 window 구간 수)
+            window (int): 있으면 window 토큰 구간 안에서 함께 나온 경우만 셈
+            weighting (str): 엣지 가중치 ('count', 'pmi', 'npmi')
+        """
         if self.data is None or self.data.empty or 'token_list' not in self.data.columns:
             return None
         
-        # 모든 토큰 결합
-        all_tokens = []
-        for tokens in self.data['token_list']:
-            if isinstance(tokens, list):
-                all_tokens.extend(tokens)
-        
-        # 단어 빈도 계산
-        word_counts = Counter(all_tokens)
+        # 단어 빈도 계산 (정수 인코딩된 토큰 저장소)
+        store = token_store(self.data, 'token_list')
+        word_counts = store.counter()
         
-        # 상위 N개 단어 선택
-        top_words = [word for word, _ in word_counts.most_common(top_n)]
+        # 상위 N개 단어의 동시 출현 계산 (문서/구간 × 단어 이진 희소 행렬의 Xᵀ·X)
+        result = build_cooccurrence(store, top_n=top_n, window=window)
+        top_words = result.terms
         word_set = set(top_words)
-        
-        # 동시 출현 횟수 계산
-        cooccurrence = defaultdict(int)
-        
-        for tokens in self.data['token_list']:
-            if not isinstance(tokens, list):
-                continue
-                
-            # 선택된 단어만 필터링
-            filtered_tokens = [token for token in tokens if token in word_set]
-            
-            # 같은 문서 내 단어 쌍 확인
-            for i, word1 in enumerate(filtered_tokens):
-                for word2 in filtered_tokens[i+1:]:
-                    if word1 != word2:
-                        # 알파벳 순으로 정렬하여 중복 쌍 방지
-                        pair = tuple(sorted([word1, word2]))
-                        cooccurrence[pair] += 1
+        cooccurrence = result.pairs()
         
         # 네트워크 그래프 생성
         G = nx.Graph()
@@ -1051,9 +1030,8 @@ class NewsAnalyzer:
             G.add_node(word, count=word_counts[word])
         
         # 엣지 추가 (임계값 이상 공동 출현)
-        for (word1, word2), count in cooccurrence.items():
-            if count >= min_count:
-                G.add_edge(word1, word2, weight=count)
+        for word1, word2, count, weight in result.edges(min_count=min_count, weighting=weighting):
+            G.add_edge(word1, word2, weight=weight if weighting != 'count' else count, count=count)
         
         # 중심성 계산
         if G.number_of_nodes() <= 1000:
@@ -1225,17 +1203,12 @@ class NewsAnalyzer:
         if self.data is None or self.data.empty or 'token_list' not in self.data.columns:
             return None
         
-        # 모든 토큰 결합
-        all_tokens = []
-        for tokens in self.data['token_list']:
-            if isinstance(tokens, list):
-                all_tokens.extend(tokens)
-        
-        # 빈도수 계산
-        word_counts = Counter(all_tokens)
+        # 빈도수 계산 (정수 인코딩된 토큰 저장소)
+        store = token_store(self.data, 'token_list')
+        word_counts = store.counter()
         
         # 기본 통계
-        total_tokens = len(all_tokens)
+        total_tokens = len(store.values)
         unique_tokens = len(word_counts)
         
         return {
@@ -1341,25 +1314,14 @@ class NewsAnalyzer:
             return None
         
         # 월별 데이터 그룹화
-        df = self.data.copy()
-        df['year_month'] = df['upload_date'].dt.strftime('%Y-%m')
-        monthly_groups = df.groupby('year_month')
-        
-        # 월별 키워드 빈도 계산
-        keyword_monthly_freq = {keyword: [] for keyword in words}
-        months = sorted(df['year_month'].unique())
-        
-        for month in months:
-            month_df = df[df['year_month'] == month]
-            month_tokens = []
-            for tokens in month_df['token_list']:
-                if isinstance(tokens, list):
-                    month_tokens.extend(tokens)
-            
-            month_counts = Counter(month_tokens)
-            
-            for keyword in words:
-                keyword_monthly_freq[keyword].append(month_counts.get(keyword, 0))
+        year_month = self.data['upload_date'].dt.strftime('%Y-%m')
+        months = sorted(year_month.unique())
+        
+        # 월별 키워드 빈도 계산 (문서별 키워드 출현 횟수를 월별로 합산)
+        store = token_store(self.data, 'token_list')
+        counts = pd.DataFrame({keyword: store.term_counts(keyword) for keyword in words}, index=np.arange(len(store)))
+        monthly_counts = counts.groupby(year_month.to_numpy()).sum().reindex(months, fill_value=0)
+        keyword_monthly_freq = {keyword: monthly_counts[keyword].tolist() for keyword in words}
         
         return {
             'months': months,
@@ -1,9 +1,11 @@
-from sqlalchemy import create_engine
 import pandas as pd
 import logging
 from datetime import datetime, timedelta
-import mysql.connector
-from .config import NEWS_DB_CONFIG, PERIOD_DAYS
+from .db_connector import DBConnector
+from .corpus_cache import CorpusCache, get_corpus_cache
+from .token_store import token_store
+from .cooccurrence import strongest_pairs
+from .config import PERIOD_DAYS
 import json
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -24,6 +26,29 @@ import matplotlib.font_manager
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 뉴스 기사 컬럼
+ARTICLE_COLUMNS = ['id', 'keyword', 'title', 'content', 'published', 'source', 'tokens']
+
+# 기사 캐시 적재/증분 갱신 쿼리 (워터마크 이후 기사)
+CORPUS_QUERY = """
+    SELECT a.id, a.keyword, a.title, a.content, a.published, a.source, t.tokens
+    FROM knews_articles a
+    LEFT JOIN tokenised t ON a.id = t.id
+    WHERE a.published >= %s
+    ORDER BY a.published
+"""
+
+
+def decode_articles(rows):
+    """조회 행 → 기사 DataFrame (토큰 JSON 디코딩, published datetime 변환)"""
+    if not rows:
+        return pd.DataFrame(columns=ARTICLE_COLUMNS)
+    data = pd.DataFrame(rows)
+    data['tokens'] = data['tokens'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
+    data['published'] = pd.to_datetime(data['published'])
+    return data
+
+
 class NewsDataLoader:
     """뉴스 데이터 로드 및 처리 클래스"""
     
@@ -31,39 +56,41 @@ class NewsDataLoader:
         """초기화"""
         self.data = None
         self.period = '7일'
-        self.db_connection = None
-        self.cursor = None
-        self.mysql_config = NEWS_DB_CONFIG
-        self.engine = create_engine(
-            f"mysql+pymysql://{self.mysql_config['user']}:{self.mysql_config['password']}@{self.mysql_config['host']}/{self.mysql_config['database']}"
-        )
-        self.connect_db()
+        self.database = 'news'  # DBConnector 연결 풀 (요청 스레드마다 연결을 빌려 씀)
         self.visualizations = {}
     
-    def connect_db(self):
-        """데이터베이스 연결"""
+    def _fetch(self, query, params=None):
+        """공유 연결 풀로 조회 쿼리 실행 (행 dict 목록 반환)"""
+        return DBConnector.fetch_all(query, params, database=self.database)
+    
+    def _cached_articles(self, start=None, end=None):
+        """기사 캐시에서 기간 기사 조회 (캐시를 쓸 수 없는 구간이면 None → DB 조회)"""
         try:
-            self.db_connection = mysql.connector.connect(**self.mysql_config)
-            self.cursor = self.db_connection.cursor(dictionary=True)
-            logging.info("뉴스 데이터베이스 연결 성공")
+            corpus = get_corpus_cache('news', lambda: CorpusCache(
+                'news', CORPUS_QUERY, 'published', key_column='id',
+                decode=decode_articles, database=self.database, token_column='tokens'
+            ))
+            return None if corpus is None else corpus.window(start, end)
         except Exception as e:
-            logging.error(f"뉴스 데이터베이스 연결 실패: {e}")
-            self.db_connection = None
-            self.cursor = None
+            logger.error(f"뉴스 기사 캐시 조회 오류: {e}")
+            return None
     
     def load_data_by_period(self, period='7일'):
         """기간별 데이터 로드"""
         try:
-            if not self.cursor:
-                self.connect_db()
-                if not self.cursor:
-                    raise Exception("데이터베이스 연결이 없습니다.")
-
             self.period = period
             days = PERIOD_DAYS.get(period, 7)
             
             start_date = datetime.now() - timedelta(days=days)
             
+            # 기사 캐시에 있는 기간이면 메모리에서 바로 반환
+            cached = self._cached_articles(start_date)
+            if cached is not None:
+                self.data = cached
+                if self.data.empty:
+                    logging.warning(f"{period} 기간 동안 뉴스 데이터가 없습니다.")
+                return self.data
+            
             query = """
                 SELECT 
                     a.id,
@@ -79,39 +106,35 @@ class NewsDataLoader:
                 ORDER BY a.published DESC
             """
             
-            self.cursor.execute(query, (start_date,))
-            rows = self.cursor.fetchall()
+            rows = self._fetch(query, (start_date,))
             
             if not rows:
                 logging.warning(f"{period} 기간 동안 뉴스 데이터가 없습니다.")
-                self.data = pd.DataFrame(columns=['id', 'keyword', 'title', 'content', 'published', 'source', 'tokens'])
+                self.data = pd.DataFrame(columns=ARTICLE_COLUMNS)
                 return self.data
             
-            # DataFrame 생성
-            self.data = pd.DataFrame(rows)
-            
-            # tokens 컬럼의 JSON 문자열을 리스트로 변환
-            self.data['tokens'] = self.data['tokens'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
-            
-            # published를 datetime으로 변환
-            self.data['published'] = pd.to_datetime(self.data['published'])
+            # DataFrame 생성 (토큰 디코딩, published datetime 변환)
+            self.data = decode_articles(rows)
             
             logging.info(f"뉴스 데이터 로드 완료: {len(self.data)}개 문서")
             return self.data
             
         except Exception as e:
             logging.error(f"뉴스 데이터 로드 중 오류 발생: {e}")
-            self.data = pd.DataFrame(columns=['id', 'keyword', 'title', 'content', 'published', 'source', 'tokens'])
+            self.data = pd.DataFrame(columns=ARTICLE_COLUMNS)
             return self.data
 
     def load_data_by_date_range(self, start_date, end_date):
         """직접 설정한 날짜 범위의 데이터 로드"""
         try:
-            if not self.cursor:
-                self.connect_db()
-                if not self.cursor:
-                    raise Exception("데이터베이스 연결이 없습니다.")
-
+            # BETWEEN 과 같은 구간 (양 끝 포함)
+            cached = self._cached_articles(pd.Timestamp(start_date), pd.Timestamp(end_date))
+            if cached is not None:
+                self.data = cached
+                if self.data.empty:
+                    logging.warning(f"{start_date}부터 {end_date}까지의 데이터가 없습니다.")
+                return self.data
+            
             query = """
                 SELECT 
                     a.id,
@@ -127,29 +150,22 @@ class NewsDataLoader:
                 ORDER BY a.published DESC
             """
             
-            self.cursor.execute(query, (start_date, end_date))
-            rows = self.cursor.fetchall()
+            rows = self._fetch(query, (start_date, end_date))
             
             if not rows:
                 logging.warning(f"{start_date}부터 {end_date}까지의 데이터가 없습니다.")
-                self.data = pd.DataFrame(columns=['id', 'keyword', 'title', 'content', 'published', 'source', 'tokens'])
+                self.data = pd.DataFrame(columns=ARTICLE_COLUMNS)
                 return self.data
             
-            # DataFrame 생성
-            self.data = pd.DataFrame(rows)
-            
-            # tokens 컬럼의 JSON 문자열을 리스트로 변환
-            self.data['tokens'] = self.data['tokens'].apply(lambda x: json.loads(x) if isinstance(x, str) else x)
-            
-            # published를 datetime으로 변환
-            self.data['published'] = pd.to_datetime(self.data['published'])
+            # DataFrame 생성 (토큰 디코딩, published datetime 변환)
+            self.data = decode_articles(rows)
             
             logging.info(f"뉴스 데이터 로드 완료: {len(self.data)}개 문서")
             return self.data
             
         except Exception as e:
             logging.error(f"뉴스 데이터 로드 중 오류 발생: {e}")
-            self.data = pd.DataFrame(columns=['id', 'keyword', 'title', 'content', 'published', 'source', 'tokens'])
+            self.data = pd.DataFrame(columns=ARTICLE_COLUMNS)
             return self.data
 
     def generate_visualizations(self, data=None):
@@ -188,13 +204,7 @@ class NewsDataLoader:
     def analyze_word_frequency(self, data):
         """단어 빈도 분석"""
         try:
-            all_tokens = []
-            for tokens in data['tokens']:
-                if isinstance(tokens, list):
-                    all_tokens.extend(tokens)
-            
-            word_freq = Counter(all_tokens)
-            return word_freq
+            return token_store(data).counter()
 
         except Exception as e:
             logger.error(f"단어 빈도 분석 중 오류 발생: {e}")
@@ -300,16 +310,14 @@ class NewsDataLoader:
     def analyze_topics(self, data, num_topics=5):
         """토픽 모델링"""
         try:
-            # TF-IDF 벡터화
-            vectorizer = TfidfVectorizer(max_features=1000)
-            tfidf = vectorizer.fit_transform([' '.join(tokens) for tokens in data['tokens']])
+            # TF-IDF 벡터화 (정수 인코딩된 토큰 저장소에서 바로 계산)
+            feature_names, tfidf = token_store(data).tfidf(max_features=1000)
 
             # LDA 수행
             lda = LatentDirichletAllocation(n_components=num_topics, random_state=42)
             lda.fit(tfidf)
 
             # 토픽별 주요 단어 추출
-            feature_names = vectorizer.get_feature_names_out()
             topics = []
             for topic_idx, topic in enumerate(lda.components_):
                 top_words = [feature_names[i] for i in topic.argsort()[:-10-1:-1]]
@@ -338,25 +346,19 @@ class NewsDataLoader:
     def analyze_word_association(self, data):
         """단어 연관성 분석"""
         try:
-            # 동시 출현 단어 쌍 계산
-            word_pairs = []
-            for tokens in data['tokens']:
-                if isinstance(tokens, list):
-                    for i, word1 in enumerate(tokens):
-                        for word2 in tokens[i+1:]:
-                            word_pairs.append(tuple(sorted([word1, word2])))
-
-            # 동시 출현 빈도 계산
-            pair_freq = Counter(word_pairs)
+            # 함께 나온 문서 수 상위 50개 단어 쌍 (다른 네트워크 뷰와 같은 동시 출현 엔진)
+            cooccurrence, top_edges = strongest_pairs(token_store(data), 50)
 
             # 네트워크 그래프 생성
             G = nx.Graph()
-            for (word1, word2), freq in pair_freq.most_common(50):
-                G.add_edge(word1, word2, weight=freq)
+            for word1, word2, count, _ in top_edges:
+                G.add_edge(word1, word2, weight=count)
 
-            # 노드 크기 계산
-            node_freq = Counter([word for pair in pair_freq.keys() for word in pair])
-            nx.set_node_attributes(G, node_freq, 'size')
+            # 노드 크기 계산 (집계한 단어 중 함께 나온 적이 있는 단어 수)
+            pairs = cooccurrence.counts.tocoo()
+            degree = np.bincount(pairs.row, minlength=len(cooccurrence)) + np.bincount(pairs.col, minlength=len(cooccurrence))
+            node_freq = dict(zip(cooccurrence.terms, degree.tolist()))
+            nx.set_node_attributes(G, {node: node_freq[node] for node in G.nodes()}, 'size')
 
             # Plotly 그래프 생성
             pos = nx.spring_layout(G)
@@ -411,12 +413,11 @@ class NewsDataLoader:
         """TF-IDF 분석"""
         try:
             # TF-IDF 벡터화
-            vectorizer = TfidfVectorizer()
-            tfidf_matrix = vectorizer.fit_transform([' '.join(tokens) for tokens in data['tokens']])
+            feature_names, tfidf_matrix = token_store(data).tfidf()
 
             # 단어별 평균 TF-IDF 점수 계산
             mean_tfidf = np.array(tfidf_matrix.mean(axis=0)).flatten()
-            feature_names = vectorizer.get_feature_names_out()
+            feature_names = np.array(feature_names, dtype=object)
 
             # 상위 20개 단어 선택
             top_indices = mean_tfidf.argsort()[-20:][::-1]
@@ -443,14 +444,4 @@ class NewsDataLoader:
 
         except Exception as e:
             logger.error(f"TF-IDF 분석 중 오류 발생: {e}")
-            return None
-
-    def __del__(self):
-        """소멸자: 데이터베이스 연결 종료"""
-        try:
-            if self.cursor:
-                self.cursor.close()
-            if self.db_connection:
-                self.db_connection.close()
-        except Exception as e:
-            logging.error(f"데이터베이스 연결 종료 중 오류 발생: {e}") 
\ No newline at end of file
+            return None 
@@ -0,0 +1,382 @@
+# core/token_store.py
+import json
+import logging
+import threading
+from collections import Counter
+from itertools import chain
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfTransformer
+
+logger = logging.getLogger(__name__)
+
+
+class Vocabulary:
+    """전역 단어 사전 (단어 ↔ 정수 id, 단어는 추가만 되므로 한 번 받은 id 는 바뀌지 않음)"""
+
+    def __init__(self):
+        self._ids = {}
+        self._terms = []
+        self._term_array = np.empty(0, dtype=object)
+        self._masks = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._terms)
+
+    def id(self, term):
+        """단어 id (사전에 없으면 -1)"""
+        return self._ids.get(term, -1)
+
+    def ids(self, terms):
+        """단어 목록 → id 배열 (사전에 없는 단어는 -1)"""
+        return np.array([self._ids.get(term, -1) for term in terms], dtype=np.int32)
+
+    def add(self, terms):
+        """단어 목록 → id 배열 (없는 단어는 사전에 추가)"""
+        ids = np.empty(len(terms), dtype=np.int32)
+        with self._lock:
+            for i, term in enumerate(terms):
+                term_id = self._ids.get(term)
+                if term_id is None:
+                    term_id = self._ids[term] = len(self._terms)
+                    self._terms.append(term)
+                ids[i] = term_id
+        return ids
+
+    def term(self, term_id):
+        return self._terms[term_id]
+
+    def terms(self, ids=None):
+        """id 배열 → 단어 배열 (object ndarray, 사전에 저장된 단어 객체를 그대로 사용)"""
+        term_array = self._term_array
+        if len(term_array) != len(self._terms):
+            term_array = self._term_array = np.array(self._terms, dtype=object)
+        return term_array if ids is None else term_array[ids]
+
+    def stopword_mask(self, stopwords, min_length=1):
+        """불용어이거나 min_length 보다 짧은 단어 id 위치가 True 인 불리언 배열
+
+        사전이 커진 경우 새로 추가된 단어만 검사한다.
+        """
+        key = (frozenset(stopwords), min_length)
+        terms = self._terms[:]
+        mask = self._masks.get(key, np.empty(0, dtype=bool))
+        if len(mask) < len(terms):
+            added = np.fromiter((term in key[0] or len(term) < min_length for term in terms[len(mask):]),
+                                dtype=bool, count=len(terms) - len(mask))
+            mask = self._masks[key] = np.concatenate([mask, added])
+        return mask
+
+
+# 프로세스 전역 단어 사전 (매거진/뉴스 저장소가 같은 id 를 씀)
+VOCABULARY = Vocabulary()
+
+
+def _is_missing(value):
+    """None 또는 NaN"""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _as_list(tokens):
+    """토큰 컬럼 값 → 리스트 (JSON 문자열은 디코딩, 리스트가 아닌 값은 빈 리스트)"""
+    if isinstance(tokens, str):
+        try:
+            tokens = json.loads(tokens)
+        except ValueError:
+            return []
+    return tokens if isinstance(tokens, (list, tuple)) else []
+
+
+class TokenStore:
+    """문서 토큰을 CSR 형태의 정수 배열로 담는 저장소
+
+    문서 i 의 토큰 id 는 values[offsets[i]:offsets[i + 1]] 이다 (둘 다 int32, 토큰 순서 유지).
+    단어 빈도, 문서 빈도, 동시 출현, 카테고리 집계, TF-IDF 를 파이썬 문자열 리스트 대신 이 배열로 계산한다.
+    저장소는 만든 뒤 바꾸지 않는다.
+    """
+
+    __slots__ = ('offsets', 'values', 'vocabulary', '_row_ids')
+
+    def __init__(self, offsets, values, vocabulary=VOCABULARY):
+        self.offsets = offsets
+        self.values = values
+        self.vocabulary = vocabulary
+        self._row_ids = None
+
+    @classmethod
+    def from_tokens(cls, token_lists, vocabulary=VOCABULARY):
+        """토큰 리스트(또는 JSON 문자열) 목록으로 저장소 생성"""
+        docs = [_as_list(tokens) for tokens in token_lists]
+        lengths = np.fromiter((len(tokens) for tokens in docs), dtype=np.int64, count=len(docs))
+        offsets = np.zeros(len(docs) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if offsets[-1] > np.iinfo(np.int32).max:
+            raise ValueError(f"토큰 수가 int32 범위를 넘습니다: {offsets[-1]}")
+
+        # 고유 단어만 사전에서 찾고 나머지는 factorize 코드로 매핑
+        tokens = pd.Series(list(chain.from_iterable(docs)), dtype=object)
+        codes, uniques = pd.factorize(tokens, use_na_sentinel=False)
+        values = vocabulary.add(list(uniques))[codes] if len(codes) else np.empty(0, dtype=np.int32)
+        return cls(offsets.astype(np.int32), values.astype(np.int32, copy=False), vocabulary)
+
+    @classmethod
+    def concat(cls, stores, vocabulary=VOCABULARY):
+        """여러 저장소를 문서 순서대로 이어 붙임"""
+        stores = list(stores)
+        if not stores:
+            return cls(np.zeros(1, dtype=np.int32), np.empty(0, dtype=np.int32), vocabulary)
+        lengths = np.concatenate([np.diff(store.offsets) for store in stores])
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        values = np.concatenate([store.values for store in stores])
+        return cls(offsets, values, stores[0].vocabulary)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __deepcopy__(self, memo):
+        # 바뀌지 않는 저장소이므로 복사하지 않음
+        return self
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.values.nbytes
+
+    def lengths(self):
+        """문서별 토큰 수"""
+        return np.diff(self.offsets)
+
+    def row_ids(self):
+        """토큰별 문서 번호 (values 와 같은 길이)"""
+        if self._row_ids is None:
+            self._row_ids = np.repeat(np.arange(len(self), dtype=np.int32), self.lengths())
+        return self._row_ids
+
+    def document(self, row):
+        """문서 토큰 (단어 리스트)"""
+        return self.vocabulary.terms(self.values[self.offsets[row]:self.offsets[row + 1]]).tolist()
+
+    def documents(self):
+        """문서별 토큰 리스트 (사전의 단어 객체를 공유해 같은 단어를 한 번만 저장)"""
+        terms = self.vocabulary.terms(self.values)
+        return [terms[start:end].tolist() for start, end in zip(self.offsets[:-1], self.offsets[1:])]
+
+    def subset(self, rows):
+        """rows 순서의 문서만 담은 저장소"""
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.offsets[:-1][rows].astype(np.int64)
+        lengths = (self.offsets[1:][rows] - self.offsets[:-1][rows]).astype(np.int64)
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # 각 토큰 위치 = 문서 시작 위치 + 문서 안 순번
+        positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        return TokenStore(offsets.astype(np.int32), self.values[positions], self.vocabulary)
+
+    def grouped(self, codes, n_groups=None):
+        """그룹별로 문서를 이어 붙인 저장소 (codes: 문서별 그룹 번호, 음수는 제외)
+
+        결과의 i 번째 문서는 그룹 i 에 속한 문서 토큰을 원래 순서대로 이어 붙인 것이다.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        n_groups = int(codes.max()) + 1 if n_groups is None and len(codes) else (n_groups or 0)
+        order = np.flatnonzero(codes >= 0)
+        order = order[np.argsort(codes[order], kind='stable')]
+        merged = self.subset(order)
+        # 그룹 경계 = 각 그룹 첫 문서의 시작 위치
+        boundaries = np.searchsorted(codes[order], np.arange(n_groups + 1), side='left')
+        return TokenStore(merged.offsets[boundaries].astype(np.int32), merged.values, self.vocabulary)
+
+    def windows(self, size):
+        """문서를 size 토큰씩 끊은 구간을 문서로 하는 저장소 (문서 경계는 넘지 않음, 마지막 구간은 짧을 수 있음)"""
+        if size < 1:
+            raise ValueError(f"구간 크기는 1 이상이어야 합니다: {size}")
+        lengths = self.lengths().astype(np.int64)
+        counts = -(-lengths // size)
+        # 구간 시작 위치 = 문서 시작 위치 + size 배수
+        starts = np.repeat(self.offsets[:-1].astype(np.int64), counts)
+        steps = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        offsets = np.append(starts + steps * size, self.offsets[-1])
+        return TokenStore(offsets.astype(np.int32), self.values, self.vocabulary)
+
+    def _exclude(self, counts, exclude):
+        """제외 단어(불리언 마스크 또는 단어 목록)의 빈도를 0 으로"""
+        if exclude is None:
+            return counts
+        if isinstance(exclude, np.ndarray) and exclude.dtype == bool:
+            size = min(len(exclude), len(counts))
+            counts[:size][exclude[:size]] = 0
+        else:
+            ids = self.vocabulary.ids(list(exclude))
+            ids = ids[(ids >= 0) & (ids < len(counts))]
+            counts[ids] = 0
+        return counts
+
+    def term_frequency(self, exclude=None):
+        """단어 id 별 출현 횟수 (사전 크기 배열)"""
+        return self._exclude(np.bincount(self.values, minlength=len(self.vocabulary)), exclude)
+
+    def document_frequency(self, exclude=None):
+        """단어 id 별 출현 문서 수 (사전 크기 배열)"""
+        size = len(self.vocabulary)
+        pairs = np.unique(self.row_ids().astype(np.int64) * size + self.values)
+        return self._exclude(np.bincount((pairs % size).astype(np.int64), minlength=size), exclude)
+
+    def most_common(self, n=None, exclude=None):
+        """(단어, 출현 횟수) 목록 (빈도 내림차순, 같은 빈도는 단어 id 순)"""
+        counts = self.term_frequency(exclude)
+        ids = np.flatnonzero(counts)
+        order = ids[np.argsort(-counts[ids], kind='stable')]
+        if n is not None:
+            order = order[:n]
+        return list(zip(self.vocabulary.terms(order).tolist(), counts[order].tolist()))
+
+    def counter(self, exclude=None):
+        """단어 → 출현 횟수 Counter"""
+        return Counter(dict(self.most_common(exclude=exclude)))
+
+    def top_ids(self, n, exclude=None):
+        """출현 횟수 상위 n 개 단어 id"""
+        counts = self.term_frequency(exclude)
+        ids = np.flatnonzero(counts)
+        return ids[np.argsort(-counts[ids], kind='stable')][:n]
+
+    def present_terms(self):
+        """저장소에 나오는 단어 id 와 단어 (id 순)"""
+        ids = np.flatnonzero(np.bincount(self.values, minlength=len(self.vocabulary)))
+        return ids, self.vocabulary.terms(ids)
+
+    def term_counts(self, terms):
+        """문서별 단어 출현 횟수 (단어 목록이면 합계)"""
+        ids = self.vocabulary.ids([terms] if isinstance(terms, str) else list(terms))
+        ids = ids[ids >= 0]
+        if not len(ids):
+            return np.zeros(len(self), dtype=np.int64)
+        hit = self.values == ids[0] if len(ids) == 1 else np.isin(self.values, ids)
+        return np.bincount(self.row_ids()[hit], minlength=len(self))
+
+    def contains(self, terms):
+        """문서별 단어(목록 중 하나라도) 포함 여부"""
+        return self.term_counts(terms) > 0
+
+    def matrix(self, columns=None, binary=False):
+        """문서 × 단어 희소 행렬 (columns 가 있으면 그 단어 id 들만 순서대로 열로 사용)
+
+        Args:
+            columns (array): 열로 쓸 단어 id (없으면 사전 전체)
+            binary (bool): True 면 출현 여부(0/1), False 면 출현 횟수
+        """
+        rows, values = self.row_ids(), self.values
+        if columns is None:
+            width, cols = len(self.vocabulary), values
+        else:
+            lookup = np.full(len(self.vocabulary), -1, dtype=np.int64)
+            lookup[columns] = np.arange(len(columns))
+            cols = lookup[values]
+            keep = cols >= 0
+            rows, cols, width = rows[keep], cols[keep], len(columns)
+        data = np.ones(len(cols), dtype=np.int64)
+        matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(self), width))
+        matrix.sum_duplicates()
+        if binary:
+            matrix.data[:] = 1
+        return matrix
+
+    def category_counts(self, category_mapping, match=None):
+        """카테고리별 토큰 출현 횟수
+
+        Args:
+            category_mapping (dict): 카테고리 → 키워드 목록
+            match (callable): match(키워드 목록, 단어) 가 참이면 그 단어를 카테고리에 셈 (없으면 정확히 일치)
+        """
+        counts = self.term_frequency()
+        present = np.flatnonzero(counts)
+        terms = self.vocabulary.terms(present)
+        result = {}
+        for category, keywords in category_mapping.items():
+            if match is None:
+                keyword_set = set(keywords)
+                hit = np.fromiter((term in keyword_set for term in terms), dtype=bool, count=len(terms))
+            else:
+                hit = np.fromiter((bool(match(keywords, term)) for term in terms), dtype=bool, count=len(terms))
+            result[category] = int(counts[present[hit]].sum())
+        return result
+
+    def tfidf(self, max_features=None, exclude=None, min_df=1):
+        """TF-IDF 행렬 (TfidfVectorizer 와 같은 기본값: 평활 idf, l2 정규화)
+
+        Args:
+            max_features (int): 전체 출현 횟수 상위 단어 수 제한
+            exclude: 제외 단어 (불용어)
+            min_df (int): 최소 출현 문서 수
+
+        Returns:
+            tuple: (단어 목록, 문서 × 단어 TF-IDF 희소 행렬)
+        """
+        counts = self.term_frequency(exclude)
+        if min_df > 1:
+            counts[self.document_frequency()[:len(counts)] < min_df] = 0
+        columns = np.flatnonzero(counts)
+        if max_features is not None and len(columns) > max_features:
+            columns = columns[np.argsort(-counts[columns], kind='stable')[:max_features]]
+        # TfidfVectorizer 처럼 단어 사전순 열
+        terms = self.vocabulary.terms(columns)
+        order = np.argsort(terms.astype(str), kind='stable')
+        columns, terms = columns[order], terms[order]
+        tfidf_matrix = TfidfTransformer().fit_transform(self.matrix(columns))
+        return terms.tolist(), tfidf_matrix
+
+
+# 문서 캐시가 등록한 스냅샷: 이름 → (저장소, 토큰 리스트 객체 id → 행 번호, 토큰 리스트, 부가 정보)
+_registered = {}
+_registered_lock = threading.Lock()
+
+
+def register_token_store(name, store, token_lists, attachment=None):
+    """문서 캐시 스냅샷의 저장소 등록 (같은 리스트 객체를 담은 DataFrame 은 다시 인코딩하지 않음)
+
+    등록 정보가 리스트 객체를 참조하므로 등록된 동안 객체 id 가 재사용되지 않는다.
+    토큰이 없는 행(None 등)은 끝에 붙인 빈 문서로 매핑한다.
+    attachment 는 같은 스냅샷 행 번호를 쓰는 부가 정보(키워드 추이 집계 등)로, 저장소/행 번호와 한 번에 교체된다.
+    """
+    token_lists = list(token_lists)
+    rows = {id(tokens): row for row, tokens in enumerate(token_lists) if isinstance(tokens, list)}
+    store = TokenStore.concat([store, TokenStore(np.zeros(2, dtype=np.int32), np.empty(0, dtype=np.int32))])
+    with _registered_lock:
+        _registered[name] = (store, rows, token_lists, attachment)
+
+
+def unregister_token_store(name):
+    with _registered_lock:
+        _registered.pop(name, None)
+
+
+def registered_rows(data, column='tokens'):
+    """문서 캐시에서 온 행이면 (캐시 이름, 등록된 저장소, 행 번호 목록, 부가 정보), 아니면 None
+
+    모든 값이 등록된 토큰 리스트이거나 None/NaN 일 때만 캐시 행으로 본다 (JSON 문자열 등은 새로 인코딩).
+    None/NaN 행의 행 번호는 저장소 끝의 빈 문서 (len(저장소) - 1) 이다.
+    """
+    token_lists = data[column].tolist()
+    if not all(isinstance(tokens, list) or _is_missing(tokens) for tokens in token_lists):
+        return None
+    for name, (store, rows, _, attachment) in list(_registered.items()):
+        empty = len(store) - 1
+        positions = [rows.get(id(tokens), -1) if isinstance(tokens, list) else empty for tokens in token_lists]
+        if -1 not in positions:
+            return name, store, positions, attachment
+    return None
+
+
+def token_store(data, column='tokens'):
+    """DataFrame 행 순서의 토큰 저장소
+
+    문서 캐시에서 온 행이면 등록된 저장소에서 행만 골라 오고, 아니면 토큰 컬럼으로 새로 만든다.
+    """
+    if data is None or data.empty or column not in data.columns:
+        return TokenStore.concat([])
+    located = registered_rows(data, column)
+    if located is not None:
+        return located[1].subset(located[2])
+    return TokenStore.from_tokens(data[column].tolist())
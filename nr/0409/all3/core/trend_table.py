@@ -0,0 +1,258 @@
+# core/trend_table.py
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from .token_store import VOCABULARY, registered_rows, token_store
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = ('daily', 'weekly', 'monthly')
+
+
+def _buckets(days, granularity):
+    """일 번호(1970-01-01 기준) → 구간 시작일 번호 (weekly 는 월요일 시작, monthly 는 1일 시작)"""
+    if granularity == 'daily':
+        return days
+    if granularity == 'weekly':
+        # 1970-01-01 은 목요일 (월요일 = 0 이면 3)
+        return days - (days + 3) % 7
+    if granularity == 'monthly':
+        return days.astype('datetime64[D]').astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+    raise ValueError(f"지원하지 않는 시간 단위입니다: {granularity}")
+
+
+def _day_numbers(dates):
+    """날짜 목록 → (일 번호 배열, 날짜가 있는 문서 마스크)"""
+    dates = pd.to_datetime(pd.Series(dates).reset_index(drop=True), errors='coerce')
+    valid = dates.notna().to_numpy().copy()
+    days = np.zeros(len(dates), dtype=np.int64)
+    days[valid] = dates[valid].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    return days, valid
+
+
+class TrendTable:
+    """(일, 그룹, 단어) → 문서 빈도 / 단어 빈도 집계표
+
+    문서 토큰을 (날짜, 그룹, 단어) 단위로 한 번 펼쳐 집계해 두고, 기간/그룹(매거진) 선택은 행 마스크로,
+    시간 단위(일/주/월) 변경과 키워드 추이는 일 단위 집계를 다시 묶는 것으로 계산한다.
+    항목 키는 일 번호 × 그룹 수 + 그룹 번호이며 항목 순서에는 의미가 없다.
+    """
+
+    def __init__(self, keys, terms, documents, tokens, total_keys, total_documents, group_names,
+                 vocabulary=VOCABULARY):
+        self.keys = keys
+        self.terms = terms
+        self.documents = documents
+        self.tokens = tokens
+        self.total_keys = total_keys
+        self.total_documents = total_documents
+        self.group_names = group_names
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_store(cls, store, dates, groups=None, group_names=None):
+        """토큰 저장소와 문서별 날짜(및 그룹)로 집계표 생성 (날짜가 없는 문서는 제외)
+
+        Args:
+            store (TokenStore): 문서 토큰 저장소
+            dates: 문서별 날짜
+            groups: 문서별 그룹 (매거진 이름 등)
+            group_names (list): 그룹 번호 순서 (없으면 groups 에 나온 순서)
+        """
+        days, valid = _day_numbers(dates)
+        if groups is None:
+            group_names, codes = [None], np.zeros(len(days), dtype=np.int64)
+        else:
+            groups = pd.Series(groups).reset_index(drop=True)
+            if group_names is None:
+                codes, uniques = pd.factorize(groups, use_na_sentinel=False)
+                group_names = list(uniques)
+            else:
+                codes = pd.Index(group_names).get_indexer(groups)
+            codes = codes.astype(np.int64)
+            valid &= codes >= 0
+        doc_keys = np.where(valid, days * len(group_names) + codes, -1)
+        return cls._build(store, doc_keys, group_names)
+
+    @classmethod
+    def _build(cls, store, doc_keys, group_names):
+        """문서별 키(음수는 제외)로 집계"""
+        size = len(store.vocabulary)
+        total_keys, total_documents = np.unique(doc_keys[doc_keys >= 0], return_counts=True)
+
+        rows = store.row_ids()
+        keep = doc_keys[rows] >= 0
+        rows, values = rows[keep].astype(np.int64), store.values[keep].astype(np.int64)
+        entries, tokens = np.unique(doc_keys[rows] * size + values, return_counts=True)
+        # 문서 빈도: (문서, 단어) 쌍을 먼저 한 번씩만 남김
+        pairs = np.unique(rows * size + values)
+        _, documents = np.unique(doc_keys[pairs // size] * size + pairs % size, return_counts=True)
+        return cls(entries // size, (entries % size).astype(np.int32), documents, tokens,
+                   total_keys, total_documents, list(group_names), store.vocabulary)
+
+    @classmethod
+    def concat(cls, tables):
+        """키가 겹치지 않는 집계표 합치기 (그룹 순서가 같아야 함)"""
+        first = tables[0]
+        return cls(*(np.concatenate([getattr(table, field) for table in tables])
+                     for field in ('keys', 'terms', 'documents', 'tokens', 'total_keys', 'total_documents')),
+                   first.group_names, first.vocabulary)
+
+    def _where(self, entry_mask, total_mask):
+        return TrendTable(self.keys[entry_mask], self.terms[entry_mask], self.documents[entry_mask],
+                          self.tokens[entry_mask], self.total_keys[total_mask], self.total_documents[total_mask],
+                          self.group_names, self.vocabulary)
+
+    def select(self, keys):
+        """(일, 그룹) 키 목록에 해당하는 부분만"""
+        return self._where(np.isin(self.keys, keys), np.isin(self.total_keys, keys))
+
+    def slice(self, start=None, end=None, groups=None):
+        """기간(시작일/종료일 포함) 및 그룹 목록으로 자른 집계표"""
+        def mask(keys):
+            days, codes = np.divmod(keys, len(self.group_names))
+            selected = np.ones(len(keys), dtype=bool)
+            if start is not None:
+                selected &= days >= pd.Timestamp(start).normalize().to_datetime64().astype('datetime64[D]').astype(np.int64)
+            if end is not None:
+                selected &= days <= pd.Timestamp(end).normalize().to_datetime64().astype('datetime64[D]').astype(np.int64)
+            if groups is not None:
+                selected &= np.isin(codes, pd.Index(self.group_names).get_indexer(list(groups)))
+            return selected
+
+        return self._where(mask(self.keys), mask(self.total_keys))
+
+    def totals(self, granularity='daily'):
+        """구간별 문서 수 (구간 시작일 Series)"""
+        buckets = _buckets(self.total_keys // len(self.group_names), granularity)
+        labels, codes = np.unique(buckets, return_inverse=True)
+        counts = np.bincount(codes, weights=self.total_documents, minlength=len(labels)).astype(np.int64)
+        return pd.Series(counts, index=pd.to_datetime(labels.astype('datetime64[D]')))
+
+    def top_terms(self, n=None, measure='tokens', exclude=None):
+        """(단어, 횟수) 목록 (횟수 내림차순, 같으면 단어 id 순)
+
+        Args:
+            measure (str): 'tokens' (출현 횟수) 또는 'documents' (출현 문서 수)
+            exclude: 제외 단어 id 불리언 마스크
+        """
+        counts = np.bincount(self.terms, weights=getattr(self, measure), minlength=len(self.vocabulary))
+        counts = counts.astype(np.int64)
+        if exclude is not None:
+            size = min(len(exclude), len(counts))
+            counts[:size][exclude[:size]] = 0
+        ids = np.flatnonzero(counts)
+        order = ids[np.argsort(-counts[ids], kind='stable')][:n]
+        return list(zip(self.vocabulary.terms(order).tolist(), counts[order].tolist()))
+
+    def trend(self, keywords, granularity='monthly', measure='documents', aliases=None, exclude=None):
+        """구간 × 키워드 집계 DataFrame (구간 시작일 인덱스, 문서가 있는 구간 전체)
+
+        Args:
+            keywords (list): 키워드 목록
+            granularity (str): 'daily', 'weekly', 'monthly'
+            measure (str): 'documents' (키워드가 나온 문서 수) 또는 'tokens' (출현 횟수)
+            aliases (dict): 키워드 → 합산할 단어 목록
+            exclude: 세지 않을 단어 id 불리언 마스크 (불용어)
+        """
+        keywords = list(keywords)
+        totals = self.totals(granularity)
+        labels = totals.index.to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+        # (단어 id, 키워드 열) 쌍을 단어 id 순으로
+        term_ids, columns = [], []
+        for column, keyword in enumerate(keywords):
+            terms = (aliases or {}).get(keyword, [keyword])
+            for term_id in self.vocabulary.ids(terms):
+                if term_id >= 0 and not (exclude is not None and term_id < len(exclude) and exclude[term_id]):
+                    term_ids.append(term_id)
+                    columns.append(column)
+        term_ids, columns = np.asarray(term_ids, dtype=np.int64), np.asarray(columns, dtype=np.int64)
+        order = np.argsort(term_ids, kind='stable')
+        term_ids, columns = term_ids[order], columns[order]
+
+        hit = np.flatnonzero(np.isin(self.terms, term_ids))
+        # 항목마다 그 단어를 쓰는 키워드 열로 펼침 (한 단어가 여러 키워드에 속할 수 있음)
+        lo = np.searchsorted(term_ids, self.terms[hit], side='left')
+        hi = np.searchsorted(term_ids, self.terms[hit], side='right')
+        repeats = hi - lo
+        entries = np.repeat(hit, repeats)
+        slots = np.repeat(lo - np.cumsum(repeats) + repeats, repeats) + np.arange(repeats.sum())
+        rows = np.searchsorted(labels, _buckets(self.keys[entries] // len(self.group_names), granularity))
+        values = np.zeros((len(labels), len(keywords)), dtype=np.int64)
+        np.add.at(values, (rows, columns[slots]), getattr(self, measure)[entries])
+        return pd.DataFrame(values, index=totals.index, columns=keywords)
+
+
+class TrendSource:
+    """문서 캐시 스냅샷의 집계표 (처음 사용할 때 한 번 만듦)
+
+    문서 캐시가 스냅샷 토큰 저장소를 등록할 때 부가 정보로 함께 등록하므로
+    registered_rows() 의 행 번호와 항상 같은 스냅샷을 가리킨다.
+    """
+
+    def __init__(self, store, dates, groups, group_column):
+        self.store = store
+        self.group_column = group_column
+        days, valid = _day_numbers(dates)
+        if groups is None:
+            self.group_names, codes = [None], np.zeros(len(days), dtype=np.int64)
+        else:
+            codes, uniques = pd.factorize(pd.Series(groups).reset_index(drop=True), use_na_sentinel=False)
+            self.group_names = list(uniques)
+        self.doc_keys = np.where(valid, days * len(self.group_names) + codes, -1)
+        self._table = None
+        self._lock = threading.Lock()
+
+    def table(self):
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    self._table = TrendTable._build(self.store, self.doc_keys, self.group_names)
+        return self._table
+
+    def table_for(self, positions):
+        """스냅샷 행 번호 목록의 집계표 (통째로 포함된 (일, 그룹) 은 스냅샷 집계에서 골라 오고,
+        일부만 포함된 (일, 그룹) 만 새로 집계, 쓸 수 없으면 None)"""
+        positions = np.asarray(positions, dtype=np.int64)
+        # 토큰이 없는 행(등록 저장소의 빈 문서)이나 중복 행은 날짜를 알 수 없거나 두 번 세므로 제외
+        if (positions >= len(self.doc_keys)).any() or len(np.unique(positions)) != len(positions):
+            return None
+        doc_keys = self.doc_keys[positions]
+        keys, counts = np.unique(doc_keys[doc_keys >= 0], return_counts=True)
+        table = self.table()
+        full = keys[table.total_documents[np.searchsorted(table.total_keys, keys)] == counts]
+        partial = positions[(doc_keys >= 0) & ~np.isin(doc_keys, full)]
+        result = table.select(full)
+        if len(partial):
+            rest = TrendTable._build(self.store.subset(partial), self.doc_keys[partial], self.group_names)
+            result = TrendTable.concat([result, rest])
+        return result
+
+
+def trend_table(data, date_column, column='tokens', group_column=None):
+    """DataFrame 행의 키워드 추이 집계표
+
+    문서 캐시에서 온 행이면 캐시 스냅샷 집계표에서 해당 (일, 그룹) 부분을 골라 오고,
+    아니면 행의 토큰으로 새로 집계한다.
+
+    Args:
+        data (DataFrame): 문서 데이터
+        date_column (str): 날짜 컬럼
+        column (str): 토큰 리스트 컬럼
+        group_column (str): 그룹 컬럼 (매거진 이름 등, 그룹별로 자를 때 필요)
+    """
+    if data is None or data.empty or column not in data.columns:
+        return TrendTable.from_store(token_store(None), [])
+    try:
+        located = registered_rows(data, column)
+        source = located[3] if located is not None else None
+        if isinstance(source, TrendSource) and group_column in (None, source.group_column):
+            table = source.table_for(located[2])
+            if table is not None:
+                return table
+    except Exception as e:
+        logger.error(f"문서 캐시 집계표 조회 오류: {e}")
+    groups = data[group_column] if group_column else None
+    return TrendTable.from_store(token_store(data, column), data[date_column], groups)
@@ -1,9 +1,12 @@
 # app/__init__.py
+import os
 from flask import Flask
 from flask_cors import CORS
 from flask_migrate import Migrate
 from .services.ocr_service import OCRProcessor
-from .models import db, init_db  # 모델 모듈 임포트
+from .models import db, init_db, init_document_sequences, init_item_sizes, init_comparison_stats, init_comparison_blobs, init_shipping_dates, ensure_tables, Invoice, Order  # 모델 모듈 임포트
+from .services.auto_match import init_order_model_index
+from .jobs import job_queue
 
 # 전역 변수로 migrate 객체 선언
 migrate = Migrate()
@@ -22,19 +25,36 @@ def create_app():
     # 최대 업로드 파일 크기 설정 (16MB)
     app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
     
+    # 업로드 처리 작업 동시 실행 수 (OCR 작업 스레드 풀 크기)
+    app.config['OCR_JOB_WORKERS'] = int(os.environ.get('OCR_JOB_WORKERS', 2))
+    
     # 데이터베이스 초기화
     db.init_app(app)
     
     # 마이그레이션 설정 추가
     migrate.init_app(app, db)
     
+    # 시작 시 테이블/인덱스 준비 및 기존 데이터 이전
+    # (문서 ID 순번, 문서 목록 인덱스, 품목 사이즈, 선적일, 비교 결과 본문/인덱스, 비교 통계 집계, 오더 모델 코드 색인)
+    with app.app_context():
+        init_document_sequences()
+        ensure_tables(Invoice, Order)
+        init_item_sizes()
+        init_shipping_dates()
+        init_comparison_blobs()
+        init_comparison_stats()
+        init_order_model_index()
+    
     # 컨텍스트 내에서 데이터베이스 테이블 생성
     # 참고: 마이그레이션을 사용하므로 init_db() 호출은 주석 처리하거나 제거해도 됨
     # with app.app_context():
     #    init_db()
     
     # 라우트 블루프린트 등록
-    from .routes import orders_bp
+    from .routes import orders_bp, process_upload_job
     app.register_blueprint(orders_bp, url_prefix='/orders')
     
+    # 업로드 처리 작업 큐 설정
+    job_queue.init_app(app, process_upload_job)
+    
     return app
\ No newline at end of file
@@ -0,0 +1,170 @@
+# app/jobs.py
+import os
+import json
+import uuid
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from .models import db, ProcessingJob, ensure_tables, ensure_columns
+
+# 처리 단계별 진행률 (단계 시작 시점 기준)
+STAGE_PROGRESS = {
+    'queued': 0,
+    'rasterize': 10,
+    'ocr': 30,
+    'parse': 70,
+    'persist': 85,
+    'reconcile': 95,  # 인보이스만: 오더시트 자동 대조
+    'done': 100
+}
+
+class JobQueue:
+    """업로드 문서 처리 작업 큐
+
+    작업 상태는 SQLite(processing_jobs 테이블)에 저장되고, 실제 처리는 크기가 제한된 스레드 풀에서 실행된다.
+    서버가 재시작되면 끝나지 않은 작업(queued/running)을 다시 큐에 넣는다.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.handler = None
+        self.executor = None
+        self.max_workers = 0
+        self.logger = logging.getLogger(__name__)
+        self._recovered = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app, handler):
+        """Flask 앱에 작업 큐 연결
+
+        Args:
+            app: Flask 애플리케이션
+            handler: 작업 처리 함수 handler(job_id) - 앱 컨텍스트 안에서 호출됨
+        """
+        self.app = app
+        self.handler = handler
+        self.max_workers = app.config.get('OCR_JOB_WORKERS', 2)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ocr-job')
+
+        with app.app_context():
+            ensure_tables(ProcessingJob)
+            ensure_columns(ProcessingJob, {'trace': 'TEXT'})
+
+        # 개발 서버 리로더의 부모 프로세스에서 작업이 중복 실행되지 않도록 첫 요청 시점에 복구
+        app.before_request(self._recover_once)
+
+    def create_job(self, filename, filepath, doc_type, brand='', season=''):
+        """작업 레코드 생성 후 큐에 등록
+
+        Returns:
+            생성된 ProcessingJob
+        """
+        job = ProcessingJob(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            filepath=filepath,
+            doc_type=doc_type,
+            brand=brand,
+            season=season,
+            status='queued',
+            stage='queued',
+            progress=0
+        )
+        db.session.add(job)
+        db.session.commit()
+
+        self.submit(job.id)
+        return job
+
+    def submit(self, job_id):
+        """작업을 스레드 풀에 제출"""
+        self.executor.submit(self._run, job_id)
+
+    def update_stage(self, job_id, stage, progress=None):
+        """작업 진행 단계 갱신 (처리 스레드 어디서든 호출 가능)"""
+        with self.app.app_context():
+            job = db.session.get(ProcessingJob, job_id)
+            if not job:
+                return
+
+            stages = json.loads(job.stage_log) if job.stage_log else {}
+            stages.setdefault(stage, datetime.utcnow().isoformat())
+
+            job.stage = stage
+            job.stage_log = json.dumps(stages)
+            job.progress = progress if progress is not None else STAGE_PROGRESS.get(stage, job.progress)
+            db.session.commit()
+
+    def complete(self, job_id, document_id, result, trace=None):
+        """작업 완료 처리 (trace 가 있으면 단계별 소요 시간 요약도 저장)"""
+        self.update_stage(job_id, 'done')
+        self._finish(job_id, 'completed', document_id=document_id, result_data=json.dumps(result, default=str),
+                     trace=json.dumps(trace) if trace else None)
+
+    def fail(self, job_id, error, trace=None):
+        """작업 실패 처리"""
+        self._finish(job_id, 'failed', error=str(error), trace=json.dumps(trace) if trace else None)
+
+    def _finish(self, job_id, status, **fields):
+        with self.app.app_context():
+            job = db.session.get(ProcessingJob, job_id)
+            if not job:
+                return
+            job.status = status
+            job.finished_at = datetime.utcnow()
+            for key, value in fields.items():
+                setattr(job, key, value)
+            db.session.commit()
+
+    def _claim(self, job_id):
+        """queued 상태인 작업만 running 으로 전환 (중복 실행 방지)"""
+        claimed = ProcessingJob.query.filter_by(id=job_id, status='queued').update(
+            {'status': 'running', 'started_at': datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.session.commit()
+        return claimed == 1
+
+    def _run(self, job_id):
+        """스레드 풀에서 실행되는 작업 래퍼"""
+        with self.app.app_context():
+            try:
+                if not self._claim(job_id):
+                    return
+                self.handler(job_id)
+            except Exception as e:
+                db.session.rollback()
+                self.logger.error(f"작업 처리 중 오류 ({job_id}): {e}")
+                self.fail(job_id, f'문서 처리 중 오류: {str(e)}')
+            finally:
+                db.session.remove()
+
+    def _recover_once(self):
+        """재시작 전에 끝나지 않은 작업을 다시 큐에 등록 (최초 1회)"""
+        if self._recovered:
+            return
+        with self._lock:
+            if self._recovered:
+                return
+            self._recovered = True
+
+        pending = ProcessingJob.query.filter(ProcessingJob.status.in_(['queued', 'running'])).all()
+        for job in pending:
+            if not os.path.exists(job.filepath):
+                job.status = 'failed'
+                job.error = '업로드 파일을 찾을 수 없어 작업을 재개할 수 없습니다.'
+                job.finished_at = datetime.utcnow()
+                continue
+            job.status = 'queued'
+            job.stage = 'queued'
+            job.progress = 0
+        db.session.commit()
+
+        for job in pending:
+            if job.status == 'queued':
+                self.logger.info(f"미완료 작업 재등록: {job.id}")
+                self.submit(job.id)
+
+# 전역 작업 큐
+job_queue = JobQueue()
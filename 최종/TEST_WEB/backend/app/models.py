@@ -1,14 +1,23 @@
 # app/models.py
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
+import hashlib
 import json
 import sqlite3
+import zlib
 
 db = SQLAlchemy()
 
 class Invoice(db.Model):
     """인보이스 문서 모델"""
     __tablename__ = 'invoices'
+    __table_args__ = (
+        # 목록 최신 순 키셋 페이지, 브랜드/시즌 필터용
+        db.Index('ix_invoices_created', 'created_at', 'id'),
+        db.Index('ix_invoices_brand_created', 'brand', 'created_at', 'id'),
+        db.Index('ix_invoices_season_created', 'season', 'created_at', 'id'),
+    )
     
     id = db.Column(db.String(20), primary_key=True)  # 'invo_1', 'invo_2', ...
     filename = db.Column(db.String(255), nullable=False)
@@ -39,22 +48,37 @@ class InvoiceItem(db.Model):
     quantity = db.Column(db.Integer, default=0)  # 총 수량
     total_price = db.Column(db.String(50))  # 품목별 총액
     
-    # 사이즈별 수량
-    size_39 = db.Column(db.Integer, default=0)
-    size_40 = db.Column(db.Integer, default=0)
-    size_41 = db.Column(db.Integer, default=0)
-    size_42 = db.Column(db.Integer, default=0)
-    size_43 = db.Column(db.Integer, default=0)
-    size_44 = db.Column(db.Integer, default=0)
-    size_45 = db.Column(db.Integer, default=0)
-    size_46 = db.Column(db.Integer, default=0)
+    # 사이즈별 수량 (invoice_item_sizes, 사이즈 체계 제한 없음)
+    sizes = db.relationship('InvoiceItemSize', backref='item', lazy=True, cascade="all, delete-orphan")
+    
+    @property
+    def size_quantities(self):
+        """사이즈 → 수량 딕셔너리"""
+        return {size.size: size.quantity for size in self.sizes}
     
     def __repr__(self):
         return f'<InvoiceItem {self.model_code}>'
 
+class InvoiceItemSize(db.Model):
+    """인보이스 품목의 사이즈별 수량 (수량이 있는 사이즈만 저장)"""
+    __tablename__ = 'invoice_item_sizes'
+    
+    item_id = db.Column(db.Integer, db.ForeignKey('invoice_items.id'), primary_key=True)
+    size = db.Column(db.String(10), primary_key=True)  # '39', '44', 'M', 'XL' ...
+    quantity = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<InvoiceItemSize {self.item_id}:{self.size}={self.quantity}>'
+
 class Order(db.Model):
     """오더시트 문서 모델"""
     __tablename__ = 'orders'
+    __table_args__ = (
+        # 목록 최신 순 키셋 페이지, 브랜드/시즌 필터용
+        db.Index('ix_orders_created', 'created_at', 'id'),
+        db.Index('ix_orders_brand_created', 'brand', 'created_at', 'id'),
+        db.Index('ix_orders_season_created', 'season', 'created_at', 'id'),
+    )
     
     id = db.Column(db.String(20), primary_key=True)  # 'order_1', 'order_2', ...
     filename = db.Column(db.String(255), nullable=False)
@@ -74,6 +98,11 @@ class Order(db.Model):
 class OrderItem(db.Model):
     """오더시트 품목 모델"""
     __tablename__ = 'order_items'
+    __table_args__ = (
+        # 캘린더 기간 조회용
+        db.Index('ix_order_items_shipping_start_date', 'shipping_start_date'),
+        db.Index('ix_order_items_shipping_end_date', 'shipping_end_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     order_id = db.Column(db.String(20), db.ForeignKey('orders.id'), nullable=False)
@@ -85,24 +114,44 @@ class OrderItem(db.Model):
     total_price = db.Column(db.String(50))  # 품목별 총액
     shipping_start = db.Column(db.String(50))  # 선적 시작일
     shipping_end = db.Column(db.String(50))  # 선적 완료일
+    shipping_start_date = db.Column(db.Date)  # 선적 시작일 (저장 시 파싱, 형식을 알 수 없으면 NULL)
+    shipping_end_date = db.Column(db.Date)  # 선적 완료일 (저장 시 파싱, 형식을 알 수 없으면 NULL)
+    
+    # 사이즈별 수량 (order_item_sizes, 사이즈 체계 제한 없음)
+    sizes = db.relationship('OrderItemSize', backref='item', lazy=True, cascade="all, delete-orphan")
     
-    # 사이즈별 수량
-    size_39 = db.Column(db.Integer, default=0)
-    size_40 = db.Column(db.Integer, default=0)
-    size_41 = db.Column(db.Integer, default=0)
-    size_42 = db.Column(db.Integer, default=0)
-    size_43 = db.Column(db.Integer, default=0)
-    size_44 = db.Column(db.Integer, default=0)
-    size_45 = db.Column(db.Integer, default=0)
-    size_46 = db.Column(db.Integer, default=0)
+    @property
+    def size_quantities(self):
+        """사이즈 → 수량 딕셔너리"""
+        return {size.size: size.quantity for size in self.sizes}
     
     def __repr__(self):
         return f'<OrderItem {self.model_code}>'
 
+class OrderItemSize(db.Model):
+    """오더시트 품목의 사이즈별 수량 (수량이 있는 사이즈만 저장)"""
+    __tablename__ = 'order_item_sizes'
+    
+    item_id = db.Column(db.Integer, db.ForeignKey('order_items.id'), primary_key=True)
+    size = db.Column(db.String(10), primary_key=True)
+    quantity = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<OrderItemSize {self.item_id}:{self.size}={self.quantity}>'
+
 # 문서 비교 결과 모델
 class DocumentComparison(db.Model):
     """문서 비교 결과 모델"""
     __tablename__ = 'document_comparisons'
+    __table_args__ = (
+        # 비교 이력(최신 순 키셋 페이지/건수), 문서별 비교 결과 조회용
+        db.Index('ix_document_comparisons_manual_date', 'manually_compared', 'comparison_date'),
+        db.Index('ix_document_comparisons_doc1_date', 'document1_id', 'comparison_date'),
+        db.Index('ix_document_comparisons_doc2_date', 'document2_id', 'comparison_date'),
+        # 재비교 캐시 조회, 본문 참조 확인용
+        db.Index('ix_document_comparisons_pair_hash', 'document1_id', 'document2_id', 'items_hash'),
+        db.Index('ix_document_comparisons_blob', 'blob_digest'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     document1_id = db.Column(db.String(20), nullable=False)
@@ -118,8 +167,13 @@ class DocumentComparison(db.Model):
     brand = db.Column(db.String(100))                       # 브랜드 정보
     season = db.Column(db.String(50))                       # 시즌 정보
     
-    # JSON 형태로 저장된 상세 비교 결과
-    comparison_data = db.Column(db.Text)  
+    # 상세 비교 결과는 comparison_blobs 에 압축해 내용 해시로 한 번만 저장 (접근할 때 조회)
+    blob_digest = db.Column(db.String(64), db.ForeignKey('comparison_blobs.digest'))
+    blob = db.relationship('ComparisonBlob', lazy='select')
+    items_hash = db.Column(db.String(64))  # 비교 입력(두 문서 품목) 지문, 재비교 캐시 키
+    
+    # 예전 JSON 직접 저장 컬럼 (시작 시 comparison_blobs 로 이전 후 비움, 기본 조회에서 제외)
+    legacy_data = db.deferred(db.Column('comparison_data', db.Text))
     comparison_date = db.Column(db.DateTime, default=datetime.utcnow)
 
     # 새로 추가된 필드
@@ -129,6 +183,13 @@ class DocumentComparison(db.Model):
     def __repr__(self):
         return f'<DocumentComparison {self.document1_id} vs {self.document2_id} ({self.match_percentage}%)>'
     
+    @property
+    def comparison_data(self):
+        """상세 비교 결과 JSON 문자열 (본문 테이블 또는 이전 컬럼)"""
+        if self.blob is not None:
+            return self.blob.text()
+        return self.legacy_data
+    
     def to_dict(self):
         """모델을 딕셔너리로 변환"""
         return {
@@ -147,6 +208,57 @@ class DocumentComparison(db.Model):
             'comparison_data': json.loads(self.comparison_data) if self.comparison_data else None
         }
 
+# 비교 결과 본문 모델
+class ComparisonBlob(db.Model):
+    """비교 결과 상세 JSON 을 zlib 압축해 저장 (내용 sha256 이 키, 같은 결과는 한 행을 공유)"""
+    __tablename__ = 'comparison_blobs'
+    
+    digest = db.Column(db.String(64), primary_key=True)  # 원본 JSON sha256
+    data = db.Column(db.LargeBinary, nullable=False)     # zlib 압축 JSON
+    raw_size = db.Column(db.Integer, default=0)          # 압축 전 바이트 수
+    
+    def __repr__(self):
+        return f'<ComparisonBlob {self.digest[:12]} ({len(self.data)}/{self.raw_size} bytes)>'
+    
+    def text(self):
+        """압축을 푼 JSON 문자열"""
+        return zlib.decompress(self.data).decode('utf-8')
+    
+    def payload(self):
+        """압축을 푼 비교 결과 딕셔너리"""
+        return json.loads(self.text())
+
+# 낮은 일치율 기준 (%)
+LOW_MATCH_THRESHOLD = 80
+
+# 비교 통계 일별 집계 모델
+class ComparisonDailyStat(db.Model):
+    """수동 비교 결과의 일별/브랜드별 집계 (비교 결과 저장 시 함께 갱신)"""
+    __tablename__ = 'comparison_daily_stats'
+    
+    day = db.Column(db.Date, primary_key=True)                      # 비교 일자 (UTC)
+    brand = db.Column(db.String(100), primary_key=True, default='')  # 브랜드 (없으면 빈 문자열)
+    comparison_count = db.Column(db.Integer, nullable=False, default=0)  # 비교 건수
+    match_sum = db.Column(db.Float, nullable=False, default=0)           # 일치율 합계 (평균 = 합계 / 건수)
+    low_match_count = db.Column(db.Integer, nullable=False, default=0)   # 일치율 80% 미만 건수
+    
+    def __repr__(self):
+        return f'<ComparisonDailyStat {self.day} {self.brand} ({self.comparison_count})>'
+
+# 오더시트 모델 코드 역색인 모델 (자동 대조 후보 검색)
+class OrderModelKey(db.Model):
+    """정규화한 모델 코드 → 오더시트 ID 역색인"""
+    __tablename__ = 'order_model_keys'
+    __table_args__ = (
+        db.Index('ix_order_model_keys_order', 'order_id'),
+    )
+    
+    model_key = db.Column(db.String(100), primary_key=True)  # 모델 코드 키 (OCR 혼동 문자 대표 문자로 통일)
+    order_id = db.Column(db.String(20), db.ForeignKey('orders.id'), primary_key=True)
+    
+    def __repr__(self):
+        return f'<OrderModelKey {self.model_key} -> {self.order_id}>'
+
 # 캘린더 일정 모델 (추가)
 class ShippingSchedule(db.Model):
     """선적 일정 모델"""
@@ -240,7 +352,407 @@ class PersonalEvent(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+# 업로드 처리 작업 모델 (비동기 처리 큐)
+class ProcessingJob(db.Model):
+    """문서 업로드 처리 작업 모델"""
+    __tablename__ = 'processing_jobs'
+    
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    filename = db.Column(db.String(255), nullable=False)  # 원본(보안 처리된) 파일명
+    filepath = db.Column(db.String(512), nullable=False)  # 저장된 업로드 파일 경로
+    doc_type = db.Column(db.String(20), nullable=False)  # invoice 또는 order
+    brand = db.Column(db.String(100))
+    season = db.Column(db.String(50))
+    
+    status = db.Column(db.String(20), default='queued', index=True)  # queued, running, completed, failed
+    stage = db.Column(db.String(20), default='queued')  # queued, rasterize, ocr, parse, persist, done
+    progress = db.Column(db.Integer, default=0)  # 진행률 (0-100)
+    stage_log = db.Column(db.Text)  # 단계별 시작 시각 (JSON)
+    
+    document_id = db.Column(db.String(20))  # 처리 완료 후 생성된 문서 ID
+    result_data = db.Column(db.Text)  # 처리 결과 응답 (JSON)
+    error = db.Column(db.Text)  # 실패 사유
+    trace = db.Column(db.Text)  # 단계별 소요 시간 요약 (JSON, OCR_JOB_TRACE 설정 시)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ProcessingJob {self.id} ({self.status}/{self.stage})>'
+    
+    def to_dict(self):
+        """모델을 딕셔너리로 변환"""
+        return {
+            'job_id': self.id,
+            'filename': self.filename,
+            'doc_type': self.doc_type,
+            'brand': self.brand,
+            'season': self.season,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': self.progress,
+            'stages': json.loads(self.stage_log) if self.stage_log else {},
+            'document_id': self.document_id,
+            'result': json.loads(self.result_data) if self.result_data else None,
+            'error': self.error,
+            'trace': json.loads(self.trace) if self.trace else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
 # init_db 함수 업데이트
 def init_db():
     """데이터베이스 테이블 초기화"""
-    db.create_all()
\ No newline at end of file
+    db.create_all()
+
+def ensure_tables(*models):
+    """지정한 모델의 테이블이 없으면 생성 (기존 테이블에는 선언된 인덱스 중 없는 것만 추가)"""
+    for model in models:
+        model.__table__.create(bind=db.engine, checkfirst=True)
+        for index in model.__table__.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+
+def ensure_columns(model, columns):
+    """기존 테이블에 없는 컬럼을 ALTER TABLE 로 추가 (테이블이 없으면 아무 것도 하지 않음)
+    
+    Args:
+        model: 대상 모델
+        columns: {컬럼명: 컬럼 정의 DDL}
+    """
+    inspector = db.inspect(db.engine)
+    if not inspector.has_table(model.__tablename__):
+        return
+    
+    existing = {column['name'] for column in inspector.get_columns(model.__tablename__)}
+    with db.engine.begin() as connection:
+        for name, ddl in columns.items():
+            if name not in existing:
+                connection.execute(db.text(f"ALTER TABLE {model.__tablename__} ADD COLUMN {name} {ddl}"))
+
+# 문서 ID 순번 모델
+class DocumentSequence(db.Model):
+    """문서 ID 순번 카운터 ('invo_N', 'order_N' 의 N)"""
+    __tablename__ = 'document_sequences'
+    
+    name = db.Column(db.String(20), primary_key=True)  # invoice 또는 order
+    value = db.Column(db.Integer, nullable=False, default=0)  # 마지막으로 발급한 번호
+    
+    def __repr__(self):
+        return f'<DocumentSequence {self.name}={self.value}>'
+
+# 문서 유형별 ID 접두어와 모델
+DOCUMENT_ID_PREFIXES = {
+    'invoice': ('invo_', Invoice),
+    'order': ('order_', Order)
+}
+
+def init_document_sequences():
+    """문서 ID 순번 테이블 생성 및 기존 문서의 최대 번호 반영 (기존 데이터 마이그레이션)
+    
+    순번이 기존 문서 번호보다 작으면(최초 실행, DB 복원 등) 기존 최대 번호로 올린다.
+    """
+    ensure_tables(DocumentSequence)
+    inspector = db.inspect(db.engine)
+    
+    for name, (prefix, model) in DOCUMENT_ID_PREFIXES.items():
+        current_max = 0
+        if inspector.has_table(model.__tablename__):
+            # 'invo_9' < 'invo_10' 이 되도록 숫자 부분을 정수로 비교
+            number = db.cast(db.func.substr(model.id, len(prefix) + 1), db.Integer)
+            current_max = db.session.query(db.func.max(number)).filter(
+                model.id.startswith(prefix, autoescape=True)
+            ).scalar() or 0
+        
+        sequence = db.session.get(DocumentSequence, name)
+        if sequence is None:
+            db.session.add(DocumentSequence(name=name, value=current_max))
+        elif sequence.value < current_max:
+            sequence.value = current_max
+    
+    db.session.commit()
+
+def next_document_id(doc_type):
+    """새 문서 ID 발급 ('invo_N' / 'order_N')
+    
+    순번 행을 UPDATE 로 증가시킨 뒤 같은 트랜잭션에서 읽으므로, SQLite 쓰기 잠금에 의해 동시 업로드도
+    서로 다른 번호를 받는다. 번호는 호출한 트랜잭션이 커밋될 때 확정되고 롤백되면 다시 사용된다.
+    """
+    prefix, _ = DOCUMENT_ID_PREFIXES[doc_type]
+    db.session.execute(
+        db.update(DocumentSequence)
+        .where(DocumentSequence.name == doc_type)
+        .values(value=DocumentSequence.value + 1)
+    )
+    value = db.session.execute(
+        db.select(DocumentSequence.value).where(DocumentSequence.name == doc_type)
+    ).scalar_one()
+    return f"{prefix}{value}"
+
+# 문서 유형별 (문서, 품목, 사이즈 모델, 품목의 문서 FK 컬럼명)
+ITEM_MODELS = {
+    'invoice': (Invoice, InvoiceItem, InvoiceItemSize, 'invoice_id'),
+    'order': (Order, OrderItem, OrderItemSize, 'order_id')
+}
+
+# 기존 고정 사이즈 컬럼 (size_39 ~ size_46)
+LEGACY_SIZE_LABELS = [str(size) for size in range(39, 47)]
+
+def init_item_sizes():
+    """사이즈 테이블 생성 및 기존 size_39 ~ size_46 컬럼 값 이전 (최초 1회)
+    
+    사이즈 테이블이 비어 있고 품목 테이블에 예전 컬럼이 남아 있으면 INSERT ... SELECT 한 번으로 옮긴다.
+    """
+    inspector = db.inspect(db.engine)
+    size_models = [size_model for _, _, size_model, _ in ITEM_MODELS.values()]
+    existing = {model: inspector.has_table(model.__tablename__) for model in size_models}
+    
+    # 테이블 생성(DDL)은 이전용 INSERT 트랜잭션보다 먼저 끝내야 SQLite 잠금이 겹치지 않는다
+    ensure_tables(*size_models)
+    
+    for _, item_model, size_model, _ in ITEM_MODELS.values():
+        size_table_exists = existing[size_model]
+        item_table = item_model.__tablename__
+        if not inspector.has_table(item_table):
+            continue
+        
+        columns = {column['name'] for column in inspector.get_columns(item_table)}
+        legacy_columns = [label for label in LEGACY_SIZE_LABELS if f'size_{label}' in columns]
+        if not legacy_columns:
+            continue
+        if size_table_exists and db.session.query(size_model.item_id).first() is not None:
+            continue
+        
+        selects = " UNION ALL ".join(
+            f"SELECT id, '{label}', size_{label} FROM {item_table} WHERE size_{label} > 0"
+            for label in legacy_columns
+        )
+        db.session.execute(db.text(
+            f"INSERT INTO {size_model.__tablename__} (item_id, size, quantity) {selects}"
+        ))
+    
+    db.session.commit()
+
+def bulk_insert_items(doc_type, item_rows, size_rows):
+    """품목과 사이즈별 수량을 executemany 로 일괄 저장 (호출한 트랜잭션 안에서 실행, 커밋은 호출 측)
+    
+    Args:
+        doc_type: 'invoice' 또는 'order'
+        item_rows: 품목 insert 매핑 목록
+        size_rows: {'row': 품목 순번, 'size', 'quantity'} 목록
+    
+    next_document_id 가 같은 트랜잭션에서 쓰기 잠금을 잡은 뒤 호출되므로 다른 업로드가 끼어들 수 없어,
+    품목 ID를 미리 배정하고 사이즈 행을 바로 연결한다.
+    """
+    if not item_rows:
+        return
+    
+    _, item_model, size_model, _ = ITEM_MODELS[doc_type]
+    first_id = (db.session.query(db.func.max(item_model.id)).scalar() or 0) + 1
+    for offset, row in enumerate(item_rows):
+        row['id'] = first_id + offset
+    
+    db.session.bulk_insert_mappings(item_model, item_rows)
+    db.session.bulk_insert_mappings(size_model, [
+        {'item_id': first_id + size_row['row'], 'size': size_row['size'], 'quantity': size_row['quantity']}
+        for size_row in size_rows
+    ])
+
+def load_item_sizes(doc_type, item_ids):
+    """여러 품목의 사이즈별 수량을 한 번의 쿼리로 조회
+    
+    Returns:
+        {품목 ID: {사이즈: 수량}}
+    """
+    _, _, size_model, _ = ITEM_MODELS[doc_type]
+    result = {item_id: {} for item_id in item_ids}
+    if not result:
+        return result
+    
+    rows = db.session.query(size_model.item_id, size_model.size, size_model.quantity)\
+                     .filter(size_model.item_id.in_(list(result))).all()
+    for item_id, size, quantity in rows:
+        result[item_id][size] = quantity
+    return result
+
+def load_document_items(doc_type, document_id):
+    """문서 품목과 사이즈별 수량을 비교용 행 목록으로 조회 (쿼리 2회)
+    
+    Returns:
+        (품목 행 목록 (id, model_code, model_name, color, quantity, wholesale_price, total_price),
+         사이즈 행 목록 (item_id, size, quantity))
+    """
+    _, item_model, size_model, parent_field = ITEM_MODELS[doc_type]
+    parent_filter = getattr(item_model, parent_field) == document_id
+    
+    items = db.session.query(item_model.id, item_model.model_code, item_model.model_name, item_model.color,
+                             item_model.quantity, item_model.wholesale_price, item_model.total_price)\
+                      .filter(parent_filter).order_by(item_model.id).all()
+    size_rows = db.session.query(size_model.item_id, size_model.size, size_model.quantity)\
+                          .join(item_model, item_model.id == size_model.item_id)\
+                          .filter(parent_filter).all()
+    return [tuple(row) for row in items], [tuple(row) for row in size_rows]
+
+def document_size_totals(doc_type, document_id):
+    """문서 전체의 사이즈별 합계 수량 (SQL 집계)
+    
+    Returns:
+        {사이즈: 합계 수량}
+    """
+    _, item_model, size_model, parent_field = ITEM_MODELS[doc_type]
+    rows = db.session.query(size_model.size, db.func.sum(size_model.quantity))\
+                     .join(item_model, item_model.id == size_model.item_id)\
+                     .filter(getattr(item_model, parent_field) == document_id)\
+                     .group_by(size_model.size).all()
+    return {size: int(total or 0) for size, total in rows}
+
+def record_comparison_stat(comparison):
+    """비교 결과 한 건을 일별 집계에 반영 (호출한 트랜잭션 안에서 실행, 커밋은 호출 측)
+    
+    수동 비교 결과만 집계하며, (일자, 브랜드) 행이 없으면 만들고 있으면 누적한다.
+    """
+    if not comparison.manually_compared:
+        return
+    
+    compared_at = comparison.comparison_date or datetime.utcnow()
+    comparison.comparison_date = compared_at
+    low_match = 1 if comparison.match_percentage < LOW_MATCH_THRESHOLD else 0
+    
+    table = ComparisonDailyStat.__table__
+    statement = sqlite_insert(table).values(
+        day=compared_at.date(),
+        brand=comparison.brand or '',
+        comparison_count=1,
+        match_sum=comparison.match_percentage,
+        low_match_count=low_match
+    )
+    db.session.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.day, table.c.brand],
+        set_={
+            'comparison_count': table.c.comparison_count + 1,
+            'match_sum': table.c.match_sum + statement.excluded.match_sum,
+            'low_match_count': table.c.low_match_count + statement.excluded.low_match_count
+        }
+    ))
+
+def init_comparison_stats():
+    """일별 집계 테이블 생성 및 기존 비교 결과로 채우기 (집계가 비어 있을 때 1회)"""
+    ensure_tables(ComparisonDailyStat)
+    
+    if db.session.query(ComparisonDailyStat.day).first() is not None:
+        return
+    
+    db.session.execute(db.text(f"""
+        INSERT INTO comparison_daily_stats (day, brand, comparison_count, match_sum, low_match_count)
+        SELECT date(comparison_date), COALESCE(brand, ''), COUNT(*), SUM(match_percentage),
+               SUM(CASE WHEN match_percentage < {LOW_MATCH_THRESHOLD} THEN 1 ELSE 0 END)
+        FROM document_comparisons
+        WHERE manually_compared = 1 AND comparison_date IS NOT NULL
+        GROUP BY date(comparison_date), COALESCE(brand, '')
+    """))
+    db.session.commit()
+
+def store_comparison_blob(payload):
+    """비교 결과 본문을 압축 저장하고 내용 해시 반환 (호출한 트랜잭션 안에서 실행, 커밋은 호출 측)
+    
+    같은 내용의 본문이 이미 있으면 새로 쓰지 않고 그 해시를 그대로 돌려준다.
+    """
+    text = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    raw = text.encode('utf-8')
+    digest = hashlib.sha256(raw).hexdigest()
+    
+    db.session.execute(sqlite_insert(ComparisonBlob.__table__).values(
+        digest=digest,
+        data=zlib.compress(raw, 6),
+        raw_size=len(raw)
+    ).on_conflict_do_nothing(index_elements=['digest']))
+    return digest
+
+def find_cached_comparison(document1_id, document2_id, items_hash):
+    """같은 문서 쌍을 같은 입력(품목 지문)으로 비교한 최근 결과 (없으면 None)"""
+    return DocumentComparison.query.filter(
+        DocumentComparison.document1_id == document1_id,
+        DocumentComparison.document2_id == document2_id,
+        DocumentComparison.items_hash == items_hash,
+        DocumentComparison.blob_digest.isnot(None)
+    ).order_by(DocumentComparison.id.desc()).first()
+
+def prune_comparison_blobs(digests):
+    """더 이상 어떤 비교 결과도 참조하지 않는 본문 삭제 (커밋은 호출 측)"""
+    digests = [digest for digest in set(digests) if digest]
+    if not digests:
+        return
+    
+    referenced = db.session.query(DocumentComparison.id)\
+                           .filter(DocumentComparison.blob_digest == ComparisonBlob.digest)
+    db.session.query(ComparisonBlob)\
+              .filter(ComparisonBlob.digest.in_(digests), ~referenced.exists())\
+              .delete(synchronize_session=False)
+
+# 비교 결과 테이블에 추가된 컬럼 (기존 DB 는 ALTER TABLE 로 추가)
+COMPARISON_ADDED_COLUMNS = {
+    'blob_digest': 'VARCHAR(64) REFERENCES comparison_blobs (digest)',
+    'items_hash': 'VARCHAR(64)'
+}
+
+def init_comparison_blobs(batch_size=500):
+    """비교 결과 본문 테이블 준비 및 comparison_data 에 직접 저장된 JSON 이전 (이전할 행이 있을 때만)
+    
+    컬럼 추가(DDL)와 인덱스 생성을 먼저 끝낸 뒤, 기존 JSON 을 압축 본문으로 옮기고 원래 컬럼은 비운다.
+    """
+    ensure_tables(ComparisonBlob)
+    ensure_columns(DocumentComparison, COMPARISON_ADDED_COLUMNS)
+    ensure_tables(DocumentComparison)
+    
+    pending = db.session.query(DocumentComparison.id, DocumentComparison.legacy_data).filter(
+        DocumentComparison.legacy_data.isnot(None),
+        DocumentComparison.blob_digest.is_(None)
+    ).all()
+    
+    for start in range(0, len(pending), batch_size):
+        updates = []
+        for comparison_id, text in pending[start:start + batch_size]:
+            try:
+                payload = json.loads(text)
+            except ValueError:
+                continue  # 읽을 수 없는 JSON 은 원래 컬럼에 그대로 둔다
+            updates.append({'id': comparison_id, 'blob_digest': store_comparison_blob(payload), 'legacy_data': None})
+        db.session.bulk_update_mappings(DocumentComparison, updates)
+        db.session.commit()
+
+# 선적일 텍스트 컬럼 → 날짜 컬럼
+SHIPPING_DATE_COLUMNS = {
+    'shipping_start': 'shipping_start_date',
+    'shipping_end': 'shipping_end_date'
+}
+
+def init_shipping_dates():
+    """오더 품목 선적일 날짜 컬럼/인덱스 준비 및 기존 텍스트 선적일 파싱 (날짜가 비어 있는 행만)
+    
+    서로 다른 텍스트 값마다 한 번만 파싱해 같은 값의 행을 executemany UPDATE 로 채운다.
+    """
+    from .services.item_records import parse_date_string
+    
+    ensure_columns(OrderItem, {date_column: 'DATE' for date_column in SHIPPING_DATE_COLUMNS.values()})
+    ensure_tables(OrderItem)
+    
+    table = OrderItem.__table__
+    for text_column, date_column in SHIPPING_DATE_COLUMNS.items():
+        values = db.session.execute(
+            db.select(table.c[text_column]).distinct()
+            .where(table.c[date_column].is_(None), table.c[text_column].isnot(None), table.c[text_column] != '')
+        ).scalars().all()
+        
+        updates = [{'text': value, 'parsed': parsed} for value in values
+                   if (parsed := parse_date_string(value)) is not None]
+        if updates:
+            db.session.execute(
+                table.update()
+                .where(table.c[text_column] == db.bindparam('text'), table.c[date_column].is_(None))
+                .values({date_column: db.bindparam('parsed')}),
+                updates
+            )
+    
+    db.session.commit()
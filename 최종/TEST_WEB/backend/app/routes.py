@@ -3,23 +3,101 @@ import os
 import logging
 import json
 import re
+import hashlib
+import tempfile
+import uuid
 from datetime import datetime, timedelta, date
-from flask import Blueprint, request, jsonify, send_file, Flask
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context, Flask
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 from .services.ocr_service import OCRProcessor
-from .models import db, Invoice, InvoiceItem, Order, OrderItem, DocumentComparison, ShippingSchedule, PersonalEvent
+from .services.ocr_cache import OCRResultCache
+from .services.page_registration import PageRegistrar
+from .services.ocr_engines import build_engines
+from .services.metrics import registry, span, tracing
+from .services.result_export import ResultStore, EXPORT_MIMETYPES, csv_chunks, write_xlsx
+from .services.document_export import SHEET_TITLES, document_export_rows
+from .services.item_records import build_item_rows, parse_date_string
+from .services.reconciliation import item_table, items_fingerprint, reconcile
+from .services.fuzzy_match import FuzzyMatcher
+from .services.auto_match import AutoReconciler, index_order_items
+from .models import db, Invoice, InvoiceItem, Order, OrderItem, DocumentComparison, ShippingSchedule, PersonalEvent, ProcessingJob, next_document_id
+from .models import ComparisonDailyStat, record_comparison_stat, store_comparison_blob, find_cached_comparison
+from .models import LEGACY_SIZE_LABELS, bulk_insert_items, load_item_sizes, load_document_items, document_size_totals
+from .jobs import job_queue
 
 # 라우트 블루프린트 생성
 orders_bp = Blueprint('orders', __name__)
 CORS(orders_bp) # 블루프린트에 CORS 적용
 
-# 서비스 초기화
-ocr_processor = OCRProcessor()
-
 # 파일 업로드 설정
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'temporary')
 PROCESSED_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'processed')
+OCR_CACHE_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'ocr_cache')
+RESULTS_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'results')
+
+# 서비스 초기화 (같은 PDF 재업로드 시 OCR 결과 재사용, 캐시 용량 기본 512MB)
+ocr_result_cache = OCRResultCache(
+    OCR_CACHE_FOLDER,
+    max_bytes=int(os.environ.get('OCR_CACHE_MAX_MB', 512)) * 1024 * 1024
+)
+# 처리 결과는 컬럼 파일로만 저장하고 엑셀/CSV 는 첫 다운로드 때 만들어 processed 폴더에 캐시
+result_store = ResultStore(RESULTS_FOLDER, PROCESSED_FOLDER)
+# OCR 엔진 구성 (OCR_ENGINE=vision|tesseract|fake, OCR_FIELD_ENGINES 예: 'digits=tesseract_digits,text=vision')
+# 로컬 엔진은 OCR_ENGINE_POOL_WORKERS 개의 워커 프로세스에 미리 띄워 재사용 (0 이면 요청 스레드에서 실행)
+# fake 엔진(오프라인 실행)은 OCR_FAKE_FIXTURE 의 페이지/단어 fixture 를 사용
+ocr_engine, ocr_field_engines = build_engines(
+    os.environ.get('OCR_ENGINE', 'vision'),
+    os.environ.get('OCR_FIELD_ENGINES', ''),
+    pool_workers=int(os.environ.get('OCR_ENGINE_POOL_WORKERS', 2)),
+    engine_options={'fake': {'fixture': os.environ.get('OCR_FAKE_FIXTURE')}}
+)
+# 문서당 동시에 처리하는 페이지 수 (작업 큐 동시 실행 수와 곱한 만큼 페이지가 메모리에 올라감)
+# 기울어지거나 여백이 밀린 스캔은 템플릿 기준 페이지에 맞춰 영역을 자름 (OCR_PAGE_REGISTRATION=0 이면 선형 스케일링만)
+ocr_processor = OCRProcessor(
+    result_cache=ocr_result_cache,
+    page_workers=int(os.environ.get('OCR_PAGE_WORKERS', 2)),
+    result_store=result_store,
+    page_registrar=PageRegistrar() if os.environ.get('OCR_PAGE_REGISTRATION', '1') != '0' else None,
+    engine=ocr_engine,
+    field_engines=ocr_field_engines
+)
+
+# 작업 레코드에 단계별 소요 시간 요약 저장 여부 (지표 히스토그램은 항상 누적)
+OCR_JOB_TRACE = os.environ.get('OCR_JOB_TRACE', '0') == '1'
+
+# 목록 API 한 페이지 최대 행 수 (limit 가 더 크면 이 값으로 제한, 나머지는 next_cursor 로 조회)
+MAX_PAGE_LIMIT = 500
+
+def _collect_ocr_metrics():
+    """요청 시점의 OCR 통계 (영역 조회/재시도, 페이지 정합, 엔진별 호출 수)"""
+    stats = ocr_processor.region_stats()
+    yield ('ocr_region_requests_total', 'counter', '템플릿 영역 조회 수', [({}, stats['region_requests'])])
+    yield ('ocr_region_retries_total', 'counter', '영역 확장 재시도 수', [({}, stats['region_retries'])])
+    if stats['registration']:
+        yield ('ocr_page_registration_total', 'counter', '페이지 정합 결과별 페이지 수',
+               [({'result': name}, value) for name, value in stats['registration'].items()])
+    yield ('ocr_engine_calls_total', 'counter', 'OCR 엔진 호출 수',
+           [({'engine': name}, calls) for name, calls in ocr_processor.engine_calls().items()])
+
+def _collect_job_metrics():
+    """상태별 처리 작업 수 (DB 조회)"""
+    counts = db.session.query(ProcessingJob.status, db.func.count(ProcessingJob.id))\
+        .group_by(ProcessingJob.status).all()
+    yield ('ocr_jobs', 'gauge', '상태별 문서 처리 작업 수', [({'status': status}, count) for status, count in counts])
+
+registry.add_collector(_collect_ocr_metrics)
+registry.add_collector(_collect_job_metrics)
+
+# 문서 비교 시 OCR 오인식(O/0, I/1, S/5 등)이 있는 모델 코드를 짝지을 최소 신뢰도
+product_matcher = FuzzyMatcher(min_confidence=float(os.environ.get('FUZZY_MATCH_MIN_CONFIDENCE', 0.9)))
+
+# 새 인보이스 ↔ 오더시트 자동 대조 (상위 결과를 manually_compared=False 로 저장)
+auto_reconciler = AutoReconciler(
+    matcher=product_matcher,
+    top_n=int(os.environ.get('AUTO_MATCH_TOP_N', 3)),
+    max_candidates=int(os.environ.get('AUTO_MATCH_MAX_CANDIDATES', 10))
+)
 
 # 폴더 생성 (존재하지 않는 경우)
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -32,47 +110,9 @@ def allowed_file(filename):
     """파일 확장자 검증"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-# 날짜 문자열을 date 객체로 변환하는 함수
-def parse_date_string(date_str):
-    """다양한 형식의 날짜 문자열을 date 객체로 변환"""
-    if not date_str or date_str.strip() == "":
-        return None
-    
-    date_str = date_str.strip()
-    
-    # MM/DD/YYYY 형식
-    try:
-        month, day, year = date_str.split('/')
-        return date(int(year), int(month), int(day))
-    except ValueError:
-        pass
-    
-    # DD-MM-YYYY 형식
-    try:
-        day, month, year = date_str.split('-')
-        return date(int(year), int(month), int(day))
-    except ValueError:
-        pass
-    
-    # YYYY-MM-DD 형식
-    try:
-        year, month, day = date_str.split('-')
-        return date(int(year), int(month), int(day))
-    except ValueError:
-        pass
-    
-    # 기타 형식은 datetime 파서로 시도
-    try:
-        dt = datetime.strptime(date_str, '%Y%m%d')
-        return dt.date()
-    except ValueError:
-        pass
-    
-    return None
-
 @orders_bp.route('/upload', methods=['POST'])
 def upload_document():
-    """문서 업로드 및 OCR 처리 엔드포인트"""
+    """문서 업로드 엔드포인트 - 처리 작업을 큐에 등록하고 작업 ID를 즉시 반환"""
     try:
         # 파일이 없는 경우 처리
         if 'file' not in request.files:
@@ -86,234 +126,31 @@ def upload_document():
         
         # 파일 확장자 검증
         if file and allowed_file(file.filename):
-            # 안전한 파일명 생성
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(UPLOAD_FOLDER, filename)
-            file.save(filepath)
-            
             # 문서 유형 정보 가져오기
             doc_type = request.form.get('docType', '')
             if not doc_type or doc_type not in ['invoice', 'order']:
                 return jsonify({'error': '올바른 문서 유형을 선택해주세요.'}), 400
             
-            # 처리 방식 결정
-            processing_method = "standard"
-            if doc_type == "invoice":
-                processing_method = "invoice_json"
-            elif doc_type == "order":
-                processing_method = "order_json"
+            # 안전한 파일명 생성 (동시 업로드 시 덮어쓰지 않도록 고유 접두사 추가)
+            filename = secure_filename(file.filename)
+            filepath = os.path.join(UPLOAD_FOLDER, f"{uuid.uuid4().hex[:12]}_{filename}")
+            file.save(filepath)
             
-            # OCR 처리
-            try:
-                # 선택된 방식으로 PDF 처리
-                df_result, output_excel = ocr_processor.process_pdf(
-                    filepath, 
-                    output_dir=PROCESSED_FOLDER,
-                    processing_method=processing_method,
-                    verbose=False
-                )
-                
-                if output_excel:
-                    # 브랜드와 시즌 정보 가져오기
-                    brand = request.form.get('brand', '자동 감지')
-                    season = request.form.get('season', '')
-                    
-                    # 총 수량 계산
-                    total_quantity = len(df_result) if not df_result.empty else 0
-                    
-                    # 문서 ID 생성 (prefix_number 형식)
-                    if doc_type == 'invoice':
-                        # 가장 큰 인보이스 ID 번호 가져오기
-                        latest_invoice = Invoice.query.order_by(db.func.substr(Invoice.id, 6).desc()).first()
-                        if latest_invoice and latest_invoice.id.startswith('invo_'):
-                            try:
-                                last_num = int(latest_invoice.id.split('_')[1])
-                                doc_id = f"invo_{last_num + 1}"
-                            except:
-                                doc_id = f"invo_1"
-                        else:
-                            doc_id = "invo_1"
-                        
-                        # 인보이스 레코드 생성
-                        invoice = Invoice(
-                            id=doc_id,
-                            filename=filename,
-                            brand=brand,
-                            season=season,
-                            total_amount="",  # 나중에 계산
-                            total_quantity=total_quantity,
-                            excel_filename=os.path.basename(output_excel)
-                        )
-                        db.session.add(invoice)
-                        
-                        # 품목 레코드 생성
-                        if not df_result.empty:
-                            total_amount_value = 0
-                            
-                            for _, row in df_result.iterrows():
-                                # 품목 정보 추출
-                                model_code = row.get('모델코드', row.get('model', ''))
-                                model_name = row.get('모델명', row.get('full_model', ''))
-                                color = row.get('컬러', row.get('color', ''))
-                                wholesale_price = row.get('구매가', row.get('wholesale_price', ''))
-                                retail_price = row.get('판매가', row.get('retail_price', ''))
-                                total_item_price = row.get('총_금액', row.get('total_price', ''))
-                                
-                                # 사이즈별 수량 추출
-                                size_39 = int(row.get('사이즈_39', row.get('size_39', 0)) or 0)
-                                size_40 = int(row.get('사이즈_40', row.get('size_40', 0)) or 0)
-                                size_41 = int(row.get('사이즈_41', row.get('size_41', 0)) or 0)
-                                size_42 = int(row.get('사이즈_42', row.get('size_42', 0)) or 0)
-                                size_43 = int(row.get('사이즈_43', row.get('size_43', 0)) or 0)
-                                size_44 = int(row.get('사이즈_44', row.get('size_44', 0)) or 0)
-                                size_45 = int(row.get('사이즈_45', row.get('size_45', 0)) or 0)
-                                size_46 = int(row.get('사이즈_46', row.get('size_46', 0)) or 0)
-                                
-                                # 총 수량 계산
-                                item_quantity = size_39 + size_40 + size_41 + size_42 + size_43 + size_44 + size_45 + size_46
-                                if not item_quantity and '총_수량' in row:
-                                    item_quantity = int(row['총_수량'])
-                                
-                                # 품목 레코드 생성
-                                item = InvoiceItem(
-                                    invoice_id=doc_id,
-                                    model_code=model_code,
-                                    model_name=model_name,
-                                    color=color,
-                                    wholesale_price=wholesale_price,
-                                    retail_price=retail_price,
-                                    quantity=item_quantity,
-                                    total_price=total_item_price,
-                                    size_39=size_39,
-                                    size_40=size_40,
-                                    size_41=size_41,
-                                    size_42=size_42,
-                                    size_43=size_43,
-                                    size_44=size_44,
-                                    size_45=size_45,
-                                    size_46=size_46
-                                )
-                                db.session.add(item)
-                                
-                                # 총액 계산
-                                try:
-                                    price_str = total_item_price.replace('EUR', '').replace('$', '').strip()
-                                    total_amount_value += float(price_str)
-                                except:
-                                    pass
-                            
-                            # 인보이스 총액 업데이트
-                            invoice.total_amount = f"EUR {total_amount_value:.2f}"
-                        
-                        # 변경사항 저장
-                        db.session.commit()
-                    
-                    else:  # 오더시트(order) 처리
-                        # 가장 큰 오더 ID 번호 가져오기
-                        latest_order = Order.query.order_by(db.func.substr(Order.id, 7).desc()).first()
-                        if latest_order and latest_order.id.startswith('order_'):
-                            try:
-                                last_num = int(latest_order.id.split('_')[1])
-                                doc_id = f"order_{last_num + 1}"
-                            except:
-                                doc_id = f"order_1"
-                        else:
-                            doc_id = "order_1"
-                        
-                        # 오더시트 레코드 생성
-                        order = Order(
-                            id=doc_id,
-                            filename=filename,
-                            brand=brand,
-                            season=season,
-                            total_amount="",  # 나중에 계산
-                            total_quantity=total_quantity,
-                            excel_filename=os.path.basename(output_excel)
-                        )
-                        db.session.add(order)
-                        
-                        # 품목 레코드 생성 및 선적 일정 추출
-                        if not df_result.empty:
-                            total_amount_value = 0
-                            
-                            for _, row in df_result.iterrows():
-                                # 품목 정보 추출
-                                model_code = row.get('모델코드', row.get('model', ''))
-                                model_name = row.get('모델명', row.get('full_model', ''))
-                                color = row.get('컬러', row.get('color', ''))
-                                wholesale_price = row.get('구매가', row.get('wholesale_price', ''))
-                                total_item_price = row.get('총_금액', row.get('total_price', ''))
-                                
-                                # 선적 일정 정보 추출
-                                shipping_start = row.get('선적_시작일', row.get('shipping_start', ''))
-                                shipping_end = row.get('선적_완료일', row.get('shipping_end', ''))
-                                
-                                # 사이즈별 수량 추출
-                                size_39 = int(row.get('사이즈_39', row.get('size_39', 0)) or 0)
-                                size_40 = int(row.get('사이즈_40', row.get('size_40', 0)) or 0)
-                                size_41 = int(row.get('사이즈_41', row.get('size_41', 0)) or 0)
-                                size_42 = int(row.get('사이즈_42', row.get('size_42', 0)) or 0)
-                                size_43 = int(row.get('사이즈_43', row.get('size_43', 0)) or 0)
-                                size_44 = int(row.get('사이즈_44', row.get('size_44', 0)) or 0)
-                                size_45 = int(row.get('사이즈_45', row.get('size_45', 0)) or 0)
-                                size_46 = int(row.get('사이즈_46', row.get('size_46', 0)) or 0)
-                                
-                                # 총 수량 계산
-                                item_quantity = size_39 + size_40 + size_41 + size_42 + size_43 + size_44 + size_45 + size_46
-                                if not item_quantity and '총_수량' in row:
-                                    item_quantity = int(row['총_수량'])
-                                
-                                # 품목 레코드 생성
-                                item = OrderItem(
-                                    order_id=doc_id,
-                                    model_code=model_code,
-                                    model_name=model_name,
-                                    color=color,
-                                    wholesale_price=wholesale_price,
-                                    quantity=item_quantity,
-                                    total_price=total_item_price,
-                                    shipping_start=shipping_start,
-                                    shipping_end=shipping_end,
-                                    size_39=size_39,
-                                    size_40=size_40,
-                                    size_41=size_41,
-                                    size_42=size_42,
-                                    size_43=size_43,
-                                    size_44=size_44,
-                                    size_45=size_45,
-                                    size_46=size_46
-                                )
-                                db.session.add(item)
-                                
-                                # 총액 계산
-                                try:
-                                    price_str = total_item_price.replace('EUR', '').replace('$', '').strip()
-                                    total_amount_value += float(price_str)
-                                except:
-                                    pass
-                            
-                            # 오더시트 총액 업데이트
-                            order.total_amount = f"EUR {total_amount_value:.2f}"
-                    
-                            # 변경사항 저장
-                            db.session.commit()
-                    
-                    # 응답 데이터 생성
-                    response_data = {
-                        'message': '문서 처리 완료',
-                        'document_id': doc_id,
-                        'document_type': doc_type,
-                        'excel_filename': os.path.basename(output_excel),
-                        'total_products': total_quantity,
-                        'data_preview': df_result.head().to_dict(orient='records')
-                    }
-                    
-                    return jsonify(response_data), 200
-                else:
-                    return jsonify({'error': '문서 처리 중 오류가 발생했습니다.'}), 500
+            # 처리 작업 등록
+            job = job_queue.create_job(
+                filename=filename,
+                filepath=filepath,
+                doc_type=doc_type,
+                brand=request.form.get('brand', '자동 감지'),
+                season=request.form.get('season', '')
+            )
             
-            except Exception as e:
-                return jsonify({'error': f'문서 처리 중 오류: {str(e)}'}), 500
+            return jsonify({
+                'message': '문서 처리 작업이 등록되었습니다.',
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': f"{request.script_root}/orders/jobs/{job.id}"
+            }), 202
         
         else:
             return jsonify({'error': '허용되지 않은 파일 형식입니다.'}), 400
@@ -321,77 +158,316 @@ def upload_document():
     except Exception as e:
         return jsonify({'error': f'예상치 못한 오류가 발생했습니다: {str(e)}'}), 500
 
+@orders_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """문서 처리 작업 상태 조회"""
+    try:
+        job = db.session.get(ProcessingJob, job_id)
+        if not job:
+            return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+        
+        return jsonify(job.to_dict()), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'작업 상태 조회 중 오류가 발생했습니다: {str(e)}'}), 500
+
+@orders_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """OCR 처리 지표 (Prometheus 텍스트 형식: 단계별 소요 시간, 전송 바이트, 엔진 호출, 작업 상태)"""
+    return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def process_upload_job(job_id):
+    """업로드 문서 처리 작업 (작업 큐 스레드에서 실행)
+    
+    래스터화 → OCR → 파싱 → DB 저장 (→ 인보이스는 오더시트 자동 대조) 순으로 진행하며 단계마다 작업 상태를 갱신한다.
+    단계별 소요 시간은 /orders/metrics 히스토그램에 누적되고, OCR_JOB_TRACE=1 이면 작업 레코드(trace)에도 요약이 남는다.
+    """
+    job = db.session.get(ProcessingJob, job_id)
+    if not job:
+        return
+    
+    # 처리 방식 결정
+    processing_method = "standard"
+    if job.doc_type == "invoice":
+        processing_method = "invoice_json"
+    elif job.doc_type == "order":
+        processing_method = "order_json"
+    
+    with tracing() as trace:
+        # 선택된 방식으로 PDF 처리
+        df_result, output_excel = ocr_processor.process_pdf(
+            job.filepath, 
+            output_dir=PROCESSED_FOLDER,
+            processing_method=processing_method,
+            verbose=False,
+            progress_callback=lambda stage: job_queue.update_stage(job_id, stage)
+        )
+        
+        if not output_excel:
+            job_queue.fail(job_id, '문서 처리 중 오류가 발생했습니다.', trace=_job_trace(trace))
+            return
+        
+        job_queue.update_stage(job_id, 'persist')
+        with span('db_persist'):
+            doc_id = _persist_document(job.doc_type, job.filename, job.brand, job.season, df_result, output_excel)
+        
+        # 응답 데이터 생성
+        response_data = {
+            'message': '문서 처리 완료',
+            'document_id': doc_id,
+            'document_type': job.doc_type,
+            'excel_filename': os.path.basename(output_excel),
+            'total_products': len(df_result) if not df_result.empty else 0,
+            'data_preview': df_result.head().to_dict(orient='records')
+        }
+        
+        # 인보이스는 모델 코드 색인으로 찾은 오더시트와 자동 대조 (실패해도 업로드는 완료 처리)
+        if job.doc_type == 'invoice':
+            job_queue.update_stage(job_id, 'reconcile')
+            try:
+                with span('reconcile'):
+                    response_data['auto_matches'] = auto_reconciler.reconcile_invoice(doc_id)
+            except Exception as e:
+                db.session.rollback()
+                logging.error(f"자동 대조 중 오류 ({doc_id}): {str(e)}")
+                response_data['auto_matches'] = []
+    
+    job_queue.complete(job_id, doc_id, response_data, trace=_job_trace(trace))
+
+def _job_trace(trace):
+    """작업 레코드에 남길 단계별 소요 시간 요약 (OCR_JOB_TRACE 가 꺼져 있으면 None)"""
+    return trace.summary() if OCR_JOB_TRACE else None
+
+def _persist_document(doc_type, filename, brand, season, df_result, output_excel):
+    """OCR 결과를 인보이스/오더시트 및 품목 레코드로 저장하고 문서 ID 반환"""
+    # 총 수량 계산
+    total_quantity = len(df_result) if not df_result.empty else 0
+    
+    # 문서 ID 생성 (prefix_number 형식)
+    if doc_type == 'invoice':
+        # 순번 테이블에서 인보이스 ID 발급
+        doc_id = next_document_id('invoice')
+        
+        # 인보이스 레코드 생성
+        invoice = Invoice(
+            id=doc_id,
+            filename=filename,
+            brand=brand,
+            season=season,
+            total_amount="",  # 나중에 계산
+            total_quantity=total_quantity,
+            excel_filename=os.path.basename(output_excel)
+        )
+        db.session.add(invoice)
+        
+        # 품목/사이즈 레코드 일괄 생성 (DataFrame 컬럼 단위 변환 후 executemany)
+        if not df_result.empty:
+            item_rows, size_rows, total_amount_value = build_item_rows(df_result, 'invoice_id', doc_id)
+            db.session.flush()
+            bulk_insert_items('invoice', item_rows, size_rows)
+            
+            # 인보이스 총액 업데이트
+            invoice.total_amount = f"EUR {total_amount_value:.2f}"
+        
+        # 변경사항 저장
+        db.session.commit()
+    
+    else:  # 오더시트(order) 처리
+        # 순번 테이블에서 오더 ID 발급
+        doc_id = next_document_id('order')
+        
+        # 오더시트 레코드 생성
+        order = Order(
+            id=doc_id,
+            filename=filename,
+            brand=brand,
+            season=season,
+            total_amount="",  # 나중에 계산
+            total_quantity=total_quantity,
+            excel_filename=os.path.basename(output_excel)
+        )
+        db.session.add(order)
+        
+        # 품목 레코드 일괄 생성 (선적 일정 포함)
+        if not df_result.empty:
+            item_rows, size_rows, total_amount_value = build_item_rows(
+                df_result, 'order_id', doc_id, with_shipping=True, with_retail=False
+            )
+            db.session.flush()
+            bulk_insert_items('order', item_rows, size_rows)
+            index_order_items(doc_id, item_rows)  # 자동 대조 후보 검색용 모델 코드 색인
+            
+            # 오더시트 총액 업데이트
+            order.total_amount = f"EUR {total_amount_value:.2f}"
+        
+        # 변경사항 저장
+        db.session.commit()
+    
+    return doc_id
+
 @orders_bp.route('/download/<filename>', methods=['GET'])
 def download_file(filename):
-    """처리된 엑셀 파일 다운로드"""
+    """처리 결과 엑셀/CSV 다운로드 (처음 요청 시 저장된 처리 결과로 생성 후 캐시)"""
     try:
-        filepath = os.path.join(PROCESSED_FOLDER, filename)
+        filename = secure_filename(filename)
+        filepath = result_store.export_path(filename) if filename else None
         
-        if os.path.exists(filepath):
+        if filepath:
             return send_file(filepath, 
                              as_attachment=True, 
                              download_name=filename,
-                             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+                             mimetype=EXPORT_MIMETYPES.get(os.path.splitext(filename)[1], EXPORT_MIMETYPES['.xlsx']))
         else:
             return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
     
     except Exception as e:
         return jsonify({'error': f'다운로드 중 오류가 발생했습니다: {str(e)}'}), 500
 
-@orders_bp.route('/documents/invoice', methods=['GET'])
-def list_invoices():
-    """인보이스 문서 목록 조회"""
+@orders_bp.route('/export', methods=['GET'])
+def export_documents():
+    """기간 내 문서 품목 통합 내보내기
+    
+    Query:
+        type: invoice, order 또는 all (기본 all, 유형별 시트)
+        start_date, end_date: 문서 등록일 기간 (YYYY-MM-DD)
+        format: xlsx (기본) 또는 csv (type 하나만 가능)
+    
+    CSV 는 품목 배치를 읽는 대로 응답으로 흘려보내고, 엑셀은 write-only 워크북을 임시 파일에
+    행 단위로 쓴 뒤 전송한다. 어느 쪽도 전체 행을 메모리에 모으지 않는다.
+    """
     try:
-        invoices = Invoice.query.order_by(Invoice.created_at.desc()).all()
+        doc_type = request.args.get('type', 'all')
+        export_format = request.args.get('format', 'xlsx')
+        doc_types = ['invoice', 'order'] if doc_type == 'all' else [doc_type]
+        if any(t not in SHEET_TITLES for t in doc_types) or export_format not in ('xlsx', 'csv'):
+            return jsonify({'error': '지원하지 않는 문서 유형 또는 형식입니다.'}), 400
+        if export_format == 'csv' and len(doc_types) > 1:
+            return jsonify({'error': 'CSV 는 문서 유형(type)을 하나만 지정해야 합니다.'}), 400
         
-        # 응답 데이터 생성
-        invoice_list = []
-        for invoice in invoices:
-            invoice_list.append({
-                'id': invoice.id,
-                'filename': invoice.filename,
-                'brand': invoice.brand,
-                'season': invoice.season,
-                'total_amount': invoice.total_amount,
-                'total_quantity': invoice.total_quantity,
-                'excel_filename': invoice.excel_filename,
-                'created_at': invoice.created_at.isoformat(),
-                'document_type': 'invoice'
-            })
+        try:
+            start = datetime.strptime(request.args['start_date'], '%Y-%m-%d') if request.args.get('start_date') else None
+            end = datetime.strptime(request.args['end_date'], '%Y-%m-%d').replace(hour=23, minute=59, second=59) \
+                if request.args.get('end_date') else None
+        except ValueError:
+            return jsonify({'error': '잘못된 날짜 형식입니다. (start_date, end_date: YYYY-MM-DD)'}), 400
+        
+        period = '_'.join(filter(None, [request.args.get('start_date'), request.args.get('end_date')])) or 'all'
+        download_name = f"{doc_type}_export_{period}.{export_format}"
+        
+        if export_format == 'csv':
+            header, rows = document_export_rows(doc_types[0], start, end)
+            response = Response(stream_with_context(csv_chunks(header, rows)), mimetype=EXPORT_MIMETYPES['.csv'])
+            response.headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+            return response
+        
+        def sheets():
+            for t in doc_types:
+                header, rows = document_export_rows(t, start, end)
+                yield SHEET_TITLES[t], header, rows
+        
+        fd, filepath = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+        try:
+            write_xlsx(filepath, sheets())
+        except Exception:
+            # 작성 실패 시 임시 파일을 남기지 않음
+            os.remove(filepath)
+            raise
+        
+        def stream_file():
+            # 전송이 끝나거나 중단되면 임시 파일 삭제
+            try:
+                with open(filepath, 'rb') as f:
+                    while chunk := f.read(64 * 1024):
+                        yield chunk
+            finally:
+                os.remove(filepath)
         
-        return jsonify({
-            'invoices': invoice_list,
-            'total_count': len(invoice_list)
-        }), 200
+        response = Response(stream_file(), mimetype=EXPORT_MIMETYPES['.xlsx'])
+        response.headers['Content-Disposition'] = f'attachment; filename="{download_name}"'
+        response.headers['Content-Length'] = str(os.path.getsize(filepath))
+        return response
+    
+    except Exception as e:
+        return jsonify({'error': f'내보내기 중 오류가 발생했습니다: {str(e)}'}), 500
+
+def _document_list(model, doc_type, list_key):
+    """인보이스/오더시트 목록 공통 처리 (필터 → ETag 확인 → 최신 순 키셋 페이지)
+    
+    ETag 는 필터 결과의 건수와 최신 created_at, 요청 파라미터로 만들어 인덱스만으로 계산한다.
+    문서는 저장 후 바뀌지 않으므로 두 값이 같으면 목록도 같아, If-None-Match 가 일치하면
+    행을 읽지 않고 304 를 반환한다.
+    """
+    # 필터 파라미터
+    brand = request.args.get('brand')
+    season = request.args.get('season')
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    limit = request.args.get('limit', 100, type=int)
+    
+    query = model.query
+    if brand:
+        query = query.filter(model.brand == brand)
+    if season:
+        query = query.filter(model.season == season)
+    try:
+        if start_date:
+            query = query.filter(model.created_at >= datetime.strptime(start_date, '%Y-%m-%d'))
+        if end_date:
+            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
+            query = query.filter(model.created_at <= end_date_obj)
+    except ValueError:
+        return jsonify({'error': '잘못된 날짜 형식입니다. (start_date, end_date: YYYY-MM-DD)'}), 400
+    
+    # 전체 건수와 최신 등록 시각 (ETag 재료)
+    total_count, latest = query.with_entities(db.func.count(model.id), db.func.max(model.created_at)).one()
+    etag = hashlib.sha1(
+        f"{doc_type}|{total_count}|{latest}|{sorted(request.args.items(multi=True))}".encode('utf-8')
+    ).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    
+    try:
+        documents, next_cursor = _keyset_page(query, model.created_at, model.id, request.args.get('cursor'),
+                                              limit, id_type=str)
+    except ValueError:
+        return jsonify({'error': '잘못된 cursor 값입니다.'}), 400
+    
+    # 응답 데이터 생성
+    response = jsonify({
+        list_key: [{
+            'id': document.id,
+            'filename': document.filename,
+            'brand': document.brand,
+            'season': document.season,
+            'total_amount': document.total_amount,
+            'total_quantity': document.total_quantity,
+            'excel_filename': document.excel_filename,
+            'created_at': document.created_at.isoformat(),
+            'document_type': doc_type
+        } for document in documents],
+        'total_count': total_count,
+        'next_cursor': next_cursor
+    })
+    response.set_etag(etag)
+    return response
+
+@orders_bp.route('/documents/invoice', methods=['GET'])
+def list_invoices():
+    """인보이스 문서 목록 조회 (brand, season, start_date, end_date 필터, cursor/limit 페이지)"""
+    try:
+        return _document_list(Invoice, 'invoice', 'invoices')
     
     except Exception as e:
         return jsonify({'error': f'인보이스 목록 조회 중 오류가 발생했습니다: {str(e)}'}), 500
 
 @orders_bp.route('/documents/order', methods=['GET'])
 def list_orders():
-    """오더시트 문서 목록 조회"""
+    """오더시트 문서 목록 조회 (brand, season, start_date, end_date 필터, cursor/limit 페이지)"""
     try:
-        orders = Order.query.order_by(Order.created_at.desc()).all()
-        
-        # 응답 데이터 생성
-        order_list = []
-        for order in orders:
-            order_list.append({
-                'id': order.id,
-                'filename': order.filename,
-                'brand': order.brand,
-                'season': order.season,
-                'total_amount': order.total_amount,
-                'total_quantity': order.total_quantity,
-                'excel_filename': order.excel_filename,
-                'created_at': order.created_at.isoformat(),
-                'document_type': 'order'
-            })
-        
-        return jsonify({
-            'orders': order_list,
-            'total_count': len(order_list)
-        }), 200
+        return _document_list(Order, 'order', 'orders')
     
     except Exception as e:
         return jsonify({'error': f'오더시트 목록 조회 중 오류가 발생했습니다: {str(e)}'}), 500
@@ -407,7 +483,8 @@ def get_document(document_id):
             if not invoice:
                 return jsonify({'error': '문서를 찾을 수 없습니다.'}), 404
             
-            # 관련 품목 조회
+            # 관련 품목 조회 (사이즈는 한 번의 쿼리로 조회)
+            item_sizes = load_item_sizes('invoice', [item.id for item in invoice.items])
             items = []
             for item in invoice.items:
                 items.append({
@@ -418,14 +495,7 @@ def get_document(document_id):
                     'retail_price': item.retail_price,
                     'quantity': item.quantity,
                     'total_price': item.total_price,
-                    'size_39': item.size_39,
-                    'size_40': item.size_40,
-                    'size_41': item.size_41,
-                    'size_42': item.size_42,
-                    'size_43': item.size_43,
-                    'size_44': item.size_44,
-                    'size_45': item.size_45,
-                    'size_46': item.size_46
+                    **_size_fields(item_sizes[item.id])
                 })
             
             # 응답 데이터 생성
@@ -439,6 +509,7 @@ def get_document(document_id):
                 'total_quantity': invoice.total_quantity,
                 'excel_filename': invoice.excel_filename,
                 'created_at': invoice.created_at.isoformat(),
+                'size_totals': document_size_totals('invoice', invoice.id),
                 'items': items
             }
             
@@ -450,7 +521,8 @@ def get_document(document_id):
             if not order:
                 return jsonify({'error': '문서를 찾을 수 없습니다.'}), 404
             
-            # 관련 품목 조회
+            # 관련 품목 조회 (사이즈는 한 번의 쿼리로 조회)
+            item_sizes = load_item_sizes('order', [item.id for item in order.items])
             items = []
             for item in order.items:
                 # 모든 필드를 명시적으로 포함
@@ -463,14 +535,7 @@ def get_document(document_id):
                     'total_price': item.total_price,
                     'shipping_start': item.shipping_start,  # 이 필드가 제대로 포함되는지 확인
                     'shipping_end': item.shipping_end,      # 이 필드가 제대로 포함되는지 확인
-                    'size_39': item.size_39,
-                    'size_40': item.size_40,
-                    'size_41': item.size_41,
-                    'size_42': item.size_42,
-                    'size_43': item.size_43,
-                    'size_44': item.size_44,
-                    'size_45': item.size_45,
-                    'size_46': item.size_46
+                    **_size_fields(item_sizes[item.id])
                 })
             
             # 응답 데이터 생성
@@ -484,6 +549,7 @@ def get_document(document_id):
                 'total_quantity': order.total_quantity,
                 'excel_filename': order.excel_filename,
                 'created_at': order.created_at.isoformat(),
+                'size_totals': document_size_totals('order', order.id),
                 'items': items
             }
             
@@ -495,6 +561,13 @@ def get_document(document_id):
     except Exception as e:
         return jsonify({'error': f'문서 조회 중 오류가 발생했습니다: {str(e)}'}), 500
 
+def _size_fields(sizes):
+    """품목 응답의 사이즈 필드: sizes 딕셔너리 + 기존 클라이언트용 size_39 ~ size_46"""
+    fields = {f'size_{label}': 0 for label in LEGACY_SIZE_LABELS}
+    fields.update({f'size_{label}': quantity for label, quantity in sizes.items()})
+    fields['sizes'] = sizes
+    return fields
+
 @orders_bp.route('/compare/<doc1_id>/<doc2_id>', methods=['GET'])
 def compare_documents(doc1_id, doc2_id):
     """두 문서 비교 및 결과 저장"""
@@ -503,205 +576,33 @@ def compare_documents(doc1_id, doc2_id):
         doc1_type = 'invoice' if doc1_id.startswith('invo_') else 'order'
         doc2_type = 'invoice' if doc2_id.startswith('invo_') else 'order'
         
-        # 문서 1 가져오기
-        doc1 = None
-        doc1_items = []
-        if doc1_type == 'invoice':
-            doc1 = Invoice.query.get(doc1_id)
-            if doc1:
-                doc1_items = InvoiceItem.query.filter_by(invoice_id=doc1_id).all()
-        else:
-            doc1 = Order.query.get(doc1_id)
-            if doc1:
-                doc1_items = OrderItem.query.filter_by(order_id=doc1_id).all()
-        
-        # 문서 2 가져오기
-        doc2 = None
-        doc2_items = []
-        if doc2_type == 'invoice':
-            doc2 = Invoice.query.get(doc2_id)
-            if doc2:
-                doc2_items = InvoiceItem.query.filter_by(invoice_id=doc2_id).all()
-        else:
-            doc2 = Order.query.get(doc2_id)
-            if doc2:
-                doc2_items = OrderItem.query.filter_by(order_id=doc2_id).all()
+        # 문서 가져오기
+        doc1 = Invoice.query.get(doc1_id) if doc1_type == 'invoice' else Order.query.get(doc1_id)
+        doc2 = Invoice.query.get(doc2_id) if doc2_type == 'invoice' else Order.query.get(doc2_id)
         
         # 문서 존재 확인
         if not doc1 or not doc2:
             return jsonify({'error': '비교할 문서를 찾을 수 없습니다.'}), 404
         
-        # 문서 비교 결과 초기화
-        comparison_result = {
-            'document_types': {
-                'doc1': doc1_type,
-                'doc2': doc2_type
-            },
-            'matches': [],
-            'mismatches': [],
-            'summary': {
-                'total_items': 0,
-                'matched_items': 0,
-                'mismatched_items': 0,
-                'match_percentage': 0
-            }
-        }
+        # 품목/사이즈 행과 비교 설정의 지문이 같은 이전 비교가 있으면 저장된 결과를 그대로 사용
+        doc1_rows = load_document_items(doc1_type, doc1_id)
+        doc2_rows = load_document_items(doc2_type, doc2_id)
+        items_hash = items_fingerprint(doc1_rows, doc2_rows, settings=f'fuzzy:{product_matcher.min_confidence}')
+        cached = find_cached_comparison(doc1_id, doc2_id, items_hash)
         
-        # 제품 정보 표준화
-        doc1_products = []
-        for item in doc1_items:
-            product = {
-                'model_code': item.model_code,
-                'model_name': item.model_name,
-                'color': item.color,
-                'quantity': item.quantity,
-                'wholesale_price': item.wholesale_price
+        if cached:
+            comparison_result = cached.blob.payload()
+            blob_digest = cached.blob_digest
+        else:
+            # 품목/사이즈를 컬럼 단위 테이블로 읽어 모델 코드 키로 한 번에 비교 (오인식 코드는 퍼지 매칭)
+            comparison_result = {
+                'document_types': {
+                    'doc1': doc1_type,
+                    'doc2': doc2_type
+                },
+                **reconcile(item_table(*doc1_rows), item_table(*doc2_rows), matcher=product_matcher)
             }
-            
-            # 사이즈별 수량 추가
-            for size in range(39, 47):
-                size_attr = f'size_{size}'
-                if hasattr(item, size_attr):
-                    product[f'사이즈_{size}'] = getattr(item, size_attr)
-            
-            doc1_products.append(product)
-        
-        doc2_products = []
-        for item in doc2_items:
-            product = {
-                'model_code': item.model_code,
-                'model_name': item.model_name,
-                'color': item.color,
-                'quantity': item.quantity,
-                'wholesale_price': item.wholesale_price
-            }
-            
-            # 사이즈별 수량 추가
-            for size in range(39, 47):
-                size_attr = f'size_{size}'
-                if hasattr(item, size_attr):
-                    product[f'사이즈_{size}'] = getattr(item, size_attr)
-            
-            doc2_products.append(product)
-        
-        # 모델 코드 정규화 함수
-        def standardize_model_code(code):
-            if not code:
-                return ""
-            match = re.search(r'(AJ\d+)', code)
-            if match:
-                return match.group(1).lower()
-            return code.lower()
-        
-        # 제품 맵 생성
-        doc1_product_map = {}
-        for product in doc1_products:
-            std_model_code = standardize_model_code(product['model_code'])
-            key = std_model_code
-            doc1_product_map[key] = product
-
-        doc2_product_map = {}
-        for product in doc2_products:
-            std_model_code = standardize_model_code(product['model_code'])
-            key = std_model_code
-            doc2_product_map[key] = product
-                
-        # 모든 제품 키 합집합
-        all_product_keys = set(doc1_product_map.keys()) | set(doc2_product_map.keys())
-        comparison_result['summary']['total_items'] = len(all_product_keys)
-        
-        # 제품별 비교
-        for key in all_product_keys:
-            product1 = doc1_product_map.get(key)
-            product2 = doc2_product_map.get(key)
-            
-            if not product1 or not product2:
-                # 한쪽에만 존재하는 항목
-                product = product1 or product2
-                product_name = product.get('model_name', key)
-                
-                if not product_name or product_name.strip() == "":
-                    product_name = product.get('model_code', key)
-                
-                comparison_result['mismatches'].append({
-                    'product_key': key,
-                    'product_name': product_name,
-                    'doc1_exists': bool(product1),
-                    'doc2_exists': bool(product2),
-                    'reason': '한쪽 문서에만 존재'
-                })
-                comparison_result['summary']['mismatched_items'] += 1
-                continue
-           
-            # 필드 비교 로직
-            mismatched_fields = []
-            
-            # 수량 비교
-            qty1 = int(product1.get('quantity', 0) or 0)
-            qty2 = int(product2.get('quantity', 0) or 0)
-            if qty1 != qty2:
-                mismatched_fields.append({
-                    'field': '총 수량',
-                    'value1': qty1,
-                    'value2': qty2
-                })
-           
-            # 사이즈별 수량 비교
-            for size in range(39, 47):
-                size_key = f'사이즈_{size}'
-                size1 = int(product1.get(size_key, 0) or 0)
-                size2 = int(product2.get(size_key, 0) or 0)
-                if size1 != size2:
-                    mismatched_fields.append({
-                        'field': f'사이즈 {size}',
-                        'value1': size1,
-                        'value2': size2
-                    })
-            
-            if mismatched_fields:
-                product_name = product1.get('model_name', key)
-                if not product_name or product_name.strip() == "":
-                    product_name = product1.get('model_code', key)
-                
-                comparison_result['mismatches'].append({
-                    'product_key': key,
-                    'product_name': product_name,
-                    'doc1_exists': True,
-                    'doc2_exists': True,
-                    'mismatched_fields': mismatched_fields
-                })
-                comparison_result['summary']['mismatched_items'] += 1
-            else:
-                # 사이즈 요약 생성
-                size_summary = []
-                for size in range(39, 47):
-                    size_key = f'사이즈_{size}'
-                    size_qty = int(product1.get(size_key, 0) or 0)
-                    if size_qty:
-                        size_summary.append(f"{size}({size_qty})")
-                
-                size_summary_str = ", ".join(size_summary) if size_summary else "-"
-                
-                product_name = product1.get('model_name', key)
-                if not product_name or product_name.strip() == "":
-                    product_name = product1.get('model_code', key)
-                
-                comparison_result['matches'].append({
-                    'product_key': key,
-                    'product_name': product_name,
-                    'size': size_summary_str,
-                    'quantity': product1.get('quantity', 0),
-                    'price': product1.get('wholesale_price', '')
-                })
-                comparison_result['summary']['matched_items'] += 1
-        
-        # 일치율 계산
-        if comparison_result['summary']['total_items'] > 0:
-            comparison_result['summary']['match_percentage'] = round(
-                (comparison_result['summary']['matched_items'] / 
-                comparison_result['summary']['total_items']) * 100,
-                2
-            )
+            blob_digest = None
         
         # 비교 결과 저장
         try:
@@ -719,23 +620,103 @@ def compare_documents(doc1_id, doc2_id):
                 matched_items=comparison_result['summary']['matched_items'],
                 mismatched_items=comparison_result['summary']['mismatched_items'],
                 total_items=comparison_result['summary']['total_items'],
-                comparison_data=json.dumps(comparison_result),
+                blob_digest=blob_digest or store_comparison_blob(comparison_result),  # 같은 결과는 본문 공유
+                items_hash=items_hash,
                 brand=brand,
                 season=season,
                 manually_compared=True  # 수동 비교 플래그 설정
             )
             db.session.add(new_comparison)
+            record_comparison_stat(new_comparison)  # 통계 일별 집계 갱신 (같은 트랜잭션)
             db.session.commit()
             
         except Exception as e:
             db.session.rollback()
             logging.error(f"비교 결과 저장 중 오류: {str(e)}")
         
-        return jsonify(comparison_result), 200
+        response = jsonify(comparison_result)
+        response.headers['X-Comparison-Cache'] = 'hit' if cached else 'miss'
+        return response, 200
     
     except Exception as e:
         return jsonify({'error': f'문서 비교 중 오류가 발생했습니다: {str(e)}'}), 500
 
+def _document_key(doc_type, doc_id):
+    """비교 결과에 저장된 문서 유형을 정규화한 조회 키 (invoice 외에는 오더시트)"""
+    return ('invoice' if doc_type == 'invoice' else 'order', doc_id)
+
+def _document_summaries(refs):
+    """(문서 유형, 문서 ID) 목록의 요약 정보를 유형별 IN 쿼리 한 번씩으로 조회
+    
+    Returns:
+        {(문서 유형, 문서 ID): {'id', 'filename', 'type', 'created_at'}}
+    """
+    ids_by_type = {'invoice': set(), 'order': set()}
+    for doc_type, doc_id in refs:
+        key_type, key_id = _document_key(doc_type, doc_id)
+        ids_by_type[key_type].add(key_id)
+    
+    summaries = {}
+    for doc_type, model in (('invoice', Invoice), ('order', Order)):
+        if not ids_by_type[doc_type]:
+            continue
+        rows = db.session.query(model.id, model.filename, model.created_at)\
+                         .filter(model.id.in_(ids_by_type[doc_type])).all()
+        for doc_id, filename, created_at in rows:
+            summaries[(doc_type, doc_id)] = {
+                'id': doc_id,
+                'filename': filename,
+                'type': doc_type,
+                'created_at': created_at.isoformat()
+            }
+    return summaries
+
+def _count_comparisons(query):
+    """비교 결과 건수 (정렬/컬럼 로딩 없이 COUNT 만 실행)"""
+    return query.order_by(None).with_entities(db.func.count(DocumentComparison.id)).scalar()
+
+def _keyset_page(query, date_column, id_column, cursor, limit, id_type=int):
+    """날짜 컬럼 기준 최신 순 키셋 페이지 조회
+    
+    OFFSET 대신 마지막 행의 (날짜, id) 보다 오래된 행부터 읽으므로 데이터가 쌓여도
+    페이지 조회 비용이 일정하다.
+    
+    Args:
+        query: 필터가 적용된 쿼리
+        date_column: 정렬 기준 날짜 컬럼 (comparison_date, created_at)
+        id_column: 같은 날짜 안의 정렬 기준 ID 컬럼
+        cursor: 이전 응답의 next_cursor ('<ISO 날짜>|<id>', 없으면 첫 페이지)
+        limit: 페이지 크기 (1 ~ MAX_PAGE_LIMIT 로 제한)
+        id_type: cursor 의 id 변환 함수 (정수 ID 는 int, 문서 ID 는 str)
+    
+    Returns:
+        (행 목록, 다음 페이지 cursor 또는 None)
+    
+    Raises:
+        ValueError: cursor 형식이 잘못된 경우
+    """
+    if cursor:
+        date_part, _, id_part = cursor.rpartition('|')
+        cursor_date, cursor_id = datetime.fromisoformat(date_part), id_type(id_part)
+        query = query.filter(
+            (date_column < cursor_date) |
+            ((date_column == cursor_date) & (id_column < cursor_id))
+        )
+    
+    limit = min(max(limit, 1), MAX_PAGE_LIMIT)
+    rows = query.order_by(date_column.desc(), id_column.desc()).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = f"{getattr(last, date_column.key).isoformat()}|{getattr(last, id_column.key)}"
+    return rows, next_cursor
+
+def _comparison_page(query, cursor, limit):
+    """비교 결과를 최신 순(comparison_date, id)으로 키셋 페이지 조회"""
+    return _keyset_page(query, DocumentComparison.comparison_date, DocumentComparison.id, cursor, limit)
+
 @orders_bp.route('/comparison-history', methods=['GET'])
 def get_comparison_history():
    """문서 비교 이력 조회"""
@@ -785,59 +766,29 @@ def get_comparison_history():
            except ValueError:
                pass
        
-       # 최신 순으로 정렬하고 제한
-       comparisons = query.order_by(DocumentComparison.comparison_date.desc()).limit(limit).all()
+       # 전체 건수 (인덱스로 계산, 페이지와 무관)
+       total_count = _count_comparisons(query)
+       
+       # 최신 순 키셋 페이지 (상세 비교 데이터 컬럼은 읽지 않음)
+       try:
+           comparisons, next_cursor = _comparison_page(query, request.args.get('cursor'), limit)
+       except ValueError:
+           return jsonify({'error': '잘못된 cursor 값입니다.'}), 400
+       
+       # 참조 문서 정보를 유형별 IN 쿼리 한 번씩으로 조회
+       documents = _document_summaries(
+           [(c.document1_type, c.document1_id) for c in comparisons] +
+           [(c.document2_type, c.document2_id) for c in comparisons]
+       )
        
        # 결과 변환
        result = []
        for comparison in comparisons:
-           # document1 정보 가져오기
-           doc1_info = {}
-           if comparison.document1_type == 'invoice':
-               doc1 = Invoice.query.get(comparison.document1_id)
-               if doc1:
-                   doc1_info = {
-                       'id': doc1.id,
-                       'filename': doc1.filename,
-                       'type': 'invoice',
-                       'created_at': doc1.created_at.isoformat()
-                   }
-           else:
-               doc1 = Order.query.get(comparison.document1_id)
-               if doc1:
-                   doc1_info = {
-                       'id': doc1.id,
-                       'filename': doc1.filename,
-                       'type': 'order',
-                       'created_at': doc1.created_at.isoformat()
-                   }
-           
-           # document2 정보 가져오기
-           doc2_info = {}
-           if comparison.document2_type == 'invoice':
-               doc2 = Invoice.query.get(comparison.document2_id)
-               if doc2:
-                   doc2_info = {
-                       'id': doc2.id,
-                       'filename': doc2.filename,
-                       'type': 'invoice',
-                       'created_at': doc2.created_at.isoformat()
-                   }
-           else:
-               doc2 = Order.query.get(comparison.document2_id)
-               if doc2:
-                   doc2_info = {
-                       'id': doc2.id,
-                       'filename': doc2.filename,
-                       'type': 'order',
-                       'created_at': doc2.created_at.isoformat()
-                   }
-           
            # 비교 결과 정보
            result.append({
                'id': comparison.id,
-               'document1': doc1_info,
-               'document2': doc2_info,
+               'document1': documents.get(_document_key(comparison.document1_type, comparison.document1_id), {}),
+               'document2': documents.get(_document_key(comparison.document2_type, comparison.document2_id), {}),
                'match_percentage': comparison.match_percentage,
                'matched_items': comparison.matched_items,
                'mismatched_items': comparison.mismatched_items,
@@ -850,7 +801,8 @@ def get_comparison_history():
        
        return jsonify({
            'comparisons': result,
-           'total_count': len(result)
+           'total_count': total_count,
+           'next_cursor': next_cursor
        }), 200
    
    except Exception as e:
@@ -864,57 +816,49 @@ def get_document_comparisons(doc_id):
        # 필터 파라미터
        limit = request.args.get('limit', 100, type=int)
        
-       # 해당 문서가 포함된 모든 비교 결과 쿼리
-       comparisons = DocumentComparison.query.filter(
+       # 해당 문서가 포함된 모든 비교 결과 쿼리 (document1_id / document2_id 인덱스 사용)
+       query = DocumentComparison.query.filter(
            (DocumentComparison.document1_id == doc_id) | 
            (DocumentComparison.document2_id == doc_id)
-       ).order_by(DocumentComparison.comparison_date.desc()).limit(limit).all()
+       )
+       total_count = _count_comparisons(query)
+       
+       try:
+           comparisons, next_cursor = _comparison_page(query, request.args.get('cursor'), limit)
+       except ValueError:
+           return jsonify({'error': '잘못된 cursor 값입니다.'}), 400
+       
+       # 비교 대상 문서 결정 (doc_id가 아닌 다른 문서)
+       others = [
+           (c.document2_type, c.document2_id) if c.document1_id == doc_id else (c.document1_type, c.document1_id)
+           for c in comparisons
+       ]
+       
+       # 다른 문서 정보를 유형별 IN 쿼리 한 번씩으로 조회
+       documents = _document_summaries(others)
        
        # 결과 변환
        result = []
-       for comparison in comparisons:
-           # 비교 대상 문서 결정 (doc_id가 아닌 다른 문서)
-           other_doc_id = comparison.document2_id if comparison.document1_id == doc_id else comparison.document1_id
-           other_doc_type = comparison.document2_type if comparison.document1_id == doc_id else comparison.document1_type
-           
-           # 다른 문서 정보 가져오기
-           other_doc_info = {}
-           if other_doc_type == 'invoice':
-               other_doc = Invoice.query.get(other_doc_id)
-               if other_doc:
-                   other_doc_info = {
-                       'id': other_doc.id,
-                       'filename': other_doc.filename,
-                       'type': 'invoice',
-                       'created_at': other_doc.created_at.isoformat()
-                   }
-           else:
-               other_doc = Order.query.get(other_doc_id)
-               if other_doc:
-                   other_doc_info = {
-                       'id': other_doc.id,
-                       'filename': other_doc.filename,
-                       'type': 'order',
-                       'created_at': other_doc.created_at.isoformat()
-                   }
-           
+       for comparison, (other_doc_type, other_doc_id) in zip(comparisons, others):
            # 비교 결과 정보
            result.append({
                'id': comparison.id,
-               'compared_with': other_doc_info,
+               'compared_with': documents.get(_document_key(other_doc_type, other_doc_id), {}),
                'match_percentage': comparison.match_percentage,
                'matched_items': comparison.matched_items,
                'mismatched_items': comparison.mismatched_items,
                'total_items': comparison.total_items,
                'brand': comparison.brand,
                'season': comparison.season,
+               'manually_compared': comparison.manually_compared,
                'comparison_date': comparison.comparison_date.isoformat()
            })
        
        return jsonify({
            'document_id': doc_id,
            'comparisons': result,
-           'total_count': len(result)
+           'total_count': total_count,
+           'next_cursor': next_cursor
        }), 200
    
    except Exception as e:
@@ -922,88 +866,90 @@ def get_document_comparisons(doc_id):
 
 @orders_bp.route('/statistics', methods=['GET'])
 def get_statistics():
-   """통계 데이터 API"""
+   """통계 데이터 API
+   
+   일별 집계 테이블(comparison_daily_stats)에서 기간/브랜드 조건으로 (일자, 브랜드)별 합계를 한 번에
+   조회한 뒤 전체 합계, 브랜드별 평균, 일별 추이를 계산한다.
+   
+   Query Args:
+       brand: 브랜드 필터
+       start_date, end_date: 기간 (YYYY-MM-DD, 양 끝 포함)
+       days: 일별 추이 기간 (기본 7일, end_date 또는 오늘까지)
+   """
    try:
        # 필터 파라미터
        brand = request.args.get('brand')
        start_date = request.args.get('start_date')
        end_date = request.args.get('end_date')
+       trend_days = min(max(request.args.get('days', 7, type=int), 1), 366)
        
-       # 기본 쿼리 (수동 비교된 문서만 포함)
-       query = DocumentComparison.query.filter(DocumentComparison.manually_compared == True)
-       
-       # 기존 필터 적용
-       if brand:
-           query = query.filter(DocumentComparison.brand == brand)
-       
+       start_day = end_day = None
        if start_date:
            try:
-               start_date_obj = datetime.strptime(start_date, '%Y-%m-%d')
-               query = query.filter(DocumentComparison.comparison_date >= start_date_obj)
+               start_day = datetime.strptime(start_date, '%Y-%m-%d').date()
            except ValueError:
                pass
        
        if end_date:
            try:
-               end_date_obj = datetime.strptime(end_date, '%Y-%m-%d')
-               # 날짜 범위에 end_date 포함하기 위해 다음 날짜로 설정
-               end_date_obj = end_date_obj.replace(hour=23, minute=59, second=59)
-               query = query.filter(DocumentComparison.comparison_date <= end_date_obj)
+               end_day = datetime.strptime(end_date, '%Y-%m-%d').date()
            except ValueError:
                pass
        
-       # 전체 비교 건수
-       total_comparisons = query.count()
-       
-       # 평균 일치율
-       avg_match_percentage = db.session.query(db.func.avg(DocumentComparison.match_percentage)).filter(
-           query.whereclause
-       ).scalar() or 0
-       
-       # 낮은 일치율(80% 미만) 문서 수
-       low_match_count = query.filter(DocumentComparison.match_percentage < 80).count()
+       # (일자, 브랜드)별 집계 조회 (한 번의 GROUP BY 쿼리)
+       query = db.session.query(
+           ComparisonDailyStat.day,
+           ComparisonDailyStat.brand,
+           db.func.sum(ComparisonDailyStat.comparison_count),
+           db.func.sum(ComparisonDailyStat.match_sum),
+           db.func.sum(ComparisonDailyStat.low_match_count)
+       )
+       if brand:
+           query = query.filter(ComparisonDailyStat.brand == brand)
+       if start_day:
+           query = query.filter(ComparisonDailyStat.day >= start_day)
+       if end_day:
+           query = query.filter(ComparisonDailyStat.day <= end_day)
+       rows = query.group_by(ComparisonDailyStat.day, ComparisonDailyStat.brand).all()
        
-       # 추가 통계: 브랜드별 평균 일치율
-       brand_stats = []
-       brands_query = db.session.query(DocumentComparison.brand, 
-                                     db.func.avg(DocumentComparison.match_percentage).label('avg_match'),
-                                     db.func.count(DocumentComparison.id).label('count'))\
-                               .filter(DocumentComparison.brand != '', 
-                                       DocumentComparison.manually_compared == True)\
-                               .group_by(DocumentComparison.brand)\
-                               .order_by(db.desc('avg_match'))
+       # 전체 비교 건수 / 평균 일치율 / 낮은 일치율(80% 미만) 문서 수
+       total_comparisons = sum(count for _, _, count, _, _ in rows)
+       total_match_sum = sum(match_sum for _, _, _, match_sum, _ in rows)
+       low_match_count = sum(low for _, _, _, _, low in rows)
+       avg_match_percentage = total_match_sum / total_comparisons if total_comparisons else 0
        
-       if query.whereclause:
-           brands_query = brands_query.filter(query.whereclause)
+       # 추가 통계: 브랜드별 평균 일치율 (브랜드 없는 비교 제외)
+       brand_totals = {}
+       for _, row_brand, count, match_sum, _ in rows:
+           if row_brand:
+               totals = brand_totals.setdefault(row_brand, [0, 0.0])
+               totals[0] += count
+               totals[1] += match_sum
+       brand_stats = [
+           {
+               'brand': row_brand,
+               'avg_match_percentage': round(match_sum / count, 2),
+               'comparison_count': count
+           }
+           for row_brand, (count, match_sum) in brand_totals.items()
+       ]
+       brand_stats.sort(key=lambda stat: stat['avg_match_percentage'], reverse=True)
        
-       for brand_result in brands_query.all():
-           brand_stats.append({
-               'brand': brand_result.brand,
-               'avg_match_percentage': round(brand_result.avg_match, 2),
-               'comparison_count': brand_result.count
-           })
+       # 최근 N일간 일치율 추이 (기간 필터 밖의 날은 0)
+       day_totals = {}
+       for day, _, count, match_sum, _ in rows:
+           totals = day_totals.setdefault(day, [0, 0.0])
+           totals[0] += count
+           totals[1] += match_sum
        
-       # 최근 7일간 일치율 추이 
-       today = datetime.utcnow().date()
+       last_day = end_day or datetime.utcnow().date()
        daily_stats = []
-       
-       for i in range(6, -1, -1):
-           target_date = today - timedelta(days=i)
-           next_date = target_date + timedelta(days=1)
-           
-           daily_query = query.filter(
-               DocumentComparison.comparison_date >= datetime.combine(target_date, datetime.min.time()),
-               DocumentComparison.comparison_date < datetime.combine(next_date, datetime.min.time()),
-               DocumentComparison.manually_compared == True
-           )
-           
-           daily_count = daily_query.count()
-           daily_avg = db.session.query(db.func.avg(DocumentComparison.match_percentage))\
-                                .filter(daily_query.whereclause).scalar() or 0
-           
+       for i in range(trend_days - 1, -1, -1):
+           target_date = last_day - timedelta(days=i)
+           daily_count, daily_sum = day_totals.get(target_date, (0, 0.0))
            daily_stats.append({
                'date': target_date.strftime('%Y-%m-%d'),
-               'avg_match_percentage': round(daily_avg, 2),
+               'avg_match_percentage': round(daily_sum / daily_count, 2) if daily_count else 0,
                'comparison_count': daily_count
            })
        
@@ -1020,73 +966,60 @@ def get_statistics():
 
 @orders_bp.route('/calendar/events', methods=['GET', 'POST'])
 def calendar_events():
-    """캘린더 이벤트 조회/추가 API"""
+    """캘린더 이벤트 조회/추가 API (GET: start, end 로 캘린더에 보이는 기간만 조회)"""
     # GET 메소드: 이벤트 조회
     if request.method == 'GET':
         try:
-            # 개인 일정 불러오기
-            personal_events = PersonalEvent.query.all()
-            personal_events_data = [event.to_dict() for event in personal_events]
+            # 조회 기간 (캘린더에 보이는 범위, 없으면 전체)
+            window_start = parse_date_string(request.args.get('start', ''))
+            window_end = parse_date_string(request.args.get('end', ''))
+            if (request.args.get('start') and not window_start) or (request.args.get('end') and not window_end):
+                return jsonify({'error': '잘못된 날짜 형식입니다. (start, end: YYYY-MM-DD)'}), 400
             
-            # 선적 일정 데이터 - 발주서 항목에서 직접 가져오기
-            shipping_events = []
-            
-            # 모든 발주서 항목에서 선적 일정이 있는 것들 찾기
-            order_items = OrderItem.query.filter(
-                (OrderItem.shipping_start.isnot(None)) | 
-                (OrderItem.shipping_end.isnot(None))
-            ).all()
+            # 개인 일정 불러오기 (반복 일정은 반복 종료일이 기간 안에 걸치면 포함)
+            personal_query = PersonalEvent.query
+            if window_end:
+                personal_query = personal_query.filter(PersonalEvent.date <= window_end)
+            if window_start:
+                personal_query = personal_query.filter(
+                    (PersonalEvent.date >= window_start) |
+                    ((PersonalEvent.repeat == True) &
+                     (PersonalEvent.repeat_until.is_(None) | (PersonalEvent.repeat_until >= window_start)))
+                )
+            personal_events_data = [event.to_dict() for event in personal_query.all()]
             
-            for item in order_items:
-                # 발주서 정보 가져오기
-                order = Order.query.get(item.order_id)
-                if not order:
-                    continue
-                
-                # 시작 일정이 있는 경우
-                if item.shipping_start and item.shipping_start.strip():
-                    try:
-                        # 날짜 파싱
-                        start_date = parse_date_string(item.shipping_start)
-                        if start_date:
-                            shipping_events.append({
-                                'id': f"order_{item.id}_start",
-                                'title': f"{order.brand} - {item.model_name or item.model_code} (시작)",
-                                'date': start_date.isoformat(),
-                                'category': 'shipping',
-                                'brand': order.brand,
-                                'model_code': item.model_code,
-                                'model_name': item.model_name,
-                                'document_id': order.id,
-                                'schedule_type': 'start',
-                                'is_confirmed': True,
-                                'description': f"품목: {item.model_name or item.model_code}\n수량: {item.quantity}\n가격: {item.wholesale_price}"
-                            })
-                    except Exception as e:
-                        print(f"시작일 처리 중 오류: {str(e)}")
+            # 선적 일정 - 오더 품목의 파싱된 선적일 인덱스로 기간 안의 품목만 오더와 조인해 조회
+            shipping_events = []
+            for schedule_type, date_column, label in (
+                ('start', OrderItem.shipping_start_date, '시작'),
+                ('end', OrderItem.shipping_end_date, '완료')
+            ):
+                query = db.session.query(
+                    OrderItem.id, OrderItem.model_code, OrderItem.model_name, OrderItem.quantity,
+                    OrderItem.wholesale_price, date_column, Order.id, Order.brand
+                ).join(Order, Order.id == OrderItem.order_id).filter(date_column.isnot(None))
+                if window_start:
+                    query = query.filter(date_column >= window_start)
+                if window_end:
+                    query = query.filter(date_column <= window_end)
                 
-                # 종료 일정이 있는 경우
-                if item.shipping_end and item.shipping_end.strip():
-                    try:
-                        # 날짜 파싱
-                        end_date = parse_date_string(item.shipping_end)
-                        if end_date:
-                            shipping_events.append({
-                                'id': f"order_{item.id}_end",
-                                'title': f"{order.brand} - {item.model_name or item.model_code} (완료)",
-                                'date': end_date.isoformat(),
-                                'category': 'shipping',
-                                'brand': order.brand,
-                                'model_code': item.model_code,
-                                'model_name': item.model_name,
-                                'document_id': order.id,
-                                'schedule_type': 'end',
-                                'is_confirmed': True,
-                                'description': f"품목: {item.model_name or item.model_code}\n수량: {item.quantity}\n가격: {item.wholesale_price}"
-                            })
-                    except Exception as e:
-                        print(f"종료일 처리 중 오류: {str(e)}")
-                        
+                for item_id, model_code, model_name, quantity, wholesale_price, event_date, order_id, brand in \
+                        query.order_by(date_column, OrderItem.id):
+                    item_name = model_name or model_code
+                    shipping_events.append({
+                        'id': f"order_{item_id}_{schedule_type}",
+                        'title': f"{brand} - {item_name} ({label})",
+                        'date': event_date.isoformat(),
+                        'category': 'shipping',
+                        'brand': brand,
+                        'model_code': model_code,
+                        'model_name': model_name,
+                        'document_id': order_id,
+                        'schedule_type': schedule_type,
+                        'is_confirmed': True,
+                        'description': f"품목: {item_name}\n수량: {quantity}\n가격: {wholesale_price}"
+                    })
+            
             return jsonify({
                 'shipping_events': shipping_events,
                 'personal_events': personal_events_data
@@ -1390,5 +1323,6 @@ def health_check():
       'status': 'healthy',
       'upload_folder': UPLOAD_FOLDER,
       'processed_folder': PROCESSED_FOLDER,
-      'database': 'connected'
+      'database': 'connected',
+      'ocr_cache': ocr_result_cache.stats()
   }), 200
\ No newline at end of file
@@ -0,0 +1,170 @@
+# auto_match.py
+
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from ..models import db, Invoice, Order, OrderItem, OrderModelKey, DocumentComparison, ensure_tables, load_document_items
+from ..models import store_comparison_blob, prune_comparison_blobs
+from .fuzzy_match import FuzzyMatcher, ocr_canonical
+from .reconciliation import fuzzy_model_keys, item_table, reconcile
+
+logger = logging.getLogger(__name__)
+
+# SQLite 바인드 변수 한도를 넘지 않도록 IN 조회를 나누는 크기
+LOOKUP_CHUNK_SIZE = 500
+
+
+def index_keys(model_codes: Iterable[str]) -> Set[str]:
+    """모델 코드 목록 → 역색인 키 집합 (비교 엔진의 퍼지 매칭 후보 문자열을 OCR 대표 문자로 통일)
+
+    'AJ1O23' 과 'AJ1023' 이 같은 키가 되므로 OCR 이 숫자를 문자로 읽은 인보이스도 후보 오더를 찾는다.
+    """
+    codes = pd.DataFrame({'model_code': list(model_codes)})
+    if codes.empty:
+        return set()
+    return {ocr_canonical(key) for key in fuzzy_model_keys(codes).unique() if key}
+
+
+def index_order_items(order_id: str, item_rows: List[Dict[str, Any]]) -> None:
+    """새 오더시트 품목의 모델 코드를 역색인에 추가 (호출한 트랜잭션 안에서 실행, 커밋은 호출 측)"""
+    keys = index_keys(row.get('model_code') for row in item_rows)
+    db.session.bulk_insert_mappings(OrderModelKey, [
+        {'model_key': key, 'order_id': order_id} for key in sorted(keys)
+    ])
+
+
+def init_order_model_index() -> None:
+    """역색인 테이블 생성 및 기존 오더시트 품목으로 채우기 (색인이 비어 있을 때 1회)"""
+    ensure_tables(OrderModelKey)
+
+    if db.session.query(OrderModelKey.order_id).first() is not None:
+        return
+
+    rows = db.session.query(OrderItem.order_id, OrderItem.model_code).all()
+    if not rows:
+        return
+
+    items = pd.DataFrame(rows, columns=['order_id', 'model_code'])
+    items['model_key'] = fuzzy_model_keys(items).map(ocr_canonical)
+    items = items[items['model_key'] != ''].drop_duplicates(['model_key', 'order_id'])
+    db.session.bulk_insert_mappings(OrderModelKey, items[['model_key', 'order_id']].to_dict('records'))
+    db.session.commit()
+    logger.info(f"오더시트 모델 코드 색인 생성: {len(items)}건")
+
+
+class AutoReconciler:
+    """새 인보이스를 오더시트와 자동 대조해 상위 결과를 비교 이력에 저장
+
+    후보 오더는 모델 코드 역색인(order_model_keys)에서 인보이스 키를 공유하는 개수 순으로만 가져오며,
+    후보마다 /orders/compare 와 같은 비교 엔진으로 채점한다. 저장 결과는 manually_compared=False 로
+    남기므로 비교 이력 기본 조회와 통계 집계에는 포함되지 않는다.
+    """
+
+    def __init__(self, matcher: Optional[FuzzyMatcher] = None, top_n: int = 3, max_candidates: int = 10):
+        """
+        Args:
+            matcher: 모델 코드 퍼지 매처 (없으면 기본 설정)
+            top_n: 저장할 상위 대조 결과 수
+            max_candidates: 채점할 후보 오더 수
+        """
+        self.matcher = matcher or FuzzyMatcher()
+        self.top_n = top_n
+        self.max_candidates = max_candidates
+
+    def candidate_orders(self, keys: Iterable[str]) -> List[Tuple[str, int]]:
+        """역색인에서 키를 많이 공유하는 오더 ID (공유 키 수 순)
+
+        Returns:
+            [(오더 ID, 공유 키 수), ...] (최대 max_candidates 개)
+        """
+        keys = sorted(set(keys))
+        shared = Counter()
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            rows = db.session.query(OrderModelKey.order_id, db.func.count())\
+                             .filter(OrderModelKey.model_key.in_(keys[start:start + LOOKUP_CHUNK_SIZE]))\
+                             .group_by(OrderModelKey.order_id).all()
+            for order_id, count in rows:
+                shared[order_id] += count
+        # 공유 키 수가 같으면 최근 오더 우선
+        ranked = sorted(shared.items(), key=lambda entry: (-entry[1], _id_number(entry[0])))
+        return ranked[:self.max_candidates]
+
+    def reconcile_invoice(self, invoice_id: str) -> List[Dict[str, Any]]:
+        """인보이스를 후보 오더시트와 대조하고 상위 결과를 저장
+
+        같은 인보이스의 이전 자동 대조 결과는 새 결과로 바꾼다.
+
+        Returns:
+            저장한 대조 결과 요약 목록 (점수 높은 순)
+        """
+        invoice = db.session.get(Invoice, invoice_id)
+        if not invoice:
+            return []
+
+        invoice_table = item_table(*load_document_items('invoice', invoice_id))
+        invoice_keys = invoice_table['key'].unique()
+        candidates = self.candidate_orders(ocr_canonical(key) for key in invoice_keys if key)
+
+        scored = []
+        for order_id, shared_keys in candidates:
+            result = reconcile(invoice_table, item_table(*load_document_items('order', order_id)),
+                               matcher=self.matcher)
+            # 인보이스 품목 중 오더에서 찾은 비율을 먼저, 일치율을 다음으로 본다
+            found = sum(1 for mismatch in result['mismatches'] if 'mismatched_fields' in mismatch)
+            coverage = (result['summary']['matched_items'] + found) / len(invoice_keys)
+            if coverage > 0:
+                scored.append((coverage, result['summary']['match_percentage'], order_id, shared_keys, result))
+        scored.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+
+        previous = DocumentComparison.query.filter_by(document1_id=invoice_id, manually_compared=False)
+        replaced_blobs = [digest for (digest,) in previous.with_entities(DocumentComparison.blob_digest)]
+        previous.delete(synchronize_session=False)
+
+        orders = {order.id: order for order in Order.query.filter(
+            Order.id.in_([entry[2] for entry in scored[:self.top_n]])
+        )} if scored else {}
+
+        saved = []
+        for coverage, match_percentage, order_id, shared_keys, result in scored[:self.top_n]:
+            order = orders.get(order_id)
+            comparison_result = {
+                'document_types': {'doc1': 'invoice', 'doc2': 'order'},
+                **result,
+                'auto_match': {'coverage': round(coverage * 100, 2), 'shared_keys': shared_keys}
+            }
+            comparison = DocumentComparison(
+                document1_id=invoice_id,
+                document1_type='invoice',
+                document2_id=order_id,
+                document2_type='order',
+                match_percentage=match_percentage,
+                matched_items=result['summary']['matched_items'],
+                mismatched_items=result['summary']['mismatched_items'],
+                total_items=result['summary']['total_items'],
+                blob_digest=store_comparison_blob(comparison_result),
+                brand=invoice.brand or (order.brand if order else '') or '',
+                season=invoice.season or (order.season if order else '') or '',
+                manually_compared=False
+            )
+            db.session.add(comparison)
+            saved.append((comparison, coverage, shared_keys))
+        db.session.flush()
+        prune_comparison_blobs(replaced_blobs)  # 바뀐 결과의 이전 본문 정리 (같은 내용이면 재사용되어 남음)
+        db.session.commit()
+
+        return [{
+            'comparison_id': comparison.id,
+            'order_id': comparison.document2_id,
+            'match_percentage': comparison.match_percentage,
+            'coverage': round(coverage * 100, 2),
+            'shared_keys': shared_keys
+        } for comparison, coverage, shared_keys in saved]
+
+
+def _id_number(document_id: str) -> int:
+    """문서 ID 정렬용 음수 순번 ('order_12' → -12, 최근 문서가 앞으로)"""
+    number = document_id.rsplit('_', 1)[-1]
+    return -int(number) if number.isdigit() else 0
@@ -4,12 +4,31 @@ import logging
 import re
 from typing import Dict, List, Any, Tuple, Optional
 
+import pandas as pd
+
+from .item_records import column
+from .fuzzy_match import FuzzyMatcher
+from .reconciliation import CompareField, model_color_keys, reconcile
+
+# 제품 비교 필드 (사이즈별 수량은 항상 비교)
+PRODUCT_FIELDS: List[CompareField] = [
+    ('quantity', '총 수량', 'int'),
+    ('price', '단가', 'exact'),
+    ('color', '색상', 'text'),
+    ('total_price', '총 금액', 'exact'),
+]
+
 class DocumentComparator:
     """문서 비교 클래스: 인보이스와 오더 시트 등 서로 다른 문서 간의 비교 기능 제공"""
     
-    def __init__(self):
-        """비교기 초기화"""
+    def __init__(self, matcher: Optional[FuzzyMatcher] = None):
+        """비교기 초기화
+        
+        Args:
+            matcher: 키가 다른 제품을 OCR 오인식 기준으로 짝지을 매처 (기본값: FuzzyMatcher())
+        """
         self.logger = logging.getLogger(__name__)
+        self.matcher = matcher or FuzzyMatcher()
     
     def compare_documents(self, doc1: Dict[str, Any], doc2: Dict[str, Any]) -> Dict[str, Any]:
         """두 문서를 비교하여 일치/불일치 정보 반환
@@ -259,7 +278,7 @@ class DocumentComparator:
         return comparison
     
     def _compare_products(self, products1: List[Dict[str, Any]], products2: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """제품 항목 비교
+        """제품 항목 비교 (/orders/compare 와 같은 비교 엔진 사용, 두 제품 모두 값이 있는 필드/사이즈만 비교)
         
         Args:
             products1: 첫 번째 문서의 제품 목록 (표준화됨)
@@ -268,185 +287,34 @@ class DocumentComparator:
         Returns:
             제품 비교 결과
         """
-        comparison = {
-            'matches': [],
-            'mismatches': [],
-            'summary': {
-                'total_items': 0,
-                'matched_items': 0,
-                'mismatched_items': 0,
-                'match_percentage': 0
-            }
-        }
-        
-        # 제품 식별 키 생성
-        products1_by_key = {}
-        for product in products1:
-            key = self._generate_product_key(product)
-            products1_by_key[key] = product
-        
-        products2_by_key = {}
-        for product in products2:
-            key = self._generate_product_key(product)
-            products2_by_key[key] = product
-        
-        # 모든 제품 키 합집합
-        all_product_keys = set(products1_by_key.keys()) | set(products2_by_key.keys())
-        comparison['summary']['total_items'] = len(all_product_keys)
-        
-        # 각 제품 비교
-        for key in all_product_keys:
-            product1 = products1_by_key.get(key)
-            product2 = products2_by_key.get(key)
-            
-            if not product1 or not product2:
-                # 한쪽에만 존재하는 항목
-                comparison['mismatches'].append({
-                    'product_key': key,
-                    'doc1_exists': bool(product1),
-                    'doc2_exists': bool(product2),
-                    'reason': '한쪽 문서에만 존재',
-                    'product_name': (product1 or product2).get('모델명', key)
-                })
-                comparison['summary']['mismatched_items'] += 1
-                continue
-            
-            # 제품 세부 필드 비교
-            field_comparison = self._compare_product_fields(product1, product2)
-            
-            if field_comparison['mismatched_fields']:
-                comparison['mismatches'].append({
-                    'product_key': key,
-                    'product_name': product1.get('모델명', key),
-                    'doc1_exists': True,
-                    'doc2_exists': True,
-                    'mismatched_fields': field_comparison['mismatched_fields']
-                })
-                comparison['summary']['mismatched_items'] += 1
-            else:
-                comparison['matches'].append({
-                    'product_key': key,
-                    'product_name': product1.get('모델명', key),
-                    'size': self._get_size_summary(product1),
-                    'quantity': product1.get('총_수량', 0),
-                    'price': product1.get('구매가', '')
-                })
-                comparison['summary']['matched_items'] += 1
-        
-        # 일치율 계산
-        if comparison['summary']['total_items'] > 0:
-            comparison['summary']['match_percentage'] = round(
-                comparison['summary']['matched_items'] / 
-                comparison['summary']['total_items'] * 100,
-                2
-            )
-        
-        return comparison
+        return reconcile(self._product_table(products1), self._product_table(products2),
+                         fields=PRODUCT_FIELDS, matcher=self.matcher, skip_missing=True)
     
-    def _get_size_summary(self, product: Dict[str, Any]) -> str:
-        """제품의 사이즈 요약 문자열 생성
-
-        Args:
-            product: 제품 정보
-
-        Returns:
-            사이즈 요약 문자열 (예: "39(1), 40(2), 41(1)")
-        """
-        size_info = []
-        for size in range(39, 47):
-            size_key = f'사이즈_{size}'
-            if size_key in product and product[size_key] > 0:
-                size_info.append(f"{size}({product[size_key]})")
-        
-        return ", ".join(size_info) if size_info else "-"
-    
-    def _compare_product_fields(self, product1: Dict[str, Any], product2: Dict[str, Any]) -> Dict[str, List]:
-        """제품 세부 필드 비교
+    def _product_table(self, products: List[Dict[str, Any]]) -> pd.DataFrame:
+        """표준화된 제품 목록을 비교 테이블로 변환 (키: 모델 코드 + 컬러)
         
         Args:
-            product1: 첫 번째 문서의 제품 정보 (표준화됨)
-            product2: 두 번째 문서의 제품 정보 (표준화됨)
+            products: 제품 목록 (표준화됨)
             
         Returns:
-            필드 비교 결과
+            비교 테이블 DataFrame
         """
-        result = {
-            'matched_fields': [],
-            'mismatched_fields': []
-        }
-        
-        # 비교할 필드 목록
-        fields_to_compare = [
-            ('총_수량', '총 수량'),
-            ('구매가', '단가'),
-            ('컬러', '색상'),
-            ('총_금액', '총 금액')
-        ]
-        
-        # 사이즈별 수량도 비교
-        for size in range(39, 47):
-            size_key = f'사이즈_{size}'
-            fields_to_compare.append((size_key, f'사이즈 {size}'))
-        
-        # 각 필드 비교
-        for field, display_name in fields_to_compare:
-            value1 = product1.get(field)
-            value2 = product2.get(field)
-            
-            # 두 값 모두 존재하는 경우만 비교
-            if value1 is not None and value2 is not None:
-                # 수량과 금액 필드는 타입 변환 없이 직접 비교 (이미 표준화됨)
-                if field == '총_수량' or field.startswith('사이즈_'):
-                    equal = value1 == value2
-                elif field == '구매가' or field == '총_금액':
-                    equal = value1 == value2
-                else:
-                    # 텍스트 필드는 일반 정규화 후 비교
-                    equal = self._normalize_value(value1) == self._normalize_value(value2)
-                
-                if equal:
-                    result['matched_fields'].append(display_name)
-                else:
-                    result['mismatched_fields'].append({
-                        'field': display_name,
-                        'value1': value1,
-                        'value2': value2
-                    })
-        
-        return result
-    
-    def _generate_product_key(self, product: Dict[str, Any]) -> str:
-        """제품 식별을 위한 키 생성
-        
-        Args:
-            product: 제품 정보
-            
-        Returns:
-            고유 식별 키
-        """
-        # 제품 코드 가져오기
-        product_code = product.get('모델코드', '')
-        
-        # 제품 코드가 없는 경우 대체 식별자 사용
-        if not product_code:
-            # 모델명에서 코드 추출 시도
-            model_name = product.get('모델명', '')
-            code_match = re.search(r'(AJ\d+|A[JRCSL]\d+)', model_name)
-            if code_match:
-                product_code = code_match.group(1)
-            else:
-                # 스타일 코드 사용 시도
-                product_code = product.get('스타일코드', 'unknown')
-        
-        # 키 생성 시 컬러 정보 포함
-        color = product.get('컬러', '')
-        
-        # 키 생성 (모델 코드 + 컬러를 기본으로 사용)
-        key_parts = [product_code]
-        if color:
-            key_parts.append(color)
-        
-        return '_'.join(key_parts).lower()
+        records = pd.DataFrame.from_records(products)
+        # 없는 필드는 None (비교에서 제외)
+        table = pd.DataFrame({
+            'model_code': column(records, ['모델코드'], None),
+            'model_name': column(records, ['모델명'], None),
+            'color': column(records, ['컬러'], None),
+            'quantity': column(records, ['총_수량'], None),
+            'price': column(records, ['구매가'], None),
+            'total_price': column(records, ['총_금액'], None),
+        }, index=records.index)
+        
+        extra_columns = [name for name in records.columns
+                         if name == '스타일코드' or (isinstance(name, str) and name.startswith('사이즈_'))]
+        table = pd.concat([table, records[extra_columns]], axis=1)
+        table['key'] = model_color_keys(table)
+        return table
     
     def _normalize_value(self, value: Any) -> str:
         """비교를 위한 값 정규화
@@ -0,0 +1,87 @@
+# document_export.py
+
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from ..models import db, ITEM_MODELS, load_item_sizes
+from .item_records import sort_sizes
+
+# 문서 유형별 시트 이름
+SHEET_TITLES = {'invoice': '인보이스', 'order': '오더시트'}
+
+# 품목 공통 컬럼 (모델 속성명, 헤더)
+ITEM_EXPORT_COLUMNS = [
+    ('model_code', '모델코드'),
+    ('model_name', '모델명'),
+    ('color', '컬러'),
+    ('wholesale_price', '구매가'),
+    ('quantity', '총_수량'),
+    ('total_price', '총_금액'),
+]
+
+# 문서 유형별 추가 컬럼
+EXTRA_EXPORT_COLUMNS = {
+    'invoice': [('retail_price', '판매가')],
+    'order': [('shipping_start', '선적_시작일'), ('shipping_end', '선적_완료일')],
+}
+
+
+def _date_filter(parent_model, start: Optional[datetime], end: Optional[datetime]) -> list:
+    """문서 등록일 기간 조건"""
+    conditions = []
+    if start:
+        conditions.append(parent_model.created_at >= start)
+    if end:
+        conditions.append(parent_model.created_at <= end)
+    return conditions
+
+
+def document_export_rows(doc_type: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                         batch_size: int = 1000) -> Tuple[List[str], Iterator[tuple]]:
+    """기간 내 문서 품목을 내보내기 행으로 조회 (품목 ID 키셋 배치, 메모리 사용량은 배치 크기만큼)
+
+    Args:
+        doc_type: 'invoice' 또는 'order'
+        start: 문서 등록일 시작 (포함)
+        end: 문서 등록일 끝 (포함)
+        batch_size: 한 번에 읽는 품목 수
+
+    Returns:
+        (헤더, 행 이터레이터) - 사이즈 컬럼은 기간 내 문서에 나오는 사이즈 전체 (정렬 순)
+    """
+    parent_model, item_model, size_model, parent_field = ITEM_MODELS[doc_type]
+    parent_id = getattr(item_model, parent_field)
+    conditions = _date_filter(parent_model, start, end)
+
+    # 사이즈 컬럼은 행을 쓰기 전에 정해야 하므로 DISTINCT 로 먼저 조회
+    sizes = sort_sizes(
+        size for (size,) in db.session.query(size_model.size).distinct()
+        .join(item_model, item_model.id == size_model.item_id)
+        .join(parent_model, parent_model.id == parent_id)
+        .filter(*conditions)
+    )
+
+    item_columns = ITEM_EXPORT_COLUMNS + EXTRA_EXPORT_COLUMNS[doc_type]
+    header = ['문서_ID', '브랜드', '시즌', '등록일'] + [label for _, label in item_columns] + \
+             [f'사이즈_{size}' for size in sizes]
+
+    def rows():
+        last_id = 0
+        while True:
+            batch = db.session.query(
+                item_model.id, parent_id, parent_model.brand, parent_model.season, parent_model.created_at,
+                *[getattr(item_model, name) for name, _ in item_columns]
+            ).join(parent_model, parent_model.id == parent_id)\
+             .filter(*conditions, item_model.id > last_id)\
+             .order_by(item_model.id).limit(batch_size).all()
+            if not batch:
+                return
+
+            item_sizes = load_item_sizes(doc_type, [row[0] for row in batch])
+            for item_id, document_id, brand, season, created_at, *values in batch:
+                quantities = item_sizes.get(item_id, {})
+                yield (document_id, brand, season, created_at.strftime('%Y-%m-%d %H:%M:%S') if created_at else None,
+                       *values, *[quantities.get(size) for size in sizes])
+            last_id = batch[-1][0]
+
+    return header, rows()
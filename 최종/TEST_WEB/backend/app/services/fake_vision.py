@@ -0,0 +1,169 @@
+# fake_vision.py
+
+import os
+import json
+import time
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+def save_fixture(path: str, page: np.ndarray, words: List[Dict[str, Any]]) -> str:
+    """가짜 클라이언트 fixture 저장 (페이지는 같은 폴더의 PNG, 단어 목록은 JSON)
+
+    Returns:
+        저장한 fixture JSON 경로
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    image_name = os.path.splitext(os.path.basename(path))[0] + '.png'
+    cv2.imwrite(os.path.join(directory, image_name), page)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'page': image_name, 'words': words}, f, ensure_ascii=False)
+    return path
+
+
+def load_fixture(path: str) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """save_fixture 로 저장한 (페이지 이미지, 단어 목록) 읽기 (페이지 경로는 fixture 폴더 기준)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        fixture = json.load(f)
+    image_path = os.path.join(os.path.dirname(os.path.abspath(path)), fixture['page'])
+    page = cv2.imread(image_path)
+    if page is None:
+        raise ValueError(f"fixture 페이지 이미지를 읽을 수 없습니다: {image_path}")
+    return page, fixture['words']
+
+
+class FakeVisionClient:
+    """오프라인 벤치마크/개발용 Vision API 대체 클라이언트
+
+    페이지 좌표로 등록된 단어(canned annotation)를 돌려준다. 요청 이미지가 페이지 전체(또는 세로 타일)면
+    해당 범위의 단어를, 잘라낸 영역이면 템플릿 매칭으로 위치를 찾아 그 안의 단어를 반환한다.
+    호출 수와 누적 지연 시간을 기록하므로 영역별/일괄 OCR 방식의 비용을 비교할 수 있다.
+    """
+
+    def __init__(self, page: np.ndarray, words: List[Dict[str, Any]], latency: float = 0.0):
+        """가짜 클라이언트 초기화
+
+        Args:
+            page: 등록할 페이지 이미지 (BGR 또는 그레이스케일)
+            words: 페이지 좌표의 단어 목록 ({'text', 'x0', 'y0', 'x1', 'y1'})
+            latency: 호출당 흉내낼 네트워크 지연 (초)
+        """
+        self.page_gray = page if page.ndim == 2 else cv2.cvtColor(page, cv2.COLOR_BGR2GRAY)
+        self.words = words
+        self.latency = latency
+
+        self.calls = 0
+        self.bytes_sent = 0
+        self.simulated_latency = 0.0
+        self.overhead = 0.0  # 위치 탐색 등 가짜 클라이언트 자체 처리 시간 (벤치마크에서 제외용)
+        self._lock = threading.Lock()
+        self._small = None
+
+    def reset(self):
+        """호출 통계 초기화"""
+        with self._lock:
+            self.calls = 0
+            self.bytes_sent = 0
+            self.simulated_latency = 0.0
+            self.overhead = 0.0
+
+    def text_detection(self, image=None, **kwargs):
+        """vision.ImageAnnotatorClient.text_detection 과 같은 형태의 응답 반환"""
+        started = time.perf_counter()
+        content = image.content
+        decoded = cv2.imdecode(np.frombuffer(content, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        offset = self._locate(decoded) if decoded is not None else None
+        response = self._build_response(decoded, offset)
+        elapsed = time.perf_counter() - started
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.calls += 1
+            self.bytes_sent += len(content)
+            self.simulated_latency += self.latency
+            self.overhead += elapsed
+
+        return response
+
+    def document_text_detection(self, image=None, **kwargs):
+        """document_text_detection 도 동일한 응답 사용 (full_text_annotation 포함)"""
+        return self.text_detection(image=image, **kwargs)
+
+    def _locate(self, crop: np.ndarray) -> Optional[tuple]:
+        """요청 이미지가 페이지의 어느 위치인지 찾기"""
+        page_h, page_w = self.page_gray.shape[:2]
+        crop_h, crop_w = crop.shape[:2]
+
+        # 페이지 전체 너비의 요청은 세로 타일 → 행 단위 비교로 빠르게 위치 결정
+        if crop_w == page_w:
+            if crop_h == page_h:
+                return 0, 0
+            result = cv2.matchTemplate(self.page_gray[:, :min(page_w, 256)], crop[:, :min(page_w, 256)], cv2.TM_SQDIFF)
+            _, _, min_loc, _ = cv2.minMaxLoc(result)
+            return 0, min_loc[1]
+
+        if crop_h > page_h or crop_w > page_w:
+            return None
+
+        # 1/4 축소본에서 대략적인 위치를 찾은 뒤 원본 해상도 주변에서 보정
+        scale = 4 if min(crop_h, crop_w) >= 16 else 1
+        if scale > 1:
+            small_crop = cv2.resize(crop, (crop_w // scale, crop_h // scale), interpolation=cv2.INTER_AREA)
+            result = cv2.matchTemplate(self._small_page(scale), small_crop, cv2.TM_SQDIFF)
+            _, _, (sx, sy), _ = cv2.minMaxLoc(result)
+            margin = 2 * scale
+            x_start = max(0, sx * scale - margin)
+            y_start = max(0, sy * scale - margin)
+            window = self.page_gray[y_start:min(page_h, sy * scale + crop_h + margin),
+                                    x_start:min(page_w, sx * scale + crop_w + margin)]
+        else:
+            x_start, y_start, window = 0, 0, self.page_gray
+
+        result = cv2.matchTemplate(window, crop, cv2.TM_SQDIFF)
+        _, _, (mx, my), _ = cv2.minMaxLoc(result)
+        return x_start + mx, y_start + my
+
+    def _small_page(self, scale: int) -> np.ndarray:
+        """축소한 페이지 이미지 (최초 1회 생성)"""
+        if self._small is None or self._small[0] != scale:
+            page_h, page_w = self.page_gray.shape[:2]
+            self._small = (scale, cv2.resize(self.page_gray, (page_w // scale, page_h // scale), interpolation=cv2.INTER_AREA))
+        return self._small[1]
+
+    def _build_response(self, crop: Optional[np.ndarray], offset: Optional[tuple]):
+        """위치가 결정된 요청 영역 안의 단어로 응답 객체 구성"""
+        annotations = []
+        if crop is not None and offset is not None:
+            ox, oy = offset
+            crop_h, crop_w = crop.shape[:2]
+            for word in self.words:
+                cx = (word['x0'] + word['x1']) / 2
+                cy = (word['y0'] + word['y1']) / 2
+                if ox <= cx < ox + crop_w and oy <= cy < oy + crop_h:
+                    vertices = [
+                        SimpleNamespace(x=int(word['x0'] - ox), y=int(word['y0'] - oy)),
+                        SimpleNamespace(x=int(word['x1'] - ox), y=int(word['y0'] - oy)),
+                        SimpleNamespace(x=int(word['x1'] - ox), y=int(word['y1'] - oy)),
+                        SimpleNamespace(x=int(word['x0'] - ox), y=int(word['y1'] - oy)),
+                    ]
+                    annotations.append(SimpleNamespace(
+                        description=word['text'],
+                        bounding_poly=SimpleNamespace(vertices=vertices)
+                    ))
+
+        full_text = " ".join(a.description for a in annotations)
+        if annotations:
+            annotations.insert(0, SimpleNamespace(description=full_text, bounding_poly=SimpleNamespace(vertices=[])))
+
+        return SimpleNamespace(
+            error=SimpleNamespace(message=''),
+            text_annotations=annotations,
+            full_text_annotation=SimpleNamespace(text=full_text)
+        )
@@ -0,0 +1,152 @@
+# fuzzy_match.py
+
+from collections import Counter, defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+
+# OCR 에서 자주 뒤바뀌는 문자 → 대표 문자 (소문자 기준)
+OCR_CONFUSIONS = {
+    'o': '0', 'q': '0',
+    'i': '1', 'l': '1', '|': '1',
+    's': '5',
+    'b': '8',
+    'z': '2',
+    'g': '6',
+}
+
+# 편집 비용: OCR 혼동 치환은 거의 같은 문자로 보고, 숫자끼리의 치환은 다른 모델로 본다
+CONFUSION_COST = 0.2
+EDIT_COST = 1.0
+DIGIT_SUBSTITUTION_COST = 2.0
+
+
+def ocr_canonical(text: str) -> str:
+    """OCR 혼동 문자를 대표 문자로 바꾼 문자열 (AJ1O23 → aj1023)"""
+    return ''.join(OCR_CONFUSIONS.get(char, char) for char in str(text).lower())
+
+
+def ocr_distance(a: str, b: str) -> float:
+    """OCR 혼동을 반영한 가중 편집 거리 (O/0, I/1, S/5 치환은 0.2)"""
+    a, b = str(a).lower(), str(b).lower()
+    canonical_a, canonical_b = ocr_canonical(a), ocr_canonical(b)
+
+    # 길이가 같고 혼동 문자만 다른 경우(가장 흔한 OCR 오류)는 편집 거리 계산 없이 바로 계산
+    if canonical_a == canonical_b:
+        return CONFUSION_COST * sum(1 for char_a, char_b in zip(a, b) if char_a != char_b)
+
+    previous = [j * EDIT_COST for j in range(len(b) + 1)]
+    for i, char_a in enumerate(a, 1):
+        current = [i * EDIT_COST]
+        for j, char_b in enumerate(b, 1):
+            if char_a == char_b:
+                cost = 0.0
+            elif canonical_a[i - 1] == canonical_b[j - 1]:
+                cost = CONFUSION_COST
+            elif char_a.isdigit() and char_b.isdigit():
+                cost = DIGIT_SUBSTITUTION_COST
+            else:
+                cost = EDIT_COST
+            current.append(min(previous[j] + EDIT_COST, current[j - 1] + EDIT_COST, previous[j - 1] + cost))
+        previous = current
+    return previous[-1]
+
+
+def ocr_similarity(a: str, b: str) -> float:
+    """OCR 혼동을 반영한 유사도 (0 ~ 1, 1 은 같은 코드)"""
+    length = max(len(str(a)), len(str(b)))
+    if length == 0:
+        return 1.0
+    return max(0.0, 1.0 - ocr_distance(a, b) / length)
+
+
+class FuzzyMatcher:
+    """OCR 오인식이 있는 제품 키를 n-gram 색인으로 짝짓는 매처
+
+    두 번째 목록의 키를 OCR 대표 문자로 바꾼 n-gram 역색인에 넣고, 첫 번째 목록의 키마다
+    n-gram 을 많이 공유하는 후보 몇 개만 가중 편집 거리로 채점한다. 대표 문자열이 같은 키(혼동 문자만
+    다른 경우)는 해시 조회로 바로 찾는다. 모든 쌍을 비교하지 않으므로 품목 수가 늘어도 후보 채점
+    횟수는 키 수에 비례한다.
+    """
+
+    def __init__(self, min_confidence: float = 0.9, ngram: int = 3,
+                 max_candidates: int = 8, max_postings: int = 200):
+        """
+        Args:
+            min_confidence: 짝지을 최소 유사도 (0 ~ 1)
+            ngram: 색인 n-gram 길이
+            max_candidates: 키마다 채점할 후보 수
+            max_postings: 이보다 많은 키에 나오는 n-gram(예: 공통 접두어 'aj')은 후보 검색에서 제외
+        """
+        self.min_confidence = min_confidence
+        self.ngram = ngram
+        self.max_candidates = max_candidates
+        self.max_postings = max_postings
+
+    def _grams(self, key: str) -> Set[str]:
+        """앞뒤를 채운 OCR 대표 문자열의 n-gram 집합"""
+        padded = f"{'^' * (self.ngram - 1)}{ocr_canonical(key)}$"
+        return {padded[i:i + self.ngram] for i in range(len(padded) - self.ngram + 1)}
+
+    def _build_index(self, keys: Sequence[str]) -> Dict[str, List[int]]:
+        """n-gram → 키 위치 목록 역색인"""
+        index = defaultdict(list)
+        for position, key in enumerate(keys):
+            for gram in self._grams(key):
+                index[gram].append(position)
+        return index
+
+    def candidates(self, key: str, index: Dict[str, List[int]]) -> List[int]:
+        """n-gram 을 많이 공유하는 후보 키 위치 (공유 개수 순)
+
+        편집 한 번은 키의 n-gram 을 최대 n 개까지만 바꾸므로, 최소 신뢰도에서 허용되는 편집 횟수로
+        공유 n-gram 하한을 정해 그보다 적게 공유하는 후보는 채점하지 않는다.
+        """
+        # 너무 흔한 n-gram 은 검색에서 빼고, 하한도 검색에 쓰는 n-gram 수 기준으로 계산
+        grams = [gram for gram in self._grams(key) if len(index.get(gram, ())) <= self.max_postings]
+        max_edits = int((1 - self.min_confidence) * len(key) / EDIT_COST)
+        min_shared = max(1, len(grams) - self.ngram * max_edits)
+
+        shared = Counter()
+        for gram in grams:
+            shared.update(index.get(gram, ()))
+        return [position for position, count in shared.most_common(self.max_candidates) if count >= min_shared]
+
+    def pair(self, keys1: Sequence[str], keys2: Sequence[str]) -> List[Tuple[str, str, float]]:
+        """두 키 목록을 일대일로 짝짓기 (유사도 높은 쌍부터 배정)
+
+        Args:
+            keys1: 첫 번째 문서에만 있는 키 목록
+            keys2: 두 번째 문서에만 있는 키 목록
+
+        Returns:
+            [(키1, 키2, 신뢰도), ...] (신뢰도 min_confidence 이상, 높은 순)
+        """
+        keys1, keys2 = list(keys1), list(keys2)
+        if not keys1 or not keys2:
+            return []
+
+        index = self._build_index(keys2)
+        canonical_index = defaultdict(list)
+        for position2, key2 in enumerate(keys2):
+            canonical_index[ocr_canonical(key2)].append(position2)
+
+        scored = []
+        for position1, key1 in enumerate(keys1):
+            # 혼동 문자만 다른 키가 있으면 그 키들만, 없으면 n-gram 후보 채점
+            candidates = canonical_index.get(ocr_canonical(key1)) or self.candidates(key1, index)
+            for position2 in candidates:
+                # 길이 차이만으로 최소 신뢰도에 못 미치면 채점 생략
+                longest = max(len(key1), len(keys2[position2]), 1)
+                if abs(len(key1) - len(keys2[position2])) * EDIT_COST / longest > 1 - self.min_confidence:
+                    continue
+                confidence = ocr_similarity(key1, keys2[position2])
+                if confidence >= self.min_confidence:
+                    scored.append((-confidence, position1, position2))
+
+        pairs, used1, used2 = [], set(), set()
+        for negative_confidence, position1, position2 in sorted(scored):
+            if position1 in used1 or position2 in used2:
+                continue
+            used1.add(position1)
+            used2.add(position2)
+            pairs.append((keys1[position1], keys2[position2], round(-negative_confidence, 4)))
+        return pairs
@@ -0,0 +1,211 @@
+# item_records.py
+
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# OCR 결과의 사이즈 컬럼 접두어 (사이즈_39, size_M ...)
+SIZE_COLUMN_PREFIXES = ('사이즈_', 'size_')
+
+# 의류 사이즈 정렬 순서
+APPAREL_SIZE_ORDER = ['XXS', 'XS', 'S', 'M', 'L', 'XL', 'XXL', 'XXXL']
+
+
+def column(df: pd.DataFrame, names: List[str], default='') -> pd.Series:
+    """후보 컬럼명(한글 → 영문 순) 중 처음 존재하는 컬럼을 반환 (없으면 기본값으로 채운 Series)"""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return pd.Series(default, index=df.index)
+
+
+def text_column(df: pd.DataFrame, names: List[str]) -> pd.Series:
+    """문자열 컬럼 (결측값은 빈 문자열)"""
+    series = column(df, names)
+    return series.where(series.notna(), '')
+
+
+def int_column(df: pd.DataFrame, names: List[str]) -> pd.Series:
+    """정수 컬럼 (빈 값/숫자가 아닌 값은 0)"""
+    return pd.to_numeric(column(df, names, 0), errors='coerce').fillna(0).astype(int)
+
+
+def parse_amounts(series: pd.Series) -> pd.Series:
+    """'EUR 150.00', '$20' 형식의 금액 문자열을 한 번에 숫자로 변환 (변환 불가 값은 NaN)"""
+    cleaned = series.astype(str).str.replace('EUR', '', regex=False).str.replace('$', '', regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def sort_sizes(labels) -> List[str]:
+    """사이즈 정렬: 숫자 사이즈(39, 44.5 ...) → 의류 사이즈(XS ~ XXL) → 기타(문자순)"""
+    def sort_key(label):
+        label = str(label)
+        if re.fullmatch(r'\d+(\.\d+)?', label):
+            return (0, float(label), label)
+        if label.upper() in APPAREL_SIZE_ORDER:
+            return (1, APPAREL_SIZE_ORDER.index(label.upper()), label)
+        return (2, 0, label)
+    return sorted({str(label) for label in labels}, key=sort_key)
+
+
+def size_columns(df: pd.DataFrame) -> Dict[str, str]:
+    """DataFrame의 사이즈 컬럼 찾기 (같은 사이즈면 한글 컬럼 우선)
+
+    Returns:
+        {사이즈: 컬럼명}
+    """
+    columns = {}
+    for prefix in SIZE_COLUMN_PREFIXES:
+        for column_name in df.columns:
+            if isinstance(column_name, str) and column_name.startswith(prefix):
+                columns.setdefault(column_name[len(prefix):], column_name)
+    return {label: columns[label] for label in sort_sizes(columns)}
+
+
+def size_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """사이즈별 수량 행렬 (컬럼: 사이즈, 행: 품목)"""
+    return pd.DataFrame({
+        label: int_column(df, [column_name])
+        for label, column_name in size_columns(df).items()
+    }, index=df.index)
+
+
+def product_sizes(product: Dict) -> Dict[str, int]:
+    """제품 딕셔너리의 '사이즈_N' / 'size_N' 키에서 {사이즈: 수량} 추출 (수량 0 제외)"""
+    sizes = {}
+    for key, value in product.items():
+        for prefix in SIZE_COLUMN_PREFIXES:
+            if isinstance(key, str) and key.startswith(prefix):
+                try:
+                    quantity = int(value or 0)
+                except (TypeError, ValueError):
+                    quantity = 0
+                if quantity:
+                    sizes.setdefault(key[len(prefix):], quantity)
+    if isinstance(product.get('sizes'), dict):
+        for label, quantity in product['sizes'].items():
+            if quantity:
+                sizes.setdefault(str(label), int(quantity))
+    return sizes
+
+
+def size_summary(sizes: Dict[str, int]) -> str:
+    """사이즈 요약 문자열 (예: "39(1), 40(2), M(3)")"""
+    parts = [f"{label}({sizes[label]})" for label in sort_sizes(sizes) if sizes[label]]
+    return ", ".join(parts) if parts else "-"
+
+
+def size_diff(sizes1: Dict[str, int], sizes2: Dict[str, int]) -> List[Tuple[str, int, int]]:
+    """두 사이즈 구성의 차이 (사이즈 순서대로 (사이즈, 수량1, 수량2))"""
+    left, right = pd.Series(sizes1, dtype='int64').align(pd.Series(sizes2, dtype='int64'), fill_value=0)
+    changed = left.index[left.to_numpy() != right.to_numpy()]
+    return [(label, int(left[label]), int(right[label])) for label in sort_sizes(changed)]
+
+
+def size_totals(size_rows: pd.DataFrame) -> Dict[str, int]:
+    """사이즈 행(long 형식: size, quantity) 합계"""
+    if size_rows.empty:
+        return {}
+    totals = size_rows.groupby('size')['quantity'].sum()
+    return {label: int(totals[label]) for label in sort_sizes(totals.index)}
+
+
+def parse_date_string(date_str: str) -> Optional[date]:
+    """다양한 형식의 날짜 문자열을 date 객체로 변환"""
+    if not date_str or date_str.strip() == "":
+        return None
+
+    date_str = date_str.strip()
+
+    # MM/DD/YYYY 형식
+    try:
+        month, day, year = date_str.split('/')
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        pass
+
+    # DD-MM-YYYY 형식
+    try:
+        day, month, year = date_str.split('-')
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        pass
+
+    # YYYY-MM-DD 형식
+    try:
+        year, month, day = date_str.split('-')
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        pass
+
+    # 기타 형식은 datetime 파서로 시도
+    try:
+        dt = datetime.strptime(date_str, '%Y%m%d')
+        return dt.date()
+    except ValueError:
+        pass
+
+    return None
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """날짜 문자열 Series → date Series (서로 다른 문자열마다 한 번만 파싱, 실패는 None)"""
+    text = values.where(values.notna(), '').astype(str)
+    parsed = {value: parse_date_string(value) for value in text.unique()}
+    return text.map(parsed).astype(object)
+
+
+def build_item_rows(df: pd.DataFrame, parent_field: str, parent_id: str,
+                    with_shipping: bool = False, with_retail: bool = True) -> Tuple[List[Dict], List[Dict], float]:
+    """OCR 결과 DataFrame을 품목 테이블 insert 용 매핑 목록으로 변환
+
+    Args:
+        df: OCR 결과 (한글/영문 컬럼명 모두 허용)
+        parent_field: 부모 문서 컬럼명 ('invoice_id' 또는 'order_id')
+        parent_id: 부모 문서 ID
+        with_shipping: 선적 시작/완료일 포함 여부 (오더시트)
+        with_retail: 판매가 포함 여부 (인보이스)
+
+    Returns:
+        (품목 insert 매핑 목록, 사이즈 행 목록 {'row': 품목 순번, 'size', 'quantity'}, 품목 총액 합계)
+    """
+    if df.empty:
+        return [], [], 0.0
+
+    sizes = size_matrix(df)
+
+    # 총 수량: 사이즈 합계, 사이즈가 모두 비어 있으면 총_수량 컬럼 사용
+    quantity = sizes.sum(axis=1)
+    if '총_수량' in df.columns:
+        quantity = quantity.where(quantity != 0, int_column(df, ['총_수량']))
+
+    total_price = text_column(df, ['총_금액', 'total_price'])
+
+    items = pd.DataFrame({
+        parent_field: parent_id,
+        'model_code': text_column(df, ['모델코드', 'model']),
+        'model_name': text_column(df, ['모델명', 'full_model']),
+        'color': text_column(df, ['컬러', 'color']),
+        'wholesale_price': text_column(df, ['구매가', 'wholesale_price']),
+        'quantity': quantity,
+        'total_price': total_price,
+    }, index=df.index)
+    if with_retail:
+        items['retail_price'] = text_column(df, ['판매가', 'retail_price'])
+    if with_shipping:
+        items['shipping_start'] = text_column(df, ['선적_시작일', 'shipping_start'])
+        items['shipping_end'] = text_column(df, ['선적_완료일', 'shipping_end'])
+        # 캘린더 조회용 날짜 컬럼 (저장 시 한 번만 파싱)
+        items['shipping_start_date'] = parse_dates(items['shipping_start'])
+        items['shipping_end_date'] = parse_dates(items['shipping_end'])
+
+    # 사이즈 행렬을 (품목 순번, 사이즈, 수량) long 형식으로 펼치고 수량이 있는 칸만 저장
+    size_rows = sizes.set_axis(range(len(sizes))).rename_axis('row').reset_index()\
+                     .melt(id_vars='row', var_name='size', value_name='quantity')
+    size_rows = size_rows[size_rows['quantity'] != 0].sort_values(['row'], kind='stable')
+
+    total_amount = float(np.nansum(parse_amounts(total_price).to_numpy(dtype=float)))
+    return items.to_dict(orient='records'), size_rows.to_dict(orient='records'), total_amount
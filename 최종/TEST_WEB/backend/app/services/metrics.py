@@ -0,0 +1,232 @@
+# metrics.py
+
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 단계 소요 시간 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# 지표 설명 (Prometheus HELP)
+METRIC_HELP = {
+    'ocr_stage_seconds': 'OCR 파이프라인 단계별 소요 시간 (초)',
+    'ocr_bytes_sent_total': 'OCR 엔진에 보낸 이미지 바이트 수',
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """구간별 누적 개수/합계/개수를 보관하는 히스토그램 (Prometheus histogram 형식)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """프로세스 내 지표 집계기
+
+    히스토그램과 카운터는 observe/inc 로 누적하고, 게이지처럼 요청 시점에 읽는 값은 add_collector 로 등록한
+    함수가 render 할 때마다 만든다. render 는 Prometheus 텍스트 형식(0.0.4)을 반환한다.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._collectors: List[Callable[[], Iterable[tuple]]] = []
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels):
+        """히스토그램에 값 추가"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """카운터 증가"""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def add_collector(self, collector: Callable[[], Iterable[tuple]]):
+        """render 때마다 호출할 수집 함수 등록
+
+        Args:
+            collector: (이름, 종류('gauge' 또는 'counter'), 설명, [(라벨 dict, 값), ...]) 를 내는 함수
+        """
+        self._collectors.append(collector)
+
+    def reset(self):
+        """누적 지표 초기화 (수집 함수는 유지)"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 지표"""
+        lines = []
+        with self._lock:
+            histograms = {name: {key: (list(h.counts), h.total, h.count) for key, h in series.items()}
+                          for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+
+        for name in sorted(histograms):
+            self._header(lines, name, 'histogram')
+            for key, (counts, total, count) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += bucket_count
+                    le = '+Inf' if bound == float('inf') else _format_value(bound)
+                    lines.append(f"{name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(key)} {count}")
+
+        for name in sorted(counters):
+            self._header(lines, name, 'counter')
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+        for collector in self._collectors:
+            try:
+                for name, kind, help_text, samples in collector():
+                    lines.append(f"# HELP {name} {help_text}")
+                    lines.append(f"# TYPE {name} {kind}")
+                    for labels, value in samples:
+                        lines.append(f"{name}{_format_labels(_label_key(labels))} {_format_value(value)}")
+            except Exception as e:
+                # 수집 함수 하나가 실패해도 나머지 지표는 내보냄
+                logger.warning(f"지표 수집 실패 ({getattr(collector, '__name__', collector)}): {e}")
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _header(lines: List[str], name: str, kind: str):
+        if name in METRIC_HELP:
+            lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+# 전역 지표 집계기 (/orders/metrics 에서 출력)
+registry = MetricsRegistry()
+
+
+class Trace:
+    """문서 한 건의 단계별 소요 시간 요약 (같은 이름의 구간은 횟수/합계/최대로 합침)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float, values: Dict[str, float]):
+        with self._lock:
+            entry = self.spans.setdefault(name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += seconds * 1000
+            entry['max_ms'] = max(entry['max_ms'], seconds * 1000)
+            for key, value in values.items():
+                entry[key] = entry.get(key, 0) + value
+
+    def summary(self) -> Dict[str, Any]:
+        """작업 레코드에 붙일 요약 (ms 단위, 소수 첫째 자리)"""
+        with self._lock:
+            spans = {
+                name: {key: round(value, 1) if isinstance(value, float) else value for key, value in entry.items()}
+                for name, entry in self.spans.items()
+            }
+        return {'total_ms': round((time.perf_counter() - self.started) * 1000, 1), 'spans': spans}
+
+
+# 처리 스레드별 현재 추적 대상과 열린 구간 목록
+_local = threading.local()
+
+
+def current_trace() -> Optional[Trace]:
+    """현재 스레드의 문서 추적 (없으면 None)"""
+    return getattr(_local, 'trace', None)
+
+
+@contextmanager
+def tracing(trace: Optional[Trace] = None):
+    """블록 안에서 열리는 구간을 trace 에 기록 (페이지 작업 스레드에는 같은 trace 를 다시 넘겨 사용)"""
+    previous = current_trace()
+    _local.trace = trace if trace is not None else Trace()
+    try:
+        yield _local.trace
+    finally:
+        _local.trace = previous
+
+
+@contextmanager
+def span(stage: str, **labels):
+    """단계 구간 측정 (ocr_stage_seconds 히스토그램 + 현재 문서 추적)
+
+    Args:
+        stage: 단계 이름 (rasterize, preprocess, ocr_call, parse, dataframe, excel_write, db_persist 등)
+        labels: 히스토그램 라벨 (예: engine='vision'), 추적에서는 'stage[값]' 이름으로 구분
+    """
+    values: Dict[str, float] = {}
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append((stage, labels, values))
+    started = time.perf_counter()
+    try:
+        yield values
+    finally:
+        elapsed = time.perf_counter() - started
+        stack.pop()
+        registry.observe('ocr_stage_seconds', elapsed, stage=stage, **labels)
+        trace = current_trace()
+        if trace is not None:
+            name = f"{stage}[{','.join(str(v) for v in labels.values())}]" if labels else stage
+            trace.add(name, elapsed, values)
+
+
+def annotate(**values: float):
+    """현재 스레드에서 가장 안쪽에 열린 구간에 수치 누적 (예: bytes_sent)
+
+    구간 밖에서 호출되면 무시한다. 값은 '<이름>_total' 카운터(ocr_ 접두사)에도 더한다.
+    """
+    stack = getattr(_local, 'stack', None)
+    if not stack:
+        return
+    stage, labels, span_values = stack[-1]
+    for key, value in values.items():
+        span_values[key] = span_values.get(key, 0) + value
+        registry.inc(f"ocr_{key}_total", value, stage=stage, **labels)
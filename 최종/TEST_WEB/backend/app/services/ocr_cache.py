@@ -0,0 +1,202 @@
+# ocr_cache.py
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - parquet 저장 가능 여부 확인용
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def template_hash(json_path: Optional[str]) -> str:
+    """템플릿 JSON 해시 (키 순서/공백 차이는 무시)"""
+    if not json_path or not os.path.exists(json_path):
+        return ''
+    with open(json_path, 'r', encoding='utf-8') as f:
+        canonical = json.dumps(json.load(f), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class OCRResultCache:
+    """PDF 내용 + 템플릿 + 처리 방식 기준의 OCR 결과 디스크 캐시
+
+    항목마다 디렉토리 하나를 쓰며 추출 DataFrame(parquet, pyarrow 가 없으면 pickle)과
+    영역별 OCR 문자열(regions.json)을 저장한다. 전체 크기가 max_bytes 를 넘으면
+    가장 오래 사용하지 않은 항목부터 삭제한다.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        """캐시 초기화
+
+        Args:
+            cache_dir: 캐시 저장 디렉토리
+            max_bytes: 디스크 사용량 상한 (바이트)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> 크기 (최근 사용 순서 유지)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def make_key(self, pdf_path: str, json_path: Optional[str], processing_method: str) -> str:
+        """캐시 키 생성: SHA-256(파일) + 템플릿 해시 + 처리 방식"""
+        parts = f"{file_sha256(pdf_path)}|{template_hash(json_path)}|{processing_method}"
+        return hashlib.sha256(parts.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict[str, str]]]:
+        """캐시 조회
+
+        Returns:
+            (DataFrame, 영역별 OCR 문자열) 또는 None
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+        try:
+            with open(os.path.join(entry_dir, 'meta.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('format') == 'parquet':
+                df = pd.read_parquet(os.path.join(entry_dir, 'data.parquet'))
+            else:
+                df = pd.read_pickle(os.path.join(entry_dir, 'data.pkl'))
+            with open(os.path.join(entry_dir, 'regions.json'), 'r', encoding='utf-8') as f:
+                regions = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"OCR 캐시 항목을 읽을 수 없어 삭제합니다 ({key}): {e}")
+            self._remove(key)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        # LRU 순서 갱신 (재시작 후에도 유지되도록 수정 시각도 갱신)
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(entry_dir, None)
+        except OSError:
+            pass
+
+        return df, regions
+
+    def put(self, key: str, df: pd.DataFrame, regions: Dict[str, str], source_name: str = ''):
+        """처리 결과 저장 (빈 결과는 저장하지 않음)"""
+        if df is None or df.empty:
+            return
+
+        tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp_')
+        try:
+            data_format = 'pickle'
+            if PARQUET_AVAILABLE:
+                try:
+                    df.to_parquet(os.path.join(tmp_dir, 'data.parquet'), index=False)
+                    data_format = 'parquet'
+                except Exception as e:
+                    # 열 안에 숫자/문자열이 섞인 경우 등 parquet 변환 실패 시 pickle 사용
+                    self.logger.warning(f"parquet 저장 실패, pickle 로 저장합니다: {e}")
+            if data_format == 'pickle':
+                df.to_pickle(os.path.join(tmp_dir, 'data.pkl'))
+
+            with open(os.path.join(tmp_dir, 'regions.json'), 'w', encoding='utf-8') as f:
+                json.dump(regions, f, ensure_ascii=False)
+            with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'format': data_format,
+                    'rows': len(df),
+                    'source': source_name,
+                    'created_at': datetime.utcnow().isoformat()
+                }, f, ensure_ascii=False)
+
+            entry_dir = os.path.join(self.cache_dir, key)
+            with self._lock:
+                if os.path.exists(entry_dir):
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(tmp_dir, entry_dir)
+                self._entries[key] = self._dir_size(entry_dir)
+                self._entries.move_to_end(key)
+            self._evict()
+        except Exception as e:
+            self.logger.error(f"OCR 캐시 저장 실패: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """모니터링용 캐시 통계"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total * 100, 2) if total else 0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size_bytes': sum(self._entries.values()),
+                'max_bytes': self.max_bytes
+            }
+
+    def _evict(self):
+        """디스크 사용량이 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        while True:
+            with self._lock:
+                if sum(self._entries.values()) <= self.max_bytes or len(self._entries) <= 1:
+                    return
+                key, _ = next(iter(self._entries.items()))
+            self._remove(key)
+            with self._lock:
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+        shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+
+    def _load_index(self):
+        """기존 캐시 디렉토리를 읽어 최근 사용 순서 복원"""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not os.path.isdir(path):
+                continue
+            if name.startswith('.tmp_'):
+                # 저장 도중 중단된 임시 디렉토리 정리
+                shutil.rmtree(path, ignore_errors=True)
+                continue
+            found.append((os.path.getmtime(path), name, self._dir_size(path)))
+
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+
+    @staticmethod
+    def _dir_size(path: str) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
@@ -0,0 +1,350 @@
+# ocr_engines.py
+
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .fake_vision import FakeVisionClient, load_fixture
+from .metrics import annotate
+from .region_ocr import detect_page_words
+
+try:
+    from google.cloud import vision
+    VISION_AVAILABLE = True
+except ImportError:
+    vision = None
+    VISION_AVAILABLE = False
+
+try:
+    import pytesseract
+    TESSERACT_AVAILABLE = True
+except ImportError:
+    pytesseract = None
+    TESSERACT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Vision 패키지가 없어도 가짜 클라이언트에 이미지를 넘길 수 있도록 vision.Image 와 같은 형태로 감쌈
+_IMAGE_MODULE = vision if VISION_AVAILABLE else SimpleNamespace(Image=lambda content=None: SimpleNamespace(content=content))
+
+# Tesseract 설정 (processor.py 의 OCR 설정과 동일)
+TESSERACT_CONFIGS = {
+    'general': r'--psm 6 --oem 3',
+    'table': r'--psm 11 --oem 3 -c preserve_interword_spaces=1',
+    'digits': r'--psm 7 --oem 3 -c tessedit_char_whitelist=0123456789'
+}
+
+# 필드별 엔진 지정에 쓰는 필드 종류 (digits: 사이즈/합계 수량 칸, text: 모델명 등 자유 텍스트)
+FIELD_KINDS = ('digits', 'text')
+
+
+class OCREngineError(Exception):
+    """OCR 엔진 오류 (API 오류 응답, 엔진 미설치 등)"""
+
+
+class OCREngine:
+    """OCR 엔진 공통 인터페이스
+
+    read_text 는 잘라낸 영역, detect_words 는 페이지 전체의 단어 박스, read_document 는 페이지 전체 텍스트를 읽는다.
+    remote 가 True 인 엔진(외부 API)의 호출만 Vision API 호출 수로 집계한다.
+    """
+
+    name = 'base'
+    remote = False
+
+    def __init__(self):
+        self.calls = 0
+        self._calls_lock = threading.Lock()
+
+    def _count(self, count: int = 1):
+        """엔진 호출 수 집계"""
+        with self._calls_lock:
+            self.calls += count
+
+    def read_text(self, image: np.ndarray) -> str:
+        """잘라낸 영역 이미지의 텍스트 (텍스트가 없으면 빈 문자열, 엔진 오류는 OCREngineError)"""
+        raise NotImplementedError
+
+    def detect_words(self, image: np.ndarray, tiles: int = 1) -> List[Dict[str, Any]]:
+        """페이지 좌표의 단어 목록 ({'text', 'x0', 'y0', 'x1', 'y1'})"""
+        raise NotImplementedError
+
+    def read_document(self, image: np.ndarray) -> str:
+        """페이지 전체 텍스트"""
+        raise NotImplementedError
+
+    def close(self):
+        """엔진 자원 정리"""
+
+
+class VisionEngine(OCREngine):
+    """Google Cloud Vision 엔진 (client 를 넘기면 그 클라이언트 사용)"""
+
+    name = 'vision'
+    remote = True
+
+    def __init__(self, client=None):
+        super().__init__()
+        if client is None:
+            if not VISION_AVAILABLE:
+                raise OCREngineError("google-cloud-vision 패키지가 설치되어 있지 않습니다.")
+            client = vision.ImageAnnotatorClient()
+        self.client = client
+
+    def read_text(self, image: np.ndarray) -> str:
+        _, buffer = cv2.imencode('.jpg', image)
+        annotate(bytes_sent=buffer.size)
+        response = self.client.text_detection(image=_IMAGE_MODULE.Image(content=buffer.tobytes()))
+        self._count()
+
+        if response.error.message:
+            raise OCREngineError(response.error.message)
+        if response.text_annotations:
+            return response.text_annotations[0].description.strip()
+        return ""
+
+    def detect_words(self, image: np.ndarray, tiles: int = 1) -> List[Dict[str, Any]]:
+        words = detect_page_words(self.client, _IMAGE_MODULE, image, tiles=tiles)
+        self._count(max(1, int(tiles)))
+        if words is None:
+            raise OCREngineError("페이지 OCR 오류 응답")
+        return words
+
+    def read_document(self, image: np.ndarray) -> str:
+        _, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 100])
+        annotate(bytes_sent=buffer.size)
+        response = self.client.document_text_detection(image=_IMAGE_MODULE.Image(content=buffer.tobytes()))
+        self._count()
+
+        if response.error.message:
+            raise OCREngineError(response.error.message)
+        return response.full_text_annotation.text
+
+
+class FakeEngine(VisionEngine):
+    """오프라인 벤치마크/개발용 엔진 (등록한 단어를 돌려주는 FakeVisionClient 사용)
+
+    page/words 를 직접 넘기거나, 설정으로 고를 때는 save_fixture 로 저장한 fixture 경로를 넘긴다.
+    Vision 을 대신하므로 호출 수는 Vision API 호출로 집계한다.
+    """
+
+    name = 'fake'
+
+    def __init__(self, page: Optional[np.ndarray] = None, words: Optional[List[Dict[str, Any]]] = None,
+                 latency: float = 0.0, fixture: Optional[str] = None):
+        if page is None:
+            if not fixture:
+                raise OCREngineError("fake 엔진에는 fixture 경로(OCR_FAKE_FIXTURE)가 필요합니다.")
+            page, words = load_fixture(fixture)
+        super().__init__(FakeVisionClient(page, words or [], latency=latency))
+
+
+class TesseractEngine(OCREngine):
+    """로컬 Tesseract 엔진 (API 비용/네트워크 없음, 오프라인 실행 가능)"""
+
+    remote = False
+
+    def __init__(self, config: str = TESSERACT_CONFIGS['general'], lang: str = 'eng', name: str = 'tesseract'):
+        """
+        Args:
+            config: 영역 텍스트 인식 설정 (숫자 칸은 TESSERACT_CONFIGS['digits'])
+            lang: 인식 언어
+            name: 엔진 이름 (통계/설정 표시용)
+        """
+        super().__init__()
+        if not TESSERACT_AVAILABLE:
+            raise OCREngineError("pytesseract 패키지가 설치되어 있지 않습니다.")
+        try:
+            pytesseract.get_tesseract_version()
+        except Exception as e:
+            raise OCREngineError(f"tesseract 실행 파일을 찾을 수 없습니다: {e}")
+        self.config = config
+        self.lang = lang
+        self.name = name
+
+    @staticmethod
+    def _prepare(image: np.ndarray) -> np.ndarray:
+        return image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+    def read_text(self, image: np.ndarray) -> str:
+        text = pytesseract.image_to_string(self._prepare(image), lang=self.lang, config=self.config)
+        self._count()
+        return text.strip()
+
+    def detect_words(self, image: np.ndarray, tiles: int = 1) -> List[Dict[str, Any]]:
+        # 양식 페이지는 흩어진 텍스트 모드(table 설정)로 단어 박스를 얻음 (로컬 엔진이라 타일 분할 불필요)
+        data = pytesseract.image_to_data(self._prepare(image), lang=self.lang, config=TESSERACT_CONFIGS['table'],
+                                         output_type=pytesseract.Output.DICT)
+        self._count()
+
+        words = []
+        for text, conf, left, top, width, height in zip(data['text'], data['conf'], data['left'],
+                                                        data['top'], data['width'], data['height']):
+            if text.strip() and float(conf) >= 0:
+                words.append({'text': text.strip(), 'x0': left, 'y0': top, 'x1': left + width, 'y1': top + height})
+        return words
+
+    def read_document(self, image: np.ndarray) -> str:
+        text = pytesseract.image_to_string(self._prepare(image), lang=self.lang, config=TESSERACT_CONFIGS['general'])
+        self._count()
+        return text
+
+
+# 이름 → (엔진 클래스, 기본 옵션)
+ENGINE_SPECS = {
+    'vision': (VisionEngine, {}),
+    'tesseract': (TesseractEngine, {}),
+    'tesseract_digits': (TesseractEngine, {'config': TESSERACT_CONFIGS['digits'], 'name': 'tesseract_digits'}),
+    'fake': (FakeEngine, {})
+}
+
+
+def create_engine(name: str, **options) -> OCREngine:
+    """이름으로 엔진 생성 (생성 실패 시 OCREngineError)"""
+    if name not in ENGINE_SPECS:
+        raise OCREngineError(f"알 수 없는 OCR 엔진: {name}")
+    engine_class, defaults = ENGINE_SPECS[name]
+    try:
+        return engine_class(**{**defaults, **options})
+    except OCREngineError:
+        raise
+    except Exception as e:
+        raise OCREngineError(f"{name} 엔진 생성 실패: {e}")
+
+
+# 프로세스 풀 워커의 엔진 (워커마다 한 번 생성해 재사용)
+_worker_engine: Optional[OCREngine] = None
+
+
+def _init_worker(name: str, options: Dict[str, Any]):
+    global _worker_engine
+    _worker_engine = create_engine(name, **options)
+
+
+def _ping_worker() -> str:
+    return _worker_engine.name
+
+
+def _run_in_worker(method: str, args: tuple) -> Tuple[Any, int]:
+    """워커 엔진 메서드 실행 후 (결과, 엔진 호출 수 증가분) 반환"""
+    before = _worker_engine.calls
+    result = getattr(_worker_engine, method)(*args)
+    return result, _worker_engine.calls - before
+
+
+class PooledEngine(OCREngine):
+    """미리 띄워 둔 프로세스 풀에서 실행하는 엔진
+
+    워커마다 엔진을 한 번만 만들어 재사용하므로 요청마다 엔진 초기화 비용을 내지 않고,
+    CPU 를 쓰는 인식(Tesseract) 이 페이지 작업 스레드와 GIL 을 다투지 않는다.
+    """
+
+    def __init__(self, name: str, workers: int = 2, **options):
+        """
+        Args:
+            name: 엔진 이름 (ENGINE_SPECS)
+            workers: 워커 프로세스 수
+            options: 엔진 생성 옵션 (워커로 전달되므로 pickle 가능해야 함)
+        """
+        super().__init__()
+        if name not in ENGINE_SPECS:
+            raise OCREngineError(f"알 수 없는 OCR 엔진: {name}")
+        # 엔진을 만들 수 없으면 워커를 띄우기 전에 실패 (설치/설정 오류를 바로 드러냄)
+        create_engine(name, **options).close()
+
+        self.name = name
+        self.remote = ENGINE_SPECS[name][0].remote
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_init_worker, initargs=(name, options))
+        # 워커를 미리 띄워 첫 요청 지연 제거 (엔진 생성 실패도 여기서 드러남)
+        try:
+            for future in [self._executor.submit(_ping_worker) for _ in range(workers)]:
+                future.result()
+        except Exception as e:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            raise OCREngineError(f"{name} 엔진 프로세스 풀 시작 실패: {e}")
+
+    def _call(self, method: str, *args):
+        result, calls = self._executor.submit(_run_in_worker, method, args).result()
+        self._count(calls)
+        return result
+
+    def read_text(self, image: np.ndarray) -> str:
+        return self._call('read_text', image)
+
+    def detect_words(self, image: np.ndarray, tiles: int = 1) -> List[Dict[str, Any]]:
+        return self._call('detect_words', image, tiles)
+
+    def read_document(self, image: np.ndarray) -> str:
+        return self._call('read_document', image)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def default_engine(names: Tuple[str, ...] = ('vision', 'tesseract')) -> Optional[OCREngine]:
+    """기본 엔진: Vision, 사용할 수 없으면 로컬 Tesseract, 둘 다 안 되면 None"""
+    for name in names:
+        try:
+            engine = create_engine(name)
+            logger.info(f"OCR 엔진: {name}")
+            return engine
+        except OCREngineError as e:
+            logger.error(f"{name} OCR 엔진을 사용할 수 없습니다: {e}")
+    return None
+
+
+def build_engines(default: str = 'vision', field_spec: str = '', pool_workers: int = 0,
+                  engine_options: Optional[Dict[str, Dict[str, Any]]] = None
+                  ) -> Tuple[Optional[OCREngine], Dict[str, OCREngine]]:
+    """설정 문자열로 기본 엔진과 필드별 엔진 구성
+
+    Args:
+        default: 기본 엔진 이름 (만들 수 없으면 default_engine 규칙으로 대체)
+        field_spec: 'digits=tesseract_digits,text=vision' 형식의 필드별 엔진 지정
+        pool_workers: 0보다 크면 로컬 엔진(Tesseract)을 이 수만큼의 워커 프로세스 풀에서 실행
+                      (Vision 은 네트워크 대기라 스레드로 충분하므로 풀을 쓰지 않음)
+        engine_options: 엔진 이름별 생성 옵션 (예: {'fake': {'fixture': 'fixtures/invoice.json'}})
+
+    Returns:
+        (기본 엔진, {필드 종류: 엔진}) - 만들 수 없는 필드 엔진은 경고 후 제외 (기본 엔진 사용)
+    """
+    engines: Dict[str, OCREngine] = {}
+    engine_options = engine_options or {}
+
+    def get(name):
+        if name not in engines:
+            options = engine_options.get(name, {})
+            if pool_workers > 0 and name in ENGINE_SPECS and not ENGINE_SPECS[name][0].remote:
+                engines[name] = PooledEngine(name, workers=pool_workers, **options)
+            else:
+                engines[name] = create_engine(name, **options)
+        return engines[name]
+
+    try:
+        engine = get(default)
+        logger.info(f"OCR 엔진: {default}")
+    except OCREngineError as e:
+        logger.error(f"{default} OCR 엔진을 사용할 수 없습니다: {e}")
+        engine = default_engine(tuple(name for name in ('vision', 'tesseract') if name != default))
+
+    field_engines = {}
+    for entry in filter(None, (part.strip() for part in field_spec.split(','))):
+        field, _, name = entry.partition('=')
+        field, name = field.strip(), name.strip()
+        if field not in FIELD_KINDS:
+            logger.warning(f"알 수 없는 필드 종류: {field} (사용 가능: {', '.join(FIELD_KINDS)})")
+            continue
+        try:
+            field_engines[field] = get(name)
+            logger.info(f"{field} 필드 OCR 엔진: {name}")
+        except OCREngineError as e:
+            logger.warning(f"{field} 필드 엔진({name})을 사용할 수 없어 기본 엔진을 사용합니다: {e}")
+
+    return engine, field_engines
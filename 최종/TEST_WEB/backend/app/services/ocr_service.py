@@ -1,53 +1,250 @@
 import os
-import tempfile
+import copy
+import time
+import threading
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
 import pandas as pd
 from datetime import datetime
 import re
 import logging
 import json
-from typing import List, Dict, Tuple, Optional, Union
-from google.cloud import vision
+from typing import Any, List, Dict, Tuple, Optional, Union, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 import io
+from .region_ocr import PageWordIndex
+from .ocr_engines import OCREngine, OCREngineError, VisionEngine, default_engine
+from .metrics import current_trace, registry, span, tracing
+from .ocr_cache import OCRResultCache
+from .result_export import ResultStore
+from .page_registration import PageRegistrar, map_region, scaling_matrix, template_key
+from .rasterize import iter_pdf_pages, pdf_page_count
 
 class OCRProcessor:
-    def __init__(self):
-        """OCR 프로세서 초기화"""
-        self.temp_dir = tempfile.mkdtemp()
+    def __init__(self, vision_client=None, region_ocr_mode: str = "batched", page_tiles: int = 1,
+                 result_cache: Optional[OCRResultCache] = None, raster_dpi: int = 300,
+                 raster_grayscale: bool = False, page_workers: int = 2,
+                 result_store: Optional[ResultStore] = None, page_registrar: Optional[PageRegistrar] = None,
+                 engine: Optional[OCREngine] = None, field_engines: Optional[Dict[str, OCREngine]] = None):
+        """OCR 프로세서 초기화
+
+        Args:
+            vision_client: 사용할 Vision 클라이언트 (engine 이 없을 때 VisionEngine 으로 감싸 사용,
+                           오프라인 벤치마크에서는 FakeVisionClient 전달)
+            region_ocr_mode: "batched" (페이지당 1회 OCR 후 단어 박스를 영역에 배정) 또는
+                             "per_region" (영역마다 잘라서 개별 OCR 호출, 기존 방식)
+            page_tiles: batched 모드에서 페이지를 세로로 나눌 타일 수
+            result_cache: OCR 결과 캐시 (같은 PDF + 템플릿 + 처리 방식이면 변환/OCR 생략)
+            raster_dpi: PDF 래스터화 해상도
+            raster_grayscale: True 이면 페이지를 그레이스케일 배열로 래스터화
+            page_workers: 한 문서에서 동시에 래스터화/OCR 하는 최대 페이지 수 (메모리 사용량 상한)
+            result_store: 처리 결과 보관소 (있으면 엑셀을 바로 쓰지 않고 결과만 저장, 엑셀은 다운로드 시 생성)
+            page_registrar: 템플릿 정합 단계 (있으면 페이지를 템플릿 기준 페이지에 맞춘 변환으로 영역 좌표 계산,
+                            없으면 document_bounds 선형 스케일링만 사용)
+            engine: 기본 OCR 엔진 (vision_client 도 없으면 Vision, 사용할 수 없으면 로컬 Tesseract)
+            field_engines: 필드 종류별 엔진 ({'digits': 사이즈/합계 수량 칸, 'text': 모델명}),
+                           지정한 필드는 페이지 일괄 OCR 결과 대신 해당 엔진으로 영역을 잘라 읽음
+        """
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
+        self.region_ocr_mode = region_ocr_mode
+        self.page_tiles = page_tiles
+        self.result_cache = result_cache
+        self.raster_dpi = raster_dpi
+        self.raster_grayscale = raster_grayscale
+        self.page_workers = max(1, int(page_workers))
+        self.result_store = result_store
+        self.page_registrar = page_registrar
+
+        # 캐시 저장용 영역별 OCR 문자열 기록 (처리 스레드별)
+        self._region_log = threading.local()
+
+        # 영역 조회 수와 확장 재시도 수 (재시도율 = 템플릿 영역이 빗나간 비율)
+        self.region_requests = 0
+        self.region_retries = 0
+        self._stats_lock = threading.Lock()
         
-        # Google Cloud Vision API 클라이언트 초기화
+        # OCR 엔진 초기화 (Vision 클라이언트를 만들 수 없어도 로컬 엔진으로 처리 가능하도록)
+        if engine is not None:
+            self.engine = engine
+        elif vision_client is not None:
+            self.engine = VisionEngine(vision_client)
+        else:
+            self.engine = default_engine()
+        self.field_engines = dict(field_engines or {})
+
+    def _engines(self) -> List[OCREngine]:
+        """사용 중인 엔진 목록 (중복 제외)"""
+        engines = []
+        for engine in [self.engine, *self.field_engines.values()]:
+            if engine is not None and all(engine is not other for other in engines):
+                engines.append(engine)
+        return engines
+
+    @property
+    def vision_calls(self) -> int:
+        """외부 API(Vision) 호출 수 (문서별 호출 수 보고용)"""
+        return sum(engine.calls for engine in self._engines() if engine.remote)
+
+    def _engine_variant(self) -> str:
+        """OCR 캐시 키용 엔진 구성 표시 (기본 Vision 단독이면 빈 문자열, 기존 캐시 유지)"""
+        if (self.engine is None or self.engine.name == 'vision') and not self.field_engines:
+            return ''
+        routes = ','.join(f"{field}={engine.name}" for field, engine in sorted(self.field_engines.items()))
+        return f"-{self.engine.name if self.engine else 'none'}{'[' + routes + ']' if routes else ''}"
+
+    def engine_calls(self) -> Dict[str, int]:
+        """엔진별 호출 수"""
+        calls = {}
+        for engine in self._engines():
+            calls[engine.name] = calls.get(engine.name, 0) + engine.calls
+        return calls
+
+    def _count_region(self, retried: bool = False):
+        """영역 조회/확장 재시도 수 집계"""
+        with self._stats_lock:
+            if retried:
+                self.region_retries += 1
+            else:
+                self.region_requests += 1
+
+    def region_stats(self) -> Dict[str, Any]:
+        """영역 OCR 통계 (조회 수, 확장 재시도 수, 재시도율, 페이지 정합 통계)"""
+        with self._stats_lock:
+            requests, retries = self.region_requests, self.region_retries
+        return {
+            'region_requests': requests,
+            'region_retries': retries,
+            'retry_rate': round(retries / requests, 4) if requests else 0.0,
+            'registration': self.page_registrar.stats() if self.page_registrar is not None else None
+        }
+
+    def _register_page(self, image: np.ndarray, key: Optional[str], base: np.ndarray) -> np.ndarray:
+        """페이지의 템플릿 좌표 → 페이지 좌표 변환 (정합 단계가 없거나 실패하면 선형 스케일링 행렬)"""
+        if self.page_registrar is None or key is None:
+            return base
         try:
-            self.vision_client = vision.ImageAnnotatorClient()
-            self.logger.info("Google Cloud Vision API 클라이언트가 성공적으로 초기화되었습니다.")
+            with span('preprocess'):
+                return self.page_registrar.register(image, key, base)
         except Exception as e:
-            self.logger.error(f"Google Cloud Vision API 클라이언트 초기화 실패: {e}")
-            self.vision_client = None
+            self.logger.warning(f"페이지 정합 실패, 선형 스케일링 사용: {e}")
+            return base
+
+    def prepare_page(self, image):
+        """영역 OCR 방식에 맞게 페이지 준비
+
+        batched 모드에서는 페이지 전체를 한 번(또는 타일 수만큼) OCR하여 PageWordIndex를 반환하고,
+        per_region 모드이거나 페이지 OCR이 실패하면 원본 이미지를 그대로 반환한다.
+        반환값은 그대로 extract_text_from_region 에 전달하면 된다.
+        """
+        if self.region_ocr_mode != "batched" or self.engine is None:
+            return image
 
-    def pdf_to_images(self, pdf_path: str, dpi: int = 300, first_page: int = 1, last_page: int = 1) -> List[str]:
-        """PDF 파일을 고해상도 이미지로 변환 (특정 페이지만 처리)"""
         try:
-            images = convert_from_path(pdf_path, dpi=dpi, first_page=first_page, last_page=last_page)
-            image_paths = []
-            
-            for i, image in enumerate(images):
-                timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-                image_path = os.path.join(self.temp_dir, f"temp_page_{i}_{timestamp}.jpg")
-                image.save(image_path, "JPEG", quality=100)  # 최대 품질로 저장
-                image_paths.append(image_path)
-            
-            self.logger.info(f"PDF의 {first_page}~{last_page} 페이지를 {len(images)}개의 이미지로 변환했습니다.")
-            return image_paths
+            with span('ocr_call', engine=self.engine.name):
+                words = self.engine.detect_words(image, tiles=self.page_tiles)
+        except Exception as e:
+            self.logger.error(f"페이지 일괄 OCR 오류: {e}")
+            words = None
+
+        if words is None:
+            self.logger.warning("페이지 일괄 OCR 실패: 영역별 OCR 방식으로 전환합니다.")
+            return image
+
+        self.logger.info(f"페이지 일괄 OCR: {len(words)}개 단어 인식")
+        return PageWordIndex(image, words)
+
+    def pdf_to_arrays(self, pdf_path: str, first_page: int = 1, last_page: Optional[int] = 1) -> List[np.ndarray]:
+        """PDF 페이지를 임시 파일 없이 NumPy 배열로 변환 (raster_dpi / raster_grayscale 설정 사용)"""
+        try:
+            pages = [page for _, page in iter_pdf_pages(pdf_path, dpi=self.raster_dpi, grayscale=self.raster_grayscale,
+                                                         first_page=first_page, last_page=last_page)]
+            self.logger.info(f"PDF의 {first_page}~{last_page or '끝'} 페이지를 {len(pages)}개의 배열로 변환했습니다.")
+            return pages
         except Exception as e:
             self.logger.error(f"PDF 변환 오류: {e}")
-            
             return []
 
-    def extract_text_from_region(self, image, region, retry_ocr=True):
-        """이미지의 특정 영역에서 텍스트를 추출"""
+    def _map_pdf_pages(self, pdf_path: str, handler: Callable[[int, np.ndarray], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """PDF의 모든 페이지를 병렬로 래스터화/처리하고 행 목록을 페이지 순서대로 합쳐 반환
+
+        페이지마다 작업 하나가 해당 페이지만 래스터화한 뒤 handler(page_number, image)를 호출하므로,
+        메모리에 동시에 올라가는 페이지 수는 page_workers 개로 제한된다.
+        페이지 변환/처리 중 오류가 나면 예외를 그대로 전달한다 (일부 페이지만 조용히 누락되지 않도록).
+        페이지가 없는 PDF는 ValueError 로 알린다.
+        """
+        page_total = pdf_page_count(pdf_path)
+        if page_total < 1:
+            raise ValueError(f"PDF에 처리할 페이지가 없습니다: {os.path.basename(pdf_path)}")
+        record_regions = getattr(self._region_log, 'regions', None) is not None
+        trace = current_trace()
+
+        def run(page_number):
+            # 영역별 OCR 기록과 문서 추적은 스레드별이므로 페이지 작업 스레드에서 다시 연결
+            self._region_log.regions = {} if record_regions else None
+            try:
+                with tracing(trace) if trace is not None else nullcontext():
+                    with span('rasterize'):
+                        pages = self.pdf_to_arrays(pdf_path, first_page=page_number, last_page=page_number)
+                    if not pages:
+                        raise RuntimeError(f"페이지 {page_number} 변환 실패")
+                    with span('extract_page'):
+                        rows = handler(page_number, pages[0])
+                return rows, self._region_log.regions
+            finally:
+                self._region_log.regions = None
+
+        workers = min(self.page_workers, page_total)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ocr-page') as executor:
+            results = list(executor.map(run, range(1, page_total + 1)))
+
+        rows = []
+        for page_number, (page_rows, regions) in enumerate(results, start=1):
+            rows.extend(page_rows)
+            if record_regions and regions:
+                for key, text in regions.items():
+                    self._region_log.regions[f"p{page_number}:{key}"] = text
+
+        self.logger.info(f"{page_total}개 페이지 처리 완료 (동시 처리 {workers}): {len(rows)}개 행")
+        return rows
+
+    def _fill_from_first_page(self, rows: List[Dict[str, Any]], fields: List[str]):
+        """이어지는 페이지에 없는 헤더 값(브랜드, 시즌 등)을 앞 페이지 값으로 채움"""
+        for field in fields:
+            value = next((row.get(field) for row in rows if row.get(field)), '')
+            if not value:
+                continue
+            for row in rows:
+                if not row.get(field):
+                    row[field] = value
+
+    def extract_text_from_region(self, image, region, retry_ocr=True, field=None):
+        """이미지의 특정 영역에서 텍스트를 추출
+
+        image 가 prepare_page 로 만든 PageWordIndex 이면 API 호출 없이 메모리에서 단어를 배정한다.
+        field('digits', 'text')에 지정된 엔진이 있으면 그 엔진으로 영역을 잘라 읽는다.
+        """
+        self._count_region()
+        engine = self.field_engines.get(field, self.engine) if field else self.engine
+        if isinstance(image, PageWordIndex) and engine is self.engine:
+            text = self._extract_text_from_index(image, region, retry_ocr)
+        else:
+            source = image.image if isinstance(image, PageWordIndex) else image
+            text = self._ocr_region(source, region, retry_ocr, engine)
+        self._record_region(region, text)
+        return text
+
+    def _record_region(self, region, text):
+        """처리 중인 문서의 영역별 OCR 문자열 기록 (process_pdf 실행 중일 때만)"""
+        log = getattr(self._region_log, 'regions', None)
+        if log is not None:
+            key = f"{region.get('x', 0)},{region.get('y', 0)},{region.get('width', 0)},{region.get('height', 0)}"
+            log[key] = text
+
+    def _ocr_region(self, image, region, retry_ocr=True, engine=None):
+        """영역을 잘라 OCR 엔진으로 인식 (영역별 방식, engine 이 없으면 기본 엔진)"""
+        engine = engine or self.engine
         try:
             # 영역 좌표 가져오기
             x = region["x"]
@@ -88,14 +285,11 @@ class OCRProcessor:
                 return ""
             
             # OCR 수행
-            _, buffer = cv2.imencode('.jpg', region_img)
-            byte_img = buffer.tobytes()
-            vision_image = vision.Image(content=byte_img)
-            
-            response = self.vision_client.text_detection(image=vision_image)
-            
-            # 오류 처리
-            if response.error.message:
+            try:
+                with span('ocr_call', engine=engine.name):
+                    text = engine.read_text(region_img)
+            except OCREngineError:
+                # 오류 처리
                 if retry_ocr:
                     # 첫 번째 시도가 실패했다면 영역을 확장하여 재시도
                     expanded_region = {
@@ -104,12 +298,13 @@ class OCRProcessor:
                         "width": width + 10,
                         "height": height + 10
                     }
-                    return self.extract_text_from_region(image, expanded_region, retry_ocr=False)
+                    self._count_region(retried=True)
+                    return self._ocr_region(image, expanded_region, retry_ocr=False, engine=engine)
                 return ""
             
             # 텍스트 추출
-            if response.text_annotations:
-                return response.text_annotations[0].description.strip()
+            if text:
+                return text
             
             # 텍스트가 없는 경우 재시도
             if retry_ocr:
@@ -120,7 +315,8 @@ class OCRProcessor:
                     "width": width + 10,
                     "height": height + 10
                 }
-                return self.extract_text_from_region(image, expanded_region, retry_ocr=False)
+                self._count_region(retried=True)
+                return self._ocr_region(image, expanded_region, retry_ocr=False, engine=engine)
             
             return ""
                 
@@ -134,11 +330,34 @@ class OCRProcessor:
                         "width": region.get("width", 20) + 10,
                         "height": region.get("height", 20) + 10
                     }
-                    return self.extract_text_from_region(image, expanded_region, retry_ocr=False)
+                    self._count_region(retried=True)
+                    return self._ocr_region(image, expanded_region, retry_ocr=False, engine=engine)
                 except:
                     return ""
             return ""
 
+    def _extract_text_from_index(self, page: PageWordIndex, region, retry_ocr=True):
+        """페이지 단어 인덱스에서 영역 텍스트 조회 (영역별 OCR과 같은 경계 보정/확장 재시도 규칙)"""
+        img_height, img_width = page.shape[:2]
+        x = max(0, min(region.get("x", 0), img_width - 1))
+        y = max(0, min(region.get("y", 0), img_height - 1))
+        width = max(10, min(region.get("width", 10), img_width - x))
+        height = max(10, min(region.get("height", 10), img_height - y))
+
+        text = page.text_in({"x": x, "y": y, "width": width, "height": height})
+        if text or not retry_ocr:
+            return text
+
+        # 텍스트가 없으면 영역을 확장하여 재시도 (추가 API 호출 없음)
+        expanded_region = {
+            "x": max(0, x - 5),
+            "y": max(0, y - 5),
+            "width": width + 10,
+            "height": height + 10
+        }
+        self._count_region(retried=True)
+        return self._extract_text_from_index(page, expanded_region, retry_ocr=False)
+
     def normalize_price(self, price_text, item_quantity=None, unit_price=None):
         """
         금액 형식을 정규화하여 'EUR 1540.00' 형식으로 반환
@@ -269,72 +488,138 @@ class OCRProcessor:
             
         return config_path
 
+    def _notify_stage(self, progress_callback: Optional[Callable[[str], None]], stage: str):
+        """처리 단계 변경 알림 (rasterize, ocr, parse)"""
+        if progress_callback is None:
+            return
+        try:
+            progress_callback(stage)
+        except Exception as e:
+            self.logger.warning(f"진행 상태 알림 실패 ({stage}): {e}")
+
     def process_pdf(self, pdf_path: str, output_dir: Optional[str] = None, 
-                    processing_method: str = "standard", verbose: bool = True) -> Tuple[pd.DataFrame, Optional[str]]:
-        """PDF 문서 처리 (처리 방식 선택 가능)"""
-        
-        # 처리 방식에 따라 다른 메소드 호출
+                    processing_method: str = "standard", verbose: bool = True,
+                    progress_callback: Optional[Callable[[str], None]] = None) -> Tuple[pd.DataFrame, Optional[str]]:
+        """PDF 문서 처리 (처리 방식 선택 가능)
+
+        progress_callback 이 주어지면 처리 단계가 바뀔 때마다 단계 이름(rasterize, ocr, parse)으로 호출한다.
+        result_cache 가 설정되어 있으면 같은 PDF 내용 + 템플릿 + 처리 방식의 이전 결과를 재사용한다.
+        """
+        started = time.perf_counter()
+        calls_before = self.vision_calls
+        requests_before, retries_before = self.region_requests, self.region_retries
+
+        json_path = None
         if processing_method == "invoice_json":
-            # 인보이스 특화 처리 (invojson.py 코드 사용)
             json_path = self._get_config_path("invoice_data.json")
-            return self._process_invoice_with_json(pdf_path, json_path, output_dir)
-        
         elif processing_method == "order_json":
-            # 오더시트 특화 처리 (newreorder.py 코드 사용)
             json_path = self._get_config_path("order_data.json")
-            return self._process_order_sheet_with_json(pdf_path, json_path, output_dir)
-        
-        else:
-            # 기본 처리 방식 - 텍스트 기반 파싱
-            return self._process_pdf_standard(pdf_path, output_dir, verbose)
 
-    def _process_pdf_standard(self, pdf_path: str, output_dir: Optional[str] = None, verbose: bool = True) -> Tuple[pd.DataFrame, Optional[str]]:
+        cache_key = None
+        if self.result_cache is not None:
+            try:
+                # 래스터화/정합/엔진 설정이 다르면 OCR 결과도 달라질 수 있으므로 키에 포함
+                variant = f"{processing_method}@{self.raster_dpi}dpi{'-gray' if self.raster_grayscale else ''}" \
+                          f"{'-registered' if self.page_registrar is not None else ''}{self._engine_variant()}"
+                cache_key = self.result_cache.make_key(pdf_path, json_path, variant)
+                cached = self.result_cache.get(cache_key)
+            except Exception as e:
+                self.logger.warning(f"OCR 캐시 조회 실패: {e}")
+                cached = None
+            if cached is not None:
+                df_cached, _ = cached
+                registry.inc('ocr_documents_total', method=processing_method, cache='hit')
+                self._notify_stage(progress_callback, 'parse')
+                output_file = self._save_cached_result(df_cached, output_dir, processing_method)
+                self.logger.info(
+                    f"OCR 캐시 적중 ({processing_method}): 변환/OCR 생략, {time.perf_counter() - started:.2f}초"
+                )
+                return df_cached, output_file
+
+        registry.inc('ocr_documents_total', method=processing_method, cache='miss')
+        self._region_log.regions = {}
+        try:
+            # 처리 방식에 따라 다른 메소드 호출 (문서 전체 소요 시간 측정)
+            with span('document', method=processing_method):
+                if processing_method == "invoice_json":
+                    # 인보이스 특화 처리 (invojson.py 코드 사용)
+                    result = self._process_invoice_with_json(pdf_path, json_path, output_dir, progress_callback)
+
+                elif processing_method == "order_json":
+                    # 오더시트 특화 처리 (newreorder.py 코드 사용)
+                    result = self._process_order_sheet_with_json(pdf_path, json_path, output_dir, progress_callback)
+
+                else:
+                    # 기본 처리 방식 - 텍스트 기반 파싱
+                    result = self._process_pdf_standard(pdf_path, output_dir, verbose, progress_callback)
+            regions = self._region_log.regions
+        finally:
+            self._region_log.regions = None
+
+        if cache_key is not None:
+            self.result_cache.put(cache_key, result[0], regions, source_name=os.path.basename(pdf_path))
+
+        region_requests = self.region_requests - requests_before
+        region_retries = self.region_retries - retries_before
+        self.logger.info(
+            f"문서 처리 완료 ({processing_method}, {self.region_ocr_mode}): "
+            f"Vision API {self.vision_calls - calls_before}회 호출, "
+            f"영역 재시도 {region_retries}/{region_requests}"
+            f"({region_retries / region_requests * 100 if region_requests else 0:.1f}%), "
+            f"{time.perf_counter() - started:.2f}초"
+        )
+        return result
+
+    def _save_cached_result(self, df: pd.DataFrame, output_dir: Optional[str], processing_method: str) -> Optional[str]:
+        """캐시에서 읽은 결과를 처리 방식별 파일명으로 저장"""
+        if not output_dir:
+            return None
+        prefixes = {"invoice_json": "invoice_data", "order_json": "order_sheet_data"}
+        return self._write_result(df, output_dir, prefixes.get(processing_method, 'standard_extraction'))
+
+    def _write_result(self, df: pd.DataFrame, output_dir: Optional[str], prefix: str) -> Optional[str]:
+        """처리 결과 저장 후 엑셀 파일 경로 반환
+
+        result_store 가 있으면 결과만 컬럼 파일로 저장하고 엑셀은 첫 다운로드 때 만든다.
+        없으면(단독 실행, 벤치마크) 기존처럼 바로 엑셀로 저장하고, output_dir 도 없으면 저장하지 않는다.
+        """
+        if self.result_store is not None:
+            with span('result_write'):
+                return self.result_store.save(df, prefix)
+        if not output_dir:
+            return None
+
+        os.makedirs(output_dir, exist_ok=True)
+        output_file = os.path.join(output_dir, f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+        with span('excel_write'):
+            df.to_excel(output_file, index=False)
+        return output_file
+
+    def _process_pdf_standard(self, pdf_path: str, output_dir: Optional[str] = None, verbose: bool = True,
+                              progress_callback: Optional[Callable[[str], None]] = None) -> Tuple[pd.DataFrame, Optional[str]]:
         """기본 텍스트 기반 PDF 처리 방식"""
-        # 전체 텍스트 추출 (첫 페이지만)
-        image_paths = self.pdf_to_images(pdf_path, first_page=1, last_page=1)
-        if not image_paths:
-            self.logger.error("PDF 변환 실패: 이미지가 생성되지 않았습니다.")
-            return pd.DataFrame(), None
-            
-        # 이미지에서 OCR 텍스트 추출
-        image_path = image_paths[0]
-        
         try:
-            # 이미지 로드
-            image = cv2.imread(image_path)
-            if image is None:
-                self.logger.error(f"이미지를 로드할 수 없습니다: {image_path}")
-                return pd.DataFrame(), None
-                
-            # OCR 텍스트 추출
-            with io.open(image_path, 'rb') as image_file:
-                content = image_file.read()
-                
-            vision_image = vision.Image(content=content)
-            response = self.vision_client.document_text_detection(image=vision_image)
-            
-            if response.error.message:
-                self.logger.error(f"Google Vision API 오류: {response.error.message}")
-                return pd.DataFrame(), None
-                
-            full_text = response.full_text_annotation.text
-            
-            # 주문 정보 추출
-            order_info = self._extract_order_info(full_text)
-            
-            # 품목 정보 추출 (정규식 기반)
-            products = self._extract_products(full_text)
+            # 전체 텍스트 추출 (모든 페이지)
+            self._notify_stage(progress_callback, 'rasterize')
+
+            def process_page(page_number, image):
+                if page_number == 1:
+                    self._notify_stage(progress_callback, 'ocr')
+                return self._extract_standard_page(page_number, image)
+
+            # 품목 정보 추출 (정규식 기반, 페이지 순서대로 병합)
+            products = self._map_pdf_pages(pdf_path, process_page)
+            self._notify_stage(progress_callback, 'parse')
             
             # 데이터프레임 생성
             if products:
-                df_result = pd.DataFrame(products)
+                with span('dataframe'):
+                    df_result = pd.DataFrame(products)
                 
                 # 출력 디렉토리 설정
                 if output_dir:
-                    os.makedirs(output_dir, exist_ok=True)
-                    output_file = os.path.join(output_dir, f"standard_extraction_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
-                    df_result.to_excel(output_file, index=False)
-                    self.logger.info(f"데이터를 엑셀 파일로 저장했습니다: {output_file}")
+                    output_file = self._write_result(df_result, output_dir, "standard_extraction")
+                    self.logger.info(f"추출 데이터를 저장했습니다: {output_file}")
                     return df_result, output_file
                 
                 return df_result, None
@@ -345,11 +630,20 @@ class OCRProcessor:
         except Exception as e:
             self.logger.error(f"표준 처리 중 오류: {e}")
             return pd.DataFrame(), None
-        finally:
-            # 임시 파일 정리
-            for path in image_paths:
-                if os.path.exists(path):
-                    os.remove(path)
+
+    def _extract_standard_page(self, page_number: int, image: np.ndarray) -> List[Dict[str, str]]:
+        """페이지 전체 텍스트를 OCR하여 품목 목록 추출"""
+        # OCR 텍스트 추출 (메모리에서 바로 인코딩)
+        if self.engine is None:
+            raise RuntimeError("사용할 수 있는 OCR 엔진이 없습니다.")
+        try:
+            with span('ocr_call', engine=self.engine.name):
+                full_text = self.engine.read_document(image)
+        except OCREngineError as e:
+            raise RuntimeError(f"{self.engine.name} OCR 오류 (페이지 {page_number}): {e}")
+
+        self._record_region({'x': 0, 'y': 0, 'width': image.shape[1], 'height': image.shape[0]}, full_text)
+        return self._extract_products(full_text)
 
     def _extract_order_info(self, text: str) -> Dict[str, str]:
         """OCR 텍스트에서 주문 정보 추출"""
@@ -420,137 +714,74 @@ class OCRProcessor:
         
         return products
 
-    def _process_invoice_with_json(self, pdf_path: str, json_path: str, output_dir: Optional[str] = None) -> Tuple[pd.DataFrame, Optional[str]]:
+    def _process_invoice_with_json(self, pdf_path: str, json_path: str, output_dir: Optional[str] = None,
+                                   progress_callback: Optional[Callable[[str], None]] = None) -> Tuple[pd.DataFrame, Optional[str]]:
         """인보이스 특화 처리 (invojson.py 기반)"""
         try:
             # 출력 폴더 생성
             if output_dir:
                 os.makedirs(output_dir, exist_ok=True)
-            else:
-                output_dir = self.temp_dir
             
             # JSON 파일 로드
             with open(json_path, 'r', encoding='utf-8') as f:
                 json_data = json.load(f)
+            layout_key = template_key(os.path.basename(json_path), json_data)
             
-            # PDF를 이미지로 변환
-            image_paths = self.pdf_to_images(pdf_path, dpi=300)
-            
-            if not image_paths:
-                self.logger.error(f"PDF 변환 실패: {pdf_path}")
-                return pd.DataFrame(), None
-            
-            # 첫 번째 페이지만 처리
-            image_path = image_paths[0]
-            image = cv2.imread(image_path)
-            
-            if image is None:
-                self.logger.error(f"이미지를 로드할 수 없습니다: {image_path}")
-                return pd.DataFrame(), None
-            
-            # 이미지 크기 확인 및 비율 계산
-            img_height, img_width = image.shape[:2]
-            
-            # JSON 문서 크기와 실제 이미지 크기 비교 및 비율 계산
-            json_width = json_data.get('document_bounds', {}).get('end_x', img_width)
-            json_height = json_data.get('document_bounds', {}).get('end_y', img_height)
-            
-            # 비율 계산 (기본값 = 1.0, 좌표 변경 없음)
-            scale_x = img_width / json_width if json_width > 0 else 1.0
-            scale_y = img_height / json_height if json_height > 0 else 1.0
-            
-            # JSON 좌표 스케일링 함수 정의
-            def scale_region(region):
-                """JSON 좌표를 실제 이미지 크기에 맞게 스케일링"""
-                scaled = {
-                    "x": int(region.get("x", 0) * scale_x),
-                    "y": int(region.get("y", 0) * scale_y),
-                    "width": max(1, int(region.get("width", 10) * scale_x)),
-                    "height": max(1, int(region.get("height", 10) * scale_y))
-                }
-                return scaled
-            
-            # 좌표 정보에 스케일링 적용
-            scaled_json = json_data.copy()
-            
-            # shipping_dates 스케일링
-            if "shipping_dates" in scaled_json:
-                shipping_dates = scaled_json["shipping_dates"]
-                if isinstance(shipping_dates, dict):
-                    if "start_date" in shipping_dates and isinstance(shipping_dates["start_date"], dict):
-                        scaled_json["shipping_dates"]["start_date"] = scale_region(shipping_dates["start_date"])
-                    if "end_date" in shipping_dates and isinstance(shipping_dates["end_date"], dict):
-                        scaled_json["shipping_dates"]["end_date"] = scale_region(shipping_dates["end_date"])
-            
-# products 스케일링
-            if "products" in scaled_json and isinstance(scaled_json["products"], list):
-                for i, product in enumerate(scaled_json["products"]):
-                    if not isinstance(product, dict):
-                        continue
-                        
-                    for key in product:
-                        if key == "sizes" and isinstance(product[key], dict):
-                            for size in product[key]:
-                                if isinstance(product[key][size], dict):
-                                    product[key][size] = scale_region(product[key][size])
-                        elif isinstance(product[key], dict) and all(k in product[key] for k in ["x", "y", "width", "height"]):
-                            product[key] = scale_region(product[key])
-            
-            # summary 스케일링
-            if "summary" in scaled_json and isinstance(scaled_json["summary"], dict):
-                for key in scaled_json["summary"]:
-                    if isinstance(scaled_json["summary"][key], dict):
-                        scaled_json["summary"][key] = scale_region(scaled_json["summary"][key])
-            
-            # 메타데이터 추출
-            metadata = self._extract_metadata_from_json(image, scaled_json, image_path)
-            
-            # 제품 데이터 추출 (스케일 조정된 JSON 사용)
-            products_data = self._extract_product_data_from_json(image, scaled_json)
-            
-            # 구조화된 데이터 생성
-            structured_data = self._clean_extracted_data(products_data, metadata)
+            # PDF 모든 페이지를 이미지 배열로 변환하여 페이지별로 병렬 처리 (임시 파일 없음)
+            self._notify_stage(progress_callback, 'rasterize')
+
+            def process_page(page_number, image):
+                if page_number == 1:
+                    self._notify_stage(progress_callback, 'ocr')
+                return self._extract_invoice_page(page_number, image, json_data, pdf_path, layout_key)
+
+            structured_data = self._map_pdf_pages(pdf_path, process_page)
             
-            # 데이터프레임 생성
-            if structured_data:
+            # 구조화된 데이터 생성 (이어지는 페이지의 빈 헤더 값은 앞 페이지 값 사용)
+            self._notify_stage(progress_callback, 'parse')
+            with span('parse'):
+                self._fill_from_first_page(structured_data, ['브랜드', '시즌', '선적_시작일', '선적_완료일'])
+
                 # 모든 가능한 사이즈 열 찾기
                 all_sizes = set()
                 for item in structured_data:
                     for key in item.keys():
                         if key.startswith('사이즈_'):
                             all_sizes.add(key)
-                
+            
                 # 정렬된 사이즈 열 리스트
                 sorted_sizes = sorted(list(all_sizes), key=lambda x: int(x.split('_')[1]))
-                
+            
                 # 모든 아이템에 모든 사이즈 열 추가 (값이 없으면 0)
                 for item in structured_data:
                     for size in sorted_sizes:
                         if size not in item:
                             item[size] = '0'
-                
+
+            # 데이터프레임 생성
+            if structured_data:
                 # 기본 열 순서 정의
                 columns = ['주문_ID', '브랜드', '시즌', '선적_시작일', '선적_완료일', 
                         '모델코드', '모델명', '모델설명', '스타일코드', '컬러', '구매가', '판매가'] + sorted_sizes + ['총_수량', '총_금액']
                 
-                # 데이터프레임 생성
-                df = pd.DataFrame(structured_data)
+                with span('dataframe'):
+                    # 데이터프레임 생성
+                    df = pd.DataFrame(structured_data)
                 
-                # 누락된 열 처리
-                for col in columns:
-                    if col not in df.columns:
-                        df[col] = ''
+                    # 누락된 열 처리
+                    for col in columns:
+                        if col not in df.columns:
+                            df[col] = ''
                 
-                # 조정된 컬럼 리스트 생성 (실제 존재하는 컬럼만 포함)
-                adjusted_columns = [col for col in columns if col in df.columns]
+                    # 조정된 컬럼 리스트 생성 (실제 존재하는 컬럼만 포함)
+                    adjusted_columns = [col for col in columns if col in df.columns]
                 
-                # 열 순서 조정
-                df = df[adjusted_columns]
+                    # 열 순서 조정
+                    df = df[adjusted_columns]
                 
-                # 엑셀 파일로 저장
-                output_file = os.path.join(output_dir, f"invoice_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
-                df.to_excel(output_file, index=False)
-                self.logger.info(f"인보이스 데이터를 엑셀 파일로 저장했습니다: {output_file}")
+                # 처리 결과 저장 (엑셀은 보관소가 없을 때만 바로 작성)
+                output_file = self._write_result(df, output_dir, "invoice_data")
+                self.logger.info(f"인보이스 데이터를 저장했습니다: {output_file}")
                 
                 return df, output_file
             
@@ -560,14 +791,81 @@ class OCRProcessor:
         except Exception as e:
             self.logger.error(f"인보이스 처리 중 오류: {e}")
             return pd.DataFrame(), None
-        finally:
-            # 임시 파일 정리
-            for path in image_paths:
-                if os.path.exists(path):
-                    try:
-                        os.remove(path)
-                    except:
-                        pass
+
+    def _extract_invoice_page(self, page_number: int, image: np.ndarray, json_data: Dict, pdf_path: str,
+                              layout_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """인보이스 한 페이지에서 구조화된 제품 행 추출"""
+        # 템플릿 좌표를 실제 페이지에 맞게 변환 (정합 단계가 있으면 기울기/여백 차이까지 보정)
+        img_height, img_width = image.shape[:2]
+        matrix = self._register_page(image, layout_key, self._invoice_base_matrix(json_data, img_width, img_height))
+        scaled_json = self._scale_invoice_template(json_data, matrix)
+
+        # 페이지 OCR 준비 (batched 모드: 페이지당 1회 호출)
+        page = self.prepare_page(image)
+
+        # 메타데이터 추출
+        metadata = self._extract_metadata_from_json(page, scaled_json, pdf_path)
+
+        # 제품 데이터 추출 (스케일 조정된 JSON 사용)
+        products_data = self._extract_product_data_from_json(page, scaled_json)
+
+        # 두 번째 페이지부터는 모델명이 인식되지 않은 빈 행 제외
+        if page_number > 1:
+            products_data = [product for product in products_data if product.get('full_model')]
+
+        return self._clean_extracted_data(products_data, metadata) or []
+
+    def _invoice_base_matrix(self, json_data: Dict, img_width: int, img_height: int) -> np.ndarray:
+        """인보이스 템플릿 좌표 → 이미지 좌표 선형 스케일링 행렬 (document_bounds 기준)"""
+        # JSON 문서 크기와 실제 이미지 크기 비교 및 비율 계산
+        json_width = json_data.get('document_bounds', {}).get('end_x', img_width)
+        json_height = json_data.get('document_bounds', {}).get('end_y', img_height)
+        
+        # 비율 계산 (기본값 = 1.0, 좌표 변경 없음)
+        scale_x = img_width / json_width if json_width > 0 else 1.0
+        scale_y = img_height / json_height if json_height > 0 else 1.0
+        return scaling_matrix(scale_x, scale_y)
+
+    def _scale_invoice_template(self, json_data: Dict, matrix: np.ndarray) -> Dict:
+        """인보이스 템플릿 좌표를 변환 행렬로 실제 페이지 좌표에 맞춘 사본 반환"""
+        # JSON 좌표 변환 함수 정의
+        def scale_region(region):
+            """JSON 좌표를 실제 페이지 좌표로 변환"""
+            return map_region(matrix, region)
+        
+        # 좌표 정보에 스케일링 적용 (원본 템플릿은 변경하지 않음)
+        scaled_json = copy.deepcopy(json_data)
+        
+        # shipping_dates 스케일링
+        if "shipping_dates" in scaled_json:
+            shipping_dates = scaled_json["shipping_dates"]
+            if isinstance(shipping_dates, dict):
+                if "start_date" in shipping_dates and isinstance(shipping_dates["start_date"], dict):
+                    scaled_json["shipping_dates"]["start_date"] = scale_region(shipping_dates["start_date"])
+                if "end_date" in shipping_dates and isinstance(shipping_dates["end_date"], dict):
+                    scaled_json["shipping_dates"]["end_date"] = scale_region(shipping_dates["end_date"])
+        
+        # products 스케일링
+        if "products" in scaled_json and isinstance(scaled_json["products"], list):
+            for i, product in enumerate(scaled_json["products"]):
+                if not isinstance(product, dict):
+                    continue
+                    
+                for key in product:
+                    if key == "sizes" and isinstance(product[key], dict):
+                        for size in product[key]:
+                            if isinstance(product[key][size], dict):
+                                product[key][size] = scale_region(product[key][size])
+                    elif isinstance(product[key], dict) and all(k in product[key] for k in ["x", "y", "width", "height"]):
+                        product[key] = scale_region(product[key])
+        
+        # summary 스케일링
+        if "summary" in scaled_json and isinstance(scaled_json["summary"], dict):
+            for key in scaled_json["summary"]:
+                if isinstance(scaled_json["summary"][key], dict):
+                    scaled_json["summary"][key] = scale_region(scaled_json["summary"][key])
+
+        return scaled_json
 
     def _extract_metadata_from_json(self, image, json_data, image_path):
         """JSON 파일과 이미지를 사용하여 메타데이터 추출"""
@@ -612,7 +910,7 @@ class OCRProcessor:
             # 모델명/코드 추출
             if "name" in product_json:
                 # 원본 텍스트 추출
-                model_text = self.extract_text_from_region(image, product_json["name"])
+                model_text = self.extract_text_from_region(image, product_json["name"], field='text')
                 
                 # 모델 정보 표준화
                 model_code, model_description, full_model = self.standardize_model_info(model_text)
@@ -661,7 +959,7 @@ class OCRProcessor:
             if "sizes" in product_json:
                 for size, region in product_json["sizes"].items():
                     if size != "qty":
-                        size_qty = self.extract_text_from_region(image, region)
+                        size_qty = self.extract_text_from_region(image, region, field='digits')
                         
                         if not size_qty or size_qty.isspace() or not re.search(r'\d+', size_qty):
                             size_qty = "0"
@@ -679,7 +977,7 @@ class OCRProcessor:
                 
                 # 총 수량 추출
                 if "qty" in product_json["sizes"]:
-                    qty_text = self.extract_text_from_region(image, product_json["sizes"]["qty"])
+                    qty_text = self.extract_text_from_region(image, product_json["sizes"]["qty"], field='digits')
                     qty_match = re.search(r'\d+', qty_text)
                     
                     if qty_match and not qty_text.isspace():
@@ -743,291 +1041,290 @@ class OCRProcessor:
         
         return structured_data
 
-    def _process_order_sheet_with_json(self, pdf_path: str, json_path: str, output_dir: Optional[str] = None) -> Tuple[pd.DataFrame, Optional[str]]:
-            """오더시트 특화 처리 (newreorder.py 기반)"""
-            try:
-                # 출력 폴더 생성
-                if output_dir:
-                    os.makedirs(output_dir, exist_ok=True)
-                else:
-                    output_dir = self.temp_dir
-
-                # JSON 파일 로드
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-
-                # PDF를 이미지로 변환
-                image_paths = self.pdf_to_images(pdf_path, dpi=300)
+    def _extract_order_page(self, page_number: int, img: np.ndarray, config: Dict, output_dir: Optional[str],
+                            layout_key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """오더시트 한 페이지에서 제품 행 추출 (output_dir 가 있으면 첫 페이지 영역 표시 디버깅 이미지도 저장)"""
+        # 이미지 크기 확인
+        img_height, img_width = img.shape[:2]
+        self.logger.info(f"이미지 크기: {img_width}x{img_height}")
+
+        # 디버깅용 이미지 생성 (좌표 시각화, 그레이스케일 페이지는 컬러로 변환)
+        debug_img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR) if img.ndim == 2 else img.copy()
+
+        # 스케일링 팩터 계산 (JSON의 document_bounds 기준으로)
+        if 'document_bounds' in config:
+            # JSON에서 document_bounds 정보 추출
+            json_base_width = config['document_bounds']['end_x'] - config['document_bounds']['start_x']
+            json_base_height = config['document_bounds']['end_y'] - config['document_bounds']['start_y']
+            json_start_x = config['document_bounds']['start_x']
+            json_start_y = config['document_bounds']['start_y']
+
+            # 스케일링 팩터 계산
+            scale_x = img_width / json_base_width
+            scale_y = img_height / json_base_height
+
+            self.logger.info(f"문서 경계: 너비={json_base_width}, 높이={json_base_height}")
+            self.logger.info(f"스케일링 팩터: x={scale_x}, y={scale_y}")
+        else:
+            # 기본값 설정 (문서 경계가 없는 경우)
+            self.logger.warning("document_bounds 정보가 없습니다. 기본값을 사용합니다.")
+            json_base_width = 1700
+            json_base_height = 2200
+            json_start_x = 0
+            json_start_y = 0
+            scale_x = img_width / json_base_width
+            scale_y = img_height / json_base_height
+
+        # 문서 경계 기준 선형 스케일링을 정합 단계로 보정 (기울기/여백 차이)
+        matrix = self._register_page(img, layout_key, scaling_matrix(scale_x, scale_y, json_start_x, json_start_y))
+
+        # 좌표 스케일링 함수
+        def scale_region(region):
+            """JSON 좌표를 실제 이미지 좌표로 변환"""
+            mapped = map_region(matrix, region, default_width=100, default_height=30)
+            x, y, width, height = mapped['x'], mapped['y'], mapped['width'], mapped['height']
 
-                if not image_paths:
-                    self.logger.error(f"PDF 변환 실패: {pdf_path}")
-                    return pd.DataFrame(), None
+            # 이미지 경계 확인
+            x = max(0, min(x, img_width - 1))
+            y = max(0, min(y, img_height - 1))
+            width = min(width, img_width - x)
+            height = min(height, img_height - y)
 
-                # 첫 번째 페이지만 처리
-                image_path = image_paths[0]
-                img = cv2.imread(image_path)
+            return {
+                "x": x,
+                "y": y,
+                "width": width,
+                "height": height
+            }
 
-                if img is None:
-                    self.logger.error(f"이미지를 로드할 수 없습니다: {image_path}")
-                    return pd.DataFrame(), None
+        # 페이지 OCR 준비 (batched 모드: 페이지당 1회 호출)
+        page = self.prepare_page(img)
 
-                # 이미지 크기 확인
-                img_height, img_width = img.shape[:2]
-                self.logger.info(f"이미지 크기: {img_width}x{img_height}")
+        # 데이터 추출
+        extracted_data = []
 
-                # 디버깅용 이미지 생성 (좌표 시각화)
-                debug_img = img.copy()
+        # 헤더 필드 추출 (브랜드, 시즌, 날짜)
+        if 'header_fields' in config:
+            header_fields = config['header_fields']
 
-                # 스케일링 팩터 계산 (JSON의 document_bounds 기준으로)
-                if 'document_bounds' in config:
-                    # JSON에서 document_bounds 정보 추출
-                    json_base_width = config['document_bounds']['end_x'] - config['document_bounds']['start_x']
-                    json_base_height = config['document_bounds']['end_y'] - config['document_bounds']['start_y']
-                    json_start_x = config['document_bounds']['start_x']
-                    json_start_y = config['document_bounds']['start_y']
+            # 브랜드 추출
+            brand_text = ""
+            if 'brand' in header_fields:
+                brand_region = scale_region(header_fields['brand'])
+                brand_text = self.extract_text_from_region(page, brand_region)
+                # 디버깅 이미지에 영역 표시
+                cv2.rectangle(debug_img, (brand_region['x'], brand_region['y']), 
+                            (brand_region['x'] + brand_region['width'], brand_region['y'] + brand_region['height']), 
+                            (0, 0, 255), 2)
+                cv2.putText(debug_img, "Brand", (brand_region['x'], brand_region['y']-5), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
 
-                    # 스케일링 팩터 계산
-                    scale_x = img_width / json_base_width
-                    scale_y = img_height / json_base_height
-                
-                    self.logger.info(f"문서 경계: 너비={json_base_width}, 높이={json_base_height}")
-                    self.logger.info(f"스케일링 팩터: x={scale_x}, y={scale_y}")
+            # 시즌 추출
+            season_text = ""
+            if 'season' in header_fields:
+                season_region = scale_region(header_fields['season'])
+                season_text = self.extract_text_from_region(page, season_region)
+                cv2.rectangle(debug_img, (season_region['x'], season_region['y']), 
+                            (season_region['x'] + season_region['width'], season_region['y'] + season_region['height']), 
+                            (255, 0, 0), 2)
+                cv2.putText(debug_img, "Season", (season_region['x'], season_region['y']-5), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
+
+            # 날짜 추출
+            date_text = ""
+            if 'date' in header_fields:
+                date_region = scale_region(header_fields['date'])
+                date_text = self.extract_text_from_region(page, date_region)
+                cv2.rectangle(debug_img, (date_region['x'], date_region['y']), 
+                            (date_region['x'] + date_region['width'], date_region['y'] + date_region['height']), 
+                            (0, 255, 0), 2)
+                cv2.putText(debug_img, "Date", (date_region['x'], date_region['y']-5), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+
+        # 각 제품 행 처리
+        for i, row_config in enumerate(config['product_rows']):
+            self.logger.info(f"\n페이지 {page_number} 제품 {i+1} 추출 시작 ---")
+
+            # 아이템 코드 추출
+            item_code = ""
+            if 'item_code' in row_config:
+                item_region = scale_region(row_config['item_code'])
+                item_code = self.extract_text_from_region(page, item_region)
+
+            # 모델명 추출
+            model_text = ""
+            if 'model' in row_config:
+                model_region = scale_region(row_config['model'])
+                model_text = self.extract_text_from_region(page, model_region, field='text')
+
+            # 모델명 정리
+            model_name = self.extract_and_clean_model_name(model_text)
+
+            # 모델 코드 추출
+            model_code_match = re.search(r'(AJ\d+|AC\d+|AR\d+|AL\d+)', model_name)
+            model_code = model_code_match.group(1) if model_code_match else ''
+
+            # 단가 추출
+            unit_price = ""
+            if 'unit_price' in row_config:
+                price_region = scale_region(row_config['unit_price'])
+                unit_price = self.extract_text_from_region(page, price_region)
+
+            # 할인율 추출
+            discount = ""
+            if 'disc_prcnt' in row_config:
+                discount_region = scale_region(row_config['disc_prcnt'])
+                discount = self.extract_text_from_region(page, discount_region)
+
+            # 선적 시작일 추출
+            shipping_start = ""
+            if 'shipping_start' in row_config:
+                start_region = scale_region(row_config['shipping_start'])
+                shipping_start = self.extract_text_from_region(page, start_region)
+
+            # 선적 완료일 추출
+            shipping_end = ""
+            if 'shipping_end' in row_config:
+                end_region = scale_region(row_config['shipping_end'])
+                shipping_end = self.extract_text_from_region(page, end_region)
+
+                # 수량 추출
+            sizes_quantities = []
+            for size_key in ['390', '400', '410', '420', '430', '440']:
+                if size_key in row_config['sizes']:
+                    size_region = scale_region(row_config['sizes'][size_key])
+                    size_quantity = self.extract_text_from_region(page, size_region, field='digits')
+                    # 빈 문자열이거나 숫자가 아닌 경우 0으로 처리
+                    qty = 0
+                    if size_quantity and size_quantity.strip() and re.search(r'\d+', size_quantity):
+                        qty_match = re.search(r'\d+', size_quantity)
+                        if qty_match:
+                            qty = int(qty_match.group(0))
+                    sizes_quantities.append(qty)
                 else:
-                    # 기본값 설정 (문서 경계가 없는 경우)
-                    self.logger.warning("document_bounds 정보가 없습니다. 기본값을 사용합니다.")
-                    json_base_width = 1700
-                    json_base_height = 2200
-                    json_start_x = 0
-                    json_start_y = 0
-                    scale_x = img_width / json_base_width
-                    scale_y = img_height / json_base_height
-
-                # 좌표 스케일링 함수
-                def scale_region(region):
-                    """JSON 좌표를 실제 이미지 크기에 맞게 스케일링"""
-                    # 원본 좌표
-                    orig_x = region.get('x', 0)
-                    orig_y = region.get('y', 0)
-                    orig_width = region.get('width', 100)
-                    orig_height = region.get('height', 30)
-
-                    # 문서 경계 기준 조정된 좌표 계산
-                    adjusted_x = orig_x - json_start_x
-                    adjusted_y = orig_y - json_start_y
-
-                    # 스케일링 적용
-                    x = int(adjusted_x * scale_x)
-                    y = int(adjusted_y * scale_y)
-                    width = max(1, int(orig_width * scale_x))
-                    height = max(1, int(orig_height * scale_y))
-
-                    # 이미지 경계 확인
-                    x = max(0, min(x, img_width - 1))
-                    y = max(0, min(y, img_height - 1))
-                    width = min(width, img_width - x)
-                    height = min(height, img_height - y)
-
-                    return {
-                        "x": x,
-                        "y": y,
-                        "width": width,
-                        "height": height
-                    }
-
-                # 데이터 추출
-                extracted_data = []
-
-                # 헤더 필드 추출 (브랜드, 시즌, 날짜)
-                if 'header_fields' in config:
-                    header_fields = config['header_fields']
-
-                    # 브랜드 추출
-                    brand_text = ""
-                    if 'brand' in header_fields:
-                        brand_region = scale_region(header_fields['brand'])
-                        brand_text = self.extract_text_from_region(img, brand_region)
-                        # 디버깅 이미지에 영역 표시
-                        cv2.rectangle(debug_img, (brand_region['x'], brand_region['y']), 
-                                    (brand_region['x'] + brand_region['width'], brand_region['y'] + brand_region['height']), 
-                                    (0, 0, 255), 2)
-                        cv2.putText(debug_img, "Brand", (brand_region['x'], brand_region['y']-5), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-
-                    # 시즌 추출
-                    season_text = ""
-                    if 'season' in header_fields:
-                        season_region = scale_region(header_fields['season'])
-                        season_text = self.extract_text_from_region(img, season_region)
-                        cv2.rectangle(debug_img, (season_region['x'], season_region['y']), 
-                                    (season_region['x'] + season_region['width'], season_region['y'] + season_region['height']), 
-                                    (255, 0, 0), 2)
-                        cv2.putText(debug_img, "Season", (season_region['x'], season_region['y']-5), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
-
-                    # 날짜 추출
-                    date_text = ""
-                    if 'date' in header_fields:
-                        date_region = scale_region(header_fields['date'])
-                        date_text = self.extract_text_from_region(img, date_region)
-                        cv2.rectangle(debug_img, (date_region['x'], date_region['y']), 
-                                    (date_region['x'] + date_region['width'], date_region['y'] + date_region['height']), 
-                                    (0, 255, 0), 2)
-                        cv2.putText(debug_img, "Date", (date_region['x'], date_region['y']-5), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
-
-                # 각 제품 행 처리
-                for i, row_config in enumerate(config['product_rows']):
-                    self.logger.info(f"\n제품 {i+1} 추출 시작 ---")
-
-                    # 아이템 코드 추출
-                    item_code = ""
-                    if 'item_code' in row_config:
-                        item_region = scale_region(row_config['item_code'])
-                        item_code = self.extract_text_from_region(img, item_region)
-
-                    # 모델명 추출
-                    model_text = ""
-                    if 'model' in row_config:
-                        model_region = scale_region(row_config['model'])
-                        model_text = self.extract_text_from_region(img, model_region)
-
-                    # 모델명 정리
-                    model_name = self.extract_and_clean_model_name(model_text)
-
-                    # 모델 코드 추출
-                    model_code_match = re.search(r'(AJ\d+|AC\d+|AR\d+|AL\d+)', model_name)
-                    model_code = model_code_match.group(1) if model_code_match else ''
-
-                    # 단가 추출
-                    unit_price = ""
-                    if 'unit_price' in row_config:
-                        price_region = scale_region(row_config['unit_price'])
-                        unit_price = self.extract_text_from_region(img, price_region)
-
-                    # 할인율 추출
-                    discount = ""
-                    if 'disc_prcnt' in row_config:
-                        discount_region = scale_region(row_config['disc_prcnt'])
-                        discount = self.extract_text_from_region(img, discount_region)
-
-                    # 선적 시작일 추출
-                    shipping_start = ""
-                    if 'shipping_start' in row_config:
-                        start_region = scale_region(row_config['shipping_start'])
-                        shipping_start = self.extract_text_from_region(img, start_region)
-
-                    # 선적 완료일 추출
-                    shipping_end = ""
-                    if 'shipping_end' in row_config:
-                        end_region = scale_region(row_config['shipping_end'])
-                        shipping_end = self.extract_text_from_region(img, end_region)
-
-                        # 수량 추출
-                    sizes_quantities = []
-                    for size_key in ['390', '400', '410', '420', '430', '440']:
-                        if size_key in row_config['sizes']:
-                            size_region = scale_region(row_config['sizes'][size_key])
-                            size_quantity = self.extract_text_from_region(img, size_region)
-                            # 빈 문자열이거나 숫자가 아닌 경우 0으로 처리
-                            qty = 0
-                            if size_quantity and size_quantity.strip() and re.search(r'\d+', size_quantity):
-                                qty_match = re.search(r'\d+', size_quantity)
-                                if qty_match:
-                                    qty = int(qty_match.group(0))
-                            sizes_quantities.append(qty)
-                        else:
-                            sizes_quantities.append(0)
-
-                    # 합계 수량 추출
-                    total_qty = 0
-                    if 'total' in row_config['sizes']:
-                        total_region = scale_region(row_config['sizes']['total'])
-                        total_qty_text = self.extract_text_from_region(img, total_region)
-                        if total_qty_text and total_qty_text.strip() and re.search(r'\d+', total_qty_text):
-                            qty_match = re.search(r'\d+', total_qty_text)
-                            if qty_match:
-                                total_qty = int(qty_match.group(0))
-                    else:
-                        total_qty = sum(sizes_quantities)  # 직접 계산
-
-                    # 단가 정규화
-                    normalized_unit_price = self.normalize_price(unit_price)
+                    sizes_quantities.append(0)
+
+            # 합계 수량 추출
+            total_qty = 0
+            if 'total' in row_config['sizes']:
+                total_region = scale_region(row_config['sizes']['total'])
+                total_qty_text = self.extract_text_from_region(page, total_region, field='digits')
+                if total_qty_text and total_qty_text.strip() and re.search(r'\d+', total_qty_text):
+                    qty_match = re.search(r'\d+', total_qty_text)
+                    if qty_match:
+                        total_qty = int(qty_match.group(0))
+            else:
+                total_qty = sum(sizes_quantities)  # 직접 계산
 
-                    # 총 금액 추출 또는 계산
-                    total_price = ""
-                    if 'total_price' in row_config:
-                        price_region = scale_region(row_config['total_price'])
-                        total_price = self.extract_text_from_region(img, price_region)
-                        total_price = self.normalize_price(total_price)
-                    else:
-                        # 총 금액 계산
-                        try:
-                            # 단가에서 숫자만 추출
-                            unit_price_text = normalized_unit_price.replace('EUR ', '').replace(',', '')
-                            unit_price_value = float(re.search(r'\d+\.?\d*', unit_price_text).group(0))
+            # 단가 정규화
+            normalized_unit_price = self.normalize_price(unit_price)
 
-                            # 총 금액 = 단가 x 수량
-                            total_amount = unit_price_value * total_qty
-                            total_price = f"EUR {total_amount:.2f}"
-                        except (ValueError, TypeError, AttributeError):
-                            total_price = 'EUR 0.00'
+            # 총 금액 추출 또는 계산
+            total_price = ""
+            if 'total_price' in row_config:
+                price_region = scale_region(row_config['total_price'])
+                total_price = self.extract_text_from_region(page, price_region)
+                total_price = self.normalize_price(total_price)
+            else:
+                # 총 금액 계산
+                try:
+                    # 단가에서 숫자만 추출
+                    unit_price_text = normalized_unit_price.replace('EUR ', '').replace(',', '')
+                    unit_price_value = float(re.search(r'\d+\.?\d*', unit_price_text).group(0))
+
+                    # 총 금액 = 단가 x 수량
+                    total_amount = unit_price_value * total_qty
+                    total_price = f"EUR {total_amount:.2f}"
+                except (ValueError, TypeError, AttributeError):
+                    total_price = 'EUR 0.00'
+
+            # 두 번째 페이지부터는 모델명/스타일코드가 모두 비어 있는 빈 행 제외
+            if page_number > 1 and not model_name and not item_code:
+                continue
 
-                    # 사이즈 변환 (390->39, 400->40, ...)
-                    converted_sizes = self.adjust_size_quantities(sizes_quantities)
+            # 사이즈 변환 (390->39, 400->40, ...)
+            converted_sizes = self.adjust_size_quantities(sizes_quantities)
+
+            # 제품 정보 딕셔너리 생성
+            product = {
+                '브랜드': brand_text,
+                '시즌': season_text,
+                '날짜': date_text,
+                '스타일코드': item_code,
+                '모델코드': model_code,
+                '모델명': model_name,
+                '구매가': normalized_unit_price,
+                '할인율': discount,
+                '선적_시작일': shipping_start,
+                '선적_완료일': shipping_end,
+                '총_수량': total_qty,
+                '총_금액': total_price
+            }
 
-                    # 제품 정보 딕셔너리 생성
-                    product = {
-                        '브랜드': brand_text,
-                        '시즌': season_text,
-                        '날짜': date_text,
-                        '스타일코드': item_code,
-                        '모델코드': model_code,
-                        '모델명': model_name,
-                        '구매가': normalized_unit_price,
-                        '할인율': discount,
-                        '선적_시작일': shipping_start,
-                        '선적_완료일': shipping_end,
-                        '총_수량': total_qty,
-                        '총_금액': total_price
-                    }
+            # 사이즈별 수량을 개별 컬럼으로 추가
+            for size in range(39, 47):
+                product[f'사이즈_{size}'] = converted_sizes.get(size, 0)
 
-                    # 사이즈별 수량을 개별 컬럼으로 추가
-                    for size in range(39, 47):
-                        product[f'사이즈_{size}'] = converted_sizes.get(size, 0)
+            extracted_data.append(product)
 
-                    extracted_data.append(product)
+        # 디버깅 이미지 저장 (첫 페이지)
+        if page_number == 1 and output_dir:
+            debug_image_path = os.path.join(output_dir, "debug_regions.jpg")
+            cv2.imwrite(debug_image_path, debug_img)
+            self.logger.info(f"디버깅 이미지를 저장했습니다: {debug_image_path}")
 
-                # 디버깅 이미지 저장
-                debug_image_path = os.path.join(output_dir, "debug_regions.jpg")
-                cv2.imwrite(debug_image_path, debug_img)
-                self.logger.info(f"디버깅 이미지를 저장했습니다: {debug_image_path}")
+        return extracted_data
 
-                # 엑셀로 저장
-                if extracted_data:
-                    # 데이터프레임 생성
-                    df = pd.DataFrame(extracted_data)
+    def _process_order_sheet_with_json(self, pdf_path: str, json_path: str, output_dir: Optional[str] = None,
+                                       progress_callback: Optional[Callable[[str], None]] = None) -> Tuple[pd.DataFrame, Optional[str]]:
+            """오더시트 특화 처리 (newreorder.py 기반)"""
+            try:
+                # 출력 폴더 생성
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
 
-                    # 컬럼 순서 지정
-                    columns_order = [
-                        '브랜드', '시즌', '날짜', '스타일코드', '모델코드', '모델명', 
-                        '구매가', '할인율', '선적_시작일', '선적_완료일', '총_수량', '총_금액'
-                    ] + [f'사이즈_{size}' for size in range(39, 47)]
+                # JSON 파일 로드
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+                layout_key = template_key(os.path.basename(json_path), config)
 
-                    # 누락된 컬럼 확인
-                    for col in columns_order:
-                        if col not in df.columns:
-                            df[col] = ''
+                # PDF 모든 페이지를 이미지 배열로 변환하여 페이지별로 병렬 처리 (임시 파일 없음)
+                self._notify_stage(progress_callback, 'rasterize')
 
-                    # 존재하는 컬럼만 사용
-                    valid_columns = [col for col in columns_order if col in df.columns]
-                    df = df[valid_columns]
+                def process_page(page_number, img):
+                    if page_number == 1:
+                        self._notify_stage(progress_callback, 'ocr')
+                    return self._extract_order_page(page_number, img, config, output_dir, layout_key)
 
-                    # 엑셀 파일 경로 생성
-                    output_file = os.path.join(output_dir, f"order_sheet_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+                extracted_data = self._map_pdf_pages(pdf_path, process_page)
 
-                    # 엑셀로 저장
-                    df.to_excel(output_file, index=False)
-                    self.logger.info(f"오더시트 데이터를 엑셀 파일로 저장했습니다: {output_file}")
+                # 엑셀로 저장 (이어지는 페이지의 빈 헤더 값은 앞 페이지 값 사용)
+                self._notify_stage(progress_callback, 'parse')
+                with span('parse'):
+                    self._fill_from_first_page(extracted_data, ['브랜드', '시즌', '날짜'])
+                if extracted_data:
+                    with span('dataframe'):
+                        # 데이터프레임 생성
+                        df = pd.DataFrame(extracted_data)
+
+                        # 컬럼 순서 지정
+                        columns_order = [
+                            '브랜드', '시즌', '날짜', '스타일코드', '모델코드', '모델명', 
+                            '구매가', '할인율', '선적_시작일', '선적_완료일', '총_수량', '총_금액'
+                        ] + [f'사이즈_{size}' for size in range(39, 47)]
+
+                        # 누락된 컬럼 확인
+                        for col in columns_order:
+                            if col not in df.columns:
+                                df[col] = ''
+
+                        # 존재하는 컬럼만 사용
+                        valid_columns = [col for col in columns_order if col in df.columns]
+                        df = df[valid_columns]
+
+                    # 처리 결과 저장 (엑셀은 보관소가 없을 때만 바로 작성)
+                    output_file = self._write_result(df, output_dir, "order_sheet_data")
+                    self.logger.info(f"오더시트 데이터를 저장했습니다: {output_file}")
                 
                     return df, output_file
 
@@ -1039,11 +1336,3 @@ class OCRProcessor:
                 import traceback
                 self.logger.error(traceback.format_exc())
                 return pd.DataFrame(), None
-            finally:
-                # 임시 파일 정리
-                for path in image_paths:
-                    if os.path.exists(path):
-                        try:
-                            os.remove(path)
-                        except:
-                            pass
\ No newline at end of file
@@ -0,0 +1,216 @@
+# page_registration.py
+
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def template_key(name: str, template: Dict[str, Any]) -> str:
+    """템플릿 식별 키 (파일 이름 + 내용 해시, 좌표를 고치면 기준 페이지/변환 캐시도 새로 만든다)"""
+    digest = hashlib.sha1(json.dumps(template, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    return f"{name}:{digest}"
+
+
+def scaling_matrix(scale_x: float, scale_y: float, offset_x: float = 0.0, offset_y: float = 0.0) -> np.ndarray:
+    """템플릿 좌표 → 페이지 좌표 선형 변환 행렬 (페이지 = (템플릿 - offset) * scale)"""
+    return np.array([
+        [scale_x, 0.0, -offset_x * scale_x],
+        [0.0, scale_y, -offset_y * scale_y],
+        [0.0, 0.0, 1.0]
+    ], dtype=np.float64)
+
+
+def map_region(matrix: np.ndarray, region: Dict[str, Any], default_width: int = 10,
+               default_height: int = 10) -> Dict[str, int]:
+    """템플릿 영역의 네 꼭짓점을 변환해 감싸는 축 정렬 영역 반환
+
+    선형 스케일링 행렬이면 기존 계산(int(x * scale), int(width * scale))과 같은 값이 나온다.
+    """
+    x = region.get("x", 0)
+    y = region.get("y", 0)
+    width = region.get("width", default_width)
+    height = region.get("height", default_height)
+
+    corners = np.array([[[x, y]], [[x + width, y]], [[x, y + height]], [[x + width, y + height]]], dtype=np.float64)
+    mapped = cv2.perspectiveTransform(corners, matrix).reshape(-1, 2)
+    x0, y0 = mapped.min(axis=0)
+    x1, y1 = mapped.max(axis=0)
+    return {
+        "x": int(x0),
+        "y": int(y0),
+        "width": max(1, int(x1 - x0)),
+        "height": max(1, int(y1 - y0))
+    }
+
+
+def _gray(image: np.ndarray) -> np.ndarray:
+    """그레이스케일 페이지 (컬러 페이지는 변환)"""
+    return image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+class PageRegistrar:
+    """스캔 페이지를 템플릿 기준 페이지에 맞추는 정합(registration) 단계
+
+    페이지의 ORB 특징점(표 선 교차점, 고정 라벨/로고 모서리 등)을 템플릿의 기준 특징점과 짝지어
+    템플릿 좌표 → 페이지 좌표 호모그래피를 구한다. 기울어지거나 여백이 밀린 스캔도 영역이 제자리에 잘리므로
+    확장 재시도(추가 Vision 호출)가 줄어든다.
+
+    기준 특징점은 템플릿별로 처음 들어온 페이지를 선형 스케일링으로 템플릿 좌표에 옮겨 등록한다
+    (첫 스캔은 기존 방식과 같다). 계산한 변환은 템플릿 + 페이지 크기 + 스캔 서명(내용 경계와 기울기)별로
+    캐시하므로 같은 공급사/스캐너의 비슷한 스캔은 특징점 매칭 없이 재사용한다.
+    정합에 실패하면 호출 측이 넘긴 선형 스케일링 행렬을 그대로 사용한다.
+    """
+
+    def __init__(self, work_width: int = 1000, max_features: int = 3000, min_inliers: int = 20,
+                 max_shift: float = 0.08, cache_size: int = 256):
+        """
+        Args:
+            work_width: 특징점 검출용으로 줄인 페이지 너비 (픽셀)
+            max_features: 페이지당 ORB 특징점 수
+            min_inliers: 변환을 채택할 최소 RANSAC 인라이어 수
+            max_shift: 선형 스케일링 대비 허용 최대 이동량 (페이지 긴 변 대비 비율, 넘으면 오정합으로 보고 버림)
+            cache_size: 보관할 변환 캐시 항목 수
+        """
+        self.work_width = work_width
+        self.max_features = max_features
+        self.min_inliers = min_inliers
+        self.max_shift = max_shift
+        self.cache_size = cache_size
+
+        self._references: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._transforms: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'pages': 0, 'registered': 0, 'cache_hits': 0, 'fallbacks': 0, 'references': 0}
+
+    def stats(self) -> Dict[str, int]:
+        """정합 통계 (처리 페이지, 정합 성공, 캐시 적중, 선형 스케일링 대체, 기준 페이지 수)"""
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def register(self, image: np.ndarray, key: str, base: np.ndarray) -> np.ndarray:
+        """페이지의 템플릿 좌표 → 페이지 좌표 변환 행렬 반환
+
+        Args:
+            image: 페이지 이미지 (BGR 또는 그레이스케일)
+            key: 템플릿 키 (template_key)
+            base: 템플릿의 document_bounds 로 만든 선형 스케일링 행렬 (정합 실패 시 그대로 반환)
+
+        Returns:
+            3x3 변환 행렬
+        """
+        gray = _gray(image)
+        shape = gray.shape[:2]
+        self._count('pages')
+
+        cache_key = (key, shape, self._signature(gray))
+        with self._lock:
+            cached = self._transforms.get(cache_key)
+            if cached is not None:
+                self._transforms.move_to_end(cache_key)
+                self._stats['cache_hits'] += 1
+                return cached.copy()
+
+        points, descriptors = self._features(gray)
+        reference = self._references.get(key)
+
+        if reference is None:
+            if descriptors is None or len(points) < self.min_inliers:
+                self._count('fallbacks')
+                return base
+            # 첫 페이지를 기준으로 등록 (특징점을 템플릿 좌표로 옮겨 보관)
+            template_points = cv2.perspectiveTransform(
+                points.reshape(-1, 1, 2).astype(np.float64), np.linalg.inv(base)
+            ).reshape(-1, 2).astype(np.float32)
+            with self._lock:
+                if key not in self._references:
+                    self._references[key] = (template_points, descriptors)
+                    self._stats['references'] += 1
+            logger.info(f"템플릿 기준 페이지 등록: {key} (특징점 {len(points)}개)")
+            matrix = base
+        else:
+            matrix = self._estimate(reference, points, descriptors, base, shape)
+            if matrix is None:
+                self._count('fallbacks')
+                return base
+            self._count('registered')
+
+        with self._lock:
+            self._transforms[cache_key] = matrix
+            while len(self._transforms) > self.cache_size:
+                self._transforms.popitem(last=False)
+        return matrix.copy()
+
+    def _signature(self, gray: np.ndarray) -> Optional[tuple]:
+        """스캔 서명: 1/8 축소 페이지의 내용(잉크) 경계와 기울기 (0.25도 단위)
+
+        같은 스캐너/공급사의 스캔은 여백과 기울기가 같으므로 서명이 같으면 같은 변환을 쓴다.
+        """
+        thumb = cv2.resize(gray, (max(1, gray.shape[1] // 8), max(1, gray.shape[0] // 8)),
+                           interpolation=cv2.INTER_AREA)
+        _, ink = cv2.threshold(thumb, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        points = cv2.findNonZero(ink)
+        if points is None:
+            return None
+        angle = cv2.minAreaRect(points)[2]
+        if angle > 45:
+            angle -= 90
+        elif angle < -45:
+            angle += 90
+        return (int(round(angle / 0.25)),) + tuple(int(v) for v in cv2.boundingRect(points))
+
+    def _features(self, gray: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """축소 페이지에서 ORB 특징점 검출 (좌표는 원본 페이지 기준)"""
+        scale = min(1.0, self.work_width / gray.shape[1])
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+
+        # ORB 객체는 스레드 간 공유하지 않음 (페이지 작업이 병렬로 실행됨)
+        orb = cv2.ORB_create(nfeatures=self.max_features)
+        keypoints, descriptors = orb.detectAndCompute(small, None)
+        points = np.array([kp.pt for kp in keypoints], dtype=np.float32).reshape(-1, 2) / scale
+        return points, descriptors
+
+    def _estimate(self, reference: Tuple[np.ndarray, np.ndarray], points: np.ndarray,
+                  descriptors: Optional[np.ndarray], base: np.ndarray, shape: Tuple[int, int]) -> Optional[np.ndarray]:
+        """기준 특징점과 매칭해 호모그래피 추정 (인라이어 부족/과도한 이동이면 None)"""
+        reference_points, reference_descriptors = reference
+        if descriptors is None or len(points) < self.min_inliers:
+            return None
+
+        matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+        good = [
+            pair[0] for pair in matcher.knnMatch(reference_descriptors, descriptors, k=2)
+            if len(pair) == 2 and pair[0].distance < 0.75 * pair[1].distance
+        ]
+        if len(good) < self.min_inliers:
+            return None
+
+        src = reference_points[[m.queryIdx for m in good]].reshape(-1, 1, 2)
+        dst = points[[m.trainIdx for m in good]].reshape(-1, 1, 2)
+        # 재투영 허용 오차는 특징점 검출 해상도의 3픽셀
+        threshold = 3.0 * max(1.0, shape[1] / self.work_width)
+        matrix, inliers = cv2.findHomography(src, dst, cv2.RANSAC, threshold)
+        if matrix is None or inliers is None or int(inliers.sum()) < self.min_inliers:
+            return None
+
+        # 페이지 네 모서리가 선형 스케일링 결과에서 너무 멀리 가면 오정합으로 판단
+        height, width = shape
+        page_corners = np.array([[[0, 0]], [[width, 0]], [[0, height]], [[width, height]]], dtype=np.float64)
+        template_corners = cv2.perspectiveTransform(page_corners, np.linalg.inv(base))
+        shift = np.abs(cv2.perspectiveTransform(template_corners, matrix) - page_corners).max()
+        if shift > self.max_shift * max(width, height):
+            logger.warning(f"페이지 정합 결과 이동량이 너무 큽니다 ({shift:.0f}px): 선형 스케일링 사용")
+            return None
+
+        return matrix
@@ -0,0 +1,51 @@
+# rasterize.py
+
+import logging
+from typing import Iterator, Optional, Tuple
+
+import cv2
+import numpy as np
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+logger = logging.getLogger(__name__)
+
+
+def pdf_page_count(pdf_path: str) -> int:
+    """PDF 페이지 수"""
+    return int(pdfinfo_from_path(pdf_path)["Pages"])
+
+
+def pil_to_array(image, grayscale: bool = False) -> np.ndarray:
+    """pdf2image(PIL) 페이지를 OpenCV 배열로 변환 (컬러는 BGR, 그레이스케일은 2차원)"""
+    array = np.array(image)
+    if grayscale or array.ndim == 2:
+        return array
+    # 새로 할당하지 않고 같은 버퍼에서 RGB → BGR 변환
+    return cv2.cvtColor(array, cv2.COLOR_RGB2BGR, dst=array)
+
+
+def iter_pdf_pages(pdf_path: str, dpi: int = 300, grayscale: bool = False,
+                   first_page: int = 1, last_page: Optional[int] = None) -> Iterator[Tuple[int, np.ndarray]]:
+    """PDF 페이지를 한 장씩 메모리에서 래스터화하여 (페이지 번호, 배열) 반환
+
+    임시 이미지 파일을 만들지 않으며(poppler 출력을 파이프로 직접 읽음), 한 번에 한 페이지만
+    변환하므로 긴 문서도 메모리 사용량이 페이지 1장 수준으로 유지된다.
+    영역 이미지는 image[y:y+h, x:x+w] 처럼 슬라이싱하면 복사 없이 같은 버퍼를 공유한다.
+
+    Args:
+        pdf_path: PDF 파일 경로
+        dpi: 래스터화 해상도 (OCR 품질이 허용하면 200 등 낮은 값으로 속도/메모리 절약)
+        grayscale: True 이면 단일 채널 배열 반환 (메모리 1/3, JPEG 인코딩 크기 감소)
+        first_page: 시작 페이지 (1부터)
+        last_page: 마지막 페이지 (None 이면 문서 끝까지)
+    """
+    if last_page is None:
+        last_page = pdf_page_count(pdf_path)
+
+    for page_number in range(first_page, last_page + 1):
+        pages = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number,
+                                  grayscale=grayscale)
+        if not pages:
+            logger.warning(f"페이지 {page_number} 래스터화 결과가 없습니다: {pdf_path}")
+            continue
+        yield page_number, pil_to_array(pages[0], grayscale)
@@ -0,0 +1,343 @@
+# reconciliation.py
+
+import hashlib
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .fuzzy_match import OCR_CONFUSIONS, FuzzyMatcher
+from .item_records import SIZE_COLUMN_PREFIXES, size_columns, sort_sizes
+
+# 비교 테이블의 사이즈 컬럼 접두어
+SIZE_PREFIX = SIZE_COLUMN_PREFIXES[0]
+
+# 비교 필드 정의: (컬럼명, 표시명, 비교 방식)
+#   int: 정수 변환 후 비교 (빈 값 0), text: 정규화 문자열 비교, exact: 문자열 그대로 비교
+CompareField = Tuple[str, str, str]
+
+# /orders/compare 기본 비교 필드 (사이즈별 수량은 항상 비교)
+QUANTITY_FIELDS: List[CompareField] = [('quantity', '총 수량', 'int')]
+
+# 모델 코드 ('AJ' + 숫자, 정확히 일치 비교용 키)
+MODEL_CODE_PATTERN = r'(AJ\d+)'
+
+# 퍼지 매칭 후보용 모델 코드 ('AJ' + 숫자, 숫자 사이의 OCR 혼동 문자 허용)
+_CONFUSABLE_CHARS = re.escape(''.join(sorted({char for key in OCR_CONFUSIONS for char in (key, key.upper())})))
+FUZZY_MODEL_CODE_PATTERN = rf'(AJ(?:[{_CONFUSABLE_CHARS}]*\d)+)'
+
+# DB 품목 행에서 읽는 컬럼
+ITEM_COLUMNS = ['id', 'model_code', 'model_name', 'color', 'quantity', 'wholesale_price', 'total_price']
+
+# 비교 결과 형식 버전 (결과가 달라지는 변경 시 올려 저장된 재비교 캐시를 무효화)
+RECONCILE_VERSION = 2
+
+
+def _text(series: pd.Series) -> pd.Series:
+    """결측값을 빈 문자열로 바꾼 문자열 Series"""
+    return series.where(series.notna(), '').astype(str)
+
+
+def _series(df: pd.DataFrame, name: str, default: Any = '') -> pd.Series:
+    """컬럼이 없으면 기본값으로 채운 Series"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(default, index=df.index)
+
+
+def standard_model_keys(df: pd.DataFrame) -> pd.Series:
+    """모델 코드 키: 'AJ숫자' 코드가 있으면 그 부분, 없으면 전체 코드 (소문자)"""
+    codes = _text(_series(df, 'model_code'))
+    return codes.str.extract(MODEL_CODE_PATTERN, expand=False).fillna(codes).str.lower()
+
+
+def fuzzy_model_keys(df: pd.DataFrame) -> pd.Series:
+    """퍼지 매칭 후보 문자열: standard_model_keys 와 같되 숫자 사이의 OCR 혼동 문자를 포함
+
+    'AJ1O23' 은 정확 키로는 'aj1' 이 되지만 후보 문자열은 'aj1o23' 이 되어, 퍼지 매칭이 전체 코드를 비교한다.
+    (코드 끝의 문자는 정확 키처럼 제외)
+    """
+    codes = _text(_series(df, 'model_code'))
+    return codes.str.extract(FUZZY_MODEL_CODE_PATTERN, expand=False).fillna(codes).str.lower()
+
+
+def model_color_keys(df: pd.DataFrame) -> pd.Series:
+    """모델 코드 + 컬러 키 (모델 코드가 없으면 모델명의 코드 → 스타일코드 → 'unknown')"""
+    codes = _text(_series(df, 'model_code'))
+    from_name = _text(_series(df, 'model_name')).str.extract(r'(AJ\d+|A[JRCSL]\d+)', expand=False)
+    if '스타일코드' in df.columns:
+        fallback = _text(df['스타일코드'].where(df['스타일코드'].notna(), 'unknown'))
+    else:
+        fallback = pd.Series('unknown', index=df.index)
+    codes = codes.where(codes != '', from_name.fillna(fallback))
+
+    colors = _text(_series(df, 'color'))
+    return codes.where(colors == '', codes + '_' + colors).str.lower()
+
+
+def normalize_values(values: pd.Series) -> pd.Series:
+    """비교용 문자열 정규화 (공백 제거, '123.00' → '123', 소문자, 통화 기호/쉼표 제거)"""
+    text = _text(values).str.strip()
+    numbers = pd.to_numeric(text.where(text.str.fullmatch(r'\d+\.?\d*|\.\d+')), errors='coerce')
+    integral = numbers.notna() & (numbers % 1 == 0)
+    if integral.any():
+        text = text.mask(integral, numbers[integral].astype('int64').astype(str))
+    return text.str.lower().str.replace(r'[$€₩,]', '', regex=True)
+
+
+def item_table(items: Sequence, size_rows: Sequence[Tuple[int, str, int]],
+               key_func: Callable[[pd.DataFrame], pd.Series] = standard_model_keys,
+               fuzzy_key_func: Optional[Callable[[pd.DataFrame], pd.Series]] = fuzzy_model_keys) -> pd.DataFrame:
+    """DB 품목/사이즈 행을 비교 테이블로 변환
+
+    Args:
+        items: ITEM_COLUMNS 순서의 품목 행 목록
+        size_rows: (품목 ID, 사이즈, 수량) 목록
+        key_func: 품목 키 생성 함수 (DataFrame → Series)
+        fuzzy_key_func: 퍼지 매칭 후보 문자열 생성 함수 (None 이면 키를 그대로 사용)
+
+    Returns:
+        key, fuzzy_key, model_code, model_name, quantity, price ... + '사이즈_<사이즈>' 컬럼의 DataFrame
+    """
+    table = pd.DataFrame.from_records(items, columns=ITEM_COLUMNS)
+    table['price'] = table['wholesale_price']
+
+    if size_rows:
+        sizes = pd.DataFrame.from_records(size_rows, columns=['item_id', 'size', 'quantity'])\
+                  .pivot_table(index='item_id', columns='size', values='quantity', aggfunc='sum', fill_value=0)\
+                  .reindex(table['id'], fill_value=0)
+        sizes.columns = [f'{SIZE_PREFIX}{label}' for label in sizes.columns]
+        table = pd.concat([table, sizes.reset_index(drop=True)], axis=1)
+
+    table['key'] = key_func(table)
+    if fuzzy_key_func is not None:
+        table['fuzzy_key'] = fuzzy_key_func(table)
+    return table
+
+
+def items_fingerprint(*documents: Tuple[Sequence, Sequence], settings: str = '') -> str:
+    """비교 입력 지문 (재비교 캐시 키)
+
+    Args:
+        documents: 문서별 (품목 행 목록, 사이즈 행 목록) - load_document_items 결과
+        settings: 결과에 영향을 주는 비교 설정 (퍼지 매칭 기준 등)
+
+    Returns:
+        sha256 16진 문자열 (품목·사이즈·설정·RECONCILE_VERSION 중 하나라도 바뀌면 달라짐)
+    """
+    digest = hashlib.sha256(f'{RECONCILE_VERSION}|{settings}'.encode('utf-8'))
+    for items, size_rows in documents:
+        digest.update(repr([tuple(row) for row in items]).encode('utf-8'))
+        digest.update(repr(sorted(tuple(row) for row in size_rows)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _fuzzy_keys(table: pd.DataFrame) -> pd.Series:
+    """퍼지 매칭 후보 문자열 (fuzzy_key 컬럼이 없거나 비어 있으면 키)"""
+    if 'fuzzy_key' not in table.columns:
+        return table['key']
+    return table['fuzzy_key'].where(table['fuzzy_key'].notna(), table['key'])
+
+
+def _field_values(series: pd.Series, kind: str) -> Tuple[np.ndarray, List]:
+    """비교 방식에 맞게 변환한 (비교용 배열, 응답용 값 목록)"""
+    if kind == 'int':
+        values = pd.to_numeric(series, errors='coerce').fillna(0).astype('int64').to_numpy()
+        return values, values.tolist()
+    if kind == 'text':
+        return normalize_values(series).to_numpy(), series.where(series.notna(), None).tolist()
+    values = _text(series)
+    return values.to_numpy(), values.tolist()
+
+
+def _size_matrix(df: pd.DataFrame, labels: List[str], columns: Dict[str, str]) -> Tuple[np.ndarray, np.ndarray]:
+    """사이즈 순서대로 정렬한 (품목 x 사이즈) 정수 행렬 (없는 사이즈는 0) 과 값이 있는 칸 마스크"""
+    matrix = np.zeros((len(df), len(labels)), dtype=np.int64)
+    present = np.zeros((len(df), len(labels)), dtype=bool)
+    for j, label in enumerate(labels):
+        if label in columns:
+            values = df[columns[label]]
+            matrix[:, j] = pd.to_numeric(values, errors='coerce').fillna(0).astype('int64').to_numpy()
+            present[:, j] = values.notna().to_numpy()
+    return matrix, present
+
+
+def _take(values: np.ndarray, positions: np.ndarray, fill) -> np.ndarray:
+    """조인 위치(-1 은 없는 품목)에 맞춰 행 선택, 없는 품목은 fill 로 채움"""
+    dtype = values.dtype if isinstance(fill, int) and values.dtype != object else object
+    result = np.full((len(positions),) + values.shape[1:], fill, dtype=dtype)
+    present = positions >= 0
+    result[present] = values[positions[present]]
+    return result
+
+
+def _group_pairs(rows: np.ndarray, cols: np.ndarray) -> Dict[int, List[int]]:
+    """np.nonzero 결과를 {행: [열, ...]} 로 묶기 (행 순서 유지)"""
+    grouped: Dict[int, List[int]] = {}
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        grouped.setdefault(row, []).append(col)
+    return grouped
+
+
+def _with_pairing(entry: Dict[str, Any], confidence: float, doc2_key: Optional[str],
+                  matcher: Optional[FuzzyMatcher]) -> Dict[str, Any]:
+    """퍼지 매칭 사용 시 짝지은 품목 정보에 신뢰도(와 다른 경우 두 번째 문서 키) 추가"""
+    if matcher is not None:
+        entry['match_confidence'] = float(confidence)
+        if doc2_key is not None:
+            entry['doc2_product_key'] = doc2_key
+    return entry
+
+
+def reconcile(table1: pd.DataFrame, table2: pd.DataFrame,
+              fields: Optional[List[CompareField]] = None,
+              matcher: Optional[FuzzyMatcher] = None,
+              skip_missing: bool = False) -> Dict[str, Any]:
+    """두 문서의 비교 테이블을 키로 외부 조인하여 품목별 일치/불일치 계산
+
+    같은 키가 여러 번 나오면 마지막 품목을 사용한다. 필드/사이즈 차이는 전체 품목에 대해
+    배열 연산으로 한 번에 계산하고, 응답 딕셔너리만 품목별로 만든다.
+    matcher 를 주면 키가 정확히 일치하지 않아 한쪽에만 남은 품목끼리 OCR 오인식을 감안해 다시 짝짓고
+    (fuzzy_key 컬럼이 있으면 그 후보 문자열로 비교),
+    짝지어진 품목에는 신뢰도(match_confidence, 정확히 일치하면 1.0)를 붙인다.
+
+    Args:
+        table1: 첫 번째 문서 비교 테이블 (key, model_code, model_name, quantity, price, 사이즈_* 컬럼)
+        table2: 두 번째 문서 비교 테이블
+        fields: 추가 비교 필드 목록 (기본값: 총 수량)
+        matcher: 한쪽에만 있는 키를 짝지을 퍼지 매처 (None 이면 정확히 일치하는 키만 비교)
+        skip_missing: True 면 어느 한쪽 값이 없는(None/NaN, 사이즈 컬럼 없음) 필드/사이즈는 비교하지 않음
+            (False 면 없는 값은 빈 값/0 으로 비교)
+
+    Returns:
+        {'matches': [...], 'mismatches': [...], 'summary': {...}}
+    """
+    fields = QUANTITY_FIELDS if fields is None else fields
+
+    left = table1.drop_duplicates('key', keep='last').reset_index(drop=True)
+    right = table2.drop_duplicates('key', keep='last').reset_index(drop=True)
+
+    # 사이즈: 두 문서에 나온 사이즈의 합집합 (정렬 순서 고정)
+    left_sizes, right_sizes = size_columns(left), size_columns(right)
+    labels = sort_sizes(set(left_sizes) | set(right_sizes))
+
+    # 키 기준 외부 조인 (첫 번째 문서 순서 → 두 번째 문서에만 있는 품목 순서)
+    keys = pd.Index(left['key']).append(pd.Index(right['key'])).drop_duplicates()
+    left_pos = pd.Index(left['key']).get_indexer(keys)
+    right_pos = pd.Index(right['key']).get_indexer(keys)
+    confidences = np.where((left_pos >= 0) & (right_pos >= 0), 1.0, np.nan)
+    doc2_keys = np.full(len(keys), None, dtype=object)
+
+    # 한쪽에만 있는 키끼리 퍼지 매칭 (후보 문자열 기준) → 두 번째 문서 행을 첫 번째 문서 행에 합침
+    fuzzy_pairs = []
+    if matcher is not None:
+        rows1 = np.flatnonzero((left_pos >= 0) & (right_pos < 0))
+        rows2 = np.flatnonzero((left_pos < 0) & (right_pos >= 0))
+        candidates1 = dict(zip(_fuzzy_keys(left).to_numpy()[left_pos[rows1]], rows1))
+        candidates2 = dict(zip(_fuzzy_keys(right).to_numpy()[right_pos[rows2]], rows2))
+        fuzzy_pairs = matcher.pair(list(candidates1), list(candidates2))
+        if fuzzy_pairs:
+            rows1 = np.array([candidates1[key1] for key1, _, _ in fuzzy_pairs])
+            rows2 = np.array([candidates2[key2] for _, key2, _ in fuzzy_pairs])
+            right_pos[rows1] = right_pos[rows2]
+            confidences[rows1] = [confidence for _, _, confidence in fuzzy_pairs]
+            doc2_keys[rows1] = keys[rows2]
+            keep = np.ones(len(keys), dtype=bool)
+            keep[rows2] = False
+            keys, left_pos, right_pos = keys[keep], left_pos[keep], right_pos[keep]
+            confidences, doc2_keys = confidences[keep], doc2_keys[keep]
+
+    exists1, exists2 = left_pos >= 0, right_pos >= 0
+    both = exists1 & exists2
+
+    # 필드/사이즈 차이 행렬 (품목 x 비교 항목)
+    names, diffs, compared, values1, values2 = [], [], [], [], []
+    for column_name, display_name, kind in fields:
+        series1, series2 = _series(left, column_name, None), _series(right, column_name, None)
+        compare1, shown1 = _field_values(series1, kind)
+        compare2, shown2 = _field_values(series2, kind)
+        diffs.append(_take(compare1, left_pos, None) != _take(compare2, right_pos, None))
+        compared.append(_take(series1.notna().to_numpy(), left_pos, False) &
+                        _take(series2.notna().to_numpy(), right_pos, False))
+        names.append(display_name)
+        values1.append(_take(np.array(shown1, dtype=object), left_pos, None).tolist())
+        values2.append(_take(np.array(shown2, dtype=object), right_pos, None).tolist())
+
+    sizes1, present1 = _size_matrix(left, labels, left_sizes)
+    sizes2, present2 = _size_matrix(right, labels, right_sizes)
+    sizes1, sizes2 = _take(sizes1, left_pos, 0), _take(sizes2, right_pos, 0)
+    names += [f'사이즈 {label}' for label in labels]
+    values1 += sizes1.T.tolist()
+    values2 += sizes2.T.tolist()
+
+    diff = np.column_stack(diffs + [sizes1 != sizes2]) if names else np.zeros((len(keys), 0), dtype=bool)
+    diff &= both[:, None]
+    if skip_missing and names:
+        diff &= np.column_stack(compared + [_take(present1, left_pos, False) & _take(present2, right_pos, False)])
+    mismatched = _group_pairs(*np.nonzero(diff))
+
+    # 제품명: 모델명 → 모델 코드 → 키 (양쪽에 있으면 첫 번째 문서 기준)
+    def display_names(table: pd.DataFrame) -> np.ndarray:
+        model_names = _text(_series(table, 'model_name')).str.strip()
+        model_codes = _text(_series(table, 'model_code'))
+        return model_names.where(model_names != '', model_codes).where(lambda s: s != '', table['key']).to_numpy()
+
+    product_names = np.where(exists1, _take(display_names(left), left_pos, ''), _take(display_names(right), right_pos, ''))
+    quantities = _take(pd.to_numeric(_series(left, 'quantity', 0), errors='coerce').fillna(0).astype('int64').to_numpy(),
+                      left_pos, 0).tolist()
+    prices = _take(_text(_series(left, 'price')).to_numpy(), left_pos, '').tolist()
+    size_parts = _group_pairs(*np.nonzero(sizes1))
+
+    result = {
+        'matches': [],
+        'mismatches': [],
+        'summary': {
+            'total_items': len(keys),
+            'matched_items': 0,
+            'mismatched_items': 0,
+            'match_percentage': 0
+        }
+    }
+
+    for row, key in enumerate(keys.tolist()):
+        if not both[row]:
+            # 한쪽에만 존재하는 항목
+            result['mismatches'].append({
+                'product_key': key,
+                'product_name': product_names[row],
+                'doc1_exists': bool(exists1[row]),
+                'doc2_exists': bool(exists2[row]),
+                'reason': '한쪽 문서에만 존재'
+            })
+        elif row in mismatched:
+            entry = {
+                'product_key': key,
+                'product_name': product_names[row],
+                'doc1_exists': True,
+                'doc2_exists': True,
+                'mismatched_fields': [
+                    {'field': names[col], 'value1': values1[col][row], 'value2': values2[col][row]}
+                    for col in mismatched[row]
+                ]
+            }
+            result['mismatches'].append(_with_pairing(entry, confidences[row], doc2_keys[row], matcher))
+        else:
+            parts = [f"{labels[col]}({values1[len(fields) + col][row]})" for col in size_parts.get(row, [])]
+            entry = {
+                'product_key': key,
+                'product_name': product_names[row],
+                'size': ", ".join(parts) if parts else "-",
+                'quantity': quantities[row],
+                'price': prices[row]
+            }
+            result['matches'].append(_with_pairing(entry, confidences[row], doc2_keys[row], matcher))
+
+    summary = result['summary']
+    summary['matched_items'] = len(result['matches'])
+    summary['mismatched_items'] = len(result['mismatches'])
+    if matcher is not None:
+        summary['fuzzy_matched_items'] = len(fuzzy_pairs)
+    if summary['total_items'] > 0:
+        summary['match_percentage'] = round(summary['matched_items'] / summary['total_items'] * 100, 2)
+    return result
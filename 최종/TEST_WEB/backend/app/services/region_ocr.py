@@ -0,0 +1,133 @@
+# region_ocr.py
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from .metrics import annotate
+
+logger = logging.getLogger(__name__)
+
+
+class PageWordIndex:
+    """페이지 전체 OCR 결과(단어 단위 박스)를 보관하고 템플릿 영역별 텍스트를 메모리에서 조회하는 인덱스"""
+
+    def __init__(self, image: np.ndarray, words: List[Dict[str, Any]]):
+        """인덱스 초기화
+
+        Args:
+            image: 원본 페이지 이미지 (영역 경계 확인용)
+            words: 단어 목록 ({'text', 'x0', 'y0', 'x1', 'y1'}, 페이지 좌표)
+        """
+        self.image = image
+        self.shape = image.shape
+        self.texts = [w['text'] for w in words]
+
+        boxes = np.array([[w['x0'], w['y0'], w['x1'], w['y1']] for w in words], dtype=np.float32).reshape(-1, 4)
+        self.x0, self.y0, self.x1, self.y1 = boxes.T
+        # 단어 중심 좌표 (영역 포함 여부 판정 기준)
+        self.cx = (self.x0 + self.x1) / 2
+        self.cy = (self.y0 + self.y1) / 2
+        self.heights = np.maximum(self.y1 - self.y0, 1)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def text_in(self, region: Dict[str, int]) -> str:
+        """영역 안에 중심이 들어오는 단어들을 줄 단위로 이어붙여 반환
+
+        Args:
+            region: {'x', 'y', 'width', 'height'} 형식의 페이지 좌표 영역
+
+        Returns:
+            영역 텍스트 (줄은 개행으로 구분, 단어가 없으면 빈 문자열)
+        """
+        x, y = region['x'], region['y']
+        w, h = region['width'], region['height']
+
+        mask = (self.cx >= x) & (self.cx < x + w) & (self.cy >= y) & (self.cy < y + h)
+        idx = np.flatnonzero(mask)
+        if idx.size == 0:
+            return ""
+
+        # 위→아래 정렬 후 단어 높이의 절반 이상 떨어지면 새 줄로 판단
+        idx = idx[np.argsort(self.cy[idx], kind='stable')]
+        line_gap = float(np.median(self.heights[idx])) / 2
+        lines = []
+        current = [idx[0]]
+        for i in idx[1:]:
+            if self.cy[i] - self.cy[current[-1]] > line_gap:
+                lines.append(current)
+                current = [i]
+            else:
+                current.append(i)
+        lines.append(current)
+
+        return "\n".join(
+            " ".join(self.texts[i] for i in sorted(line, key=lambda j: self.x0[j]))
+            for line in lines
+        ).strip()
+
+
+def _annotation_words(response, offset_x: int = 0, offset_y: int = 0) -> List[Dict[str, Any]]:
+    """Vision text_detection 응답에서 단어 단위 박스 추출 (첫 번째 항목은 전체 텍스트이므로 제외)"""
+    words = []
+    for annotation in list(response.text_annotations)[1:]:
+        vertices = annotation.bounding_poly.vertices
+        if not vertices:
+            continue
+        xs = [v.x for v in vertices]
+        ys = [v.y for v in vertices]
+        words.append({
+            'text': annotation.description,
+            'x0': min(xs) + offset_x,
+            'y0': min(ys) + offset_y,
+            'x1': max(xs) + offset_x,
+            'y1': max(ys) + offset_y
+        })
+    return words
+
+
+def detect_page_words(vision_client, vision_module, image: np.ndarray,
+                      tiles: int = 1, overlap: int = 64) -> Optional[List[Dict[str, Any]]]:
+    """페이지 전체(또는 세로 타일)를 한 번씩 OCR하여 페이지 좌표의 단어 목록 반환
+
+    Args:
+        vision_client: Vision ImageAnnotatorClient (또는 동일 인터페이스의 가짜 클라이언트)
+        vision_module: vision.Image 생성을 위한 모듈
+        image: 페이지 이미지
+        tiles: 세로 분할 개수 (해상도 제한이 있는 경우 2~3 권장)
+        overlap: 타일 경계에서 잘리는 단어를 위한 겹침 픽셀
+
+    Returns:
+        단어 목록 (API 오류 시 None)
+    """
+    img_height = image.shape[0]
+    tiles = max(1, int(tiles))
+    band = int(np.ceil(img_height / tiles))
+    words = []
+
+    for t in range(tiles):
+        own_start = t * band
+        own_end = min(img_height, own_start + band)
+        start = max(0, own_start - overlap)
+        end = min(img_height, own_end + overlap)
+
+        _, buffer = cv2.imencode('.jpg', image[start:end])
+        annotate(bytes_sent=buffer.size)
+        vision_image = vision_module.Image(content=buffer.tobytes())
+        response = vision_client.text_detection(image=vision_image)
+
+        if response.error.message:
+            logger.error(f"페이지 OCR 오류 (타일 {t + 1}/{tiles}): {response.error.message}")
+            return None
+
+        for word in _annotation_words(response, offset_y=start):
+            # 겹침 구간의 단어는 중심이 속한 타일에서만 채택 (중복 제거)
+            cy = (word['y0'] + word['y1']) / 2
+            if own_start <= cy < own_end or (t == tiles - 1 and cy >= own_end):
+                words.append(word)
+
+    return words
@@ -0,0 +1,174 @@
+# result_export.py
+
+import io
+import os
+import csv
+import uuid
+import codecs
+import logging
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from .ocr_cache import PARQUET_AVAILABLE
+from .metrics import span
+
+logger = logging.getLogger(__name__)
+
+# 다운로드 형식별 MIME 타입
+EXPORT_MIMETYPES = {
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.csv': 'text/csv; charset=utf-8'
+}
+
+
+def _cell(value: Any) -> Any:
+    """엑셀/CSV 셀 값 (결측값은 빈 칸, numpy 값은 파이썬 값)"""
+    if value is None:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def frame_rows(df: pd.DataFrame) -> Iterator[tuple]:
+    """DataFrame 행 이터레이터 (전체를 리스트로 만들지 않음)"""
+    return df.itertuples(index=False, name=None)
+
+
+def _replace_atomically(path: str, write) -> str:
+    """같은 디렉토리의 임시 파일에 쓴 뒤 이름을 바꿔 저장 (동시 다운로드가 반쯤 쓴 파일을 읽지 않도록)"""
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def write_xlsx(path: str, sheets: Iterable[tuple]) -> str:
+    """write-only 워크북으로 엑셀 저장 (행을 하나씩 써서 전체 행을 메모리에 올리지 않음)
+
+    Args:
+        path: 저장 경로
+        sheets: (시트 이름, 헤더, 행 이터레이터) 목록
+
+    Returns:
+        저장 경로
+    """
+    def write(tmp_path):
+        workbook = Workbook(write_only=True)
+        for title, header, rows in sheets:
+            sheet = workbook.create_sheet(title=title)
+            sheet.append([str(name) for name in header])
+            for row in rows:
+                sheet.append([_cell(value) for value in row])
+        workbook.save(tmp_path)
+
+    return _replace_atomically(path, write)
+
+
+def csv_chunks(header: Sequence[str], rows: Iterable[Sequence], rows_per_chunk: int = 500) -> Iterator[bytes]:
+    """CSV 를 행 묶음 단위 바이트 조각으로 생성 (엑셀에서 한글이 깨지지 않도록 UTF-8 BOM 포함)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    yield codecs.BOM_UTF8
+    writer.writerow(header)
+    for count, row in enumerate(rows, 1):
+        writer.writerow(['' if value is None else value for value in map(_cell, row)])
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def write_csv(path: str, header: Sequence[str], rows: Iterable[Sequence]) -> str:
+    """CSV 파일 저장 (csv_chunks 를 그대로 파일에 기록)"""
+    def write(tmp_path):
+        with open(tmp_path, 'wb') as f:
+            for chunk in csv_chunks(header, rows):
+                f.write(chunk)
+
+    return _replace_atomically(path, write)
+
+
+class ResultStore:
+    """OCR 처리 결과 보관소
+
+    처리 결과 DataFrame 은 컬럼 파일(parquet, pyarrow 가 없으면 pickle)로만 저장하고, 엑셀/CSV 는
+    처음 다운로드할 때 write-only 방식으로 만들어 export_dir 에 캐시한다. 처리 작업은 파일 이름만 받으므로
+    엑셀 작성 시간이 업로드 처리 시간에 포함되지 않는다.
+    """
+
+    def __init__(self, results_dir: str, export_dir: str):
+        """
+        Args:
+            results_dir: 처리 결과 컬럼 파일 디렉토리
+            export_dir: 다운로드 파일(엑셀/CSV) 캐시 디렉토리 (/orders/download 경로)
+        """
+        self.results_dir = results_dir
+        self.export_dir = export_dir
+        os.makedirs(results_dir, exist_ok=True)
+        os.makedirs(export_dir, exist_ok=True)
+
+    def save(self, df: pd.DataFrame, prefix: str) -> str:
+        """처리 결과 저장 후 다운로드용 엑셀 경로 반환 (엑셀 파일은 아직 만들지 않음)"""
+        stem = f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        base = os.path.join(self.results_dir, stem)
+
+        saved = False
+        if PARQUET_AVAILABLE:
+            try:
+                df.to_parquet(f"{base}.parquet", index=False)
+                saved = True
+            except Exception as e:
+                # 열 안에 숫자/문자열이 섞인 경우 등 parquet 변환 실패 시 pickle 사용
+                logger.warning(f"parquet 저장 실패, pickle 로 저장합니다: {e}")
+        if not saved:
+            df.to_pickle(f"{base}.pkl")
+
+        return os.path.join(self.export_dir, f"{stem}.xlsx")
+
+    def load(self, stem: str) -> Optional[pd.DataFrame]:
+        """저장된 처리 결과 (없으면 None)"""
+        base = os.path.join(self.results_dir, stem)
+        if os.path.exists(f"{base}.parquet"):
+            return pd.read_parquet(f"{base}.parquet")
+        if os.path.exists(f"{base}.pkl"):
+            return pd.read_pickle(f"{base}.pkl")
+        return None
+
+    def export_path(self, filename: str) -> Optional[str]:
+        """다운로드 파일 경로 (캐시에 없으면 저장된 처리 결과로 만들어 캐시, 결과도 없으면 None)
+
+        Args:
+            filename: '<결과 이름>.xlsx' 또는 '<결과 이름>.csv' (경로 구분자 없는 파일 이름)
+        """
+        path = os.path.join(self.export_dir, filename)
+        if os.path.exists(path):
+            return path
+
+        stem, extension = os.path.splitext(filename)
+        if extension not in EXPORT_MIMETYPES:
+            return None
+        df = self.load(stem)
+        if df is None:
+            return None
+
+        if extension == '.xlsx':
+            with span('excel_write'):
+                write_xlsx(path, [('Sheet1', df.columns, frame_rows(df))])
+        else:
+            with span('csv_write'):
+                write_csv(path, df.columns, frame_rows(df))
+        logger.info(f"다운로드 파일 생성: {filename} ({len(df)}행)")
+        return path
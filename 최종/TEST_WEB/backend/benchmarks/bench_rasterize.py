@@ -0,0 +1,125 @@
+# benchmarks/bench_rasterize.py
+"""PDF 래스터화 방식별 처리 시간/최대 메모리(RSS) 비교
+
+- file: 기존 방식 (pdf2image → 품질 100 JPEG 임시 파일 저장 → cv2.imread)
+- memory: iter_pdf_pages 로 페이지 배열을 메모리에서 바로 사용 (컬러 / 그레이스케일 / 낮은 DPI)
+
+각 방식은 별도 프로세스에서 실행하여 최대 RSS 가 서로 섞이지 않게 한다. --pdf 를 지정하지 않으면
+인보이스 템플릿으로 만든 합성 페이지를 --pages 장 묶은 PDF 를 사용한다. (poppler 필요)
+
+    python benchmarks/bench_rasterize.py --pages 8
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import resource
+import argparse
+import tempfile
+import subprocess
+
+import cv2
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pdf2image import convert_from_path
+from app.services.rasterize import iter_pdf_pages
+
+MODES = [
+    ('file', 300, False),
+    ('memory', 300, False),
+    ('memory', 300, True),
+    ('memory', 200, True),
+]
+
+
+def build_pdf(path, pages, seed):
+    """인보이스 템플릿 합성 페이지로 여러 페이지 PDF 생성"""
+    from bench_region_ocr import render_page, CONFIG_DIR
+
+    with open(os.path.join(CONFIG_DIR, 'invoice_data.json'), 'r', encoding='utf-8') as f:
+        template = json.load(f)
+    rng = random.Random(seed)
+    images = [Image.fromarray(cv2.cvtColor(render_page(template, rng)[0], cv2.COLOR_BGR2RGB)) for _ in range(pages)]
+    images[0].save(path, 'PDF', resolution=300.0, save_all=True, append_images=images[1:])
+
+
+def consume(page):
+    """OCR 전송과 같은 작업 (페이지 전체 JPEG 인코딩 + 영역 잘라내기)"""
+    _, buffer = cv2.imencode('.jpg', page)
+    crop = page[100:400, 100:900]  # 복사 없는 뷰
+    return len(buffer) + int(crop.shape[0])
+
+
+def run_file(pdf_path, dpi):
+    """기존 경로: 임시 JPEG 파일을 거쳐 다시 읽기"""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        total = 0
+        for i, image in enumerate(convert_from_path(pdf_path, dpi=dpi)):
+            image_path = os.path.join(temp_dir, f"temp_page_{i}.jpg")
+            image.save(image_path, "JPEG", quality=100)
+            total += consume(cv2.imread(image_path))
+        return total
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def run_memory(pdf_path, dpi, grayscale):
+    """메모리 경로: 페이지 배열을 한 장씩 바로 사용"""
+    return sum(consume(page) for _, page in iter_pdf_pages(pdf_path, dpi=dpi, grayscale=grayscale))
+
+
+def worker(args):
+    """하위 프로세스: 한 방식만 실행하고 결과를 JSON 한 줄로 출력"""
+    started = time.perf_counter()
+    if args.worker == 'file':
+        run_file(args.pdf, args.dpi)
+    else:
+        run_memory(args.pdf, args.dpi, args.gray)
+    elapsed = time.perf_counter() - started
+    # Linux 의 ru_maxrss 단위는 KB
+    print(json.dumps({'wall_time': elapsed, 'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pdf', help='측정할 PDF (없으면 합성 PDF 생성)')
+    parser.add_argument('--pages', type=int, default=8, help='합성 PDF 페이지 수')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--worker', choices=['file', 'memory'], help=argparse.SUPPRESS)
+    parser.add_argument('--dpi', type=int, default=300, help=argparse.SUPPRESS)
+    parser.add_argument('--gray', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        pdf_path = args.pdf
+        if not pdf_path:
+            pdf_path = os.path.join(work_dir, 'bench.pdf')
+            build_pdf(pdf_path, args.pages, args.seed)
+
+        print(f"PDF: {pdf_path}")
+        print(f"{'방식':<10}{'DPI':>6}{'그레이':>8}{'처리 시간(s)':>16}{'최대 RSS(MB)':>16}")
+        for mode, dpi, gray in MODES:
+            command = [sys.executable, __file__, '--worker', mode, '--pdf', pdf_path, '--dpi', str(dpi)]
+            if gray:
+                command.append('--gray')
+            output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:<10}{dpi:>6}{('예' if gray else '아니오'):>8}"
+                  f"{result['wall_time']:>16.2f}{result['max_rss_mb']:>16.1f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
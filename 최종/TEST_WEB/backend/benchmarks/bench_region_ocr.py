@@ -0,0 +1,146 @@
+# benchmarks/bench_region_ocr.py
+"""영역별 OCR(per_region)과 페이지 일괄 OCR(batched)의 Vision 호출 수/지연 비교 (오프라인)
+
+템플릿(invoice_data.json / order_data.json)의 모든 영역에 가짜 텍스트를 그린 합성 페이지를 만들고,
+FakeVisionClient 로 두 방식의 호출 수, 전송 바이트, 예상 지연을 측정한다.
+
+    python benchmarks/bench_region_ocr.py --template invoice --latency 0.08
+
+--save-fixture 로 합성 페이지를 fake 엔진 fixture 로 저장하면 OCR_ENGINE=fake OCR_FAKE_FIXTURE=<경로> 로
+서버를 오프라인으로 실행할 수 있다.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.ocr_service import OCRProcessor
+from app.services.fake_vision import FakeVisionClient, save_fixture
+
+CONFIG_DIR = os.path.join(os.path.dirname(__file__), '..', 'app', 'services', 'config')
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def iter_regions(node, path=()):
+    """템플릿 JSON에서 좌표 영역({'x','y','width','height'})을 모두 찾아 (경로, 영역) 반환"""
+    if isinstance(node, dict):
+        if all(k in node for k in ('x', 'y', 'width', 'height')):
+            yield path, node
+            return
+        for key, value in node.items():
+            if key != 'document_bounds':
+                yield from iter_regions(value, path + (key,))
+    elif isinstance(node, list):
+        for i, value in enumerate(node):
+            yield from iter_regions(value, path + (i,))
+
+
+def sample_text(path, rng):
+    """영역 이름에 어울리는 가짜 텍스트 (사이즈 칸은 일부 비워 둠)"""
+    key = str(path[-1])
+    parent = str(path[-2]) if len(path) > 1 else ''
+    if parent in ('sizes', 'size_headers') or key in ('qty', 'total'):
+        return str(rng.randint(1, 6)) if rng.random() < 0.6 else ''
+    if 'price' in key:
+        return f"EUR {rng.randint(90, 900)}.00"
+    if key in ('name', 'model'):
+        return f"AJ{rng.randint(100, 1999)} BLACK LEATHER"
+    if 'date' in key or 'shipping' in key:
+        return f"{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2025"
+    if key == 'disc_prcnt':
+        return f"{rng.randint(0, 40)}%"
+    return key.upper().replace('_', '')[:10]
+
+
+def render_page(template, rng):
+    """템플릿 영역마다 텍스트를 그린 합성 페이지, 단어 박스, 영역별 정답 텍스트 생성"""
+    bounds = template.get('document_bounds', {})
+    width, height = bounds.get('end_x', 2480), bounds.get('end_y', 3508)
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+    words = []
+    truth = []
+
+    for path, region in iter_regions(template):
+        text = sample_text(path, rng)
+        truth.append(text)
+        if not text:
+            continue
+        scale = max(0.4, region['height'] * 0.5 / 22)
+        (text_w, _), _ = cv2.getTextSize(text, FONT, scale, 2)
+        if text_w > region['width'] * 0.9:
+            scale *= region['width'] * 0.9 / text_w
+
+        cursor = region['x'] + 2
+        baseline_y = region['y'] + int(region['height'] * 0.7)
+        space_w = cv2.getTextSize(' ', FONT, scale, 2)[0][0]
+        for token in text.split():
+            (tw, th), _ = cv2.getTextSize(token, FONT, scale, 2)
+            cv2.putText(page, token, (cursor, baseline_y), FONT, scale, (0, 0, 0), 2)
+            words.append({'text': token, 'x0': cursor, 'y0': baseline_y - th, 'x1': cursor + tw, 'y1': baseline_y})
+            cursor += tw + space_w
+
+    return page, words, truth
+
+
+def run_mode(mode, page, words, regions, latency, tiles):
+    """한 방식으로 모든 영역을 읽고 (텍스트 목록, 통계) 반환"""
+    client = FakeVisionClient(page, words, latency=latency)
+    processor = OCRProcessor(vision_client=client, region_ocr_mode=mode, page_tiles=tiles)
+
+    started = time.perf_counter()
+    prepared = processor.prepare_page(page)
+    texts = [processor.extract_text_from_region(prepared, dict(region)) for _, region in regions]
+    elapsed = time.perf_counter() - started
+
+    return texts, {
+        'calls': client.calls,
+        'bytes': client.bytes_sent,
+        'simulated_latency': client.simulated_latency,
+        # 가짜 클라이언트 자체의 위치 탐색 시간은 제외한 처리 시간
+        'wall_time': elapsed - client.overhead
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--template', choices=['invoice', 'order'], default='invoice')
+    parser.add_argument('--latency', type=float, default=0.08, help='Vision 호출당 가정 지연 (초)')
+    parser.add_argument('--tiles', type=int, default=1, help='batched 모드 타일 수')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--save-fixture', help='합성 페이지/단어를 fake 엔진 fixture(JSON)로 저장할 경로')
+    args = parser.parse_args()
+
+    with open(os.path.join(CONFIG_DIR, f'{args.template}_data.json'), 'r', encoding='utf-8') as f:
+        template = json.load(f)
+
+    rng = random.Random(args.seed)
+    page, words, truth = render_page(template, rng)
+    regions = list(iter_regions(template))
+    if args.save_fixture:
+        print(f"fake 엔진 fixture 저장: {save_fixture(args.save_fixture, page, words)}")
+
+    per_region_texts, per_region = run_mode('per_region', page, words, regions, args.latency, args.tiles)
+    batched_texts, batched = run_mode('batched', page, words, regions, args.latency, args.tiles)
+
+    print(f"템플릿: {args.template}, 영역 {len(regions)}개, 단어 {len(words)}개, 호출당 지연 {args.latency:.3f}s")
+    print(f"{'방식':<12}{'호출 수':>10}{'전송 KB':>12}{'예상 지연(s)':>16}{'처리 시간(s)':>16}")
+    for name, stats in (('per_region', per_region), ('batched', batched)):
+        print(f"{name:<12}{stats['calls']:>10}{stats['bytes'] / 1024:>12.1f}"
+              f"{stats['simulated_latency']:>16.2f}{stats['wall_time']:>16.2f}")
+    print(f"호출 감소: {per_region['calls']} → {batched['calls']} "
+          f"({(1 - batched['calls'] / max(1, per_region['calls'])) * 100:.1f}%), "
+          f"지연 감소: {per_region['wall_time']:.2f}s → {batched['wall_time']:.2f}s")
+    # 영역별 방식의 오답은 가짜 클라이언트가 비슷한 잘라낸 이미지의 위치를 잘못 찾은 경우일 수 있음
+    print(f"정답 일치: per_region {sum(a == t for a, t in zip(per_region_texts, truth))}/{len(regions)}, "
+          f"batched {sum(b == t for b, t in zip(batched_texts, truth))}/{len(regions)}")
+
+
+if __name__ == '__main__':
+    main()
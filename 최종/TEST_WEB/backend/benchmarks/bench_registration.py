@@ -0,0 +1,114 @@
+# benchmarks/bench_registration.py
+"""템플릿 정합(registration) 유무에 따른 영역 재시도율/정답률/Vision 호출 수 비교 (오프라인)
+
+템플릿 영역마다 테두리(표 선)와 가짜 텍스트를 그린 양식 페이지를 만들고, 첫 장은 반듯한 스캔,
+나머지는 기울기와 여백 이동이 있는 스캔으로 만들어 FakeVisionClient 로 영역을 읽는다.
+같은 기울기/이동의 스캔이 반복되므로 변환 캐시 적중도 함께 확인한다.
+
+    python benchmarks/bench_registration.py --template invoice --pages 8 --angle 1.2 --shift 30
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.ocr_service import OCRProcessor
+from app.services.ocr_engines import FakeEngine
+from app.services.page_registration import PageRegistrar, map_region, scaling_matrix, template_key
+from bench_region_ocr import CONFIG_DIR, iter_regions, render_page
+
+
+def render_form(template, rng):
+    """영역 테두리(표 선)까지 그린 양식 페이지"""
+    page, words, truth = render_page(template, rng)
+    for _, region in iter_regions(template):
+        cv2.rectangle(page, (region['x'] - 4, region['y'] - 4),
+                      (region['x'] + region['width'] + 4, region['y'] + region['height'] + 4), (0, 0, 0), 2)
+    return page, words, truth
+
+
+def distort(page, words, angle, shift_x, shift_y):
+    """페이지를 회전/이동한 스캔과 옮겨진 단어 박스 생성"""
+    height, width = page.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    matrix[:, 2] += (shift_x, shift_y)
+    scan = cv2.warpAffine(page, matrix, (width, height), borderValue=(255, 255, 255))
+
+    moved = []
+    for word in words:
+        cx, cy = (word['x0'] + word['x1']) / 2, (word['y0'] + word['y1']) / 2
+        nx, ny = matrix @ np.array([cx, cy, 1.0])
+        half_w, half_h = (word['x1'] - word['x0']) / 2, (word['y1'] - word['y0']) / 2
+        moved.append({'text': word['text'], 'x0': nx - half_w, 'y0': ny - half_h, 'x1': nx + half_w, 'y1': ny + half_h})
+    return scan, moved
+
+
+def read_page(processor, template, key, page, truth):
+    """페이지 한 장의 모든 영역을 읽어 정답 수 반환"""
+    # 합성 페이지는 템플릿 좌표와 같은 크기로 그리므로 선형 스케일링은 항등 변환
+    matrix = processor._register_page(page, key, scaling_matrix(1.0, 1.0))
+    prepared = processor.prepare_page(page)
+    texts = [processor.extract_text_from_region(prepared, map_region(matrix, region))
+             for _, region in iter_regions(template)]
+    return sum(text == expected for text, expected in zip(texts, truth))
+
+
+def run(template, scans, mode, registrar):
+    """스캔 목록을 한 방식으로 처리하고 통계 반환"""
+    key = template_key('template.json', template)
+    processor = OCRProcessor(engine=FakeEngine(*scans[0][:2]), region_ocr_mode=mode, page_registrar=registrar)
+    correct = total = calls = 0
+    started = time.perf_counter()
+    for page, words, truth in scans:
+        processor.engine = FakeEngine(page, words)
+        correct += read_page(processor, template, key, page, truth)
+        total += len(truth)
+        calls += processor.engine.calls
+    stats = processor.region_stats()
+    return {'correct': correct, 'total': total, 'calls': calls, 'stats': stats,
+            'time': time.perf_counter() - started}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--template', choices=['invoice', 'order'], default='invoice')
+    parser.add_argument('--mode', choices=['per_region', 'batched'], default='per_region')
+    parser.add_argument('--pages', type=int, default=6, help='기울어진 스캔 페이지 수')
+    parser.add_argument('--angle', type=float, default=1.0, help='스캔 회전 각도 (도)')
+    parser.add_argument('--shift', type=int, default=30, help='스캔 여백 이동 (픽셀)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    with open(os.path.join(CONFIG_DIR, f'{args.template}_data.json'), 'r', encoding='utf-8') as f:
+        template = json.load(f)
+
+    rng = random.Random(args.seed)
+    scans = [render_form(template, rng)]
+    for i in range(args.pages):
+        page, words, truth = render_form(template, rng)
+        # 같은 스캐너 설정이 반복되는 상황 (두 가지 기울기/이동을 번갈아 사용)
+        sign = 1 if i % 2 == 0 else -1
+        scan, moved = distort(page, words, sign * args.angle, args.shift, sign * args.shift // 2)
+        scans.append((scan, moved, truth))
+
+    print(f"템플릿: {args.template}, 방식: {args.mode}, 페이지 {len(scans)}장 "
+          f"(기울기 ±{args.angle}도, 이동 {args.shift}px)")
+    print(f"{'정합':<12}{'정답':>12}{'재시도율':>12}{'Vision 호출':>14}{'처리 시간(s)':>16}")
+    for name, registrar in (('linear', None), ('registered', PageRegistrar())):
+        result = run(template, scans, args.mode, registrar)
+        stats = result['stats']
+        print(f"{name:<12}{result['correct']:>7}/{result['total']:<4}{stats['retry_rate'] * 100:>11.1f}%"
+              f"{result['calls']:>14}{result['time']:>16.2f}")
+        if stats['registration']:
+            print(f"  정합 통계: {stats['registration']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -345,6 +345,14 @@ function formatDate(date) {
     return `${year}-${month}-${day}`;
 }
 
+// 월간 뷰에 보이는 기간 (앞뒤 달 날짜 포함, 최대 6주)
+function getVisibleRange() {
+    const firstDay = new Date(currentDate.getFullYear(), currentDate.getMonth(), 1);
+    const start = new Date(firstDay.getFullYear(), firstDay.getMonth(), 1 - firstDay.getDay());
+    const end = new Date(start.getFullYear(), start.getMonth(), start.getDate() + 41);
+    return { start: formatDate(start), end: formatDate(end) };
+}
+
 // 날짜 형식 변환 (표시용)
 function formatDisplayDate(date) {
     const year = date.getFullYear();
@@ -417,6 +425,9 @@ function navigatePrevious() {
     
     updateCalendarHeader();
     renderCalendar();
+    
+    // 보이는 기간이 바뀌었으므로 선적 일정 다시 조회
+    loadManuallyAddedEvents();
 }
 
 // 다음 달/주/일로 이동
@@ -431,6 +442,9 @@ function navigateNext() {
     
     updateCalendarHeader();
     renderCalendar();
+    
+    // 보이는 기간이 바뀌었으므로 선적 일정 다시 조회
+    loadManuallyAddedEvents();
 }
 
 // 필터 적용
@@ -834,24 +848,31 @@ function loadShippingEvents() {
         });
  }
  
- /*// 문서 로드 및 처리
+ /*// 문서 목록 전체 조회
+ async function fetchAllDocuments(docType) {
+    const listKey = docType === 'invoice' ? 'invoices' : 'orders';
+    let documents = [];
+    let cursor = null;
+    do {
+        const params = new URLSearchParams({ limit: 500 });
+        if (cursor) params.set('cursor', cursor);
+        const response = await fetch(`${API_BASE_URL}/documents/${docType}?${params.toString()}`);
+        if (!response.ok) {
+            throw new Error(`${docType} 목록 로드 실패: ${response.status}`);
+        }
+        const data = await response.json();
+        documents = documents.concat(data[listKey] || []);
+        cursor = data.next_cursor;
+    } while (cursor);
+    return documents;
+ }
+ 
+ // 문서 로드 및 처리
  async function loadDocumentsAndProcess() {
     try {
-        // 인보이스 데이터 로드
-        const invoiceResponse = await fetch(`${API_BASE_URL}/documents/invoice`);
-        if (!invoiceResponse.ok) {
-            throw new Error(`인보이스 로드 실패: ${invoiceResponse.status}`);
-        }
-        const invoiceData = await invoiceResponse.json();
-        allInvoices = invoiceData.invoices || [];
-        
-        // 오더시트 데이터 로드
-        const orderResponse = await fetch(`${API_BASE_URL}/documents/order`);
-        if (!orderResponse.ok) {
-            throw new Error(`오더시트 로드 실패: ${orderResponse.status}`);
-        }
-        const orderData = await orderResponse.json();
-        allOrders = orderData.orders || [];
+        // 인보이스 / 오더시트 데이터 로드 (목록 API 는 최신 순 페이지이므로 next_cursor 를 따라 끝까지 읽음)
+        allInvoices = await fetchAllDocuments('invoice');
+        allOrders = await fetchAllDocuments('order');
         
         // 문서 처리 및 일정 생성
         await processDocuments();
@@ -1065,8 +1086,9 @@ function loadManuallyAddedEvents() {
     
     console.log("선적 일정 로드 시작");
     
-    // API 호출
-    fetch(`${API_BASE_URL}/calendar/events`)
+    // API 호출 (현재 보이는 기간의 일정만 조회)
+    const range = getVisibleRange();
+    fetch(`${API_BASE_URL}/calendar/events?start=${range.start}&end=${range.end}`)
         .then(response => {
             if (!response.ok) {
                 throw new Error('선적 일정 로드 실패');
@@ -1078,19 +1100,7 @@ function loadManuallyAddedEvents() {
             
             // API 응답에서 shipping_events 배열 사용
             if (data.shipping_events && Array.isArray(data.shipping_events)) {
-                shippingEvents = data.shipping_events.map(event => ({
-                    id: event.id || `ship-${Math.random().toString(36).substr(2, 9)}`,
-                    title: event.title || '무제 일정',
-                    date: event.date || event.start || new Date().toISOString().split('T')[0],
-                    category: event.category || 'shipping',
-                    description: event.description || '',
-                    is_confirmed: event.is_confirmed !== undefined ? event.is_confirmed : true,
-                    schedule_type: event.schedule_type || 'start',
-                    brand: event.brand || '',
-                    model_code: event.model_code || '',
-                    model_name: event.model_name || '',
-                    color: event.color || getBrandColor(event.brand)
-                }));
+                shippingEvents = data.shipping_events.map(toShippingEvent);
                 
                 console.log("변환된 이벤트 데이터:", shippingEvents);
             } else {
@@ -1137,6 +1147,23 @@ function loadManuallyAddedEvents() {
         });
 }
 
+// API 선적 일정을 캘린더 이벤트 형식으로 변환
+function toShippingEvent(event) {
+    return {
+        id: event.id || `ship-${Math.random().toString(36).substr(2, 9)}`,
+        title: event.title || '무제 일정',
+        date: event.date || event.start || new Date().toISOString().split('T')[0],
+        category: event.category || 'shipping',
+        description: event.description || '',
+        is_confirmed: event.is_confirmed !== undefined ? event.is_confirmed : true,
+        schedule_type: event.schedule_type || 'start',
+        brand: event.brand || '',
+        model_code: event.model_code || '',
+        model_name: event.model_name || '',
+        color: event.color || getBrandColor(event.brand)
+    };
+}
+
 // 브랜드 색상 가져오기 헬퍼 함수
 function getBrandColor(brand) {
     if (!brand) return BRAND_COLORS['default'];
@@ -1212,14 +1239,27 @@ function getBrandColor(brand) {
  }
  
  // 이벤트 검색
- function searchEvents(searchText) {
+ async function searchEvents(searchText) {
     if (!searchText.trim()) {
         renderCalendar();
         return;
     }
     
+    // 선적 일정은 보이는 기간만 불러와 있으므로 검색 때는 전체 기간을 조회
+    let allShippingEvents = shippingEvents;
+    try {
+        const response = await fetch(`${API_BASE_URL}/calendar/events`);
+        if (!response.ok) {
+            throw new Error('선적 일정 로드 실패');
+        }
+        const data = await response.json();
+        allShippingEvents = (data.shipping_events || []).map(toShippingEvent);
+    } catch (error) {
+        console.error('선적 일정 검색 중 오류:', error);
+    }
+    
     // 검색어 포함 필터링
-    const searchResults = calendarEvents.filter(event => {
+    const searchResults = [...personalEvents, ...businessEvents, ...allShippingEvents].filter(event => {
         return (
             event.title.toLowerCase().includes(searchText.toLowerCase()) ||
             (event.description && event.description.toLowerCase().includes(searchText.toLowerCase())) ||
@@ -1244,6 +1284,7 @@ function getBrandColor(brand) {
         // 캘린더 새로고침
         updateCalendarHeader();
         renderCalendar();
+        loadManuallyAddedEvents();
         
         // 결과 메시지
         alert(`'${searchText}' 검색 결과: ${searchResults.length}개 일정 찾음`);
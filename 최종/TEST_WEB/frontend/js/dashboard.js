@@ -140,7 +140,8 @@ async function fetchDocuments() {
         return {
             invoices: invoiceData.invoices || [],
             orders: orderData.orders || [],
-            total: (invoiceData.invoices?.length || 0) + (orderData.orders?.length || 0)
+            // 목록은 최신 페이지만 내려오므로 전체 건수는 total_count 사용
+            total: (invoiceData.total_count ?? invoiceData.invoices?.length ?? 0) + (orderData.total_count ?? orderData.orders?.length ?? 0)
         };
     } catch (error) {
         console.error('문서 데이터 로드 오류:', error);
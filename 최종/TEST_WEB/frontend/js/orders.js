@@ -3,6 +3,28 @@
 // API 기본 URL 설정 (개발 환경)
 const API_BASE_URL = 'http://localhost:5000/orders';
 
+// 목록 API 한 번에 받을 문서 수 (서버 최대값)
+const DOCUMENT_PAGE_SIZE = 500;
+
+// 문서 목록 전체 조회 (목록 API 는 최신 순 페이지로 내려오므로 next_cursor 를 따라 끝까지 읽음)
+async function fetchAllDocuments(docType) {
+    const listKey = docType === 'invoice' ? 'invoices' : 'orders';
+    let documents = [];
+    let cursor = null;
+    do {
+        const params = new URLSearchParams({ limit: DOCUMENT_PAGE_SIZE });
+        if (cursor) params.set('cursor', cursor);
+        const response = await fetch(`${API_BASE_URL}/documents/${docType}?${params.toString()}`);
+        if (!response.ok) {
+            throw new Error(`${docType} 목록 로드 실패: ${response.status}`);
+        }
+        const data = await response.json();
+        documents = documents.concat(data[listKey] || []);
+        cursor = data.next_cursor;
+    } while (cursor);
+    return documents;
+}
+
 document.addEventListener('DOMContentLoaded', function() {
     // DOM 요소 선택
     const documentGrid = document.querySelector('.document-grid');
@@ -96,14 +118,14 @@ document.addEventListener('DOMContentLoaded', function() {
         
         // 인보이스 및 오더 데이터 가져오기
         Promise.all([
-            fetch(`${API_BASE_URL}/documents/invoice`).then(response => response.json()),
-            fetch(`${API_BASE_URL}/documents/order`).then(response => response.json())
+            fetchAllDocuments('invoice'),
+            fetchAllDocuments('order')
         ])
-        .then(([invoiceData, orderData]) => {
+        .then(([invoices, orders]) => {
             // 모든 문서 목록 병합
             let allDocuments = [
-                ...(invoiceData.invoices || []).map(doc => ({...doc, document_type: 'invoice'})),
-                ...(orderData.orders || []).map(doc => ({...doc, document_type: 'order'}))
+                ...invoices.map(doc => ({...doc, document_type: 'invoice'})),
+                ...orders.map(doc => ({...doc, document_type: 'order'}))
             ];
             
             console.log("API에서 로드한 문서:", allDocuments.length, "개");
@@ -432,15 +454,10 @@ document.addEventListener('DOMContentLoaded', function() {
         compareButton.onclick = function() {
             // 현재 선택된 문서와 다른 문서 타입 선택
             let targetDocType = currentDoc.document_type === 'invoice' ? 'order' : 'invoice';
-            let targetEndpoint = targetDocType === 'invoice' ? 'documents/invoice' : 'documents/order';
             
             // 비교할 문서 목록 가져오기
-            fetch(`${API_BASE_URL}/${targetEndpoint}`)
-                .then(response => response.json())
-                .then(data => {
-                    // 문서 목록 가져오기
-                    const documents = targetDocType === 'invoice' ? data.invoices : data.orders;
-                    
+            fetchAllDocuments(targetDocType)
+                .then(documents => {
                     // 비교할 문서 선택 옵션 생성
                     if (compareDocSelect) {
                         compareDocSelect.innerHTML = '<option value="">선택하세요</option>';
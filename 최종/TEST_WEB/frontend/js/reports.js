@@ -3,6 +3,28 @@
 // API 기본 URL 설정
 const API_BASE_URL = 'http://localhost:5000/orders';
 
+// 목록 API 한 번에 받을 문서 수 (서버 최대값)
+const DOCUMENT_PAGE_SIZE = 500;
+
+// 문서 목록 전체 조회 (목록 API 는 최신 순 페이지로 내려오므로 next_cursor 를 따라 끝까지 읽음)
+async function fetchAllDocuments(docType) {
+    const listKey = docType === 'invoice' ? 'invoices' : 'orders';
+    let documents = [];
+    let cursor = null;
+    do {
+        const params = new URLSearchParams({ limit: DOCUMENT_PAGE_SIZE });
+        if (cursor) params.set('cursor', cursor);
+        const response = await fetch(`${API_BASE_URL}/documents/${docType}?${params.toString()}`);
+        if (!response.ok) {
+            throw new Error(`${docType} 목록 로드 실패: ${response.status}`);
+        }
+        const data = await response.json();
+        documents = documents.concat(data[listKey] || []);
+        cursor = data.next_cursor;
+    } while (cursor);
+    return documents;
+}
+
 document.addEventListener('DOMContentLoaded', function() {
     // 초기 데이터 로드
     loadReportData();
@@ -111,24 +133,17 @@ function getFilterValues() {
 // 문서 데이터 가져오기
 async function fetchDocuments() {
     try {
-        const [invoiceResponse, orderResponse] = await Promise.all([
-            fetch(`${API_BASE_URL}/documents/invoice`),
-            fetch(`${API_BASE_URL}/documents/order`)
+        const [invoices, orders] = await Promise.all([
+            fetchAllDocuments('invoice'),
+            fetchAllDocuments('order')
         ]);
         
-        if (!invoiceResponse.ok || !orderResponse.ok) {
-            throw new Error('문서 데이터를 가져오는데 실패했습니다.');
-        }
-        
-        const invoiceData = await invoiceResponse.json();
-        const orderData = await orderResponse.json();
-        
         // 문서 데이터 처리 및 가공
-        const processedData = processDocumentData(invoiceData.invoices || [], orderData.orders || []);
+        const processedData = processDocumentData(invoices, orders);
         
         return {
-            invoices: invoiceData.invoices || [],
-            orders: orderData.orders || [],
+            invoices: invoices,
+            orders: orders,
             brands: processedData.brands,
             brandOrders: processedData.brandOrders,
             seasons: processedData.seasons,
@@ -92,15 +92,18 @@ document.addEventListener('DOMContentLoaded', function() {
         uploadStatusIcon.className = 'fas fa-spinner fa-spin';
         uploadStatusMessage.textContent = '문서를 처리하고 있습니다...';
         
-        // 진행 상태 표시 (시각적 효과)
-        let progress = 0;
+        // 진행 상태 표시 (서버 작업 진행률 기준)
         const progressBar = document.querySelector('#uploadStatus .progress');
-        const progressInterval = setInterval(() => {
-            if (progress < 90) {
-                progress += 5;
-                progressBar.style.width = progress + '%';
-            }
-        }, 500);
+        progressBar.style.width = '0%';
+        const stageMessages = {
+            queued: '처리 대기 중입니다...',
+            rasterize: 'PDF를 이미지로 변환하고 있습니다...',
+            ocr: '문서 텍스트를 인식하고 있습니다...',
+            parse: '추출 데이터를 정리하고 있습니다...',
+            persist: '결과를 저장하고 있습니다...',
+            reconcile: '오더시트와 자동 대조하고 있습니다...',
+            done: '처리가 완료되었습니다.'
+        };
         
         // FormData 생성
         const formData = new FormData();
@@ -119,12 +122,15 @@ document.addEventListener('DOMContentLoaded', function() {
             body: formData
         })
         .then(response => {
-            clearInterval(progressInterval);
             if (!response.ok) {
                 throw new Error('파일 업로드 실패');
             }
             return response.json();
         })
+        .then(job => pollJob(job.job_id, (status) => {
+            progressBar.style.width = (status.progress || 0) + '%';
+            uploadStatusMessage.textContent = stageMessages[status.stage] || '문서를 처리하고 있습니다...';
+        }))
         .then(data => {
             // 업로드 성공
             progressBar.style.width = '100%';
@@ -193,7 +199,6 @@ document.addEventListener('DOMContentLoaded', function() {
         })
         .catch(error => {
             // 업로드 실패
-            clearInterval(progressInterval);
             uploadStatusDiv.style.display = 'block';
             uploadStatusIcon.className = 'fas fa-exclamation-circle';
             uploadStatusMessage.textContent = `업로드 중 오류 발생: ${error.message}`;
@@ -202,6 +207,33 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // 처리 작업 상태를 완료될 때까지 조회하는 함수
+    function pollJob(jobId, onProgress, interval = 1000) {
+        return new Promise((resolve, reject) => {
+            const check = () => {
+                fetch(`${API_BASE_URL}/jobs/${jobId}`)
+                    .then(response => {
+                        if (!response.ok) {
+                            throw new Error('작업 상태 조회 실패');
+                        }
+                        return response.json();
+                    })
+                    .then(status => {
+                        onProgress(status);
+                        if (status.status === 'completed') {
+                            resolve(status.result);
+                        } else if (status.status === 'failed') {
+                            reject(new Error(status.error || '문서 처리 실패'));
+                        } else {
+                            setTimeout(check, interval);
+                        }
+                    })
+                    .catch(reject);
+            };
+            check();
+        });
+    }
+    
     // 히스토리에 항목 추가하는 함수
     function addToHistory(fileName, data) {
         const historyItems = document.querySelector('.history-items');
@@ -299,12 +331,12 @@ document.addEventListener('DOMContentLoaded', function() {
         // 로딩 표시
         historyItems.innerHTML = '<div class="loading-indicator"><i class="fas fa-spinner fa-spin"></i> 히스토리 로드 중...</div>';
         
-        // 인보이스 목록 가져오기
-        fetch(`${API_BASE_URL}/documents/invoice`)
+        // 유형별 최신 5개씩만 가져오기 (목록 API 는 최신 순이므로 합쳐서 정렬하면 전체 최신 5개)
+        fetch(`${API_BASE_URL}/documents/invoice?limit=5`)
             .then(response => response.json())
             .then(invoiceData => {
                 // 오더시트 목록 가져오기
-                return fetch(`${API_BASE_URL}/documents/order`)
+                return fetch(`${API_BASE_URL}/documents/order?limit=5`)
                     .then(response => response.json())
                     .then(orderData => {
                         return {